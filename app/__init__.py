@@ -161,19 +161,30 @@ def _ensure_db_tables(flask_app: Flask) -> None:
 # Application factory
 # =============================================================================
 def create_app(env_name: str = None, config_class=None) -> Flask:
-    package_root = Path(__file__).resolve().parent
-    flask_app = Flask(
-        "flask_app",
-        template_folder=str(package_root / "templates"),
-        static_folder=str(package_root / "static"),
-    )
+    from .utils.boot_profile import BootProfile
+
+    profile = BootProfile()
+    with profile.step("flask"):
+        package_root = Path(__file__).resolve().parent
+        flask_app = Flask(
+            "flask_app",
+            template_folder=str(package_root / "templates"),
+            static_folder=str(package_root / "static"),
+        )
+
+    # Fast JSON codec (orjson/msgspec when installed) for jsonify and request JSON
+    with profile.step("json_provider"):
+        from .utils.json_codec import init_json_provider
+
+        init_json_provider(flask_app)
 
     # 1. Load configuration
-    if config_class:
-        flask_app.config.from_object(config_class)
-    else:
-        cfg = get_config_class(env_name)
-        flask_app.config.from_object(cfg)
+    with profile.step("config"):
+        if config_class:
+            flask_app.config.from_object(config_class)
+        else:
+            cfg = get_config_class(env_name)
+            flask_app.config.from_object(cfg)
 
     # -------------------------------------------------------------------------
     # Force TestingConfig when running tests (SQLite in-memory)
@@ -187,6 +198,14 @@ def create_app(env_name: str = None, config_class=None) -> Flask:
         flask_app.config["TEMPLATES_AUTO_RELOAD"] = True
         flask_app.jinja_env.cache = {}
 
+    # Shared Jinja bytecode cache (off under TESTING) + per-template render timing
+    with profile.step("template_cache"):
+        from .filters.datetime_filters import register_datetime_filters
+        from .utils.template_cache import init_template_cache
+
+        init_template_cache(flask_app)
+        register_datetime_filters(flask_app)
+
     # -------------------------------------------------------------------------
     # ⭐ MAINTENANCE MODE GUARD (Gatekeeper)
     # -------------------------------------------------------------------------
@@ -226,75 +245,102 @@ def create_app(env_name: str = None, config_class=None) -> Flask:
     flask_app.start_time = time.time()
 
     # 4. Initialize extensions (NOW after TESTING config is set)
-    init_extensions(flask_app)
+    with profile.step("extensions"):
+        init_extensions(flask_app)
+
+        # Fail at boot, not on the first login, if the hashing pool config is bad
+        from .services import password_hashing
+
+        password_hashing.init_app(flask_app)
 
     # Initialize limiter AFTER extensions and AFTER the app exists.
     # This avoids passing `app` at import time (fixes TypeError from positional args).
-    try:
-        limiter.init_app(flask_app)
-        flask_app.logger.info("⏱️ Limiter initialized via init_app()")
-    except Exception as exc:
-        # If limiter initialization fails, log the error but allow the app to continue.
-        # This ensures import-time errors don't crash the web process.
-        flask_app.logger.error("Failed to init limiter: %s", exc, exc_info=True)
+    with profile.step("limiter"):
+        try:
+            limiter.init_app(flask_app)
+            flask_app.logger.info("⏱️ Limiter initialized via init_app()")
+        except Exception as exc:
+            # If limiter initialization fails, log the error but allow the app to continue.
+            # This ensures import-time errors don't crash the web process.
+            flask_app.logger.error("Failed to init limiter: %s", exc, exc_info=True)
 
     # Register all models so SQLAlchemy mappings exist for test collection and imports.
     # Do this after extensions are initialized so `db` is bound to the app.
-    from . import models  # noqa: F401 - package-relative import ensures correct module resolution
+    with profile.step("models"):
+        from . import models  # noqa: F401 - package-relative import for correct resolution
+        from .services.portfolio_exposure import track_exposure
+
+        # Running credit exposure totals follow every CreditLedger/PaymentLog flush
+        track_exposure()
 
     # 5. JWT loaders
-    _register_jwt_loaders(flask_app)
+    with profile.step("loaders"):
+        _register_jwt_loaders(flask_app)
+
+        # Core component registration
+        _setup_logging(flask_app)
+        _register_error_handlers(flask_app)
+        _register_login_manager_loader(flask_app)
 
-    # Core component registration
-    _setup_logging(flask_app)
-    _register_error_handlers(flask_app)
-    _register_login_manager_loader(flask_app)
+        # Request timing for views that opt into the @enveloped API envelope
+        from .middleware.response_wrapper import init_response_handling
+
+        init_response_handling(flask_app)
 
     # 6. Admin blueprints
-    try:
-        from .blueprints.admin_routes import admin_api_bp, admin_bp
+    with profile.step("admin_blueprints"):
+        try:
+            from .blueprints.admin_routes import admin_api_bp, admin_bp
 
-        flask_app.register_blueprint(admin_bp)
-        flask_app.register_blueprint(admin_api_bp)
-    except Exception as exc:
-        flask_app.logger.error("Failed to register admin blueprints: %s", exc, exc_info=True)
-        raise
+            flask_app.register_blueprint(admin_bp)
+            flask_app.register_blueprint(admin_api_bp)
+        except Exception as exc:
+            flask_app.logger.error("Failed to register admin blueprints: %s", exc, exc_info=True)
+            raise
 
     # 6.5 Tiles blueprint (global /tiles/* endpoints)
-    try:
-        from .routes.tiles import tiles_bp
+    with profile.step("tiles_blueprint"):
+        try:
+            from .routes.tiles import tiles_bp
 
-        flask_app.register_blueprint(tiles_bp)
-    except Exception as exc:
-        flask_app.logger.warning("Tiles blueprint not loaded: %s", exc, exc_info=True)
+            flask_app.register_blueprint(tiles_bp)
+        except Exception as exc:
+            flask_app.logger.warning("Tiles blueprint not loaded: %s", exc, exc_info=True)
 
     # 7. Auto-discovered blueprints
-    _register_blueprints(flask_app)
+    with profile.step("blueprints"):
+        _register_blueprints(flask_app)
 
     # 8. Ensure tables exist in fallback scenarios
     # Skip calling _ensure_db_tables during Alembic migrations (ALEMBIC_RUNNING=1)
-    if flask_app.testing or os.environ.get("ALEMBIC_RUNNING") != "1":
-        with flask_app.app_context():
-            _ensure_db_tables(flask_app)
+    with profile.step("ensure_tables"):
+        if flask_app.testing or os.environ.get("ALEMBIC_RUNNING") != "1":
+            with flask_app.app_context():
+                _ensure_db_tables(flask_app)
 
     # 9. CLI commands
-    try:
-        from .cli import init_app as init_cli
+    with profile.step("cli"):
+        try:
+            from .cli import init_app as init_cli
 
-        init_cli(flask_app)
-    except Exception as exc:
-        _logger.error("Failed to register CLI commands: %s", exc)
+            init_cli(flask_app)
+        except Exception as exc:
+            _logger.error("Failed to register CLI commands: %s", exc)
 
-    try:
-        from .cli_commands.sweep_endpoints import sweep_endpoints
+        try:
+            from .cli_commands.sweep_endpoints import sweep_endpoints
 
-        flask_app.cli.add_command(sweep_endpoints)
-    except Exception as exc:
-        _logger.debug("Sweep endpoints CLI not available: %s", exc)
+            flask_app.cli.add_command(sweep_endpoints)
+        except Exception as exc:
+            _logger.debug("Sweep endpoints CLI not available: %s", exc)
 
     # 10. Root health-check route for platform probes
     @flask_app.route("/health")
     def root_health_check():
         return {"status": "ok"}, 200
 
+    # Per-step factory timings, reported by `flask boot-profile`
+    profile.finish()
+    flask_app.boot_profile = profile
+
     return flask_app
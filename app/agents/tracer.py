@@ -5,9 +5,6 @@ from datetime import datetime
 
 from app.utils.redis_utils import get_redis_client  # ✅ centralised, SSL‑safe client
 
-# Use the centralised Redis client
-redis_client = get_redis_client()
-
 
 def log_trace(agent, service, redis_key, ui_path):
     """
@@ -22,6 +19,8 @@ def log_trace(agent, service, redis_key, ui_path):
         "timestamp": datetime.utcnow().isoformat(),
     }
 
+    # Use the centralised Redis client, resolved per call (not at import)
+    redis_client = get_redis_client()
     if redis_client:
         try:
             redis_client.lpush("orchestration_tracer", json.dumps(event))
@@ -20,7 +20,7 @@ from flask_jwt_extended import (
 )
 from sqlalchemy.exc import SQLAlchemyError
 from werkzeug.exceptions import BadRequest, HTTPException, Unauthorized
-from werkzeug.security import check_password_hash, generate_password_hash
+from werkzeug.security import generate_password_hash
 
 from app.api.fintech_routes import fintech_bp
 from app.extensions import csrf, db
@@ -28,6 +28,7 @@ from app.models.schema_event import SchemaEvent
 from app.models.tradeline import Tradeline
 from app.models.user import User
 from app.security.api_key_auth import require_api_key
+from app.services.password_hashing import HashingOverloaded, verify_and_upgrade
 from app.utils.api_response import error_response, success_response
 from app.utils.rate_limit_guard import rate_limit_if_enabled
 from app.utils.telemetry import increment_counter
@@ -397,7 +398,19 @@ def login():
 
     user = User.query.filter_by(email=email).first()
 
-    if not user or not check_password_hash(user.password_hash, password):
+    try:
+        password_ok = verify_and_upgrade(user, password)
+    except HashingOverloaded:
+        increment_counter("auth_login_busy_v1")
+        response, status = error_response(
+            "E_LOGIN_BUSY",
+            message="Login is busy; retry shortly.",
+            http_status_code=503,
+        )
+        response.headers["Retry-After"] = "1"
+        return response, status
+
+    if not password_ok:
         increment_counter("auth_login_fail_credentials_v1")
         return error_response(
             "E_INVALID_CREDENTIALS",
@@ -54,6 +54,7 @@ from app.security_utilities import (
     synthetic_login_probe,
     token_revoked_check,
 )
+from app.services.password_hashing import HashingOverloaded, verify_and_upgrade
 from app.services.rate_limiter import apply_rate_limit, is_rate_limited
 from app.services.sms import send_mfa_code as send_mfa_sms
 from app.services.totp_service import generate_totp_secret, verify_totp_code
@@ -407,7 +408,12 @@ def login_view():
         # Use the same session as pytest (db.session)
         user = db.session.query(User).filter_by(email=email).first()
 
-        password_ok = bool(user) and check_password_hash(user.password_hash, password)
+        try:
+            password_ok = verify_and_upgrade(user, password)
+        except HashingOverloaded:
+            # Shed load instead of queueing behind CPU-bound hashes
+            flash("Sign-in is busy right now. Please try again in a moment.", "warning")
+            return render_template("auth/login.html"), 503, {"Retry-After": "1"}
         apply_rate_limit(ip, "login", is_failure=not password_ok)
 
         if password_ok:
@@ -935,7 +941,11 @@ def api_token():
         return jsonify(error="Too many attempts, try later"), 429
 
     user = User.query.filter_by(email=email).first()
-    if user and check_password_hash(user.password_hash, password):
+    try:
+        password_ok = verify_and_upgrade(user, password)
+    except HashingOverloaded:
+        return jsonify(error="Authentication busy, try again shortly"), 503, {"Retry-After": "1"}
+    if password_ok:
         if user.mfa_enabled:
             log_identity_event(user.id, "API_AUTH_FAIL_MFA_REQUIRED", ip=ip, user_agent=user_agent)
             return jsonify(error="MFA required; use session flow"), 403
@@ -0,0 +1,105 @@
+# =============================================================================
+# FILE: app/blueprints/export_routes.py
+# DESCRIPTION: Streaming NDJSON/CSV exports of transactions and ledger
+#              entries (see app/services/streaming_export.py). Users export
+#              their own rows; admins may pass ?user_id= or omit it for all.
+#              Large exports are fetched in windows: pass ?limit=N, then
+#              follow the X-Export-Next-Cursor header with ?cursor=.
+#              /export/arrow/<dataset> streams any columnar dataset
+#              (app/services/columnar_export.py) as Arrow IPC, admins only.
+# =============================================================================
+
+from flask import Blueprint, Response, request, stream_with_context
+from flask_login import current_user, login_required
+
+from app.services import columnar_export
+from app.services.streaming_export import (
+    LEDGER,
+    NEXT_CURSOR_HEADER,
+    TRANSACTIONS,
+    export_response,
+    export_window,
+    ledger_statement,
+    parse_export_args,
+    transactions_statement,
+)
+from app.utils.api_response import error_response
+from app.utils.pagination import InvalidCursor
+from app.utils.user_helpers import user_is_admin
+
+export_bp = Blueprint("export", __name__, url_prefix="/export")
+
+
+def _owner_scope():
+    """User id the export is limited to (None = every user, admins only)."""
+    if user_is_admin(current_user):
+        return request.args.get("user_id") or None
+    return current_user.id
+
+
+def _stream(spec, build_statement):
+    try:
+        params = parse_export_args(request.args)
+        return export_response(build_statement(_owner_scope(), params), spec, params)
+    except InvalidCursor:
+        return error_response("E_BAD_CURSOR", message="Invalid or expired export cursor.")
+    except ValueError as exc:
+        return error_response("E_BAD_REQUEST", message=str(exc))
+
+
+@export_bp.route("/transactions", methods=["GET"])
+@login_required
+def export_transactions():
+    """Stream transactions ordered by (date, id), filtered by the query string."""
+    return _stream(TRANSACTIONS, transactions_statement)
+
+
+@export_bp.route("/ledger", methods=["GET"])
+@login_required
+def export_ledger():
+    """Stream ledger entries in id (received) order, filtered by the query string."""
+    return _stream(LEDGER, ledger_statement)
+
+
+@export_bp.route("/arrow/<dataset>", methods=["GET"])
+@login_required
+def export_arrow(dataset):
+    """Stream a columnar dataset as Arrow IPC, ordered by (time column, id)."""
+    if not user_is_admin(current_user):
+        return error_response("E_FORBIDDEN", message="Admins only.", http_status_code=403)
+    spec = columnar_export.DATASETS.get(dataset)
+    if spec is None:
+        return error_response(
+            "E_NOT_FOUND", message=f"Unknown dataset {dataset!r}.", http_status_code=404
+        )
+    try:
+        params = parse_export_args(request.args, formats=("arrow",))
+        table = spec.table
+        stmt, next_cursor = export_window(
+            columnar_export.dataset_statement(
+                spec, params.start, params.end, request.args.get("user_id")
+            ),
+            table.c[spec.time_col],
+            table.primary_key.columns.values()[0],
+            params,
+        )
+        body = columnar_export.iter_ipc(stmt, spec)
+    except columnar_export.ArrowUnavailable as exc:
+        return error_response("E_UNAVAILABLE", message=str(exc), http_status_code=501)
+    except InvalidCursor:
+        return error_response("E_BAD_CURSOR", message="Invalid or expired export cursor.")
+    except ValueError as exc:
+        return error_response("E_BAD_REQUEST", message=str(exc))
+
+    headers = {
+        "Content-Disposition": f"attachment;filename={dataset}.arrows",
+        "X-Accel-Buffering": "no",
+        "Access-Control-Expose-Headers": NEXT_CURSOR_HEADER,
+    }
+    if next_cursor:
+        headers[NEXT_CURSOR_HEADER] = next_cursor
+    return Response(
+        stream_with_context(body),
+        mimetype=columnar_export.ARROW_STREAM_MIMETYPE,
+        headers=headers,
+    )
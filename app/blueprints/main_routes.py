@@ -21,10 +21,10 @@ from flask import (
 from flask_login import current_user, login_required, login_user
 from jinja2 import TemplateNotFound
 from sqlalchemy.exc import OperationalError
-from werkzeug.security import check_password_hash
 
 from app.constants import OPERATOR_MODE_KEY
 from app.models.user import User
+from app.services.password_hashing import HashingOverloaded, verify_and_upgrade
 from app.utils.redis_utils import get_redis_client
 
 # Blueprint for main routes
@@ -215,7 +215,7 @@ def handle_login_post(source: str):
     password = request.form.get("password", "")
     try:
         user = User.query.filter_by(email=email).first()
-        if user and check_password_hash(user.password_hash, password):
+        if verify_and_upgrade(user, password):
             login_user(user)
             emit_narrative_trace("login", f"user_id:{user.id}", "ok", f"via:{source}")
             flash(f"Welcome back, {user.email}!", "success")
@@ -223,6 +223,9 @@ def handle_login_post(source: str):
         else:
             flash("Invalid credentials.", "danger")
             emit_narrative_trace("login", f"email:{email}", "error", "invalid_credentials")
+    except HashingOverloaded:
+        flash("Sign-in is busy right now. Please try again in a moment.", "warning")
+        return render_template("auth/login.html", app=current_app), 503, {"Retry-After": "1"}
     except Exception:
         current_app.logger.exception("Login error for email=%s", email)
         flash("Login error. Please try again.", "danger")
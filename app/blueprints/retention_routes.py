@@ -0,0 +1,53 @@
+# =============================================================================
+# FILE: app/blueprints/retention_routes.py
+# DESCRIPTION: Audit reads across hot and archived rows of the retained
+#              tables (see app/services/retention.py), admins only.
+#              GET /retention/<table>/history?start=&end=&user_id=&event_type=
+#              returns one keyset page; follow next_cursor with ?cursor=.
+# =============================================================================
+
+from flask import Blueprint, request
+from flask_login import current_user, login_required
+
+from app.services import retention
+from app.services.streaming_export import parse_export_args
+from app.utils.api_response import error_response, success_response
+from app.utils.pagination import InvalidCursor, parse_page_args
+from app.utils.user_helpers import user_is_admin
+
+retention_bp = Blueprint("retention", __name__, url_prefix="/retention")
+
+# Equality filters accepted from the query string, when the table has the column
+FILTER_ARGS = ("user_id", "event_type", "bureau", "status")
+
+
+@retention_bp.route("/<table>/history", methods=["GET"])
+@login_required
+def table_history(table):
+    """One page of a table's rows, hot and archived, newest first (?order=asc to flip)."""
+    if not user_is_admin(current_user):
+        return error_response("E_FORBIDDEN", message="Admins only.", http_status_code=403)
+    policy = retention.POLICIES.get(table)
+    if policy is None:
+        return error_response(
+            "E_NOT_FOUND", message=f"Unknown table {table!r}.", http_status_code=404
+        )
+    columns = policy.table.columns.keys()
+    filters = {k: request.args[k] for k in FILTER_ARGS if k in columns and request.args.get(k)}
+    try:
+        window = parse_export_args(request.args, formats=("json",))
+        page_args = parse_page_args(request.args, {policy.time_col: None}, policy.time_col)
+        page = retention.history(
+            table,
+            start=window.start,
+            end=window.end,
+            filters=filters,
+            cursor=page_args.cursor,
+            limit=page_args.limit,
+            descending=page_args.descending,
+        )
+    except InvalidCursor:
+        return error_response("E_BAD_CURSOR", message="Invalid or expired cursor.")
+    except ValueError as exc:
+        return error_response("E_BAD_REQUEST", message=str(exc))
+    return success_response({"items": page.items, "next_cursor": page.next_cursor})
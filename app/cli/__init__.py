@@ -31,6 +31,7 @@ from app.cli_commands.sweep_endpoints import sweep_endpoints
 from app.scripts.cli_template_tracer import trace_templates_command
 
 from .blueprint_emit import blueprint_emit
+from .boot_profile import boot_profile
 from .cockpit_pdf_test import test_cockpit_pdf
 
 # ---------------------------------------------------------------------------
@@ -38,14 +39,18 @@ from .cockpit_pdf_test import test_cockpit_pdf
 # ---------------------------------------------------------------------------
 from .commands import route_map_command as route_map_dump
 from .commands import validate_relationships_command
+from .compliance import compliance
 from .doctor import doctor
 
 # ---------------------------------------------------------------------------
 # Diagnostics & Blueprint Inspection
 # ---------------------------------------------------------------------------
 from .emit_blueprint_inspector import emit_blueprint_inspector
-from .grant_pulse import grant_pulse
+from .exposure import exposure
+from .grant_pulse import ai_risk_index, grant_pulse
+from .parquet_export import parquet
 from .reset_and_reseed import reset_and_reseed
+from .retention import retention
 
 # ---------------------------------------------------------------------------
 # Seeder commands (core users)
@@ -69,10 +74,12 @@ from .seed_mock_bank_transfers_summary import seed_mock_bank_transfers_summary
 # ---------------------------------------------------------------------------
 from .seed_mock_transactions import seed_mock_transactions
 from .seed_subscriber import seed_subscriber
+from .seed_synthetic import seed_synthetic
 from .seed_timeline import seed_timeline
 from .seed_todos import seed_todos
 from .statement_leaders import statement_leaders
 from .statement_pulse import statement_pulse
+from .templates import templates
 
 # =============================================================================
 # CLI Registration
@@ -93,6 +100,7 @@ def init_app(flask_app: Flask) -> None:
 
     # Pulses & Diagnostics
     flask_app.cli.add_command(grant_pulse)
+    flask_app.cli.add_command(ai_risk_index)
     flask_app.cli.add_command(statement_pulse)
     flask_app.cli.add_command(statement_leaders)
     flask_app.cli.add_command(emit_blueprint_inspector)
@@ -101,6 +109,12 @@ def init_app(flask_app: Flask) -> None:
 
     # ⭐ NEW: Unified diagnostics
     flask_app.cli.add_command(diagnostics_full)
+    flask_app.cli.add_command(boot_profile)
+    flask_app.cli.add_command(compliance)
+    flask_app.cli.add_command(exposure)
+    flask_app.cli.add_command(parquet)
+    flask_app.cli.add_command(retention)
+    flask_app.cli.add_command(templates)
 
     # Template wiring audit (endpoint tracer)
     flask_app.cli.add_command(trace_templates_command)
@@ -122,6 +136,7 @@ def init_app(flask_app: Flask) -> None:
     flask_app.cli.add_command(seed_timeline)
     flask_app.cli.add_command(seed_todos)
     flask_app.cli.add_command(seed_everything)
+    flask_app.cli.add_command(seed_synthetic)
 
     # Mock‑bank‑transfer seeders
     flask_app.cli.add_command(seed_mock_bank_transfers_flags)
@@ -138,12 +153,15 @@ cli_command_lattice = {
     "route_map_dump": route_map_dump,
     "validate_relationships": validate_relationships_command,
     "grant_pulse": grant_pulse,
+    "ai_risk_index": ai_risk_index,
     "statement_pulse": statement_pulse,
     "statement_leaders": statement_leaders,
     "emit_blueprint_inspector": emit_blueprint_inspector,
     "blueprint_emit": blueprint_emit,
     "test_cockpit_pdf": test_cockpit_pdf,
     "diagnostics_full": diagnostics_full,  # ⭐ Added to lattice
+    "boot_profile": boot_profile,
+    "templates": templates,
     "template_inheritance": template_inheritance_command,
     "template_block_audit": template_block_audit_command,
     "sweep_endpoints": sweep_endpoints,
@@ -163,6 +181,7 @@ cli_command_lattice = {
     "seed_timeline": seed_timeline,
     "seed_todos": seed_todos,
     "seed_everything": seed_everything,
+    "seed_synthetic": seed_synthetic,
     # Mock‑bank‑transfer seeders
     "seed_mock_bank_transfers_flags": seed_mock_bank_transfers_flags,
     "seed_mock_bank_transfers_all": seed_mock_bank_transfers_all,
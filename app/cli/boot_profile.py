@@ -0,0 +1,71 @@
+# =============================================================================
+# FILE: app/cli/boot_profile.py
+# DESCRIPTION: `flask boot-profile` — report per-step create_app() timings and
+#              per-module import cost, optionally failing against a budget.
+# =============================================================================
+
+import json
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+
+from app.utils.boot_profile import app_module_timings, profile_imports
+
+
+@click.command("boot-profile")
+@click.option("--top", default=25, show_default=True, help="Number of modules to list.")
+@click.option("--imports/--no-imports", default=True, help="Profile module imports.")
+@click.option("--all-modules", is_flag=True, help="Include third-party modules.")
+@click.option("--budget-ms", type=float, default=None, help="Fail if create_app exceeds this.")
+@click.option("--as-json", "as_json", is_flag=True, help="Emit machine-readable JSON.")
+@with_appcontext
+def boot_profile(top, imports, all_modules, budget_ms, as_json):
+    """Show where worker boot time goes: factory steps and module imports."""
+    profile = getattr(current_app, "boot_profile", None)
+    if profile is not None:
+        factory = profile.as_dict()
+    else:
+        factory = {"steps": [], "untimed_ms": 0.0, "total_ms": 0.0}
+
+    modules = []
+    if imports:
+        rows = profile_imports()
+        if all_modules:
+            rows = sorted(rows, key=lambda r: r.self_us, reverse=True)
+        else:
+            rows = app_module_timings(rows)
+        modules = [
+            {
+                "module": r.module,
+                "self_ms": round(r.self_us / 1000, 2),
+                "cumulative_ms": round(r.cumulative_us / 1000, 2),
+            }
+            for r in rows[:top]
+        ]
+
+    over_budget = budget_ms is not None and factory["total_ms"] > budget_ms
+
+    if as_json:
+        click.echo(
+            json.dumps({"factory": factory, "imports": modules, "budget_ms": budget_ms}, indent=2)
+        )
+    else:
+        click.echo("\n⏱️  create_app() steps:")
+        for step in factory["steps"]:
+            click.echo(f"  {step['step']:<20} {step['ms']:>10.2f} ms")
+        click.echo(f"  {'(untimed)':<20} {factory['untimed_ms']:>10.2f} ms")
+        click.echo(f"  {'TOTAL':<20} {factory['total_ms']:>10.2f} ms")
+
+        if modules:
+            click.echo(f"\n📦 Slowest imports (top {len(modules)}, self time):")
+            for row in modules:
+                click.echo(
+                    f"  {row['self_ms']:>9.2f} ms  (cum {row['cumulative_ms']:>9.2f} ms)  "
+                    f"{row['module']}"
+                )
+
+    if over_budget:
+        raise click.ClickException(
+            f"create_app took {factory['total_ms']:.1f} ms (budget {budget_ms:.1f} ms)"
+        )
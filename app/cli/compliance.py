@@ -0,0 +1,70 @@
+# =============================================================================
+# FILE: app/cli/compliance.py
+# DESCRIPTION: `flask compliance refresh|report|fraud-trends` — batch-evaluate
+#              lender compliance into snapshots, print stored snapshots
+#              without recomputing them, and fold new fraud reports into the
+#              fraud trend rollup.
+# =============================================================================
+
+import json
+
+import click
+from flask.cli import with_appcontext
+
+
+@click.group("compliance")
+def compliance():
+    """Lender compliance snapshots."""
+
+
+@compliance.command("refresh")
+@click.option("--force", is_flag=True, help="Re-evaluate every lender, changed or not.")
+@click.option("--lender", "lender_ids", multiple=True, help="Limit to these lender ids.")
+@with_appcontext
+def refresh(force, lender_ids):
+    """Re-evaluate lenders whose agreements or account state changed."""
+    from app.compliance import refresh_compliance_snapshots
+
+    summary = refresh_compliance_snapshots(lender_ids=list(lender_ids) or None, force=force)
+    click.echo(
+        f"🧾 Compliance refresh: {summary['refreshed']}/{summary['evaluated']} lenders "
+        f"re-evaluated, {summary['locked']} locked, {summary['removed']} snapshots removed"
+    )
+
+
+@compliance.command("report")
+@click.option("--status", type=click.Choice(["compliant", "at_risk", "locked"]), default=None)
+@click.option("--limit", type=int, default=50, show_default=True)
+@click.option("--as-json", "as_json", is_flag=True, help="Emit machine-readable JSON.")
+@with_appcontext
+def report(status, limit, as_json):
+    """Print stored snapshots (run `refresh` to update them)."""
+    from app.compliance import get_compliance_snapshots
+
+    snapshots = get_compliance_snapshots(status=status, limit=limit)
+    if as_json:
+        click.echo(json.dumps(snapshots, indent=2))
+        return
+
+    click.echo(f"{'LENDER':<38}{'STATUS':<11}{'AGREEMENTS':>11}{'VIOLATIONS':>11}  EVALUATED")
+    for snap in snapshots:
+        click.echo(
+            f"{snap['lender_id']:<38}{snap['status']:<11}{snap['total_agreements']:>11}"
+            f"{snap['violations_total']:>11}  {snap['evaluated_at']}"
+        )
+
+
+@compliance.command("fraud-trends")
+@click.option("--rebuild", is_flag=True, help="Recount every fraud report from scratch.")
+@click.option("--days", type=int, default=30, show_default=True)
+@with_appcontext
+def fraud_trends(rebuild, days):
+    """Fold fraud reports newer than the high-water mark into the trend rollup."""
+    from app.compliance_ai import predict_fraud_trends, refresh_fraud_trends
+
+    summary = refresh_fraud_trends(rebuild=rebuild)
+    click.echo(
+        f"🕵️ Fraud trends: {summary['processed']} new reports folded into "
+        f"{summary['buckets']} buckets"
+    )
+    click.echo(json.dumps(predict_fraud_trends(days=days), indent=2))
@@ -0,0 +1,52 @@
+# =============================================================================
+# FILE: app/cli/exposure.py
+# DESCRIPTION: `flask exposure rebuild|report|violations` — recompute the
+#              running credit exposure totals, and print portfolio-level
+#              utilization, delinquency buckets and overexposed borrowers.
+# =============================================================================
+
+import json
+
+import click
+from flask.cli import with_appcontext
+
+
+@click.group("exposure")
+def exposure():
+    """Portfolio credit exposure."""
+
+
+@exposure.command("rebuild")
+@click.option("--user", "user_ids", multiple=True, help="Limit to these borrower ids.")
+@with_appcontext
+def rebuild(user_ids):
+    """Recompute running totals from credit_ledger and payment_log."""
+    from app.services.portfolio_exposure import rebuild_exposure
+
+    count = rebuild_exposure(list(user_ids) or None)
+    click.echo(f"📊 Exposure rebuilt for {count} borrowers")
+
+
+@exposure.command("report")
+@with_appcontext
+def report():
+    """Portfolio totals, utilization and delinquency buckets as JSON."""
+    from app.services.portfolio_exposure import portfolio_summary
+
+    click.echo(json.dumps(portfolio_summary(), indent=2))
+
+
+@exposure.command("violations")
+@click.option("--limit", type=int, default=50, show_default=True)
+@with_appcontext
+def violations(limit):
+    """Overexposed borrowers, highest outstanding principal first."""
+    from app.services.portfolio_exposure import credit_violations, user_exposures
+
+    violating = credit_violations()
+    click.echo(f"⚠️ {len(violating)} overexposed borrowers")
+    for row in user_exposures(list(violating))[:limit]:
+        click.echo(
+            f"{row['user_id']:<38}{row['exposure']:>14}{row['utilization'] or 0:>9.2%}"
+            f"  {row['delinquency']}"
+        )
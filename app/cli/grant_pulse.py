@@ -1,10 +1,9 @@
 # app/cli/grant_pulse.py
 
-import json
-
 import click
 
 from app.telemetry.ttl_emit import trace_log
+from app.utils.ai_risk_log import backfill_ai_risk_log_index, recent_ai_risk_logs
 from app.utils.redis_utils import get_redis_client
 
 
@@ -14,17 +13,25 @@ def grant_pulse():
     # Emit cockpit telemetry
     trace_log("cli/grant_pulse/status", "Grant pulse executed")
 
-    redis = get_redis_client()
-    keys = redis.keys("grants_composed:*")
-
     by_type = {}
-    for key in keys:
-        raw = redis.get(key)
-        if raw:
-            data = json.loads(raw)
-            t = data.get("grant_type", "unknown")
-            by_type[t] = by_type.get(t, 0) + 1
+    for data in recent_ai_risk_logs(get_redis_client(), limit=None):
+        t = data.get("grant_type", "unknown")
+        by_type[t] = by_type.get(t, 0) + 1
 
     click.echo("📊 Grant Composition Pulse:")
     for grant_type, count in by_type.items():
         click.echo(f"- {grant_type.upper()}: {count}")
+
+
+@click.command("cockpit:ai-risk-index")
+@click.option("--force", is_flag=True, help="Scan again even if the backfill already ran.")
+def ai_risk_index(force):
+    """Index AI risk logs written before the time-ordered index existed."""
+    client = get_redis_client()
+    if client is None:
+        raise click.ClickException("Redis is unavailable")
+    indexed = backfill_ai_risk_log_index(client, force=force)
+    if indexed is None:
+        click.echo("AI risk log index already backfilled (use --force to rescan).")
+    else:
+        click.echo(f"Indexed {indexed} AI risk logs.")
@@ -0,0 +1,72 @@
+# =============================================================================
+# FILE: app/cli/parquet_export.py
+# DESCRIPTION: `flask parquet export|status` — incremental, partitioned
+#              Parquet exports of the analytics datasets (transactions, vault
+#              transactions, ledger entries, schema and trace events). See
+#              app/services/columnar_export.py.
+# =============================================================================
+
+import os
+import time
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+
+
+def _default_root() -> str:
+    return current_app.config.get("PARQUET_EXPORT_ROOT") or os.path.join(
+        current_app.instance_path, "parquet"
+    )
+
+
+@click.group("parquet")
+def parquet():
+    """Columnar exports for analytics."""
+
+
+@parquet.command("export")
+@click.option("--root", default=None, help="Dataset root (default: PARQUET_EXPORT_ROOT).")
+@click.option("--dataset", "names", multiple=True, help="Limit to these datasets.")
+@click.option("--buckets", default=16, show_default=True, type=int, help="User buckets.")
+@click.option("--batch-rows", default=50_000, show_default=True, type=int)
+@click.option("--full", is_flag=True, help="Ignore watermarks and rewrite the datasets.")
+@with_appcontext
+def export(root, names, buckets, batch_rows, full):
+    """Write rows added since the last run to partitioned Parquet files."""
+    from app.services.columnar_export import DATASETS, ArrowUnavailable, export_parquet
+
+    unknown = set(names) - set(DATASETS)
+    if unknown:
+        raise click.BadParameter(f"unknown dataset(s): {', '.join(sorted(unknown))}")
+    root = root or _default_root()
+    for name in names or DATASETS:
+        started = time.perf_counter()
+        try:
+            result = export_parquet(name, root, buckets, batch_rows, full)
+        except ArrowUnavailable as exc:
+            raise click.ClickException(str(exc)) from exc
+        elapsed = time.perf_counter() - started
+        click.echo(f"📦 {name:<20}{result['rows']:>12,} rows  {elapsed:7.2f}s  run={result['run']}")
+    click.echo(f"✅ Parquet datasets under {root}")
+
+
+@parquet.command("status")
+@click.option("--root", default=None, help="Dataset root (default: PARQUET_EXPORT_ROOT).")
+@with_appcontext
+def status(root):
+    """Watermark, exported row count and last run per dataset."""
+    from app.services.columnar_export import DATASETS, load_state
+
+    state = load_state(root or _default_root())
+    for name in DATASETS:
+        entry = state["datasets"].get(name)
+        if not entry:
+            click.echo(f"{name:<20} never exported")
+            continue
+        click.echo(
+            f"{name:<20}{entry['rows']:>12,} rows  last_run={entry['last_run']}  "
+            f"updated_at={entry['updated_at']}"
+        )
+    if state.get("pending"):
+        click.echo(f"⚠️ run {state['pending']['run']} is staged but unpublished")
@@ -0,0 +1,103 @@
+# =============================================================================
+# FILE: app/cli/retention.py
+# DESCRIPTION: `flask retention run|status|partition|purge` — moves aged rows
+#              of the audit and trace tables into their archives in bounded
+#              chunks. See app/services/retention.py.
+# =============================================================================
+
+import time
+
+import click
+from flask.cli import with_appcontext
+
+
+def _check_tables(names):
+    from app.services.retention import POLICIES
+
+    unknown = set(names) - set(POLICIES)
+    if unknown:
+        raise click.BadParameter(f"unknown table(s): {', '.join(sorted(unknown))}")
+    return names or tuple(POLICIES)
+
+
+@click.group("retention")
+def retention():
+    """Retention and archival of audit and trace tables."""
+
+
+@retention.command("run")
+@click.option("--table", "names", multiple=True, help="Limit to these tables.")
+@click.option(
+    "--target",
+    type=click.Choice(["table", "parquet"]),
+    default=None,
+    help="Archive destination (default: RETENTION_TARGET, else table).",
+)
+@click.option("--chunk-rows", default=2_000, show_default=True, type=int)
+@click.option("--max-chunks", default=None, type=int, help="Stop after this many chunks.")
+@click.option("--pause", default=0.0, show_default=True, type=float, help="Seconds between chunks.")
+@with_appcontext
+def run(names, target, chunk_rows, max_chunks, pause):
+    """Archive rows older than each table's retention age."""
+    from app.services.columnar_export import ArrowUnavailable
+    from app.services.retention import archive_expired
+
+    for name in _check_tables(names):
+        started = time.perf_counter()
+        try:
+            result = archive_expired(
+                name, target=target, chunk_rows=chunk_rows, max_chunks=max_chunks, pause=pause
+            )
+        except ArrowUnavailable as exc:
+            raise click.ClickException(str(exc)) from exc
+        elapsed = time.perf_counter() - started
+        click.echo(
+            f"🗄️ {name:<14}{result['rows']:>12,} rows  {result['chunks']:>6} chunks  "
+            f"{elapsed:7.2f}s  -> {result['target']} (before {result['cutoff']:%Y-%m-%d})"
+        )
+
+
+@retention.command("status")
+@with_appcontext
+def status():
+    """Retention age, hot, expired and archived rows per table."""
+    from app.services.retention import retention_status
+
+    for entry in retention_status():
+        click.echo(
+            f"{entry['table']:<14} keep {entry['max_age_days']:>4}d  "
+            f"hot={entry['hot_rows']:,}  expired={entry['expired_rows']:,}  "
+            f"archived={entry['archived_rows']:,}  parquet_files={entry['parquet_files']}  "
+            f"partitions={entry['partitions']}"
+        )
+
+
+@retention.command("partition")
+@click.option("--table", "names", multiple=True, help="Limit to these tables.")
+@with_appcontext
+def partition(names):
+    """Range-partition archive tables by month (MySQL with partitioning only)."""
+    from app.extensions import db
+    from app.services.retention import partition_archive
+
+    for name in _check_tables(names):
+        if not partition_archive(name):
+            click.echo("⚠️ Native partitioning is not available on this database")
+            return
+        db.session.commit()
+        click.echo(f"✅ {name}_archive partitioned by month")
+
+
+@retention.command("purge")
+@click.option("--table", "names", multiple=True, help="Limit to these tables.")
+@click.option("--older-than-days", required=True, type=int, help="Archived rows to drop.")
+@click.confirmation_option(prompt="Permanently delete archived rows?")
+@with_appcontext
+def purge(names, older_than_days):
+    """Permanently drop archived rows (whole partitions where possible)."""
+    from app.services.retention import purge_archive
+
+    for name in _check_tables(names):
+        result = purge_archive(name, older_than_days)
+        dropped = ", ".join(result["partitions"]) or "none"
+        click.echo(f"🧹 {name:<14}{result['rows']:>12,} rows  partitions dropped: {dropped}")
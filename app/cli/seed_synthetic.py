@@ -0,0 +1,59 @@
+# FILE: app/cli/seed_synthetic.py
+
+import time
+
+import click
+from flask.cli import with_appcontext
+
+from app.services.synthetic_data import SyntheticConfig
+from app.services.synthetic_data import seed_synthetic as run_seed
+
+
+@click.command("seed-synthetic")
+@click.option("--users", default=1_000, show_default=True, type=int)
+@click.option("--transactions", default=100_000, show_default=True, type=int)
+@click.option("--vault", "vault_transactions", default=10_000, show_default=True, type=int)
+@click.option("--events", "schema_events", default=10_000, show_default=True, type=int)
+@click.option("--days", default=365, show_default=True, type=int, help="History window")
+@click.option("--fraud-rate", default=0.005, show_default=True, type=float)
+@click.option("--seed", default=42, show_default=True, type=int)
+@click.option("--batch-size", default=250_000, show_default=True, type=int)
+@click.option(
+    "--load-data",
+    is_flag=True,
+    help="MySQL: use LOAD DATA LOCAL INFILE (needs local_infile on client and server).",
+)
+@with_appcontext
+def seed_synthetic(
+    users,
+    transactions,
+    vault_transactions,
+    schema_events,
+    days,
+    fraud_rate,
+    seed,
+    batch_size,
+    load_data,
+):
+    """Bulk-load a large reproducible synthetic dataset for load testing."""
+    config = SyntheticConfig(
+        users=users,
+        transactions=transactions,
+        vault_transactions=vault_transactions,
+        schema_events=schema_events,
+        days=days,
+        fraud_rate=fraud_rate,
+        seed=seed,
+        batch_size=batch_size,
+    )
+
+    def progress(table, rows, seconds):
+        rate = rows / seconds if seconds else 0
+        click.echo(f"  {table:<20} +{rows:>9,} rows in {seconds:6.2f}s ({rate:,.0f} rows/s)")
+
+    click.echo(f"📄 Seeding synthetic dataset (seed={seed})...")
+    started = time.perf_counter()
+    counts = run_seed(config, load_data=load_data, progress=progress)
+    elapsed = time.perf_counter() - started
+    total = sum(counts.values())
+    click.echo(f"✅ {total:,} rows in {elapsed:.1f}s ({total / elapsed:,.0f} rows/s)")
@@ -0,0 +1,57 @@
+# =============================================================================
+# FILE: app/cli/templates.py
+# DESCRIPTION: `flask templates precompile` — compile every Jinja template
+#              into the shared bytecode cache at deploy time, failing the
+#              deploy on template syntax errors.
+#              `flask templates index` — refresh the shared template index
+#              used by the template audits and summarize it.
+# =============================================================================
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+
+
+@click.group("templates")
+def templates():
+    """Jinja template maintenance."""
+
+
+@templates.command("precompile")
+@click.option("--clear", is_flag=True, help="Drop cached bytecode before compiling.")
+@with_appcontext
+def precompile(clear):
+    """Compile all templates; exits non-zero when any fails to parse."""
+    from app.utils.template_cache import precompile_templates
+
+    result = precompile_templates(current_app, clear=clear)
+    target = result["cache_dir"] or "no bytecode cache configured (syntax check only)"
+    click.echo(f"🧩 Compiled {result['compiled']} templates in {result['ms']} ms → {target}")
+    for error in result["errors"]:
+        click.echo(f"❌ {error['template']}:{error['line']}: {error['error']}", err=True)
+    if result["errors"]:
+        raise click.ClickException(f"{len(result['errors'])} templates failed to compile")
+
+
+@templates.command("index")
+@with_appcontext
+def index():
+    """Refresh the template index; report parse errors and unknown url_for targets."""
+    from app.utils.template_index import get_template_index, template_roots
+
+    roots = template_roots(current_app)
+    template_index = get_template_index(current_app, roots)
+    stats = template_index.last_refresh
+    click.echo(
+        f"🗂️ {stats['files']} templates: {stats['parsed']} parsed, "
+        f"{stats['touched']} touched, {stats['unchanged']} unchanged, "
+        f"{stats['removed']} removed"
+    )
+    endpoints = set(current_app.view_functions)
+    for info in template_index.templates(roots):
+        problem = info.read_error or info.syntax_error
+        if problem:
+            click.echo(f"❌ {info.name}: {problem}")
+        unknown = sorted(set(info.url_for) - endpoints)
+        if unknown:
+            click.echo(f"⚠️ {info.name}: unknown endpoints {', '.join(unknown)}")
@@ -1,9 +1,8 @@
 # /home/srpihhllc/PlaidBridgeOpenBankingApi/app/cli_commands/cli_template_inheritance.py
 
 import click
-import redis
-from flask import current_app
 
+from app.utils.redis_utils import get_redis_client
 from app.utils.template_inheritance_audit import audit_template_inheritance
 
 
@@ -12,12 +11,7 @@ def template_inheritance_command():
     """
     Run the cockpit-grade template inheritance audit.
     """
-    try:
-        redis_client = redis.Redis.from_url(
-            current_app.config.get("REDIS_URL", "redis://localhost:6379/0")
-        )
-    except Exception:
-        redis_client = None
+    redis_client = get_redis_client()
 
     summary = audit_template_inheritance(redis_client)
 
@@ -1,29 +1,484 @@
 # app/cockpit/lib/ttl.py
+#
+# Two-tier TTL cache for cockpit tiles.
+#   - Tier 1: per-process LRU (bounded, thread-safe)
+#   - Tier 2: optional shared Redis tier (results that survive a JSON round
+#     trip unchanged, so both tiers return the same types)
+# Misses are single-flight: one caller computes, concurrent callers for the
+# same key wait for its result (per process), and a short Redis lock keeps
+# other workers from recomputing the same shared entry. Expired entries inside
+# the stale window are served while one caller revalidates.
+# Invalidation bumps a per-tile generation (locally and in Redis); a result
+# computed under an older generation is returned to its callers but never
+# stored, so a refresh racing a write cannot put the old value back.
 
+import hashlib
+import logging
+import os
+import threading
 import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from functools import wraps
 
-# Simple in-memory TTL cache
-_cache_store: dict[str, object] = {}
+from app.utils import json_codec
 
+logger = logging.getLogger(__name__)
+
+_SHARED_PREFIX = "cockpit:tile"
+
+
+@dataclass
+class _Entry:
+    value: object
+    stored_at: float
+    fresh_for: float
+    stale_for: float
+
+    def age(self, now: float) -> float:
+        return now - self.stored_at
+
+    def is_fresh(self, now: float) -> bool:
+        return self.age(now) < self.fresh_for
+
+    def is_servable(self, now: float) -> bool:
+        return self.age(now) < self.fresh_for + self.stale_for
+
+
+@dataclass
+class TileStats:
+    hits: int = 0
+    stale_hits: int = 0
+    shared_hits: int = 0
+    misses: int = 0
+    waits: int = 0
+    computes: int = 0
+    errors: int = 0
+    compute_ms: float = 0.0
+
+    def as_dict(self) -> dict:
+        served = self.hits + self.stale_hits + self.shared_hits
+        lookups = served + self.misses
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "shared_hits": self.shared_hits,
+            "misses": self.misses,
+            "waits": self.waits,
+            "computes": self.computes,
+            "errors": self.errors,
+            "hit_ratio": round(served / lookups, 4) if lookups else 0.0,
+            "avg_compute_ms": round(self.compute_ms / self.computes, 2) if self.computes else 0.0,
+        }
+
+
+@dataclass
+class _Flight:
+    done: threading.Event = field(default_factory=threading.Event)
+    value: object = None
+    error: BaseException | None = None
+
+
+@dataclass
+class _Lookup:
+    """Outcome of TileCache.lookup(): serve ``value``, wait on or lead ``flight``."""
+
+    hit: bool = False
+    value: object = None
+    flight: _Flight | None = None
+    leader: bool = False
+    stale: _Entry | None = None
+    generation: int = 0
+
+
+class TileCache:
+    """Bounded LRU + single-flight bookkeeping shared by every ttl_cache tile."""
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: OrderedDict = OrderedDict()
+        self._flights: dict = {}
+        self._stats: dict[str, TileStats] = {}
+        self._tags: dict[str, set[str]] = {}
+        self._generations: dict[str, int] = {}
+
+    # -- stats ---------------------------------------------------------------
+    def stats_for(self, name: str) -> TileStats:
+        stats = self._stats.get(name)
+        if stats is None:
+            stats = self._stats.setdefault(name, TileStats())
+        return stats
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {name: s.as_dict() for name, s in sorted(self._stats.items())}
+
+    # -- local tier ----------------------------------------------------------
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key, entry: _Entry) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # -- single flight -------------------------------------------------------
+    def lookup(self, key, now: float) -> _Lookup:
+        """
+        Serve a fresh entry, or a stale one while another caller refreshes;
+        otherwise join the in-flight computation or become its leader.
+        """
+        name = key[0]
+        with self._lock:
+            stats = self.stats_for(name)
+            entry = self.get(key)
+            if entry is not None and entry.is_fresh(now):
+                stats.hits += 1
+                return _Lookup(hit=True, value=entry.value)
+
+            stale = entry if entry is not None and entry.is_servable(now) else None
+            flight = self._flights.get(key)
+            if flight is not None:
+                if stale is not None:
+                    stats.stale_hits += 1
+                    return _Lookup(hit=True, value=stale.value)
+                stats.waits += 1
+                return _Lookup(flight=flight)
+
+            stats.misses += 1
+            return _Lookup(
+                flight=self._flights.setdefault(key, _Flight()),
+                leader=True,
+                stale=stale,
+                generation=self._generations.get(name, 0),
+            )
+
+    def is_current(self, name: str, generation: int) -> bool:
+        """False once ``name`` was invalidated after ``generation`` was read."""
+        with self._lock:
+            return self._generations.get(name, 0) == generation
+
+    def finish(self, key, lookup: _Lookup, entry: _Entry | None = None) -> bool:
+        """
+        End the leader's flight, storing ``entry`` unless the tile was
+        invalidated meanwhile. Returns True when the entry was stored.
+        """
+        with self._lock:
+            self._flights.pop(key, None)
+            stored = entry is not None and (self._generations.get(key[0], 0) == lookup.generation)
+            if stored:
+                self.put(key, entry)
+            return stored
+
+    # -- invalidation --------------------------------------------------------
+    def register(self, name: str, tags) -> None:
+        with self._lock:
+            self._stats.setdefault(name, TileStats())
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(name)
+
+    def names_for_tag(self, tag: str) -> set[str]:
+        with self._lock:
+            return set(self._tags.get(tag, ()))
+
+    def drop(self, names) -> None:
+        names = set(names)
+        with self._lock:
+            for name in names:
+                self._generations[name] = self._generations.get(name, 0) + 1
+            for key in [k for k in self._entries if k[0] in names]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._stats.clear()
+
+
+_tile_cache = TileCache(max_entries=int(os.getenv("TILE_CACHE_MAX_ENTRIES", "512")))
+
+
+# -----------------------------------------------------------------------------
+# Shared (Redis) tier
+# -----------------------------------------------------------------------------
+def _shared_client():
+    try:
+        from app.utils.redis_utils import get_redis_client
+
+        return get_redis_client()
+    except Exception:
+        return None
+
+
+def _shared_key(key) -> str:
+    digest = hashlib.sha1(repr(key[1:]).encode("utf-8")).hexdigest()[:16]
+    return f"{_SHARED_PREFIX}:{key[0]}:{digest}"
+
+
+def _generation_key(name: str) -> str:
+    return f"{_SHARED_PREFIX}:gen:{name}"
+
+
+def _shared_get(client, name: str, skey: str):
+    """
+    ((value, stored_at) or None, generation) from the shared tier, in one
+    round trip. Entries stored under an older generation are ignored.
+    """
+    try:
+        raw, gen = client.mget(skey, _generation_key(name))
+        generation = int(gen or 0)
+    except Exception:
+        return None, 0
+    if not raw:
+        return None, generation
+    try:
+        payload = json_codec.loads(raw)
+        if int(payload.get("g", 0)) != generation:
+            return None, generation
+        return (payload["v"], float(payload["t"])), generation
+    except Exception:
+        return None, generation
+
+
+def _shared_put(
+    client, name: str, skey: str, value, stored_at: float, ttl: float, generation: int
+) -> None:
+    try:
+        encoded = json_codec.dumps({"v": value, "t": stored_at, "g": generation})
+        if json_codec.loads(encoded)["v"] != value:
+            return  # tuples, datetimes, non-str keys... would come back changed
+    except TypeError:
+        return  # not JSON-encodable: local tier only
+    try:
+        pipe = client.pipeline()
+        pipe.setex(skey, max(1, int(ttl)), encoded)
+        pipe.sadd(f"{_SHARED_PREFIX}:keys:{name}", skey)
+        pipe.expire(f"{_SHARED_PREFIX}:keys:{name}", max(1, int(ttl)))
+        pipe.execute()
+    except Exception:
+        logger.debug("Shared tile cache write failed for %s", name, exc_info=True)
+
+
+def _shared_drop(names) -> None:
+    client = _shared_client()
+    if client is None:
+        return
+    for name in names:
+        index = f"{_SHARED_PREFIX}:keys:{name}"
+        try:
+            # Entries stored under the old generation (including ones written
+            # by a refresh still in flight) are ignored from now on
+            client.incr(_generation_key(name))
+            keys = list(client.smembers(index))
+            client.delete(index, *keys)
+        except Exception:
+            logger.debug("Shared tile cache invalidation failed for %s", name, exc_info=True)
+
+
+# -----------------------------------------------------------------------------
+# Decorator
+# -----------------------------------------------------------------------------
+def ttl_cache(
+    seconds=30,
+    *,
+    name=None,
+    stale_seconds=0,
+    shared=False,
+    tags=(),
+    lock_timeout=5.0,
+):
+    """
+    Cache a tile's result for ``seconds``.
+
+    stale_seconds: after expiry, keep serving the old value for this long
+        while a single caller recomputes it.
+    shared: also store JSON-encodable results in Redis so other workers reuse
+        them; a short Redis lock keeps workers from recomputing together.
+    tags: invalidation groups; see invalidate_tiles() / invalidate_on_write().
+    """
 
-def ttl_cache(seconds=30):
     def decorator(fn):
+        tile = name or f"{fn.__module__}.{fn.__qualname__}"
+        _tile_cache.register(tile, tags)
+
+        def compute(key, stats):
+            started = time.perf_counter()
+            try:
+                value = fn(*key[1], **dict(key[2]))
+            except Exception:
+                stats.errors += 1
+                raise
+            finally:
+                stats.computes += 1
+                stats.compute_ms += (time.perf_counter() - started) * 1000
+            return value
+
+        def load(key, stats, generation):
+            """Leader path: shared tier, then (cross-process locked) compute."""
+            client = _shared_client() if shared else None
+            if client is None:
+                return compute(key, stats), time.time()
+
+            skey = _shared_key(key)
+            found, shared_generation = _shared_get(client, tile, skey)
+            if found is not None and time.time() - found[1] < seconds:
+                stats.shared_hits += 1
+                return found
+
+            lock_key = f"{skey}:lock"
+            try:
+                owner = client.set(lock_key, os.getpid(), nx=True, px=int(lock_timeout * 1000))
+            except Exception:
+                owner = True
+            if not owner:
+                # Another worker is computing; wait briefly for its result
+                deadline = time.monotonic() + lock_timeout
+                while time.monotonic() < deadline:
+                    time.sleep(0.05)
+                    found, _ = _shared_get(client, tile, skey)
+                    if found is not None and time.time() - found[1] < seconds:
+                        stats.shared_hits += 1
+                        return found
+            try:
+                value = compute(key, stats)
+                stored_at = time.time()
+                if _tile_cache.is_current(tile, generation):
+                    _shared_put(
+                        client,
+                        tile,
+                        skey,
+                        value,
+                        stored_at,
+                        seconds + stale_seconds,
+                        shared_generation,
+                    )
+                return value, stored_at
+            finally:
+                if owner:
+                    try:
+                        client.delete(lock_key)
+                    except Exception:
+                        pass
+
         @wraps(fn)
         def wrapper(*args, **kwargs):
-            key = (fn.__name__, args, frozenset(kwargs.items()))
-            now = time.time()
-            cached = _cache_store.get(key)
+            try:
+                key = (tile, args, tuple(sorted(kwargs.items())))
+                hash(key)
+            except TypeError:
+                return fn(*args, **kwargs)  # unhashable arguments: no caching
 
-            if cached:
-                value, timestamp = cached
-                if now - timestamp < seconds:
-                    return value
+            cache = _tile_cache
+            lookup = cache.lookup(key, time.time())
+            if lookup.hit:
+                return lookup.value
+            flight = lookup.flight
+            if not lookup.leader:
+                flight.done.wait()
+                if flight.error is not None:
+                    raise flight.error
+                return flight.value
 
+            try:
+                value, stored_at = load(key, cache.stats_for(tile), lookup.generation)
+            except Exception as exc:
+                cache.finish(key, lookup)
+                flight.error = exc
+                flight.done.set()
+                if lookup.stale is not None:
+                    logger.warning("Tile %s refresh failed; serving stale value", tile)
+                    return lookup.stale.value
+                raise
+
+            cache.finish(key, lookup, _Entry(value, stored_at, seconds, stale_seconds))
+            flight.value = value
+            flight.done.set()
+            return value
+
+        wrapper.tile_name = tile
+        wrapper.invalidate = lambda: invalidate_tiles(names=[tile])
+        return wrapper
+
+    return decorator
+
+
+# -----------------------------------------------------------------------------
+# Invalidation hooks and metrics
+# -----------------------------------------------------------------------------
+def invalidate_tiles(*tags, names=()):
+    """Drop cached results for the given tags and/or tile names (both tiers)."""
+    targets = set(names)
+    for tag in tags:
+        targets |= _tile_cache.names_for_tag(tag)
+    if not targets:
+        return
+    _tile_cache.drop(targets)
+    _shared_drop(targets)
+
+
+def invalidates(*tags):
+    """Decorator for data-writing functions: invalidate ``tags`` after success."""
+
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
             result = fn(*args, **kwargs)
-            _cache_store[key] = (result, now)
+            invalidate_tiles(*tags)
             return result
 
         return wrapper
 
     return decorator
+
+
+_write_watch: dict = {}
+_write_listeners_installed = False
+
+
+def invalidate_on_write(model, *tags):
+    """
+    Invalidate ``tags`` whenever a session commit inserts, updates or deletes
+    ``model`` rows, so writers do not need to call invalidate_tiles() by hand.
+    """
+    global _write_listeners_installed
+    _write_watch.setdefault(model, set()).update(tags)
+    if _write_listeners_installed:
+        return
+
+    from sqlalchemy import event
+    from sqlalchemy.orm import Session
+
+    @event.listens_for(Session, "after_flush")
+    def _collect(session, flush_context):
+        touched = session.info.setdefault("_tile_tags", set())
+        for obj in (*session.new, *session.dirty, *session.deleted):
+            touched |= _write_watch.get(type(obj), set())
+
+    @event.listens_for(Session, "after_commit")
+    def _invalidate(session):
+        touched = session.info.pop("_tile_tags", None)
+        if touched:
+            invalidate_tiles(*touched)
+
+    @event.listens_for(Session, "after_rollback")
+    def _discard(session):
+        session.info.pop("_tile_tags", None)
+
+    _write_listeners_installed = True
+
+
+def tile_cache_stats() -> dict:
+    """Per-tile hit/miss/compute metrics plus cache occupancy."""
+    return {
+        "entries": len(_tile_cache),
+        "max_entries": _tile_cache.max_entries,
+        "tiles": _tile_cache.stats(),
+    }
@@ -0,0 +1,163 @@
+# app/cockpit/lib/vault_queries.py
+#
+# Page loaders for the cockpit vault and card views.
+# Every loader issues a fixed number of statements per page regardless of how
+# many rows it returns: related rows are joined (many-to-one) or fetched for
+# the whole page with one IN query (User.borrower_cards is a dynamic
+# relationship, so it cannot be eager-loaded), and pages are keyset paginated
+# via app.utils.pagination. Card metrics are a single cached aggregate.
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import contains_eager, joinedload
+
+from app.cockpit.lib.ttl import invalidate_on_write, ttl_cache
+from app.extensions import db
+from app.models.borrower_card import BorrowerCard
+from app.models.user import User
+from app.models.vault_transaction import VaultTransaction
+from app.utils.pagination import keyset_paginate
+
+VAULT_TXN_SORTS = {
+    "created_at": VaultTransaction.created_at,
+    "amount": VaultTransaction.amount,
+    "id": VaultTransaction.id,
+}
+
+CARD_SORTS = {
+    "issued_at": BorrowerCard.issued_at,
+    "score": BorrowerCard.score,
+    "id": BorrowerCard.id,
+}
+
+
+def vault_transaction_page(params, status=None, user_id=None, min_amount=None, max_amount=None):
+    """One page of vault transactions with their user joined in (1 statement)."""
+    query = VaultTransaction.query.options(joinedload(VaultTransaction.user))
+
+    if status:
+        query = query.filter(VaultTransaction.status == status)
+    if user_id:
+        query = query.filter(VaultTransaction.user_id == user_id)
+    if min_amount is not None:
+        query = query.filter(VaultTransaction.amount >= min_amount)
+    if max_amount is not None:
+        query = query.filter(VaultTransaction.amount <= max_amount)
+
+    return keyset_paginate(
+        query,
+        VAULT_TXN_SORTS[params.sort],
+        VaultTransaction.id,
+        descending=params.descending,
+        cursor=params.cursor,
+        limit=params.limit,
+    )
+
+
+def latest_cards_for(user_ids):
+    """Most recently issued non-revoked card per user, in one statement."""
+    user_ids = {uid for uid in user_ids if uid}
+    if not user_ids:
+        return {}
+    cards = (
+        BorrowerCard.query.filter(
+            BorrowerCard.user_id.in_(user_ids), BorrowerCard.revoked.isnot(True)
+        )
+        .order_by(BorrowerCard.issued_at.asc(), BorrowerCard.id.asc())
+        .all()
+    )
+    return {card.user_id: card for card in cards}  # later (newer) cards win
+
+
+def borrower_card_page(params, color=None, min_score=None, include_revoked=True, search=None):
+    """One page of borrower cards joined to their owner (1 statement)."""
+    query = (
+        BorrowerCard.query.join(BorrowerCard.user)
+        .options(contains_eager(BorrowerCard.user))
+        .filter(User.role == "borrower")
+    )
+    if color:
+        query = query.filter(BorrowerCard.color == color)
+    if min_score is not None:
+        query = query.filter(BorrowerCard.score >= min_score)
+    if not include_revoked:
+        query = query.filter(BorrowerCard.revoked.isnot(True))
+    if search:
+        query = query.filter(User.username.like(f"{search}%"))
+
+    return keyset_paginate(
+        query,
+        CARD_SORTS[params.sort],
+        BorrowerCard.id,
+        descending=params.descending,
+        cursor=params.cursor,
+        limit=params.limit,
+    )
+
+
+CARD_BUCKETS = ("active", "expiring", "expired", "dormant", "revoked")
+EXPIRING_WITHIN_DAYS = 30
+DORMANT_AFTER_DAYS = 90
+_EXPIRING_ORDER = (BorrowerCard.expires_on.asc(), BorrowerCard.id.asc())
+
+
+@ttl_cache(seconds=60, tags=("borrower_cards",))
+def vault_card_metrics(today=None):
+    """
+    Card counts per bucket plus the total, from one SUM(CASE ...) aggregate.
+
+    Buckets are exclusive and checked in order: revoked, expired, expiring
+    (within 30 days), dormant (unused for 90 days), active. Cards whose
+    expiry could not be parsed (expires_on NULL) count by usage only.
+    """
+    today = today or datetime.utcnow().date()
+    bucket = case(
+        (BorrowerCard.revoked.is_(True), "revoked"),
+        (BorrowerCard.expires_on < today, "expired"),
+        (BorrowerCard.expires_on <= today + timedelta(days=EXPIRING_WITHIN_DAYS), "expiring"),
+        (
+            BorrowerCard.last_used_at
+            < datetime.combine(today, datetime.min.time()) - timedelta(days=DORMANT_AFTER_DAYS),
+            "dormant",
+        ),
+        else_="active",
+    )
+    sums = (func.coalesce(func.sum(case((bucket == name, 1), else_=0)), 0) for name in CARD_BUCKETS)
+    row = db.session.execute(select(*sums, func.count(BorrowerCard.id))).one()
+    counts = dict(zip(CARD_BUCKETS, (int(v) for v in row[:-1])))
+    counts["total"] = int(row[-1])
+    return counts
+
+
+def cards_expiring_soon(within_days=EXPIRING_WITHIN_DAYS, today=None):
+    """
+    Query for non-revoked cards expiring in [today, today + within_days],
+    soonest first. An index range scan on expires_on; notification jobs can
+    iterate it with yield_per() or page it with keyset_paginate().
+    """
+    return BorrowerCard.query.filter(*_expiring_criteria(today, within_days)).order_by(
+        *_EXPIRING_ORDER
+    )
+
+
+def cards_expiring_soon_stmt(today=None, within_days=EXPIRING_WITHIN_DAYS):
+    """Core SELECT equivalent of cards_expiring_soon() (no app context needed)."""
+    return (
+        select(BorrowerCard)
+        .where(*_expiring_criteria(today, within_days))
+        .order_by(*_EXPIRING_ORDER)
+    )
+
+
+def _expiring_criteria(today, within_days):
+    today = today or datetime.utcnow().date()
+    return (
+        BorrowerCard.expires_on >= today,
+        BorrowerCard.expires_on <= today + timedelta(days=within_days),
+        BorrowerCard.revoked.isnot(True),
+    )
+
+
+# Card writes (revoke, link, issue) drop the cached metrics on commit
+invalidate_on_write(BorrowerCard, "borrower_cards")
@@ -3,7 +3,8 @@
 # DESCRIPTION: Cockpit-grade template tracer. Iterates over all GET routes,
 #              invokes them in a test request context, and records wiring health.
 #              Uses PARAMETERIZED_ENDPOINTS to supply safe dummy values.
-#              Verifies template existence and auto-creates placeholders.
+#              Verifies template existence (via the shared template index,
+#              refreshed once per trace) and auto-creates placeholders.
 #              Distinguishes MISSING_TEMPLATE vs ERROR for cockpit dashboard.
 # =============================================================================
 
@@ -14,6 +15,8 @@ from pathlib import Path
 
 from flask import Blueprint, current_app, g, render_template
 
+from app.utils.template_index import get_template_index, template_roots
+
 bp = Blueprint("tracer", __name__, url_prefix="/cockpit")
 
 # Path to templates directory
@@ -29,11 +32,11 @@ PLACEHOLDER = """{% extends "base.html" %}
 """
 
 
-def template_exists(template_name: str) -> bool:
-    for _root, _, files in os.walk(TEMPLATES_DIR):
-        if template_name in files:
-            return True
-    return False
+def template_exists(template_name: str, index=None) -> bool:
+    """True when ``template_name`` (a template path or bare file name) exists."""
+    if index is None:
+        index = get_template_index(roots=[TEMPLATES_DIR])
+    return index.has(template_name)
 
 
 def create_placeholder(template_name: str) -> str:
@@ -84,6 +87,7 @@ PARAMETERIZED_ENDPOINTS = {
 def trace_templates(app=None):
     app = app or current_app
     results = []
+    index = get_template_index(app, [TEMPLATES_DIR, *template_roots(app)])
 
     for rule in app.url_map.iter_rules():
         if "GET" not in rule.methods or rule.endpoint.startswith("static"):
@@ -107,7 +111,7 @@ def trace_templates(app=None):
                     raise ValueError(f"Returned status {response.status_code}")
 
                 # Check template existence
-                if hasattr(response, "template") and not template_exists(response.template):
+                if hasattr(response, "template") and not template_exists(response.template, index):
                     placeholder_path = create_placeholder(response.template)
                     raise ValueError(f"MISSING_TEMPLATE: Created placeholder at {placeholder_path}")
 
@@ -4,63 +4,120 @@
 #              compliance violations, and fraud trend indicators.
 # =============================================================================
 
-import json
-from datetime import datetime
+from datetime import datetime, timedelta
 
-from flask import Blueprint, render_template
-from sqlalchemy import desc
+from flask import Blueprint, jsonify, render_template, request
+from sqlalchemy import desc, func, select
 
+from app.cockpit.lib.ttl import invalidate_on_write, ttl_cache
+from app.extensions import db
 from app.models.fraud_report import FraudReport
 from app.models.schema_event import SchemaEvent
+from app.utils.ai_risk_log import recent_ai_risk_logs
 from app.utils.redis_utils import get_redis_client
 
 lender_risk_tile_bp = Blueprint(
     "lender_risk_tile_bp", __name__, url_prefix="/cockpit/tiles/lender_risk"
 )
 
+# New fraud reports / schema events drop the cached loaders on commit
+invalidate_on_write(FraudReport, "fraud_cases")
+invalidate_on_write(SchemaEvent, "lender_events")
+
+
+HEATMAP_EVENTS = ("LENDER_RISK_ALERT", "LENDER_SELF_LINKED")
+HEATMAP_MAX_DAYS = 365
+
 
 # -----------------------------------------------------------------------------
 # Helper: Load recent AI risk evaluations from Redis
 # -----------------------------------------------------------------------------
-def load_ai_risk_logs(limit=20):
-    r = get_redis_client()
-    if not r:
+def load_ai_risk_logs(limit=20, since=None, until=None):
+    try:
+        return recent_ai_risk_logs(get_redis_client(), limit=limit, since=since, until=until)
+    except Exception:
         return []
 
-    keys = sorted([k.decode() for k in r.keys("grants_composed:*")], reverse=True)[:limit]
 
-    logs = []
-    for key in keys:
-        try:
-            raw = r.get(key)
-            if raw:
-                logs.append(json.loads(raw))
-        except Exception:
+# -----------------------------------------------------------------------------
+# Helper: Lender risk rollup (one GROUP BY, time-bounded)
+# -----------------------------------------------------------------------------
+def lender_risk_rollup_stmt(since):
+    """Per (lender, day, event_type) counts of heatmap events since ``since``."""
+    day = func.date(SchemaEvent.timestamp).label("day")
+    return (
+        select(
+            SchemaEvent.user_id.label("lender"),
+            day,
+            SchemaEvent.event_type,
+            func.count().label("events"),
+        )
+        .where(SchemaEvent.event_type.in_(HEATMAP_EVENTS), SchemaEvent.timestamp >= since)
+        .group_by(SchemaEvent.user_id, day, SchemaEvent.event_type)
+    )
+
+
+@ttl_cache(seconds=60, stale_seconds=300, shared=True, tags=("lender_events",))
+def lender_risk_rollup(days=90):
+    since = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(
+        days=days - 1
+    )
+    rows = db.session.execute(lender_risk_rollup_stmt(since)).all()
+    return [
+        {"lender": r.lender, "day": str(r.day), "event_type": r.event_type, "events": r.events}
+        for r in rows
+    ]
+
+
+def get_lender_risk_heatmap(days=90, lender=None):
+    """Day -> {"alerts", "links"} built from the cached rollup."""
+    heatmap = {}
+    for row in lender_risk_rollup(days=days):
+        if lender is not None and row["lender"] != lender:
             continue
+        cell = heatmap.setdefault(row["day"], {"alerts": 0, "links": 0})
+        key = "alerts" if row["event_type"] == "LENDER_RISK_ALERT" else "links"
+        cell[key] += row["events"]
+    return dict(sorted(heatmap.items()))
+
 
-    return logs
+def _heatmap_days(default):
+    days = request.args.get("days", default, type=int) or default
+    return max(1, min(days, HEATMAP_MAX_DAYS))
 
 
 # -----------------------------------------------------------------------------
 # Helper: Load recent fraud trend summaries
 # -----------------------------------------------------------------------------
+@ttl_cache(seconds=30, stale_seconds=60, shared=True, tags=("fraud_cases",))
 def load_recent_fraud_cases(limit=20):
-    cases = FraudReport.query.order_by(desc(FraudReport.timestamp)).limit(limit).all()
+    cases = FraudReport.query.order_by(desc(FraudReport.created_at)).limit(limit).all()
 
     return [
         {
             "id": c.id,
             "transaction_id": c.transaction_id,
-            "reason": c.flagged_reason,
-            "timestamp": c.timestamp.isoformat(),
+            "reason": c.description or c.category,
+            "timestamp": c.created_at.isoformat() if c.created_at else None,
         }
         for c in cases
     ]
 
 
+# -----------------------------------------------------------------------------
+# Helper: Fraud trend summary (incremental rollup, see app.compliance_ai)
+# -----------------------------------------------------------------------------
+@ttl_cache(seconds=60, stale_seconds=300, shared=True, tags=("fraud_cases",))
+def load_fraud_trends(days=30):
+    from app.compliance_ai import fraud_trend_series, predict_fraud_trends
+
+    return {"summary": predict_fraud_trends(days=days), "daily": fraud_trend_series(days=days)}
+
+
 # -----------------------------------------------------------------------------
 # Helper: Load recent lender self-link events
 # -----------------------------------------------------------------------------
+@ttl_cache(seconds=30, stale_seconds=60, shared=True, tags=("lender_events",))
 def load_lender_events(limit=20):
     events = (
         SchemaEvent.query.filter(
@@ -123,6 +180,7 @@ def lender_risk_tile():
     context = {
         "ai_risk_logs": load_ai_risk_logs(),
         "fraud_cases": load_recent_fraud_cases(),
+        "fraud_trends": load_fraud_trends(),
         "lender_events": load_lender_events(),
         "counters": counters,
         "timestamp": datetime.utcnow().isoformat(),
@@ -138,32 +196,14 @@ def lender_risk_tile():
 def lender_risk_heatmap():
     """
     Render a heatmap visualization of lender risk over time.
-    Groups SchemaEvent entries by day and counts:
+    Counts per day (last ``?days=``, default 90; ``?lender=`` narrows to one):
     - LENDER_RISK_ALERT events (high‑risk lenders)
     - LENDER_SELF_LINKED events (successful verifications)
     """
-
-    # Fetch relevant events
-    events = (
-        SchemaEvent.query.filter(
-            SchemaEvent.event_type.in_(["LENDER_RISK_ALERT", "LENDER_SELF_LINKED"])
-        )
-        .order_by(SchemaEvent.timestamp.asc())
-        .all()
+    risk_data = get_lender_risk_heatmap(
+        days=_heatmap_days(90), lender=request.args.get("lender") or None
     )
 
-    # Aggregate counts per day
-    risk_data = {}
-    for e in events:
-        day = e.timestamp.date().isoformat()
-        if day not in risk_data:
-            risk_data[day] = {"alerts": 0, "links": 0}
-
-        if e.event_type == "LENDER_RISK_ALERT":
-            risk_data[day]["alerts"] += 1
-        else:
-            risk_data[day]["links"] += 1
-
     return render_template(
         "admin/cockpit/lender_risk_heatmap.html",
         risk_data=risk_data,
@@ -203,21 +243,14 @@ def lender_risk_day_detail(date_str):
 
     # Fraud cases for that day
     fraud_cases = (
-        FraudReport.query.filter(FraudReport.timestamp >= start_dt)
-        .filter(FraudReport.timestamp <= end_dt)
-        .order_by(FraudReport.timestamp.asc())
+        FraudReport.query.filter(FraudReport.created_at >= start_dt)
+        .filter(FraudReport.created_at <= end_dt)
+        .order_by(FraudReport.created_at.asc())
         .all()
     )
 
-    # AI logs (Redis) — filter by timestamp inside the JSON
-    ai_logs = []
-    for log in load_ai_risk_logs(limit=200):
-        try:
-            ts = datetime.fromisoformat(log.get("timestamp"))
-            if start_dt <= ts <= end_dt:
-                ai_logs.append(log)
-        except Exception:
-            continue
+    # AI logs (Redis) — range query on the time-ordered index
+    ai_logs = load_ai_risk_logs(limit=200, since=start_dt.timestamp(), until=end_dt.timestamp())
 
     return render_template(
         "admin/cockpit/lender_risk_day_detail.html",
@@ -246,25 +279,8 @@ def lender_risk_overview():
     recent_fraud = load_recent_fraud_cases(limit=10)
     recent_ai = load_ai_risk_logs(limit=10)
 
-    # Build a small heatmap preview (last 14 days)
-    events = (
-        SchemaEvent.query.filter(
-            SchemaEvent.event_type.in_(["LENDER_RISK_ALERT", "LENDER_SELF_LINKED"])
-        )
-        .order_by(SchemaEvent.timestamp.asc())
-        .all()
-    )
-
-    heatmap = {}
-    for e in events:
-        day = e.timestamp.date().isoformat()
-        if day not in heatmap:
-            heatmap[day] = {"alerts": 0, "links": 0}
-
-        if e.event_type == "LENDER_RISK_ALERT":
-            heatmap[day]["alerts"] += 1
-        else:
-            heatmap[day]["links"] += 1
+    # Small heatmap preview (last 14 days)
+    heatmap = get_lender_risk_heatmap(days=14)
 
     return render_template(
         "admin/cockpit/lender_risk_overview.html",
@@ -273,3 +289,19 @@ def lender_risk_overview():
         recent_ai=recent_ai,
         heatmap=heatmap,
     )
+
+
+# -----------------------------------------------------------------------------
+# Compliance snapshots (read-only; `flask compliance refresh` updates them)
+# -----------------------------------------------------------------------------
+@lender_risk_tile_bp.route("/compliance", methods=["GET"])
+def lender_compliance_snapshots():
+    """
+    Stored lender compliance snapshots, worst first.
+    Query args: status (compliant|at_risk|locked), limit (default 50, max 500).
+    """
+    from app.compliance import get_compliance_snapshots
+
+    limit = max(1, min(request.args.get("limit", 50, type=int) or 50, 500))
+    snapshots = get_compliance_snapshots(status=request.args.get("status") or None, limit=limit)
+    return jsonify({"snapshots": snapshots, "count": len(snapshots)})
@@ -1,9 +1,16 @@
 # FILE: app/cockpit/tiles/redis_health.py
-# DESCRIPTION: Cockpit tile showing Redis connection status and last successful ping timestamp.
+# DESCRIPTION: Cockpit tile showing Redis connection status, last successful ping timestamp
+#              the client circuit-breaker state and tile cache metrics.
 
 from flask import Blueprint, jsonify
 
-from app.utils.redis_utils import REDIS_PING_SUCCESS_TS_KEY, get_redis_client
+from app.cockpit.lib.ttl import tile_cache_stats
+from app.utils.redis_utils import (
+    REDIS_PING_SUCCESS_TS_KEY,
+    get_breaker_state,
+    get_pool_stats,
+    get_redis_client,
+)
 
 redis_health = Blueprint("redis_health", __name__)
 
@@ -12,8 +19,11 @@ redis_health = Blueprint("redis_health", __name__)
 def redis_health_tile():
     """
     Returns JSON with:
-      - status: 🟢 OK or 🔴 DOWN
+      - status: 🟢 OK, 🟡 DEGRADED (circuit open/half-open) or 🔴 DOWN
       - last_ping: ISO timestamp of last successful ping, or "never"
+      - breaker: circuit-breaker snapshot (state, failures, retry_in)
+      - pool: connection pool reuse stats for this worker
+      - tile_cache: per-tile hit/miss/compute-time metrics for this worker
     """
     client = get_redis_client()
     last_ping = None
@@ -23,5 +33,17 @@ def redis_health_tile():
         except Exception:
             last_ping = None
 
-    status = "🟢 OK" if last_ping else "🔴 DOWN"
-    return jsonify({"status": status, "last_ping": last_ping or "never"})
+    breaker = get_breaker_state()
+    if breaker["state"] != "closed":
+        status = "🟡 DEGRADED"
+    else:
+        status = "🟢 OK" if last_ping else "🔴 DOWN"
+    return jsonify(
+        {
+            "status": status,
+            "last_ping": last_ping or "never",
+            "breaker": breaker,
+            "pool": get_pool_stats(),
+            "tile_cache": tile_cache_stats(),
+        }
+    )
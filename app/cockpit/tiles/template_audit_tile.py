@@ -1,9 +1,8 @@
 # app/cockpit/tiles/template_audit_tile.py
 
-import json
-
 from flask import Blueprint, render_template
 
+from app.utils import json_codec
 from app.utils.redis_utils import get_redis_client
 
 tile_bp = Blueprint("template_audit_tile", __name__, url_prefix="/cockpit/template_audit")
@@ -23,7 +22,7 @@ def index():
     try:
         latest_summary = r.get("ttl:template:audit_summary")
         if latest_summary:
-            summary.update(json.loads(latest_summary.decode()))
+            summary.update(json_codec.loads(latest_summary.decode()))
     except Exception:
         pass
 
@@ -33,7 +32,7 @@ def index():
         history_raw = r.lrange("template_audit:history", 0, 9)
         for h in history_raw:
             try:
-                history.append(json.loads(h.decode()))
+                history.append(json_codec.loads(h.decode()))
             except Exception:
                 continue
     except Exception:
@@ -4,10 +4,9 @@
 # Reads Redis key audit:template_wiring and renders JSON table.
 # =============================================================================
 
-import json
-
 from flask import Blueprint, current_app, jsonify
 
+from app.utils import json_codec
 from app.utils.redis_utils import get_redis_client
 
 template_wiring_tile_bp = Blueprint("template_wiring_tile", __name__)
@@ -25,7 +24,7 @@ def template_wiring_tile():
         try:
             raw = redis_client.get("audit:template_wiring")
             if raw:
-                results = json.loads(raw.decode("utf-8"))
+                results = json_codec.loads(raw.decode("utf-8"))
         except Exception as e:
             current_app.logger.error(f"Failed to read template wiring audit: {e}")
 
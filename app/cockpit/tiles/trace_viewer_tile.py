@@ -1,10 +1,10 @@
 # /home/srpihhllc/PlaidBridgeOpenBankingApi/app/cockpit/tiles/trace_viewer_tile.py
 
-import json
 import time
 
 from flask import Blueprint, current_app, render_template
 
+from app.utils import json_codec
 from app.utils.redis_utils import get_redis_client  # ✅ centralised, SSL‑safe client
 
 bp_trace_viewer = Blueprint("trace_viewer_tile", __name__, url_prefix="/cockpit/trace-viewer")
@@ -26,7 +26,7 @@ def render_trace_viewer():
             raw = r.get(key)
             if raw:
                 try:
-                    payload = json.loads(raw)
+                    payload = json_codec.loads(raw)
                     traces.append(
                         {
                             "key": key.decode() if isinstance(key, bytes) else key,
@@ -1,39 +1,59 @@
 # app/cockpit/tiles/vault_transaction_tile.py
 
-from app.extensions import redis_client
-from app.models.borrower_card import BorrowerCard
-from app.models.user import User
-from app.models.vault_transaction import VaultTransaction  # ✅ Clean, TTL-ready, cockpit-grade
+from app.cockpit.lib.vault_queries import latest_cards_for, vault_transaction_page
+from app.utils.pagination import PageParams
+from app.utils.redis_utils import get_redis_client
 
 
-def get_vault_transaction_tile():
-    transactions = (
-        VaultTransaction.query.order_by(VaultTransaction.received_at.desc()).limit(50).all()
-    )
-    tile_data = []
+def _ttls(keys):
+    """TTL for every key in one round trip (-2 when Redis is unavailable)."""
+    client = get_redis_client()
+    if client is None or not keys:
+        return [-2] * len(keys)
+    try:
+        pipe = client.pipeline(transaction=False)
+        for key in keys:
+            pipe.ttl(key)
+        return pipe.execute()
+    except Exception:
+        return [-2] * len(keys)
 
-    for tx in transactions:
-        borrower = User.query.get(tx.borrower_id)
-        card = BorrowerCard.query.get(tx.card_id)
 
-        ttl_key = f"vault_txn:{tx.id}:ttl"
-        ttl = redis_client.ttl(ttl_key)
+def get_vault_transaction_tile(
+    limit=50, cursor=None, sort="created_at", descending=True, **filters
+):
+    """
+    Latest vault transactions with borrower and card details.
 
+    Two SQL statements per page (transactions joined to users, then the page's
+    cards) and one Redis pipeline for the TTLs. ``filters`` are passed to
+    vault_transaction_page (status, user_id, min_amount, max_amount).
+    """
+    page = vault_transaction_page(
+        PageParams(sort=sort, descending=descending, cursor=cursor, limit=limit), **filters
+    )
+    cards = latest_cards_for(tx.user_id for tx in page.items)
+    ttls = _ttls([f"vault_txn:{tx.id}:ttl" for tx in page.items])
+
+    tile_data = []
+    for tx, ttl in zip(page.items, ttls):
+        borrower = tx.user
+        card = cards.get(tx.user_id)
         tile_data.append(
             {
                 "id": tx.id,
                 "amount": tx.amount,
-                "method": tx.method,
-                "received_at": tx.received_at.isoformat(),
+                "currency": tx.currency,
+                "status": tx.status,
+                "received_at": tx.created_at.isoformat() if tx.created_at else None,
                 "ttl_seconds": ttl,
-                "reconciled": tx.reconciled,
                 "borrower": {
                     "id": borrower.id if borrower else None,
                     "username": borrower.username if borrower else "Orphaned",
                     "role": borrower.role if borrower else "Unknown",
                 },
-                "card_last4": card.last4 if card else "Missing",
+                "card_last4": card.card_number[-4:] if card else "Missing",
             }
         )
 
-    return tile_data
+    return {"items": tile_data, "next_cursor": page.next_cursor}
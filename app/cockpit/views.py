@@ -1,29 +1,38 @@
 # app/cockpit/views.py
 
-import json
 from datetime import datetime
 
 from flask import (
     Blueprint,
     Response,
+    abort,
     current_app,
     jsonify,
     redirect,
     render_template,
     request,
     session,
+    stream_with_context,
+    url_for,
 )
 from flask_login import current_user, login_required
 
+from app.cockpit.lib.vault_queries import (
+    CARD_SORTS,
+    VAULT_TXN_SORTS,
+    borrower_card_page,
+    vault_card_metrics,
+    vault_transaction_page,
+)
 from app.constants import OPERATOR_MODE_KEY  # <--- ADDED IMPORT
 from app.extensions import db
-from app.models import User
 from app.models.borrower_card import BorrowerCard
 from app.models.underwriter import UnderwriterAgent
-from app.models.vault_transaction import VaultTransaction
 from app.telemetry.ttl_emit import ttl_emit
 from app.tiles.login_link_pulse_tile import get_login_link_status
-from app.utils.export import serialize_logs_as_csv, serialize_logs_as_json
+from app.utils import json_codec
+from app.utils.export import CARD_EVENT_FIELDS, iter_csv, iter_json_array
+from app.utils.pagination import InvalidCursor, parse_page_args
 from app.utils.redis_utils import get_redis_client
 
 # One unified cockpit blueprint
@@ -89,7 +98,7 @@ def refresh_operator_ttl():
 def identity_events_view(client):
     """Shows the last 50 identity events for cockpit operator tile."""
     event_strings = client.lrange("identity_events_stream", 0, 49)
-    events = [json.loads(event_str) for event_str in event_strings]
+    events = [json_codec.loads(event_str) for event_str in event_strings]
     return render_template("identity_events.html", events=events)
 
 
@@ -175,7 +184,7 @@ def ignite_dashboard():
                     }
                     client.set(
                         f"identity_event:low_ttl:{event['timestamp']}",
-                        json.dumps(event),
+                        json_codec.dumps(event),
                     )
                     client.setex(alert_flag_key, ttl if ttl > 0 else 30, "1")
             except Exception as e:
@@ -195,7 +204,7 @@ def ignite_dashboard():
     for key in keys:
         raw = client.get(key)
         if raw:
-            evt = json.loads(raw)
+            evt = json_codec.loads(raw)
             if evt["event_type"] in [
                 "CORTEX_IGNITION",
                 "IGNITION_FAIL",
@@ -247,31 +256,57 @@ def ignite_dashboard():
     )
 
 
+def _next_page_url(next_cursor):
+    """Current URL with ``cursor`` advanced; None on the last page."""
+    if not next_cursor:
+        return None
+    args = request.args.to_dict()
+    args["cursor"] = next_cursor
+    return url_for(request.endpoint, **args)
+
+
 # -------------------------------------------------------------------
 # Borrower card grid
 # -------------------------------------------------------------------
 @cockpit_bp.route("/borrower-card-grid")
 @login_required
 def borrower_card_grid():
-    """Renders a grid view of borrower cards."""
-    borrowers = User.query.filter_by(role="borrower").all()
+    """
+    Renders a grid view of borrower cards, one keyset page at a time.
+
+    Query args: sort (issued_at|score|id), order (asc|desc), cursor, limit,
+    color, min_score, q (username prefix), include_revoked (0/1).
+    """
+    params = parse_page_args(request.args, CARD_SORTS, "issued_at")
+    try:
+        page = borrower_card_page(
+            params,
+            color=request.args.get("color") or None,
+            min_score=request.args.get("min_score", type=int),
+            include_revoked=request.args.get("include_revoked", "1") != "0",
+            search=request.args.get("q") or None,
+        )
+    except InvalidCursor:
+        abort(400, "invalid cursor")
+
     cards = []
-    for b in borrowers:
-        score = b.credit_score
+    for card in page.items:
+        score = card.score
         color = "green" if score > 700 else "orange" if score > 600 else "red"
         cards.append(
             {
-                "name": b.username,
+                "name": card.user.username,
                 "score": score,
                 "color": color,
-                "card_number": b.card_number,
-                "expiration": b.card_expiration,
-                "cvv": b.card_cvv,
+                "card_number": card.card_number,
+                "expiration": card.expiration_date,
+                "cvv": card.cvv,
             }
         )
     return render_template(
         "admin/cockpit/borrower_card_grid.html",
         cards=cards,
+        next_url=_next_page_url(page.next_cursor),
         current_time=datetime.utcnow(),
     )
 
@@ -284,34 +319,7 @@ def borrower_card_grid():
 @cockpit_instrument("ttl:view:vault_metrics")
 def vault_metrics(client=None):
     """Renders a view of the card vault's key metrics."""
-    cards = BorrowerCard.query.all()
-    now = datetime.utcnow()
-    active = expiring = revoked = dormant = 0
-    for card in cards:
-        if card.revoked:
-            revoked += 1
-            continue
-        # Card expiration date is stored as "MM/YY"
-        exp_month, exp_year = map(int, card.expiration_date.split("/"))
-        expiry_date = datetime(exp_year + 2000, exp_month, 1)
-
-        if (expiry_date - now).days <= 30:
-            expiring += 1
-        elif card.last_used_at and (now - card.last_used_at).days > 90:
-            dormant += 1
-        else:
-            active += 1
-
-    total = len(cards)
-
-    return render_template(
-        "admin/cockpit/vault_metrics.html",
-        active=active,
-        expiring=expiring,
-        dormant=dormant,
-        revoked=revoked,
-        total=total,
-    )
+    return render_template("admin/cockpit/vault_metrics.html", **vault_card_metrics())
 
 
 # -------------------------------------------------------------------
@@ -332,7 +340,7 @@ def revoke_card(card_id):
         "timestamp": int(datetime.utcnow().timestamp()),
         "reason": "Delinquent borrowing pattern",
     }
-    redis.set(f"identity_event:card:{card.id}:{event['timestamp']}", json.dumps(event))
+    redis.set(f"identity_event:card:{card.id}:{event['timestamp']}", json_codec.dumps(event))
     return redirect("/card-vault")
 
 
@@ -351,7 +359,7 @@ def link_wallet(card_id):
         "timestamp": int(datetime.utcnow().timestamp()),
         "method": "Operator Manual Link",
     }
-    redis.set(f"identity_event:card:{card.id}:{event['timestamp']}", json.dumps(event))
+    redis.set(f"identity_event:card:{card.id}:{event['timestamp']}", json_codec.dumps(event))
     return redirect("/card-vault")
 
 
@@ -366,7 +374,7 @@ def card_audit(card_id):
     for key in keys:
         raw = redis.get(key)
         if raw:
-            audit_logs.append(json.loads(raw))
+            audit_logs.append(json_codec.loads(raw))
     audit_logs.sort(key=lambda log: log["timestamp"], reverse=True)
     return render_template("admin/cockpit/card_audit.html", logs=audit_logs, card_id=card_id)
 
@@ -376,29 +384,49 @@ def card_audit(card_id):
 def card_vault_export():
     """Exports card-related identity events in JSON or CSV format."""
     redis = get_redis_client()
+    export_format = request.args.get("format")
+    if export_format in ("json", "csv"):
+        # Stream downloads: only the key names are held, newest first
+        # (keys end in the event's epoch timestamp)
+        keys = sorted(
+            redis.scan_iter("identity_event:card:*", count=1000),
+            key=_card_event_timestamp,
+            reverse=True,
+        )
+        events = _iter_card_events(redis, keys)
+        if export_format == "json":
+            body, mimetype = iter_json_array(events), "application/json"
+        else:
+            body, mimetype = iter_csv(events, CARD_EVENT_FIELDS), "text/csv"
+        return Response(
+            stream_with_context(body),
+            mimetype=mimetype,
+            headers={"Content-Disposition": f"attachment;filename=vault_export.{export_format}"},
+        )
+
     keys = redis.keys("identity_event:card:*")
     logs = []
     for key in keys:
         raw = redis.get(key)
         if raw:
-            logs.append(json.loads(raw))
+            logs.append(json_codec.loads(raw))
     logs.sort(key=lambda log: log["timestamp"], reverse=True)
-    export_format = request.args.get("format")
-    if export_format == "json":
-        return Response(
-            serialize_logs_as_json(logs),
-            mimetype="application/json",
-            headers={"Content-Disposition": "attachment;filename=vault_export.json"},
-        )
-    elif export_format == "csv":
-        return Response(
-            serialize_logs_as_csv(logs),
-            mimetype="text/csv",
-            headers={"Content-Disposition": "attachment;filename=vault_export.csv"},
-        )
     return render_template("admin/cockpit/card_vault_export.html", logs=logs)
 
 
+def _card_event_timestamp(key) -> int:
+    suffix = (key.decode() if isinstance(key, bytes) else key).rsplit(":", 1)[-1]
+    return int(suffix) if suffix.isdigit() else 0
+
+
+def _iter_card_events(redis, keys, batch=500):
+    """Decoded events for ``keys``, one MGET per batch."""
+    for start in range(0, len(keys), batch):
+        for raw in redis.mget(keys[start : start + batch]):
+            if raw:
+                yield json_codec.loads(raw)
+
+
 @cockpit_bp.route("/underwriter-intake")
 @login_required
 def underwriter_intake():
@@ -410,9 +438,28 @@ def underwriter_intake():
 @cockpit_bp.route("/vault-intake")
 @login_required
 def vault_intake():
-    """Renders a view of all vault transactions."""
-    txns = VaultTransaction.query.order_by(VaultTransaction.received_at.desc()).all()
-    return render_template("admin/cockpit/vault_intake.html", txns=txns)
+    """
+    Renders vault transactions, one keyset page at a time.
+
+    Query args: sort (created_at|amount|id), order (asc|desc), cursor, limit,
+    status, user_id, min_amount, max_amount.
+    """
+    params = parse_page_args(request.args, VAULT_TXN_SORTS, "created_at")
+    try:
+        page = vault_transaction_page(
+            params,
+            status=request.args.get("status") or None,
+            user_id=request.args.get("user_id") or None,
+            min_amount=request.args.get("min_amount", type=float),
+            max_amount=request.args.get("max_amount", type=float),
+        )
+    except InvalidCursor:
+        abort(400, "invalid cursor")
+    return render_template(
+        "admin/cockpit/vault_intake.html",
+        txns=page.items,
+        next_url=_next_page_url(page.next_cursor),
+    )
 
 
 @cockpit_bp.route("/debug/blueprints")
@@ -1,69 +1,311 @@
 # app/compliance.py
+#
+# Set-based lender compliance engine.
+#   - refresh_compliance_snapshots(): evaluates every rule for all (or some)
+#     lenders with grouped SQL and persists ComplianceSnapshot rows; lenders
+#     whose agreements / account state did not change since their last
+#     snapshot are skipped
+#   - get_compliance_snapshots(): read-only access for the CLI and cockpit
+#   - check_lender_compliance(): single-lender wrapper kept for the link flow
+# Importing this module performs no DB work.
 
+from datetime import datetime
+
+from sqlalchemy import case, func, insert, or_, select, update
 
 from app.extensions import db
 from app.models import (
+    ComplianceSnapshot,
     FinancialAuditLog,  # Added FinancialAuditLog
     LoanAgreement,
     User,
 )
 
+STRIKE_LIMIT = 3
+_IN_CHUNK = 500
 
-def check_lender_compliance(lender_id):
+
+def _chunks(ids):
+    ids = list(ids)
+    for start in range(0, len(ids), _IN_CHUNK):
+        yield ids[start : start + _IN_CHUNK]
+
+
+def _count_where(condition):
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
+def _participants():
+    # Lenders, or any non-admin account that has lent under an agreement
+    return or_(User.role == "lender", User.is_admin.is_(False))
+
+
+# -----------------------------------------------------------------------------
+# Grouped queries
+# -----------------------------------------------------------------------------
+def _change_probe(lender_ids=None):
     """
-    Checks if a lender follows ethical loan agreements.
-    If predatory patterns are found, it logs a violation and enforces a lock.
+    Per lender: agreement count, newest agreement update and the account's
+    violation/lock state. Cheap enough to run over every lender; drives the
+    incremental refresh.
     """
-    lender = db.session.get(User, lender_id)
-    if not lender:
-        return {"error": "Lender not found"}
+    stmt = (
+        select(
+            LoanAgreement.lender_id,
+            func.count(LoanAgreement.id).label("total"),
+            func.max(LoanAgreement.updated_at).label("updated_at"),
+            User.violation_count,
+            User.is_locked,
+        )
+        .join(User, User.id == LoanAgreement.lender_id)
+        .where(_participants())
+        .group_by(LoanAgreement.lender_id, User.violation_count, User.is_locked)
+    )
+    if lender_ids is None:
+        return {row.lender_id: row for row in db.session.execute(stmt)}
 
-    lender_agreements = LoanAgreement.query.filter_by(lender_id=lender_id).all()
+    probe = {}
+    for chunk in _chunks(lender_ids):
+        for row in db.session.execute(stmt.where(LoanAgreement.lender_id.in_(chunk))):
+            probe[row.lender_id] = row
+    return probe
 
-    # Logic: Identify "Bad" agreements (e.g., those with internal violation flags)
-    current_violations = [a for a in lender_agreements if getattr(a, "violation_count", 0) > 0]
 
-    if current_violations:
-        for v in current_violations:
-            # 1. Update the User's aggregate violation count
-            lender.violation_count += 1
+def _rule_rollup(lender_ids):
+    """Every rule input for ``lender_ids`` in one GROUP BY per IN-chunk."""
+    stmt = select(
+        LoanAgreement.lender_id,
+        func.count(LoanAgreement.id).label("total"),
+        _count_where(LoanAgreement.status == "active").label("active"),
+        _count_where(LoanAgreement.status == "defaulted").label("defaulted"),
+        _count_where(LoanAgreement.ai_flagged.is_(True)).label("ai_flagged"),
+        _count_where(_violating()).label("violating"),
+        func.max(LoanAgreement.updated_at).label("updated_at"),
+    ).group_by(LoanAgreement.lender_id)
+
+    rollup = {}
+    for chunk in _chunks(lender_ids):
+        for row in db.session.execute(stmt.where(LoanAgreement.lender_id.in_(chunk))):
+            rollup[row.lender_id] = row
+    return rollup
+
+
+def _violating():
+    return func.coalesce(LoanAgreement.violation_count, 0) > 0
 
-            # 2. Log to the new FinancialAuditLog table
-            audit = FinancialAuditLog(
-                actor_id=lender.id,
-                action_type="VIOLATION_LOGGED",
-                description=f"Agreement ID {v.id} flagged for compliance violation.",
-            )
-            db.session.add(audit)
 
-    # 3. Strike 3 Rule: Automatic Lockout
-    if lender.violation_count >= 3 and not lender.is_locked:
-        lender.is_locked = True
-        lender.lock_reason = "Automated Lock: Exceeded 3 compliance violations."
+def _uncounted_violations(lender_ids):
+    """{lender_id: [agreement ids]} for violating agreements not yet struck."""
+    stmt = select(LoanAgreement.lender_id, LoanAgreement.id).where(
+        _violating(), LoanAgreement.violation_counted.is_(False)
+    )
+    uncounted = {}
+    for chunk in _chunks(lender_ids):
+        for lender_id, agreement_id in db.session.execute(
+            stmt.where(LoanAgreement.lender_id.in_(chunk))
+        ):
+            uncounted.setdefault(lender_id, []).append(agreement_id)
+    return uncounted
 
-        lock_audit = FinancialAuditLog(
-            actor_id=lender.id,
-            action_type="ACCOUNT_LOCKED",
-            description="Lender account locked due to repeated predatory patterns.",
+
+def _mark_counted(agreement_ids):
+    # updated_at is kept as is: marking must not look like an agreement change
+    for chunk in _chunks(agreement_ids):
+        db.session.execute(
+            update(LoanAgreement)
+            .where(LoanAgreement.id.in_(chunk))
+            .values(violation_counted=True, updated_at=LoanAgreement.updated_at)
+            .execution_options(synchronize_session=False)
         )
-        db.session.add(lock_audit)
 
+
+def _load_snapshots(lender_ids=None):
+    if lender_ids is None:
+        return {s.lender_id: s for s in ComplianceSnapshot.query.all()}
+    snapshots = {}
+    for chunk in _chunks(lender_ids):
+        for s in ComplianceSnapshot.query.filter(ComplianceSnapshot.lender_id.in_(chunk)):
+            snapshots[s.lender_id] = s
+    return snapshots
+
+
+def _is_stale(snapshot, probe_row):
+    return (
+        snapshot is None
+        or snapshot.total_agreements != probe_row.total
+        or snapshot.source_updated_at != probe_row.updated_at
+        or snapshot.violations_total != (probe_row.violation_count or 0)
+        or snapshot.is_locked != bool(probe_row.is_locked)
+    )
+
+
+def _status(locked, rollup_row):
+    if locked:
+        return "locked"
+    if rollup_row.violating or rollup_row.defaulted or rollup_row.ai_flagged:
+        return "at_risk"
+    return "compliant"
+
+
+# -----------------------------------------------------------------------------
+# Batch refresh
+# -----------------------------------------------------------------------------
+def refresh_compliance_snapshots(lender_ids=None, force=False, now=None):
+    """
+    Re-evaluate lenders whose data changed (all of them with ``force``) and
+    persist their snapshots.
+
+    Rules, per lender:
+      - each newly violating agreement (violation_count > 0) adds one strike
+        to User.violation_count and a VIOLATION_LOGGED audit row
+      - STRIKE_LIMIT strikes lock the account (ACCOUNT_LOCKED audit row)
+    Agreements are marked violation_counted once struck, so a violation is
+    never counted twice, and a new one counts even if another agreement
+    stopped violating since the last run.
+
+    Returns counts: evaluated, refreshed, locked, removed.
+    """
+    now = now or datetime.utcnow()
+    probe = _change_probe(lender_ids)
+    snapshots = _load_snapshots(None if lender_ids is None else list(probe))
+
+    removed = 0
+    if lender_ids is None:
+        # Lenders with no remaining agreements no longer have a snapshot
+        orphaned = [lid for lid in snapshots if lid not in probe]
+        for chunk in _chunks(orphaned):
+            ComplianceSnapshot.query.filter(ComplianceSnapshot.lender_id.in_(chunk)).delete(
+                synchronize_session=False
+            )
+        removed = len(orphaned)
+
+    changed = [lid for lid, row in probe.items() if force or _is_stale(snapshots.get(lid), row)]
+    summary = {"evaluated": len(probe), "refreshed": len(changed), "locked": 0, "removed": removed}
+    if not changed:
+        if removed:
+            db.session.commit()
+        return summary
+
+    rollup = _rule_rollup(changed)
+    uncounted = _uncounted_violations(changed)
+    user_updates, audits, struck = [], [], []
+    for lender_id in changed:
+        row, account = rollup[lender_id], probe[lender_id]
+        snapshot = snapshots.get(lender_id)
+
+        struck += uncounted.get(lender_id, ())
+        new_violations = len(uncounted.get(lender_id, ()))
+        violations_total = (account.violation_count or 0) + new_violations
+        locked = bool(account.is_locked)
+
+        if new_violations:
+            audits.append(
+                {
+                    "actor_id": lender_id,
+                    "action_type": "VIOLATION_LOGGED",
+                    "description": f"{new_violations} agreement(s) flagged for compliance "
+                    "violation.",
+                    "created_at": now,
+                }
+            )
+        user_update = {}
+        if violations_total >= STRIKE_LIMIT and not locked:
+            locked = True
+            summary["locked"] += 1
+            user_update.update(
+                is_locked=True,
+                lock_reason="Automated Lock: Exceeded 3 compliance violations.",
+            )
+            audits.append(
+                {
+                    "actor_id": lender_id,
+                    "action_type": "ACCOUNT_LOCKED",
+                    "description": "Lender account locked due to repeated predatory patterns.",
+                    "created_at": now,
+                }
+            )
+        if new_violations:
+            user_update["violation_count"] = violations_total
+        if user_update:
+            user_updates.append({"id": lender_id, **user_update})
+
+        values = {
+            "total_agreements": row.total,
+            "active_agreements": row.active,
+            "defaulted_agreements": row.defaulted,
+            "ai_flagged_agreements": row.ai_flagged,
+            "violating_agreements": row.violating,
+            "violations_total": violations_total,
+            "is_locked": locked,
+            "status": _status(locked, row),
+            "source_updated_at": row.updated_at,
+            "evaluated_at": now,
+        }
+        if snapshot is None:
+            db.session.add(ComplianceSnapshot(lender_id=lender_id, **values))
+        else:
+            for key, value in values.items():
+                setattr(snapshot, key, value)
+
+    # Bulk writes: one executemany per statement shape
+    for shape in {tuple(sorted(u)) for u in user_updates}:
+        db.session.execute(update(User), [u for u in user_updates if tuple(sorted(u)) == shape])
+    if audits:
+        db.session.execute(insert(FinancialAuditLog), audits)
+    _mark_counted(struck)
     db.session.commit()
+    return summary
 
+
+# -----------------------------------------------------------------------------
+# Readers
+# -----------------------------------------------------------------------------
+def get_compliance_snapshots(status=None, lender_ids=None, limit=None):
+    """Stored snapshots (no recomputation), worst first."""
+    query = ComplianceSnapshot.query
+    if status:
+        query = query.filter(ComplianceSnapshot.status == status)
+    if lender_ids is not None:
+        query = query.filter(ComplianceSnapshot.lender_id.in_(list(lender_ids)))
+    query = query.order_by(
+        ComplianceSnapshot.violations_total.desc(), ComplianceSnapshot.lender_id.asc()
+    )
+    if limit:
+        query = query.limit(limit)
+    return [s.to_dict() for s in query]
+
+
+def check_lender_compliance(lender_id):
+    """
+    Checks if a lender follows ethical loan agreements.
+    Refreshes this lender's snapshot if its data changed and returns it.
+    """
+    lender = db.session.get(User, lender_id)
+    if not lender:
+        return {"error": "Lender not found"}
+
+    refresh_compliance_snapshots([lender_id])
+    snapshot = db.session.get(ComplianceSnapshot, lender_id)
+    if snapshot is None:
+        return {
+            "lender_id": lender_id,
+            "violations_total": lender.violation_count or 0,
+            "is_locked": bool(lender.is_locked),
+            "total_agreements": 0,
+        }
     return {
         "lender_id": lender_id,
-        "violations_total": lender.violation_count,
-        "is_locked": lender.is_locked,
-        "total_agreements": len(lender_agreements),
+        "violations_total": snapshot.violations_total,
+        "is_locked": snapshot.is_locked,
+        "total_agreements": snapshot.total_agreements,
+        "status": snapshot.status,
     }
 
 
-# Inside generate_compliance_report
-lender_compliance = {
-    lender.id: check_lender_compliance(lender.id)
-    for lender in User.query.filter(
-        (User.role == "lender")
-        | (User.is_admin.is_(False))  # Or any logic that excludes non-participants
-    ).all()
-    if lender.lent_loan_agreements.count() > 0
-}
+def generate_compliance_report():
+    """
+    Refresh every participating lender and return their snapshots by id.
+    Called explicitly; importing this module performs no DB work.
+    """
+    refresh_compliance_snapshots()
+    return {snap["lender_id"]: snap for snap in get_compliance_snapshots()}
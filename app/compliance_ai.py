@@ -1,46 +1,223 @@
 # app/compliance_ai.py
+#
+# Fraud trend analysis over an incremental rollup.
+#   - refresh_fraud_trends(): folds fraud reports newer than the stored
+#     high-water mark into per (day, category) buckets with one joined
+#     GROUP BY; reruns with no new reports cost a single indexed probe
+#   - fraud_trend_series() / predict_fraud_trends(): read the buckets
+# The category of a report is the first word of its transaction's
+# description ("Unknown" when there is no linked transaction).
 
 import logging
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 
-from app.models import FraudReport, Transaction  # ✅ Keep this!
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.exc import IntegrityError
 
+from app.extensions import db
+from app.models import FraudReport, FraudTrendBucket, FraudTrendWatermark, Transaction
 
-def predict_fraud_trends():
+WATERMARK_SOURCE = "fraud_reports"
+HIGH_RISK_CASES = 5
+_CATEGORY_LEN = 64
+
+
+def _category_expr():
+    described = func.trim(Transaction.description)
+    first_word = func.substr(described, 1, func.instr(described + " ", " ") - 1)
+    return func.coalesce(func.nullif(first_word, ""), "Unknown")
+
+
+def _as_date(value):
+    # func.date() comes back as a string on SQLite and a date on MySQL
+    return date.fromisoformat(value) if isinstance(value, str) else value
+
+
+def _after(created_at, report_id):
+    """Reports strictly after (created_at, report_id) in (created_at, id) order."""
+    if created_at is None:
+        return FraudReport.created_at.isnot(None)
+    return or_(
+        FraudReport.created_at > created_at,
+        and_(FraudReport.created_at == created_at, FraudReport.id > report_id),
+    )
+
+
+def _up_to(created_at, report_id):
+    return or_(
+        FraudReport.created_at < created_at,
+        and_(FraudReport.created_at == created_at, FraudReport.id <= report_id),
+    )
+
+
+def fraud_trend_rollup_stmt(after=(None, None), up_to=None):
+    """Report counts per (day, category) for reports in (after, up_to]."""
+    day = func.date(FraudReport.created_at).label("day")
+    category = _category_expr().label("category")
+    stmt = (
+        select(day, category, func.count(FraudReport.id).label("cases"))
+        .select_from(FraudReport)
+        .outerjoin(Transaction, Transaction.id == FraudReport.transaction_id)
+        .where(_after(*after))
+        .group_by(day, category)
+    )
+    if up_to is not None:
+        stmt = stmt.where(_up_to(*up_to))
+    return stmt
+
+
+# -----------------------------------------------------------------------------
+# Incremental refresh
+# -----------------------------------------------------------------------------
+def _advance_watermark(mark, top, processed):
+    """
+    Move the high-water mark from ``mark`` to ``top``. Returns False when
+    another worker moved it first (its buckets already include these reports).
+    """
+    if mark is None:
+        db.session.add(
+            FraudTrendWatermark(
+                source=WATERMARK_SOURCE,
+                last_created_at=top.created_at,
+                last_report_id=top.id,
+                reports_processed=processed,
+            )
+        )
+        try:
+            db.session.flush()
+        except IntegrityError:
+            return False
+        return True
+
+    result = db.session.execute(
+        update(FraudTrendWatermark)
+        .where(
+            FraudTrendWatermark.source == WATERMARK_SOURCE,
+            FraudTrendWatermark.last_created_at == mark.last_created_at,
+            FraudTrendWatermark.last_report_id == mark.last_report_id,
+        )
+        .values(
+            last_created_at=top.created_at,
+            last_report_id=top.id,
+            reports_processed=FraudTrendWatermark.reports_processed + processed,
+            updated_at=datetime.utcnow(),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
+
+
+def refresh_fraud_trends(rebuild=False):
+    """
+    Fold fraud reports created since the last run into the trend buckets.
+
+    Only reports after the stored (created_at, id) high-water mark are read.
+    A report backdated behind the mark, a deleted report or a relinked
+    transaction is not picked up incrementally; ``rebuild`` recounts
+    everything from scratch.
+
+    Returns counts: processed (reports folded in), buckets (buckets touched).
+    """
+    if rebuild:
+        FraudTrendBucket.query.delete(synchronize_session=False)
+        FraudTrendWatermark.query.filter_by(source=WATERMARK_SOURCE).delete(
+            synchronize_session=False
+        )
+        db.session.expire_all()
+
+    mark = db.session.get(FraudTrendWatermark, WATERMARK_SOURCE)
+    after = (mark.last_created_at, mark.last_report_id) if mark else (None, None)
+
+    # Pin the upper bound first so reports landing mid-refresh wait for the next run
+    top = db.session.execute(
+        select(FraudReport.created_at, FraudReport.id)
+        .where(_after(*after))
+        .order_by(FraudReport.created_at.desc(), FraudReport.id.desc())
+        .limit(1)
+    ).first()
+    if top is None:
+        if rebuild:
+            db.session.commit()
+        return {"processed": 0, "buckets": 0}
+
+    deltas = {}
+    for row in db.session.execute(fraud_trend_rollup_stmt(after, (top.created_at, top.id))):
+        key = (_as_date(row.day), row.category[:_CATEGORY_LEN])
+        deltas[key] = deltas.get(key, 0) + row.cases
+    processed = sum(deltas.values())
+
+    if not _advance_watermark(mark, top, processed):
+        db.session.rollback()
+        return {"processed": 0, "buckets": 0}
+
+    existing = {
+        (b.day, b.category): b
+        for b in FraudTrendBucket.query.filter(FraudTrendBucket.day.in_({day for day, _ in deltas}))
+    }
+    for (day, category), cases in deltas.items():
+        bucket = existing.get((day, category))
+        if bucket is None:
+            db.session.add(FraudTrendBucket(day=day, category=category, cases=cases))
+        else:
+            bucket.cases += cases
+    db.session.commit()
+    return {"processed": processed, "buckets": len(deltas)}
+
+
+# -----------------------------------------------------------------------------
+# Readers
+# -----------------------------------------------------------------------------
+def _window_start(days, now=None):
+    return ((now or datetime.utcnow()) - timedelta(days=days - 1)).date()
+
+
+def fraud_trend_series(days=30, now=None):
+    """Daily report counts per category for the last ``days`` days, oldest first."""
+    buckets = (
+        FraudTrendBucket.query.filter(FraudTrendBucket.day >= _window_start(days, now))
+        .order_by(FraudTrendBucket.day.asc(), FraudTrendBucket.category.asc())
+        .all()
+    )
+    return [b.to_dict() for b in buckets]
+
+
+def predict_fraud_trends(days=30, now=None):
     """
     AI-powered fraud trend analysis based on recent transaction data.
 
+    Brings the rollup up to date, then ranks categories by fraud reports in
+    the last ``days`` days (whole-day buckets).
+
     Returns:
       dict: Fraud trend insights including high-risk categories.
     """
     try:
-        # Analyze recent fraud cases within the last 30 days
-        fraud_cases = FraudReport.query.filter(
-            FraudReport.timestamp >= datetime.utcnow() - timedelta(days=30)
-        ).all()
+        refresh_fraud_trends()
+
+        totals = dict(
+            db.session.execute(
+                select(FraudTrendBucket.category, func.sum(FraudTrendBucket.cases))
+                .where(FraudTrendBucket.day >= _window_start(days, now))
+                .group_by(FraudTrendBucket.category)
+            ).all()
+        )
+        totals = {category: int(cases) for category, cases in totals.items() if cases}
 
-        if not fraud_cases:
+        if not totals:
             return {
                 "status": "low risk",
                 "trend": "No significant fraud patterns detected",
             }
 
-        # Extract transaction details from fraud cases
-        risk_categories = {}
-        for case in fraud_cases:
-            txn = Transaction.query.get(case.transaction_id)
-            category = txn.description.split()[0] if txn else "Unknown"
-
-            risk_categories[category] = risk_categories.get(category, 0) + 1
-
         # Determine risk level based on transaction patterns
-        max_category = max(risk_categories, key=risk_categories.get)
-        risk_level = "high risk" if risk_categories[max_category] > 5 else "moderate risk"
+        max_category = min(totals, key=lambda category: (-totals[category], category))
+        risk_level = "high risk" if totals[max_category] > HIGH_RISK_CASES else "moderate risk"
 
         fraud_summary = {
             "status": risk_level,
             "high_risk_category": max_category,
-            "cases_analyzed": len(fraud_cases),
+            "cases_analyzed": sum(totals.values()),
+            "categories": totals,
             "trend": f"Fraud patterns detected in {max_category} transactions.",
         }
 
@@ -48,5 +225,6 @@ def predict_fraud_trends():
         return fraud_summary
 
     except Exception as e:
+        db.session.rollback()
         logging.error(f"🚨 Error in fraud trend prediction: {e}")
         return {"status": "error", "message": str(e)}
@@ -10,6 +10,8 @@ REDIS_PING_TTL = 1_800
 REDIS_FAIL_TTL = 900
 # Time-to-live for a successful queue flush pulse (30 minutes)
 REDIS_QUEUE_FLUSH_TTL = 1_800
+# Time-to-live for a circuit-breaker state transition pulse (30 minutes)
+REDIS_BREAKER_TTL = 1_800
 
 # --- Telemetry Key Names ---
 # General status key (success/error)
@@ -20,6 +22,8 @@ REDIS_PING_SUCCESS_KEY = "ttl:boot:redis_ping_success"
 REDIS_PING_SUCCESS_TS_KEY = "ttl:boot:redis_ping_success_timestamp"
 # Marker indicating the internal queue was successfully cleared
 REDIS_QUEUE_FLUSH_KEY = "ttl:boot:redis_queue_flushed"
+# Circuit-breaker state (closed/open/half_open) for the shared Redis client
+REDIS_BREAKER_KEY = "ttl:redis:circuit_state"
 
 # --- Metrics Configuration Placeholders ---
 # The actual REDIS_CONNECT_FAILURES_COUNTER object lives in app.metrics.
@@ -124,6 +124,13 @@ def timeago_any(value: DateLike) -> str:
     return timeago(dt.timestamp())
 
 
+def time_since(value: DateLike) -> str:
+    """
+    Relative age without the suffix (e.g., '5m'), for '{{ ts|time_since }} ago'.
+    """
+    return timeago_any(value).removesuffix(" ago")
+
+
 def fmt_iso_utc(value: DateLike) -> str:
     """
     Format any date-like value as ISO8601 in UTC.
@@ -176,7 +183,9 @@ def register_datetime_filters(app) -> None:
     """
     app.jinja_env.filters["timeago"] = timeago
     app.jinja_env.filters["timeago_any"] = timeago_any
+    app.jinja_env.filters["time_since"] = time_since
     app.jinja_env.filters["fmt_iso_utc"] = fmt_iso_utc
     app.jinja_env.filters["fmt_datetime"] = fmt_datetime
     app.jinja_env.filters["fmt_date"] = fmt_date
     app.jinja_env.filters["fmt_time"] = fmt_time
+    app.jinja_env.filters["datetimeformat"] = fmt_datetime
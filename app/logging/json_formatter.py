@@ -1,9 +1,10 @@
 # /home/srpihhllc/PlaidBridgeOpenBankingApi/app/logging/json_formatter.py
 
-import json
 import logging
 import re
 
+from app.utils import json_codec
+
 SECRET_KEYS = re.compile(r"(password|secret|token|key)", re.I)
 
 
@@ -23,4 +24,4 @@ class JsonFormatter(logging.Formatter):
                 base["request_id"] = g.request_id
         except RuntimeError:
             pass
-        return json.dumps(base, ensure_ascii=False)
+        return json_codec.dumps(base)
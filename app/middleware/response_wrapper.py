@@ -4,8 +4,148 @@
 # =============================================================================
 
 import time
+from functools import wraps
+from typing import Any
 
-from flask import g, jsonify, request
+from flask import Response, current_app, g, jsonify
+
+# Attribute set on responses whose body is already a standard envelope, so
+# enveloped views never have to parse the payload back out to find out.
+ENVELOPE_ATTR = "_api_enveloped"
+
+
+def mark_enveloped(response: Response) -> Response:
+    """Flag a response as already carrying the standard envelope."""
+    setattr(response, ENVELOPE_ATTR, True)
+    return response
+
+
+def is_enveloped(response: Response) -> bool:
+    return bool(getattr(response, ENVELOPE_ATTR, False))
+
+
+def _is_standard_payload(data: Any) -> bool:
+    return isinstance(data, dict) and "status" in data and ("data" in data or "code" in data)
+
+
+def _duration_ms() -> int:
+    return int((time.time() - g.get("start_time", time.time())) * 1000)
+
+
+def build_envelope(data: Any, status_code: int = 200) -> dict[str, Any]:
+    """Build the standard envelope for ``data`` without serializing it."""
+    message_source = data if isinstance(data, dict) else {}
+
+    if status_code >= 400:
+        return {
+            "status": "error",
+            "code": f"HTTP_{status_code}",
+            "message": message_source.get("message", "An error occurred"),
+            "request_id": getattr(g, "request_id", None),
+            "meta": {"duration_ms": _duration_ms()},
+        }
+
+    return {
+        "status": "success",
+        "message": message_source.get("message", "Success"),
+        "data": data,
+        "request_id": getattr(g, "request_id", None),
+        "meta": {"duration_ms": _duration_ms()},
+    }
+
+
+def _split_return_value(rv):
+    """Split a view return value into (body, status, headers) like Flask does."""
+    if not isinstance(rv, tuple):
+        return rv, None, None
+    if len(rv) == 3:
+        return rv
+    if len(rv) == 2:
+        body, extra = rv
+        if isinstance(extra, (int, str)) or extra is None:
+            return body, extra, None
+        return body, None, extra
+    return rv, None, None
+
+
+def envelope_return_value(rv):
+    """
+    Wrap a dict/list view return value in the standard envelope.
+
+    The envelope is built around the original Python object and serialized
+    exactly once; anything that is already a Response is returned untouched.
+    """
+    body, status, headers = _split_return_value(rv)
+    if not isinstance(body, (dict, list)):
+        return rv
+
+    status_code = int(str(status).split()[0]) if status is not None else 200
+    payload = body if _is_standard_payload(body) else build_envelope(body, status_code)
+    response = mark_enveloped(current_app.json.response(payload))
+
+    if status is None and headers is None:
+        return response
+    if headers is None:
+        return response, status
+    if status is None:
+        return response, headers
+    return response, status, headers
+
+
+def envelope_response(response: Response) -> Response:
+    """
+    Re-wrap a JSON Response a view built itself (e.g. via jsonify()).
+
+    This is the legacy path: the body is parsed and serialized again, so views
+    should prefer returning dicts/lists, which envelope_return_value encodes once.
+    """
+    if is_enveloped(response) or response.is_streamed:
+        return response
+    if not response.content_type.startswith("application/json"):
+        return response
+
+    try:
+        data = response.get_json()
+    except Exception:
+        # If response isn't JSON, return it as-is
+        return response
+
+    # If already using our standard format, return as-is
+    if _is_standard_payload(data):
+        return response
+
+    new_response = mark_enveloped(jsonify(build_envelope(data, response.status_code)))
+    new_response.status_code = response.status_code
+
+    # Copy headers from original response
+    for key, value in response.headers.items():
+        if key != "Content-Length":
+            new_response.headers[key] = value
+
+    return new_response
+
+
+def enveloped(view):
+    """
+    Opt a view into the standard envelope.
+
+    Only decorated views are wrapped; every other endpoint keeps the response
+    shape it returns, so existing API contracts are untouched.
+    """
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        rv = envelope_return_value(view(*args, **kwargs))
+        body, status, headers = _split_return_value(rv)
+        if not isinstance(body, Response) or is_enveloped(body):
+            return rv
+        # Apply a (jsonify(...), 500) status first so errors envelope as errors
+        if status is not None:
+            body.status = status
+        response = envelope_response(body)
+        return response if headers is None else (response, headers)
+
+    return wrapper
 
 
 def init_response_handling(app):
@@ -15,58 +155,3 @@ def init_response_handling(app):
     def before_request():
         """Set start time for request timing"""
         g.start_time = time.time()
-
-    @app.after_request
-    def standardize_response(response):
-        """Wrap all JSON responses in standard envelope"""
-
-        # Skip non-JSON responses
-        if not response.content_type.startswith("application/json"):
-            return response
-
-        # Only wrap API responses
-        if not request.path.startswith("/api"):
-            return response
-
-        # Get original data
-        try:
-            data = response.get_json()
-        except Exception:
-            # If response isn't JSON, return it as-is
-            return response
-
-        # If already using our standard format, return as-is
-        if isinstance(data, dict) and "status" in data and ("data" in data or "code" in data):
-            return response
-
-        # Calculate request duration
-        duration_ms = int((time.time() - g.get("start_time", time.time())) * 1000)
-
-        # Create standard response envelope
-        if response.status_code >= 400:
-            standard_response = {
-                "status": "error",
-                "code": f"HTTP_{response.status_code}",
-                "message": data.get("message", "An error occurred"),
-                "request_id": getattr(g, "request_id", None),
-                "meta": {"duration_ms": duration_ms},
-            }
-        else:
-            standard_response = {
-                "status": "success",
-                "message": data.get("message", "Success"),
-                "data": data,
-                "request_id": getattr(g, "request_id", None),
-                "meta": {"duration_ms": duration_ms},
-            }
-
-        # Create new response with our standardized format
-        new_response = jsonify(standard_response)
-        new_response.status_code = response.status_code
-
-        # Copy headers from original response
-        for key, value in response.headers.items():
-            if key != "Content-Length":
-                new_response.headers[key] = value
-
-        return new_response
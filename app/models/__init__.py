@@ -30,14 +30,17 @@ from .bank_statement import BankStatement
 from .bank_transaction import BankTransaction
 from .borrower_card import BorrowerCard
 from .complaint_log import ComplaintLog
+from .compliance_snapshot import ComplianceSnapshot
 from .credit_ledger import CreditLedger
 from .dispute_log import DisputeLog
 from .fraud_report import FraudReport
+from .fraud_trend import FraudTrendBucket, FraudTrendWatermark
 from .lender import Lender
 from .loan_agreement import LoanAgreement
 from .mfa_code import MFACode
 from .payment_log import PaymentLog
 from .plaid_item import PlaidItem
+from .portfolio_exposure import PortfolioExposure
 from .registry import Registry
 from .schema_event import SchemaEvent
 from .subscriber_profile import SubscriberProfile
@@ -50,6 +53,9 @@ from .underwriter import UnderwriterAgent
 from .user_dashboard import UserDashboard
 from .vault_transaction import VaultTransaction
 
+# Archive tables mirror hot tables above, so they register last
+from .archive import ARCHIVE_TABLES
+
 __all__ = [
     "db",
     "User",
@@ -72,9 +78,13 @@ __all__ = [
     "Tradeline",
     "CreditLedger",
     "PaymentLog",
+    "PortfolioExposure",
     "DisputeLog",
     "ComplaintLog",
+    "ComplianceSnapshot",
     "FraudReport",
+    "FraudTrendBucket",
+    "FraudTrendWatermark",
     "Registry",
     "SchemaEvent",
     "TraceEvent",
@@ -83,4 +93,5 @@ __all__ = [
     "AuditLog",
     "FinancialAuditLog",
     "LedgerEntry",
+    "ARCHIVE_TABLES",
 ]
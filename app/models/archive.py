@@ -0,0 +1,57 @@
+# =============================================================================
+# FILE: app/models/archive.py
+# DESCRIPTION: Archive tables for the append-only audit and trace tables.
+#              app.services.retention moves rows past their retention age
+#              from each hot table into <table>_archive. Archive tables mirror
+#              the hot columns (without foreign keys, so archived audit rows
+#              survive user deletion), add archived_at, and key rows by
+#              (id, <time column>) so MySQL can range-partition them by month.
+# =============================================================================
+
+from datetime import datetime
+
+from ..extensions import db
+from .audit_log import AuditLog
+from .dispute_log import DisputeLog
+from .schema_event import SchemaEvent
+from .trace_events import TraceEvent
+
+ARCHIVE_SUFFIX = "_archive"
+
+# Hot table -> the column rows age out by (and archive partitions follow)
+ARCHIVE_TIME_COLUMNS = {
+    AuditLog.__tablename__: "created_at",
+    TraceEvent.__tablename__: "timestamp",
+    SchemaEvent.__tablename__: "timestamp",
+    DisputeLog.__tablename__: "delivery_ts",
+}
+
+
+def _archive_table(hot, time_col: str):
+    name = hot.name + ARCHIVE_SUFFIX
+    columns = [
+        db.Column(
+            column.name,
+            column.type,
+            primary_key=column.primary_key or column.name == time_col,
+            nullable=column.nullable and not column.primary_key and column.name != time_col,
+            autoincrement=False,
+        )
+        for column in hot.columns
+    ]
+    return db.Table(
+        name,
+        db.metadata,
+        *columns,
+        db.Column("archived_at", db.DateTime, nullable=False, default=datetime.utcnow),
+        # (time, id) order is what retention scans and history pages follow
+        db.Index(f"ix_{name}_{time_col}_id", time_col, "id"),
+        db.Index(f"ix_{name}_user_id_{time_col}_id", "user_id", time_col, "id"),
+        extend_existing=True,
+    )
+
+
+ARCHIVE_TABLES = {
+    model.__tablename__: _archive_table(model.__table__, ARCHIVE_TIME_COLUMNS[model.__tablename__])
+    for model in (AuditLog, TraceEvent, SchemaEvent, DisputeLog)
+}
@@ -47,7 +47,11 @@ class FinancialAuditLog(db.Model):
 class AuditLog(db.Model):
     __tablename__ = "audit_logs"
     __table_args__ = {"extend_existing": True}
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        db.Index("ix_audit_logs_user_id_created_at", "user_id", "created_at"),
+        db.Index("ix_audit_logs_event_type_created_at", "event_type", "created_at"),
+        {"extend_existing": True},
+    )
 
     id = db.Column(db.Integer, primary_key=True)
 
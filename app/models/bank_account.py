@@ -8,6 +8,7 @@
 from datetime import datetime
 
 from ..extensions import db
+from ..utils.money import MoneyCents, sync_exact
 
 
 class BankAccount(db.Model):
@@ -29,6 +30,8 @@ class BankAccount(db.Model):
     account_type = db.Column(db.String(32))
     account_number = db.Column(db.String(64), unique=True, nullable=False)
     balance = db.Column(db.Float, default=0.0)
+    # Exact integer-cents mirror of `balance` (dual-written until cutover)
+    balance_exact = db.Column("balance_cents", MoneyCents(), default=0.0, nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     last_synced_at = db.Column(db.DateTime)
     trace_status = db.Column(db.String(32), default="healthy")
@@ -56,3 +59,6 @@ class BankAccount(db.Model):
 
     def __repr__(self):
         return f"<BankAccount id={self.id} user={self.user_id} balance={self.balance}>"
+
+
+sync_exact(BankAccount.balance, BankAccount.balance_exact)
@@ -7,18 +7,24 @@
 from datetime import datetime
 
 from ..extensions import db
+from ..utils.money import MoneyCents, sync_exact
 
 
 class BankTransaction(db.Model):
     __tablename__ = "bank_transactions"
     __table_args__ = {"extend_existing": True}
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        db.Index("ix_bank_transactions_timestamp", "timestamp"),
+        {"extend_existing": True},
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     from_account_id = db.Column(db.Integer, db.ForeignKey("bank_accounts.id"), nullable=True)
     to_account_id = db.Column(db.Integer, db.ForeignKey("bank_accounts.id"), nullable=True)
 
     amount = db.Column(db.Float, nullable=False)
+    # Exact integer-cents mirror of `amount` (dual-written until cutover)
+    amount_exact = db.Column("amount_cents", MoneyCents(), nullable=True)
     txn_type = db.Column(db.String(32))  # transfer, ach, wire, internal
     method = db.Column(db.String(64))  # online, teller, mobile
     timestamp = db.Column(db.DateTime, default=datetime.utcnow)
@@ -50,3 +56,6 @@ class BankTransaction(db.Model):
             f"<BankTransaction id={self.id} from={self.from_account_id} "
             f"to={self.to_account_id} amount={self.amount}>"
         )
+
+
+sync_exact(BankTransaction.amount, BankTransaction.amount_exact)
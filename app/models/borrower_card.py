@@ -1,10 +1,29 @@
 # app/models/borrower_card.py
 
-from datetime import datetime
+import calendar
+from datetime import date, datetime
+
+from sqlalchemy import event
 
 from ..extensions import db
 
 
+def parse_card_expiry(value):
+    """
+    "MM/YY" -> the last day of that month (cards are valid through it).
+
+    Returns None for values that do not parse.
+    """
+    try:
+        month, year = (int(part) for part in str(value).strip().split("/"))
+    except (AttributeError, TypeError, ValueError):
+        return None
+    if not 1 <= month <= 12:
+        return None
+    year += 2000 if year < 100 else 0
+    return date(year, month, calendar.monthrange(year, month)[1])
+
+
 class BorrowerCard(db.Model):
     __tablename__ = "borrower_cards"
     __table_args__ = {"extend_existing": True}
@@ -22,6 +41,8 @@ class BorrowerCard(db.Model):
 
     card_number = db.Column(db.String(16), nullable=False, unique=True)
     expiration_date = db.Column(db.String(5), nullable=False)
+    # Normalized `expiration_date` (last day of the month), kept in sync on write
+    expires_on = db.Column(db.Date, nullable=True, index=True)
     cvv = db.Column(db.String(3), nullable=False)
     score = db.Column(db.Integer, nullable=False)
     color = db.Column(db.String(10), nullable=False)
@@ -33,3 +54,8 @@ class BorrowerCard(db.Model):
     trace_status = db.Column(db.String(32), default="active")
 
     user = db.relationship("User", back_populates="borrower_cards")
+
+
+@event.listens_for(BorrowerCard.expiration_date, "set", propagate=True)
+def _sync_expires_on(target, value, oldvalue, initiator):
+    target.expires_on = parse_card_expiry(value)
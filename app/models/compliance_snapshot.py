@@ -0,0 +1,57 @@
+# =============================================================================
+# FILE: app/models/compliance_snapshot.py
+# DESCRIPTION: Latest batch compliance evaluation per lender. Written by
+#              app.compliance.refresh_compliance_snapshots(); the CLI and the
+#              cockpit endpoint read these rows instead of recomputing.
+# =============================================================================
+
+from datetime import datetime
+
+from ..extensions import db
+
+
+class ComplianceSnapshot(db.Model):
+    __tablename__ = "compliance_snapshots"
+    __table_args__ = {"extend_existing": True}
+
+    lender_id = db.Column(
+        db.String(36),
+        db.ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+
+    # Rule inputs (from loan_agreement, grouped per lender)
+    total_agreements = db.Column(db.Integer, nullable=False, default=0)
+    active_agreements = db.Column(db.Integer, nullable=False, default=0)
+    defaulted_agreements = db.Column(db.Integer, nullable=False, default=0)
+    ai_flagged_agreements = db.Column(db.Integer, nullable=False, default=0)
+    violating_agreements = db.Column(db.Integer, nullable=False, default=0)
+
+    # Rule outcomes (mirrors User.violation_count / is_locked after evaluation)
+    violations_total = db.Column(db.Integer, nullable=False, default=0)
+    is_locked = db.Column(db.Boolean, nullable=False, default=False)
+    status = db.Column(db.String(16), nullable=False, index=True)  # compliant/at_risk/locked
+
+    # Change detection: agreement watermark at evaluation time
+    source_updated_at = db.Column(db.DateTime, nullable=True)
+    evaluated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
+
+    def to_dict(self):
+        return {
+            "lender_id": self.lender_id,
+            "status": self.status,
+            "total_agreements": self.total_agreements,
+            "active_agreements": self.active_agreements,
+            "defaulted_agreements": self.defaulted_agreements,
+            "ai_flagged_agreements": self.ai_flagged_agreements,
+            "violating_agreements": self.violating_agreements,
+            "violations_total": self.violations_total,
+            "is_locked": self.is_locked,
+            "source_updated_at": (
+                self.source_updated_at.isoformat() if self.source_updated_at else None
+            ),
+            "evaluated_at": self.evaluated_at.isoformat() if self.evaluated_at else None,
+        }
+
+    def __repr__(self):
+        return f"<ComplianceSnapshot lender_id={self.lender_id} status={self.status}>"
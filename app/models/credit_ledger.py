@@ -1,6 +1,7 @@
 # app/models/credit_ledger.py
 
 from ..extensions import db
+from ..utils.money import MoneyCents, sync_exact
 
 
 class CreditLedger(db.Model):
@@ -20,7 +21,13 @@ class CreditLedger(db.Model):
 
     card_id = db.Column(db.String(64), nullable=False)
     credit_limit = db.Column(db.Float, default=5000.00)
+    # Exact integer-cents mirror of `credit_limit` (dual-written until cutover)
+    credit_limit_exact = db.Column(
+        "credit_limit_cents", MoneyCents(), default=5000.00, nullable=True
+    )
     balance_used = db.Column(db.Float, default=0.0)
+    # Exact integer-cents mirror of `balance_used` (dual-written until cutover)
+    balance_used_exact = db.Column("balance_used_cents", MoneyCents(), default=0.0, nullable=True)
     last_payment_ts = db.Column(db.DateTime)
     created_at = db.Column(db.DateTime, server_default=db.func.current_timestamp())
     updated_at = db.Column(
@@ -31,3 +38,7 @@ class CreditLedger(db.Model):
     suspended = db.Column(db.Boolean, default=False)
 
     user = db.relationship("User", back_populates="credit_ledger_entries")
+
+
+sync_exact(CreditLedger.credit_limit, CreditLedger.credit_limit_exact)
+sync_exact(CreditLedger.balance_used, CreditLedger.balance_used_exact)
@@ -29,7 +29,7 @@ class DisputeLog(db.Model):
     sendgrid_id = db.Column(db.String(128), nullable=True)
 
     content_hash = db.Column(db.String(128), nullable=False)
-    delivery_ts = db.Column(db.DateTime, default=datetime.utcnow)
+    delivery_ts = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     acknowledged_ts = db.Column(db.DateTime, nullable=True)
     response_notes = db.Column(db.Text, nullable=True)
 
@@ -12,8 +12,11 @@ from ..extensions import db
 
 class FraudReport(db.Model):
     __tablename__ = "fraud_reports"
-    __table_args__ = {"extend_existing": True}
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        # Fraud trend high-water-mark scans: rows after (created_at, id)
+        db.Index("ix_fraud_reports_created_at_id", "created_at", "id"),
+        {"extend_existing": True},
+    )
 
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
 
@@ -0,0 +1,44 @@
+# =============================================================================
+# FILE: app/models/fraud_trend.py
+# DESCRIPTION: Incremental fraud trend rollup. FraudTrendBucket holds report
+#              counts per (day, transaction category); FraudTrendWatermark
+#              records the last fraud report folded in, so
+#              app.compliance_ai.refresh_fraud_trends() only reads newer ones.
+# =============================================================================
+
+from datetime import datetime
+
+from ..extensions import db
+
+
+class FraudTrendBucket(db.Model):
+    __tablename__ = "fraud_trend_buckets"
+    __table_args__ = {"extend_existing": True}
+
+    day = db.Column(db.Date, primary_key=True)
+    category = db.Column(db.String(64), primary_key=True)
+    cases = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def to_dict(self):
+        return {"day": self.day.isoformat(), "category": self.category, "cases": self.cases}
+
+    def __repr__(self):
+        return f"<FraudTrendBucket {self.day} {self.category}={self.cases}>"
+
+
+class FraudTrendWatermark(db.Model):
+    __tablename__ = "fraud_trend_watermark"
+    __table_args__ = {"extend_existing": True}
+
+    # One row per rollup source; "fraud_reports" is the only one today
+    source = db.Column(db.String(32), primary_key=True)
+
+    # (created_at, id) of the newest fraud report already counted
+    last_created_at = db.Column(db.DateTime, nullable=True)
+    last_report_id = db.Column(db.String(36), nullable=True)
+    reports_processed = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<FraudTrendWatermark {self.source} at={self.last_created_at}>"
@@ -7,6 +7,7 @@
 from datetime import datetime
 
 from ..extensions import db
+from ..utils.money import MoneyCents, sync_exact
 from .vault_transaction import VaultTransaction
 
 # Linter‑safe import anchor (prevents unused‑import warnings)
@@ -39,6 +40,8 @@ class LedgerEntry(db.Model):
     )
 
     amount = db.Column(db.Float, nullable=False)
+    # Exact integer-cents mirror of `amount` (dual-written until cutover)
+    amount_exact = db.Column("amount_cents", MoneyCents(), nullable=True)
     method = db.Column(db.String(64))
     received_at = db.Column(db.DateTime, default=datetime.utcnow)
     reconciled = db.Column(db.Boolean, default=False)
@@ -51,3 +54,6 @@ class LedgerEntry(db.Model):
             f"<LedgerEntry id={self.id} borrower_id={self.borrower_id} "
             f"amount={self.amount} reconciled={self.reconciled}>"
         )
+
+
+sync_exact(LedgerEntry.amount, LedgerEntry.amount_exact)
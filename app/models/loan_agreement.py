@@ -11,7 +11,11 @@ from ..extensions import db
 class LoanAgreement(db.Model):
     __tablename__ = "loan_agreement"
     __table_args__ = {"extend_existing": True}
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        # Compliance change probe: per-lender COUNT / MAX(updated_at)
+        db.Index("ix_loan_agreement_lender_id_updated_at", "lender_id", "updated_at"),
+        {"extend_existing": True},
+    )
 
     id = db.Column(db.Integer, primary_key=True)
 
@@ -38,6 +42,10 @@ class LoanAgreement(db.Model):
     ai_flagged = db.Column(db.Boolean, default=False)
     locked = db.Column(db.Boolean, default=False)
     violation_count = db.Column(db.Integer, default=0)
+    # Set once this agreement's violation has added a strike to the lender
+    violation_counted = db.Column(
+        db.Boolean, nullable=False, default=False, server_default=db.false()
+    )
 
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -7,6 +7,7 @@
 from datetime import datetime
 
 from ..extensions import db
+from ..utils.money import MoneyCents, sync_exact
 
 
 class PaymentLog(db.Model):
@@ -26,6 +27,8 @@ class PaymentLog(db.Model):
 
     payment_processor_id = db.Column(db.String(120), nullable=False)
     amount = db.Column(db.Float, nullable=False)
+    # Exact integer-cents mirror of `amount` (dual-written until cutover)
+    amount_exact = db.Column("amount_cents", MoneyCents(), nullable=True)
     currency = db.Column(db.String(5), nullable=False, default="USD")
 
     status = db.Column(
@@ -50,3 +53,6 @@ class PaymentLog(db.Model):
 
     def __repr__(self):
         return f"<PaymentLog id={self.id} user_id={self.user_id} status='{self.status}'>"
+
+
+sync_exact(PaymentLog.amount, PaymentLog.amount_exact)
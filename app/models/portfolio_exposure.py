@@ -0,0 +1,40 @@
+# =============================================================================
+# FILE: app/models/portfolio_exposure.py
+# DESCRIPTION: Running credit exposure totals per borrower, kept current by
+#              app.services.portfolio_exposure on every CreditLedger /
+#              PaymentLog flush. Amounts are exact integer cents.
+# =============================================================================
+
+from datetime import datetime
+
+from ..extensions import db
+from ..utils.money import MoneyCents
+
+
+class PortfolioExposure(db.Model):
+    __tablename__ = "portfolio_exposure"
+    __table_args__ = {"extend_existing": True}
+
+    user_id = db.Column(
+        db.String(36),
+        db.ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+
+    # credit_ledger rollup
+    cards = db.Column(db.Integer, nullable=False, default=0)
+    credit_limit = db.Column("credit_limit_cents", MoneyCents(), nullable=False, default=0)
+    balance_used = db.Column("balance_used_cents", MoneyCents(), nullable=False, default=0)
+    first_credit_at = db.Column(db.DateTime, nullable=True)
+
+    # payment_log rollup (failed payments excluded)
+    payments = db.Column(db.Integer, nullable=False, default=0)
+    repaid = db.Column("repaid_cents", MoneyCents(), nullable=False, default=0)
+
+    # Newest of the last card payment and the last logged payment; drives
+    # the delinquency bucket, which is derived at read time
+    last_paid_at = db.Column(db.DateTime, nullable=True, index=True)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<PortfolioExposure user_id={self.user_id} used={self.balance_used}>"
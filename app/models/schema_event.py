@@ -12,7 +12,13 @@ from ..extensions import db
 class SchemaEvent(db.Model):
     __tablename__ = "schema_event"
     __table_args__ = {"extend_existing": True}
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        # Cockpit feeds filter by event_type and order by timestamp
+        db.Index("ix_schema_event_event_type_timestamp", "event_type", "timestamp"),
+        db.Index("ix_schema_event_user_id_timestamp", "user_id", "timestamp"),
+        db.Index("ix_schema_event_timestamp", "timestamp"),
+        {"extend_existing": True},
+    )
 
     id = db.Column(db.Integer, primary_key=True)
 
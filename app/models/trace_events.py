@@ -17,6 +17,11 @@ class TraceEvent(db.Model):
     """
 
     __tablename__ = "trace_events"
+    __table_args__ = (
+        db.Index("ix_trace_events_timestamp", "timestamp"),
+        db.Index("ix_trace_events_event_type_timestamp", "event_type", "timestamp"),
+        db.Index("ix_trace_events_user_id_timestamp", "user_id", "timestamp"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
 
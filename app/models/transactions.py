@@ -9,12 +9,17 @@ import uuid
 from datetime import datetime
 
 from ..extensions import db
+from ..utils.money import MoneyCents, sync_exact
 
 
 class Transaction(db.Model):
     __tablename__ = "transactions"
     __table_args__ = {"extend_existing": True}
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        # Per-user history ordered / ranged by date
+        db.Index("ix_transactions_user_id_date", "user_id", "date"),
+        {"extend_existing": True},
+    )
 
     # -------------------------------------------------------------------------
     # Primary Key
@@ -42,6 +47,8 @@ class Transaction(db.Model):
     plaid_account_id = db.Column(db.String(120))
     account_id = db.Column(db.String(120))
     amount = db.Column(db.Float, nullable=False)
+    # Exact integer-cents mirror of `amount` (dual-written until cutover)
+    amount_exact = db.Column("amount_cents", MoneyCents(), nullable=True)
     currency = db.Column(db.String(5), default="USD")
     date = db.Column(db.DateTime, nullable=False)
     name = db.Column(db.String(255))
@@ -92,3 +99,6 @@ class Transaction(db.Model):
     # -------------------------------------------------------------------------
     def __repr__(self):
         return f"<Transaction id={self.id} user_id={self.user_id} amount={self.amount}>"
+
+
+sync_exact(Transaction.amount, Transaction.amount_exact)
@@ -7,12 +7,17 @@
 from datetime import datetime
 
 from ..extensions import db
+from ..utils.money import MoneyCents, sync_exact
 
 
 class VaultTransaction(db.Model):
     __tablename__ = "vault_transactions"
     __table_args__ = {"extend_existing": True}
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        db.Index("ix_vault_transactions_user_id_created_at", "user_id", "created_at"),
+        db.Index("ix_vault_transactions_status_created_at", "status", "created_at"),
+        {"extend_existing": True},
+    )
 
     id = db.Column(db.Integer, primary_key=True)
 
@@ -26,6 +31,8 @@ class VaultTransaction(db.Model):
 
     transaction_id = db.Column(db.String(120), unique=True, nullable=False)
     amount = db.Column(db.Float, nullable=False)
+    # Exact integer-cents mirror of `amount` (dual-written until cutover)
+    amount_exact = db.Column("amount_cents", MoneyCents(), nullable=True)
     currency = db.Column(db.String(5), nullable=False, default="USD")
     status = db.Column(db.String(50), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -35,3 +42,6 @@ class VaultTransaction(db.Model):
 
     def __repr__(self):
         return f"<VaultTransaction id={self.id} user_id={self.user_id} " f"amount={self.amount}>"
+
+
+sync_exact(VaultTransaction.amount, VaultTransaction.amount_exact)
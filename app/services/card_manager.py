@@ -10,11 +10,13 @@ mypy‑friendly request handling.
 import os
 from typing import Final
 
-import requests
 from requests import Response
 
+from app.utils import http_client
+
 API_BASE: Final[str] = "https://api.sandbox.treasuryprime.com/cards"
 API_KEY_ENV: Final[str] = "TREASURY_PRIME_SANDBOX_API_KEY"
+VENDOR: Final[str] = "treasury_prime"
 
 
 def _auth_headers() -> dict[str, str]:
@@ -28,7 +30,7 @@ def suspend_card(card_id: str) -> bool:
     url = f"{API_BASE}/{card_id}/suspend"
     headers = _auth_headers()
 
-    res: Response = requests.post(url, headers=headers)
+    res: Response = http_client.post(VENDOR, url, headers=headers)
     return res.status_code == 200
 
 
@@ -37,5 +39,5 @@ def unfreeze_card(card_id: str) -> bool:
     url = f"{API_BASE}/{card_id}/unsuspend"
     headers = _auth_headers()
 
-    res: Response = requests.post(url, headers=headers)
+    res: Response = http_client.post(VENDOR, url, headers=headers)
     return res.status_code == 200
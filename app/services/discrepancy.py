@@ -8,6 +8,8 @@ from copy import deepcopy
 from decimal import Decimal, InvalidOperation
 from typing import Any
 
+from app.utils.money import cents_array, from_cents, to_cents
+
 
 def _normalize_amount(value: Any) -> Any:
     """
@@ -65,3 +67,27 @@ def correct_discrepancies(statements: Sequence[dict[str, Any]]) -> list[dict[str
         corrected.append(new_rec)
 
     return corrected
+
+
+def _amount_cents(value: Any) -> int:
+    try:
+        return to_cents(_normalize_amount(value))
+    except ValueError:
+        # NaN/Infinity parse as Decimal but are not amounts; count as 0.00
+        return 0
+
+
+def statement_total(statements: Sequence[dict[str, Any]]) -> Decimal:
+    """
+    Exact total of the (normalized) 'amount' fields of ``statements``.
+
+    Amounts are converted to integer cents once and summed as an int64 array,
+    so large statement sets neither accumulate float error nor pay per-row
+    Decimal arithmetic. Records without an amount contribute nothing.
+    """
+    amounts = cents_array(
+        _amount_cents(rec["amount"])
+        for rec in statements
+        if isinstance(rec, dict) and "amount" in rec
+    )
+    return from_cents(int(amounts.sum()))
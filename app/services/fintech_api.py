@@ -8,6 +8,8 @@ import os
 
 import requests
 
+from app.utils import http_client
+
 logger = logging.getLogger(__name__)
 
 # NOTE: In a production environment, base URLs and API keys would be loaded
@@ -32,11 +34,12 @@ def _make_fintech_verification_request(vendor_name: str, url: str, account_data:
     }
 
     try:
-        response = requests.post(
+        # Pooled keep-alive session; timeouts and retries come from the vendor settings
+        response = http_client.post(
+            vendor_name.lower(),
             url,
             json=account_data,
             headers=headers,
-            timeout=10,  # Set a reasonable timeout
         )
         response.raise_for_status()  # Raise exception for bad status codes (4xx or 5xx)
         return response.json()
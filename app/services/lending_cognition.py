@@ -3,10 +3,10 @@
 import os
 from datetime import datetime
 
-import requests
-
 from app.extensions import db
 from app.models import CreditLedger, LoanAgreement, PaymentLog
+from app.services.portfolio_exposure import credit_violations, user_exposures
+from app.utils import http_client
 
 
 class CreditReflexManager:
@@ -20,7 +20,8 @@ class CreditReflexManager:
             raise RuntimeError("Missing TREASURY_PRIME_API_KEY environment variable")
 
         try:
-            response = requests.post(
+            response = http_client.post(
+                "treasury_prime",
                 "https://api.treasuryprime.com/cards",
                 headers={"Authorization": f"Bearer {api_key}"},
                 json={
@@ -29,7 +30,6 @@ class CreditReflexManager:
                     "limit": limit,
                     "network": "visa",
                 },
-                timeout=10,
             )
             response.raise_for_status()
             data = response.json()
@@ -65,21 +65,18 @@ class CreditReflexManager:
     @staticmethod
     def detect_credit_violation(user_id: int) -> bool:
         """Flags borrower overexposure if repayments lag behind credit issued."""
-        ledger_entries = CreditLedger.query.filter_by(user_id=user_id).all()
-        repayments = PaymentLog.query.filter_by(user_id=user_id).all()
-
-        total_credit_limit = sum(entry.credit_limit for entry in ledger_entries)
-        total_repaid = sum(p.amount for p in repayments)
-
-        overexposure = total_credit_limit - total_repaid
-        threshold = 0.20 * total_credit_limit
-
-        if overexposure > threshold:
-            print(f"⚠️ Violation: User {user_id} overexposed by ${overexposure:.2f}")
+        exposure = user_exposures([user_id])
+        if exposure and exposure[0]["violation"]:
+            print(f"⚠️ Violation: User {user_id} overexposed by ${exposure[0]['exposure']}")
             return True
         print(f"✅ User {user_id} credit behavior normal.")
         return False
 
+    @staticmethod
+    def detect_credit_violations(user_ids=None) -> set:
+        """Batch form for the nightly risk job: every overexposed borrower at once."""
+        return credit_violations(user_ids)
+
     @staticmethod
     def reconcile_loan_vs_card(user_id: int):
         """Audits borrower repayment gap across lender loans and card usage."""
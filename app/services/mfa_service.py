@@ -2,39 +2,240 @@
 # FILE: app/services/mfa_service.py
 # DESCRIPTION: Redis‑backed MFA service with TTL expiry, one‑time use enforcement,
 #              fail‑count tracking, and optional DB persistence for audit trails.
+#              Every state transition (issue, verify, lockout, consume) is a
+#              single Lua script call, so concurrent retries see one atomic
+#              outcome; MFACode audit rows are written in background batches.
 # =============================================================================
-import random
+import logging
+import secrets
+import threading
 from datetime import datetime, timedelta
 
 from flask import current_app
 from flask_mail import Message
+from sqlalchemy import bindparam, insert
 
-from app.extensions import db, mail, redis_client
+from app.extensions import db, mail
 from app.models.mfa_code import MFACode
+from app.utils.redis_utils import get_redis_client
 
+logger = logging.getLogger(__name__)
 
-def generate_mfa_code(user, ttl_seconds=300, persist=True):
+FAIL_WINDOW_SECONDS = 300
+AUDIT_BATCH_SIZE = 100
+AUDIT_FLUSH_SECONDS = 2.0
+AUDIT_MAX_QUEUE = 10_000
+
+# -----------------------------------------------------------------------------
+# Lua state transitions
+#   KEYS[1] = active code, KEYS[2] = failure counter (same hash slot per user)
+# -----------------------------------------------------------------------------
+# ARGV: code, ttl_ms, max_failures -> {issued (1/0), failures}
+ISSUE_LUA = """
+local fails = tonumber(redis.call('GET', KEYS[2]) or '0')
+if fails >= tonumber(ARGV[3]) then
+  return {0, fails}
+end
+redis.call('SET', KEYS[1], ARGV[1], 'PX', ARGV[2])
+return {1, fails}
+"""
+
+# ARGV: submitted, max_failures, fail_window_s -> {status, failures}
+# status: ok | invalid | expired | lockout (this miss hit the limit) | locked
+VERIFY_LUA = """
+local max_failures = tonumber(ARGV[2])
+local fails = tonumber(redis.call('GET', KEYS[2]) or '0')
+if fails >= max_failures then
+  return {'locked', fails}
+end
+local stored = redis.call('GET', KEYS[1])
+if stored and stored == ARGV[1] then
+  redis.call('DEL', KEYS[1], KEYS[2])
+  return {'ok', 0}
+end
+fails = redis.call('INCR', KEYS[2])
+redis.call('EXPIRE', KEYS[2], ARGV[3])
+if fails >= max_failures then
+  redis.call('DEL', KEYS[1])
+  return {'lockout', fails}
+end
+if stored then
+  return {'invalid', fails}
+end
+return {'expired', fails}
+"""
+
+_scripts = {}
+_scripts_lock = threading.Lock()
+
+
+def _client():
+    return get_redis_client()
+
+
+def _run(name, source, client, keys, args):
+    script = _scripts.get(name)
+    if script is None:
+        with _scripts_lock:
+            script = _scripts.get(name) or client.register_script(source)
+            _scripts[name] = script
+    # EVALSHA against ``client`` (loads the script once on NOSCRIPT)
+    return script(keys=keys, args=args, client=client)
+
+
+def _keys(user_id):
+    return [f"mfa:{{{user_id}}}:code", f"mfa:{{{user_id}}}:fails"]
+
+
+def _text(value):
+    return value.decode() if isinstance(value, bytes) else value
+
+
+# -----------------------------------------------------------------------------
+# Audit trail (off the request path, batched)
+#   Queue entries are (flask_app, event); each app's events are written
+#   inside that app's context.
+# -----------------------------------------------------------------------------
+_audit_queue = []
+_audit_lock = threading.Lock()
+_audit_wake = threading.Event()
+_flusher = None
+
+
+def _queue_audit(event):
+    global _flusher
+    flask_app = current_app._get_current_object()
+    with _audit_lock:
+        if len(_audit_queue) >= AUDIT_MAX_QUEUE:
+            logger.warning("MFA audit queue full; dropping %s event", event[0])
+            return
+        _audit_queue.append((flask_app, event))
+        size = len(_audit_queue)
+        if _flusher is None:
+            _flusher = threading.Thread(target=_flush_loop, daemon=True, name="MFAAuditFlusher")
+            _flusher.start()
+    if size >= AUDIT_BATCH_SIZE:
+        _audit_wake.set()
+
+
+def _take(flask_app=None):
+    """Remove and return queued events, grouped by app (one app if given)."""
+    with _audit_lock:
+        taken, kept = [], []
+        for entry in _audit_queue:
+            (taken if flask_app is None or entry[0] is flask_app else kept).append(entry)
+        _audit_queue[:] = kept
+    grouped = {}
+    for owner, event in taken:
+        grouped.setdefault(owner, []).append(event)
+    return grouped
+
+
+def _requeue(flask_app, events):
+    with _audit_lock:
+        # Keep the batch for the next flush unless the queue is saturated
+        room = max(0, AUDIT_MAX_QUEUE - len(_audit_queue))
+        _audit_queue[:0] = [(flask_app, event) for event in events[:room]]
+
+
+def _flush_loop():
+    while True:
+        _audit_wake.wait(AUDIT_FLUSH_SECONDS)
+        _audit_wake.clear()
+        for flask_app, events in _take().items():
+            try:
+                with flask_app.app_context():
+                    _write_audit(events)
+            except Exception:
+                logger.exception("MFA audit flush failed; %d events requeued", len(events))
+                _requeue(flask_app, events)
+
+
+def flush_mfa_audit():
     """
-    Generate a one‑time MFA code for a user.
-    - Stores ephemeral code in Redis with TTL.
-    - Optionally persists to DB for audit trail.
+    Write this app's queued audit events now (the background flusher does
+    this every AUDIT_FLUSH_SECONDS). Returns the number of events written.
     """
-    code = str(random.randint(100000, 999999))
-    key = f"mfa:{user.id}:{code}"
+    flask_app = current_app._get_current_object()
+    events = _take(flask_app).get(flask_app, [])
+    if events:
+        try:
+            _write_audit(events)
+        except Exception:
+            _requeue(flask_app, events)
+            raise
+    return len(events)
 
-    # Store in Redis with TTL
-    redis_client.setex(key, timedelta(seconds=ttl_seconds), "valid")
 
-    # Persist to DB for audit trail
-    if persist:
-        expires_at = datetime.utcnow() + timedelta(seconds=ttl_seconds)
-        mfa = MFACode(user_id=user.id, code=code, expires_at=expires_at)
-        db.session.add(mfa)
+def _write_audit(events):
+    """Issued codes as one multi-row INSERT, failures as one executemany UPDATE."""
+    issued, failures = [], {}
+    for kind, user_id, code, at, ttl_seconds in events:
+        if kind == "issued":
+            issued.append(
+                {
+                    "user_id": user_id,
+                    "code": code,
+                    "created_at": at,
+                    "expires_at": at + timedelta(seconds=ttl_seconds),
+                    "fail_count": 0,
+                }
+            )
+        else:
+            failures[(user_id, code)] = failures.get((user_id, code), 0) + 1
+
+    table = MFACode.__table__
+    try:
+        if issued:
+            db.session.execute(insert(table), issued)
+        if failures:
+            db.session.execute(
+                table.update()
+                .where(
+                    table.c.user_id == bindparam("b_user_id"),
+                    table.c.code == bindparam("b_code"),
+                )
+                .values(fail_count=table.c.fail_count + bindparam("b_failures")),
+                [
+                    {"b_user_id": user_id, "b_code": code, "b_failures": n}
+                    for (user_id, code), n in failures.items()
+                ],
+            )
         db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+
+# -----------------------------------------------------------------------------
+# Public API
+# -----------------------------------------------------------------------------
+def generate_mfa_code(user, ttl_seconds=300, persist=True, max_failures=3):
+    """
+    Generate a one‑time MFA code for a user.
+    - Stores ephemeral code in Redis with TTL, replacing any earlier code.
+    - Refuses (returns None) while the user is locked out.
+    - Optionally queues a DB row for the audit trail.
+    """
+    client = _client()
+    if client is None:
+        logger.error("MFA issue for user %s failed: Redis unavailable", user.id)
+        return None
 
-    current_app.logger.info(
-        f"✅ MFA code {code} generated for user {user.email} with TTL={ttl_seconds}s"
+    code = f"{secrets.randbelow(900000) + 100000}"
+    issued, fails = _run(
+        "issue", ISSUE_LUA, client, _keys(user.id), [code, ttl_seconds * 1000, max_failures]
     )
+    if not issued:
+        current_app.logger.warning(
+            f"🚫 MFA code not issued for {user.email}: locked out after {fails} failures"
+        )
+        return None
+
+    if persist:
+        _queue_audit(("issued", user.id, code, datetime.utcnow(), ttl_seconds))
+
+    current_app.logger.info(f"✅ MFA code generated for user {user.email} with TTL={ttl_seconds}s")
     return code
 
 
@@ -43,52 +244,53 @@ def send_mfa_code(user, ttl_seconds=300, persist=True):
     Generate and deliver MFA code via email.
     """
     code = generate_mfa_code(user, ttl_seconds=ttl_seconds, persist=persist)
+    if code is None:
+        return None
     msg = Message(
         subject="Your MFA Code",
         recipients=[user.email],
         body=f"Your MFA verification code is: {code}",
     )
     mail.send(msg)
-    current_app.logger.info(f"📩 MFA code {code} sent to {user.email}")
+    current_app.logger.info(f"📩 MFA code sent to {user.email}")
     return code
 
 
-def verify_mfa_code(user, submitted_code, max_failures=3):
+def verify_mfa_code(user, submitted_code, max_failures=3, persist=True):
     """
-    Verify MFA code:
-    - Checks Redis for validity.
-    - Enforces one‑time use by deleting key.
-    - Tracks fail‑count in Redis and DB.
-    - Locks out after max_failures.
+    Verify MFA code in one atomic Redis call:
+    - A matching code is consumed (exactly once) and resets the fail counter.
+    - A miss increments the fail counter (FAIL_WINDOW_SECONDS sliding window).
+    - Reaching max_failures locks the user out and burns the active code.
+    Failed attempts are queued for the DB audit trail when ``persist``.
     """
-    key = f"mfa:{user.id}:{submitted_code}"
-    fail_key = f"mfa:fail:{user.id}"
+    client = _client()
+    if client is None:
+        logger.error("MFA verify for user %s failed: Redis unavailable", user.id)
+        return False
+
+    status, fails = _run(
+        "verify",
+        VERIFY_LUA,
+        client,
+        _keys(user.id),
+        [str(submitted_code), max_failures, FAIL_WINDOW_SECONDS],
+    )
+    status = _text(status)
+    if status == "ok":
+        current_app.logger.info(f"✅ MFA code verified for user {user.email}")
+        return True
 
-    # Check if user is locked out
-    fails = int(redis_client.get(fail_key) or 0)
-    if fails >= max_failures:
+    if status == "locked":
+        # Attempt while already locked out: not counted again
         current_app.logger.warning(
             f"🚫 User {user.email} locked out after {fails} failed MFA attempts"
         )
         return False
 
-    if redis_client.get(key) == b"valid":
-        redis_client.delete(key)  # enforce one‑time use
-        redis_client.delete(fail_key)  # reset fail counter
-        current_app.logger.info(f"✅ MFA code {submitted_code} verified for user {user.email}")
-        return True
-
-    # Increment fail counter
-    redis_client.incr(fail_key)
-    redis_client.expire(fail_key, 300)  # expire fail counter after 5 minutes
-
-    # Update DB fail_count if persisted
-    mfa = user.mfa_codes.filter_by(code=submitted_code).first()
-    if mfa:
-        mfa.fail_count += 1
-        db.session.commit()
-
+    if persist:
+        _queue_audit(("failed", user.id, str(submitted_code), datetime.utcnow(), 0))
     current_app.logger.warning(
-        f"❌ Invalid MFA code {submitted_code} for user {user.email} (fail_count={fails+1})"
+        f"❌ Invalid MFA code for user {user.email} ({status}, fail_count={fails})"
     )
     return False
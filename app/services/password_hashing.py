@@ -0,0 +1,345 @@
+# =============================================================================
+# FILE: app/services/password_hashing.py
+# DESCRIPTION: Password verification and hashing off the request thread.
+#              Work runs in a small per-process worker pool with a hard cap
+#              on in-flight operations; callers over the cap are rejected
+#              immediately (HashingOverloaded) instead of queueing behind
+#              CPU-bound hashes, so a login burst cannot occupy every uwsgi
+#              thread. Successful logins transparently rehash to the
+#              configured method/cost. Per-method cost metrics: hash_stats().
+#
+# Config (app.config, falling back to the environment; see app/README.md):
+#   PASSWORD_HASH_METHOD       werkzeug method, e.g. "scrypt", "pbkdf2:sha256:600000"
+#   PASSWORD_HASH_WORKERS      pool processes (0 = run inline on the caller)
+#   PASSWORD_HASH_QUEUE_DEPTH  extra operations allowed to wait for a worker
+#                              (default: one per uwsgi thread)
+#   PASSWORD_HASH_TIMEOUT      seconds a caller waits before giving up
+# Settings are read from the current app on every call; the pool is rebuilt
+# when they change. Workers come from a forkserver, never from a fork of the
+# threaded request process.
+# =============================================================================
+
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from functools import partial
+
+from flask import current_app
+from werkzeug.security import (
+    DEFAULT_PBKDF2_ITERATIONS,
+    check_password_hash,
+    generate_password_hash,
+)
+
+from app.extensions import db
+from app.utils.redis_utils import uwsgi_threads
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_METHOD = "scrypt"
+DEFAULT_WORKERS = 1
+DEFAULT_TIMEOUT = 5.0
+SAMPLES_PER_METHOD = 1024
+
+
+class HashingOverloaded(RuntimeError):
+    """Raised when the hashing pool is at capacity or a caller timed out."""
+
+
+# -----------------------------------------------------------------------------
+# Method strings
+# -----------------------------------------------------------------------------
+def normalize_method(method: str) -> str:
+    """Expand a werkzeug method to the full form stored in its hashes."""
+    name, *args = method.split(":")
+    if name == "scrypt":
+        n, r, p = args if args else (2**15, 8, 1)
+        return f"scrypt:{int(n)}:{int(r)}:{int(p)}"
+    if name == "pbkdf2":
+        hash_name = args[0] if args else "sha256"
+        iterations = int(args[1]) if len(args) > 1 else DEFAULT_PBKDF2_ITERATIONS
+        return f"pbkdf2:{hash_name}:{iterations}"
+    return method
+
+
+def method_of(pwhash: str) -> str:
+    return (pwhash or "").split("$", 1)[0]
+
+
+def _setting(config, name, default):
+    return config.get(name, os.getenv(name, default))
+
+
+def configured_method() -> str:
+    return normalize_method(_setting(current_app.config, "PASSWORD_HASH_METHOD", DEFAULT_METHOD))
+
+
+@dataclass(frozen=True)
+class PoolSettings:
+    workers: int
+    max_in_flight: int
+    timeout: float
+
+
+def default_queue_depth() -> int:
+    """One waiting slot per uwsgi thread, so a burst queues instead of failing."""
+    return int(os.getenv("UWSGI_THREADS") or uwsgi_threads() or 2)
+
+
+def pool_settings(config) -> PoolSettings:
+    """Pool sizing for an app config (see the module header for the keys)."""
+    workers = int(_setting(config, "PASSWORD_HASH_WORKERS", DEFAULT_WORKERS))
+    depth = _setting(config, "PASSWORD_HASH_QUEUE_DEPTH", None)
+    depth = default_queue_depth() if depth in (None, "") else int(depth)
+    return PoolSettings(
+        workers=workers,
+        max_in_flight=max(1, workers) + max(0, depth),
+        timeout=float(_setting(config, "PASSWORD_HASH_TIMEOUT", DEFAULT_TIMEOUT)),
+    )
+
+
+def needs_rehash(pwhash: str, method: str | None = None) -> bool:
+    """True when ``pwhash`` was made with a method/cost other than ``method``."""
+    target = normalize_method(method) if method else configured_method()
+    return method_of(pwhash) != target
+
+
+# -----------------------------------------------------------------------------
+# Worker side (module-level so the pool can pickle them by reference)
+# -----------------------------------------------------------------------------
+def _verify_job(pwhash, password):
+    start = time.perf_counter()
+    ok = check_password_hash(pwhash, password)
+    return ok, time.perf_counter() - start
+
+
+def _hash_job(password, method):
+    start = time.perf_counter()
+    pwhash = generate_password_hash(password, method=method)
+    return pwhash, time.perf_counter() - start
+
+
+# -----------------------------------------------------------------------------
+# Pool state (per process; rebuilt after fork)
+# -----------------------------------------------------------------------------
+_lock = threading.Lock()
+_pool = None
+_pool_pid = None
+_slots = None
+_settings = None
+_stats = {}
+
+
+def _reset_stats():
+    _stats.clear()
+    _stats.update(in_flight=0, peak_in_flight=0, rejected=0, timeouts=0, rehashed=0, samples={})
+
+
+_reset_stats()
+
+
+def _mp_context():
+    # Forking a threaded uwsgi worker can copy locks held by other threads;
+    # a forkserver forks from a clean single-threaded process instead.
+    methods = multiprocessing.get_all_start_methods()
+    if "forkserver" in methods:
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload([__name__])
+        return context
+    return multiprocessing.get_context("spawn")
+
+
+def _ensure_pool() -> PoolSettings:
+    """(Re)build the pool and slot semaphore for this process and app config."""
+    global _pool, _pool_pid, _slots, _settings
+    settings = pool_settings(current_app.config)
+    if _pool_pid == os.getpid() and _settings == settings:
+        return settings
+    with _lock:
+        if _pool_pid == os.getpid() and _settings == settings:
+            return settings
+        if _pool_pid != os.getpid():
+            _reset_stats()
+        elif _pool is not None:
+            # Settings changed: in-flight jobs finish on the old pool and slots
+            _pool.shutdown(wait=False)
+        # A pool inherited across fork is unusable here; drop it without joining
+        _pool = (
+            ProcessPoolExecutor(max_workers=settings.workers, mp_context=_mp_context())
+            if settings.workers > 0
+            else None
+        )
+        _slots = threading.BoundedSemaphore(settings.max_in_flight)
+        _settings = settings
+        _pool_pid = os.getpid()
+    return settings
+
+
+def init_app(app) -> None:
+    """Parse the pool settings at startup so bad values fail fast."""
+    settings = pool_settings(app.config)
+    logger.debug(
+        "Password hashing: %d worker(s), %d in flight max",
+        settings.workers,
+        settings.max_in_flight,
+    )
+
+
+def shutdown_pool(wait: bool = True) -> None:
+    """Stop the worker pool; the next call rebuilds it from current config."""
+    global _pool, _pool_pid, _settings
+    with _lock:
+        if _pool is not None and _pool_pid == os.getpid():
+            _pool.shutdown(wait=wait, cancel_futures=True)
+        _pool = None
+        _pool_pid = None
+        _settings = None
+
+
+def _acquire():
+    """Take a slot without waiting; returns the releaser for that slot."""
+    slots = _slots
+    if not slots.acquire(blocking=False):
+        with _lock:
+            _stats["rejected"] += 1
+        raise HashingOverloaded("password hashing at capacity")
+    with _lock:
+        _stats["in_flight"] += 1
+        _stats["peak_in_flight"] = max(_stats["peak_in_flight"], _stats["in_flight"])
+    return partial(_release, slots)
+
+
+def _release(slots, _future=None):
+    with _lock:
+        _stats["in_flight"] -= 1
+    slots.release()
+
+
+def _record(op, method, cost_s, wait_s):
+    with _lock:
+        samples = _stats["samples"].setdefault(
+            (op, method),
+            (deque(maxlen=SAMPLES_PER_METHOD), deque(maxlen=SAMPLES_PER_METHOD), [0]),
+        )
+        samples[0].append(cost_s * 1000)
+        samples[1].append(max(0.0, wait_s) * 1000)
+        samples[2][0] += 1
+
+
+def _run(op, fn, args, method):
+    """Run ``fn(*args)`` in a slot; returns the job's result value."""
+    settings = _ensure_pool()
+    pool = _pool
+    release = _acquire()
+    start = time.perf_counter()
+    if pool is None:
+        try:
+            value, cost = fn(*args)
+        finally:
+            release()
+        _record(op, method, cost, 0.0)
+        return value
+
+    try:
+        future = pool.submit(fn, *args)
+    except (BrokenProcessPool, RuntimeError):
+        release()
+        logger.exception("Password hashing pool unavailable; running inline")
+        shutdown_pool(wait=False)
+        value, cost = fn(*args)
+        _record(op, method, cost, 0.0)
+        return value
+
+    # The slot is held until the worker finishes, even if the caller gives up
+    future.add_done_callback(release)
+    try:
+        value, cost = future.result(timeout=settings.timeout)
+    except FutureTimeout:
+        with _lock:
+            _stats["timeouts"] += 1
+        raise HashingOverloaded("password hashing timed out") from None
+    except BrokenProcessPool:
+        logger.exception("Password hashing worker died; running inline")
+        shutdown_pool(wait=False)
+        value, cost = fn(*args)
+    _record(op, method, cost, time.perf_counter() - start - cost)
+    return value
+
+
+# -----------------------------------------------------------------------------
+# Public API
+# -----------------------------------------------------------------------------
+def verify_password(pwhash: str, password: str) -> bool:
+    """check_password_hash in the pool. Raises HashingOverloaded when full."""
+    if not pwhash or password is None:
+        return False
+    return _run("verify", _verify_job, (pwhash, password), method_of(pwhash))
+
+
+def hash_password(password: str, method: str | None = None) -> str:
+    """generate_password_hash with the configured method, in the pool."""
+    method = normalize_method(method) if method else configured_method()
+    return _run("hash", _hash_job, (password, method), method)
+
+
+def verify_and_upgrade(user, password: str) -> bool:
+    """
+    Verify ``password`` for ``user`` and, on success, rehash it to the
+    configured method when the stored hash is older/weaker. The upgrade is
+    best-effort: skipped when the pool is busy, never fails the login.
+    """
+    if not user or not verify_password(user.password_hash, password):
+        return False
+    if needs_rehash(user.password_hash):
+        try:
+            user.password_hash = hash_password(password)
+            db.session.commit()
+        except HashingOverloaded:
+            logger.info("Rehash for user %s deferred: hashing pool busy", user.id)
+        except Exception:
+            db.session.rollback()
+            logger.exception("Rehash for user %s failed", user.id)
+        else:
+            with _lock:
+                _stats["rehashed"] += 1
+    return True
+
+
+def _summary(values):
+    if not values:
+        return {"avg_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0}
+    ordered = sorted(values)
+    return {
+        "avg_ms": round(sum(ordered) / len(ordered), 2),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 2),
+        "max_ms": round(ordered[-1], 2),
+    }
+
+
+def hash_stats() -> dict:
+    """Pool occupancy, rejections and per-method hash cost for this process."""
+    with _lock:
+        methods = {}
+        for (op, method), (costs, waits, count) in _stats["samples"].items():
+            methods.setdefault(method, {})[op] = {
+                "count": count[0],
+                "cost": _summary(costs),
+                "queue_wait": _summary(waits),
+            }
+        return {
+            "workers": _settings.workers if _settings else None,
+            "max_in_flight": _settings.max_in_flight if _settings else None,
+            "in_flight": _stats["in_flight"],
+            "peak_in_flight": _stats["peak_in_flight"],
+            "rejected": _stats["rejected"],
+            "timeouts": _stats["timeouts"],
+            "rehashed": _stats["rehashed"],
+            "methods": methods,
+        }
@@ -5,6 +5,7 @@
 #              and transaction retrieval with robust error handling.
 # =============================================================================
 
+import functools
 import json
 import os
 from datetime import datetime, timedelta
@@ -26,15 +27,28 @@ PLAID_CLIENT_ID = os.getenv("PLAID_CLIENT_ID")
 PLAID_SECRET = os.getenv("PLAID_SECRET")
 PLAID_ENV = os.getenv("PLAID_ENV", "sandbox")  # 'sandbox', 'development', or 'production'
 
-if not PLAID_CLIENT_ID or not PLAID_SECRET:
-    raise RuntimeError("❌ Missing Plaid API credentials. Check environment variables.")
 
-configuration = Configuration(
-    host=f"https://{PLAID_ENV}.plaid.com",
-    api_key={"clientId": PLAID_CLIENT_ID, "secret": PLAID_SECRET},
-)
-api_client = ApiClient(configuration)
-plaid_client = PlaidApi(api_client)
+@functools.lru_cache(maxsize=1)
+def get_plaid_client() -> PlaidApi:
+    """
+    Build the Plaid client on first use (not at import time).
+    Raises RuntimeError when credentials are missing.
+    """
+    if not PLAID_CLIENT_ID or not PLAID_SECRET:
+        raise RuntimeError("❌ Missing Plaid API credentials. Check environment variables.")
+
+    configuration = Configuration(
+        host=f"https://{PLAID_ENV}.plaid.com",
+        api_key={"clientId": PLAID_CLIENT_ID, "secret": PLAID_SECRET},
+    )
+    return PlaidApi(ApiClient(configuration))
+
+
+def __getattr__(name: str):
+    # Backwards compatibility for `from app.services.plaid_api import plaid_client`
+    if name == "plaid_client":
+        return get_plaid_client()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # -----------------------------------------------------------------------------
@@ -53,7 +67,7 @@ def generate_link_token(user_id: str):
             user={"client_user_id": str(user_id)},
             products=["auth", "transactions"],
         )
-        response = plaid_client.link_token_create(request)
+        response = get_plaid_client().link_token_create(request)
         return jsonify({"link_token": response.link_token})
     except ApiException as e:
         error_body = {}
@@ -84,7 +98,7 @@ def verify_via_plaid(plaid_token: str):
             start_date="2024-05-01",
             end_date="2024-06-01",
         )
-        response = plaid_client.transactions_get(request)
+        response = get_plaid_client().transactions_get(request)
         return response.to_dict()
     except ApiException as e:
         try:
@@ -119,7 +133,7 @@ def get_transactions(access_token: str, start_date: str = None, end_date: str =
             start_date=start_date,
             end_date=end_date,
         )
-        response = plaid_client.transactions_get(request)
+        response = get_plaid_client().transactions_get(request)
         # Convert to dict for JSON safety
         transactions = [txn.to_dict() for txn in response.transactions]
         return jsonify({"transactions": transactions})
@@ -0,0 +1,345 @@
+# app/services/portfolio_exposure.py
+#
+# Portfolio-wide credit exposure.
+#   - Running per-borrower totals (PortfolioExposure) are recomputed for the
+#     borrowers touched by every CreditLedger / PaymentLog flush, inside the
+#     same transaction, with grouped SQL over just those borrowers
+#   - user_exposures() / portfolio_summary() / credit_violations() read the
+#     totals with SQL aggregates; delinquency buckets are derived at read time
+#   - what_if() re-evaluates a batch of borrowers under hypothetical changes
+#     without writing anything
+# create_app() installs the flush hook (track_exposure). Bulk Core writes
+# (insert()/update() statements) bypass it; run rebuild_exposure() after them.
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import BigInteger, case, cast, delete, event, func, insert, inspect, select
+from sqlalchemy.orm import Session
+
+from app.extensions import db
+from app.models import CreditLedger, PaymentLog, PortfolioExposure
+from app.utils.money import cents, from_cents, to_cents
+
+# Legacy rule: exposure (credit issued - repaid) above 20% of the limit
+EXPOSURE_THRESHOLD_PCT = 20
+DELINQUENCY_BUCKETS = ("current", "dpd_30", "dpd_60", "dpd_90")
+EXCLUDED_PAYMENT_STATUSES = ("failed",)
+_IN_CHUNK = 500
+
+
+def _chunks(ids):
+    ids = list(ids)
+    for start in range(0, len(ids), _IN_CHUNK):
+        yield ids[start : start + _IN_CHUNK]
+
+
+def _sum_cents(exact, legacy):
+    # Rows written before the exact columns were backfilled only have the float
+    per_row = func.coalesce(cents(exact), cast(func.round(legacy * 100), BigInteger))
+    return func.coalesce(func.sum(per_row), 0)
+
+
+# -----------------------------------------------------------------------------
+# Running totals
+# -----------------------------------------------------------------------------
+def _recompute(conn, user_ids, now=None):
+    """Rebuild the PortfolioExposure rows of ``user_ids`` from their source rows."""
+    now = now or datetime.utcnow()
+    ledger_stmt = select(
+        CreditLedger.user_id,
+        func.count(CreditLedger.id).label("cards"),
+        _sum_cents(CreditLedger.credit_limit_exact, CreditLedger.credit_limit).label("limit"),
+        _sum_cents(CreditLedger.balance_used_exact, CreditLedger.balance_used).label("used"),
+        func.min(CreditLedger.created_at).label("first_credit_at"),
+        func.max(CreditLedger.last_payment_ts).label("last_card_payment"),
+    ).group_by(CreditLedger.user_id)
+    payment_stmt = (
+        select(
+            PaymentLog.user_id,
+            func.count(PaymentLog.id).label("payments"),
+            _sum_cents(PaymentLog.amount_exact, PaymentLog.amount).label("repaid"),
+            func.max(PaymentLog.created_at).label("last_payment"),
+        )
+        .where(PaymentLog.status.notin_(EXCLUDED_PAYMENT_STATUSES))
+        .group_by(PaymentLog.user_id)
+    )
+
+    table = PortfolioExposure.__table__
+    for chunk in _chunks(user_ids):
+        ledgers = {
+            row.user_id: row
+            for row in conn.execute(ledger_stmt.where(CreditLedger.user_id.in_(chunk)))
+        }
+        payments = {
+            row.user_id: row
+            for row in conn.execute(payment_stmt.where(PaymentLog.user_id.in_(chunk)))
+        }
+        conn.execute(delete(table).where(table.c.user_id.in_(chunk)))
+
+        rows = []
+        for user_id in chunk:
+            ledger, paid = ledgers.get(user_id), payments.get(user_id)
+            if ledger is None and paid is None:
+                continue
+            paid_at = []
+            if ledger is not None and ledger.last_card_payment:
+                paid_at.append(ledger.last_card_payment)
+            if paid is not None and paid.last_payment:
+                paid_at.append(paid.last_payment)
+            rows.append(
+                {
+                    "user_id": user_id,
+                    "cards": ledger.cards if ledger else 0,
+                    "credit_limit_cents": from_cents(ledger.limit if ledger else 0),
+                    "balance_used_cents": from_cents(ledger.used if ledger else 0),
+                    "first_credit_at": ledger.first_credit_at if ledger else None,
+                    "payments": paid.payments if paid else 0,
+                    "repaid_cents": from_cents(paid.repaid if paid else 0),
+                    "last_paid_at": max(paid_at) if paid_at else None,
+                    "updated_at": now,
+                }
+            )
+        if rows:
+            conn.execute(insert(table), rows)
+
+
+def _touched_users(session):
+    user_ids = set()
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if not isinstance(obj, (CreditLedger, PaymentLog)):
+            continue
+        history = inspect(obj).attrs.user_id.history
+        user_ids.update(uid for uid in (*history.added, *history.unchanged, *history.deleted))
+    user_ids.discard(None)
+    return user_ids
+
+
+def _after_flush(session, flush_context):
+    user_ids = _touched_users(session)
+    if user_ids:
+        _recompute(session.connection(), sorted(user_ids))
+
+
+_listener_installed = False
+
+
+def track_exposure():
+    """Keep PortfolioExposure current on every ORM flush. Idempotent."""
+    global _listener_installed
+    if not _listener_installed:
+        event.listen(Session, "after_flush", _after_flush)
+        _listener_installed = True
+
+
+def rebuild_exposure(user_ids=None):
+    """
+    Recompute running totals from the source tables: every borrower with a
+    card or payment (plus stale rows) by default, or just ``user_ids``.
+    Returns the number of borrowers recomputed.
+    """
+    if user_ids is None:
+        user_ids = set(db.session.scalars(select(CreditLedger.user_id).distinct()))
+        user_ids |= set(db.session.scalars(select(PaymentLog.user_id).distinct()))
+        user_ids |= set(db.session.scalars(select(PortfolioExposure.user_id)))
+    user_ids = sorted(set(user_ids))
+    _recompute(db.session.connection(), user_ids)
+    db.session.commit()
+    return len(user_ids)
+
+
+# -----------------------------------------------------------------------------
+# Readers
+# -----------------------------------------------------------------------------
+def delinquency_bucket_expr(now=None):
+    """
+    SQL CASE naming each borrower's delinquency bucket: days since the last
+    payment (or since credit was first issued) while a balance is owed.
+    """
+    now = now or datetime.utcnow()
+    since = func.coalesce(PortfolioExposure.last_paid_at, PortfolioExposure.first_credit_at)
+    return case(
+        (cents(PortfolioExposure.balance_used) <= 0, "current"),
+        (since.is_(None), "current"),
+        (since >= now - timedelta(days=30), "current"),
+        (since >= now - timedelta(days=60), "dpd_30"),
+        (since >= now - timedelta(days=90), "dpd_60"),
+        else_="dpd_90",
+    )
+
+
+def _violation_expr():
+    # credit_limit - repaid > 20% of credit_limit, in integer cents
+    limit, repaid = cents(PortfolioExposure.credit_limit), cents(PortfolioExposure.repaid)
+    return (limit - repaid) * 100 > limit * EXPOSURE_THRESHOLD_PCT
+
+
+def _utilization(limit_cents, used_cents):
+    return round(used_cents / limit_cents, 4) if limit_cents > 0 else None
+
+
+def _exposure_dict(user_id, limit_cents, used_cents, repaid_cents, bucket=None):
+    data = {
+        "user_id": user_id,
+        "credit_limit": str(from_cents(limit_cents)),
+        "outstanding_principal": str(from_cents(used_cents)),
+        "repaid": str(from_cents(repaid_cents)),
+        "utilization": _utilization(limit_cents, used_cents),
+        "exposure": str(from_cents(limit_cents - repaid_cents)),
+        "violation": (limit_cents - repaid_cents) * 100 > limit_cents * EXPOSURE_THRESHOLD_PCT,
+    }
+    if bucket is not None:
+        data["delinquency"] = bucket
+    return data
+
+
+def _exposure_stmt(now=None):
+    return select(
+        PortfolioExposure.user_id,
+        cents(PortfolioExposure.credit_limit).label("limit"),
+        cents(PortfolioExposure.balance_used).label("used"),
+        cents(PortfolioExposure.repaid).label("repaid"),
+        delinquency_bucket_expr(now).label("bucket"),
+    )
+
+
+def user_exposures(user_ids=None, bucket=None, limit=None, now=None):
+    """Per-borrower exposure, highest outstanding principal first."""
+    stmt = _exposure_stmt(now).order_by(
+        cents(PortfolioExposure.balance_used).desc(), PortfolioExposure.user_id
+    )
+    if bucket:
+        stmt = stmt.where(delinquency_bucket_expr(now) == bucket)
+    if limit:
+        stmt = stmt.limit(limit)
+
+    if user_ids is None:
+        rows = db.session.execute(stmt).all()
+    else:
+        rows = []
+        for chunk in _chunks(user_ids):
+            rows.extend(db.session.execute(stmt.where(PortfolioExposure.user_id.in_(chunk))))
+    return [_exposure_dict(r.user_id, r.limit, r.used, r.repaid, r.bucket) for r in rows]
+
+
+def _totals_dict(limit_cents, used_cents, repaid_cents, violations):
+    return {
+        "credit_limit": str(from_cents(limit_cents)),
+        "outstanding_principal": str(from_cents(used_cents)),
+        "repaid": str(from_cents(repaid_cents)),
+        "utilization": _utilization(limit_cents, used_cents),
+        "violations": violations,
+    }
+
+
+def _portfolio_totals(now=None):
+    bucket = delinquency_bucket_expr(now).label("bucket")
+    stmt = select(
+        bucket,
+        func.count().label("borrowers"),
+        func.coalesce(func.sum(cents(PortfolioExposure.credit_limit)), 0).label("limit"),
+        func.coalesce(func.sum(cents(PortfolioExposure.balance_used)), 0).label("used"),
+        func.coalesce(func.sum(cents(PortfolioExposure.repaid)), 0).label("repaid"),
+        func.coalesce(func.sum(case((_violation_expr(), 1), else_=0)), 0).label("violations"),
+    ).group_by(bucket)
+    return {row.bucket: row for row in db.session.execute(stmt)}
+
+
+def portfolio_summary(now=None):
+    """Portfolio totals, utilization and delinquency buckets in one GROUP BY."""
+    by_bucket = _portfolio_totals(now)
+    rows = by_bucket.values()
+    return {
+        "borrowers": sum(r.borrowers for r in rows),
+        **_totals_dict(
+            sum(int(r.limit) for r in rows),
+            sum(int(r.used) for r in rows),
+            sum(int(r.repaid) for r in rows),
+            sum(int(r.violations) for r in rows),
+        ),
+        "delinquency": {
+            name: {
+                "borrowers": by_bucket[name].borrowers if name in by_bucket else 0,
+                "outstanding_principal": str(
+                    from_cents(int(by_bucket[name].used) if name in by_bucket else 0)
+                ),
+            }
+            for name in DELINQUENCY_BUCKETS
+        },
+    }
+
+
+def credit_violations(user_ids=None):
+    """Borrowers over the exposure threshold, as a set of user ids."""
+    stmt = select(PortfolioExposure.user_id).where(_violation_expr())
+    if user_ids is None:
+        return set(db.session.scalars(stmt))
+    violating = set()
+    for chunk in _chunks(user_ids):
+        violating.update(db.session.scalars(stmt.where(PortfolioExposure.user_id.in_(chunk))))
+    return violating
+
+
+# -----------------------------------------------------------------------------
+# What-if
+# -----------------------------------------------------------------------------
+def what_if(adjustments, now=None):
+    """
+    Re-evaluate borrowers under hypothetical changes, without writing.
+
+    ``adjustments`` maps user id -> {"credit_limit": delta, "balance_used":
+    delta, "payment": amount}; amounts are currency units and any key may be
+    omitted. Borrowers without exposure start from zero.
+
+    Returns {"users": [{user_id, before, after}], "portfolio": {before,
+    after}} where the portfolio side reflects every adjustment at once.
+    """
+    current = {}
+    for chunk in _chunks(adjustments):
+        for row in db.session.execute(
+            _exposure_stmt(now).where(PortfolioExposure.user_id.in_(chunk))
+        ):
+            current[row.user_id] = row
+
+    users, delta_limit, delta_used, delta_repaid = [], 0, 0, 0
+    for user_id, change in adjustments.items():
+        row = current.get(user_id)
+        limit, used, repaid = (int(row.limit), int(row.used), int(row.repaid)) if row else (0, 0, 0)
+        bucket = row.bucket if row else "current"
+        d_limit = to_cents(change.get("credit_limit", 0))
+        d_used = to_cents(change.get("balance_used", 0))
+        d_repaid = to_cents(change.get("payment", 0))
+        delta_limit += d_limit
+        delta_used += d_used
+        delta_repaid += d_repaid
+        users.append(
+            {
+                "user_id": user_id,
+                "before": _exposure_dict(user_id, limit, used, repaid, bucket),
+                "after": _exposure_dict(
+                    user_id, limit + d_limit, max(0, used + d_used), repaid + d_repaid
+                ),
+            }
+        )
+
+    totals = _portfolio_totals(now).values()
+    limit = sum(int(r.limit) for r in totals)
+    used = sum(int(r.used) for r in totals)
+    repaid = sum(int(r.repaid) for r in totals)
+    violations = sum(int(r.violations) for r in totals)
+    violations_after = (
+        violations
+        - sum(u["before"]["violation"] for u in users)
+        + sum(u["after"]["violation"] for u in users)
+    )
+    return {
+        "users": users,
+        "portfolio": {
+            "before": _totals_dict(limit, used, repaid, violations),
+            "after": _totals_dict(
+                limit + delta_limit,
+                max(0, used + delta_used),
+                repaid + delta_repaid,
+                violations_after,
+            ),
+        },
+    }
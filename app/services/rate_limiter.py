@@ -2,15 +2,20 @@
 # FILE: app/services/rate_limiter.py
 # DESCRIPTION: Redis-backed rate limiting service for login, MFA, and other
 #              sensitive endpoints. Provides cockpit-grade protection against
-#              brute force and abuse.
+#              brute force and abuse. While the Redis circuit breaker is
+#              open, counters fall back to a process-local store.
 # =============================================================================
 
 import logging
 
-from app.utils.redis_utils import get_redis_client
+from app.utils.local_store import LocalTTLStore
+from app.utils.redis_utils import get_redis_client, is_redis_degraded
 
 logger = logging.getLogger(__name__)
 
+# Degraded-mode counters (per process) used while Redis is unreachable
+_local_counters = LocalTTLStore()
+
 
 # -----------------------------------------------------------------------------
 # Key Construction
@@ -39,12 +44,14 @@ def is_rate_limited(identifier: str, action: str, limit: int, period: int) -> bo
     Returns:
         bool: True if rate limited, False otherwise
     """
+    key = _make_key(identifier, action)
     client = get_redis_client()
     if not client:
+        if is_redis_degraded():
+            return (_local_counters.get(key) or 0) >= limit
         logger.warning("Redis unavailable — skipping rate limit check (fail-open).")
         return False
 
-    key = _make_key(identifier, action)
     try:
         count = client.get(key)
         if count is None:
@@ -57,7 +64,7 @@ def is_rate_limited(identifier: str, action: str, limit: int, period: int) -> bo
             return False
     except Exception as e:
         logger.error(f"Rate limit check failed for {key}: {e}", exc_info=True)
-        return False
+        return (_local_counters.get(key) or 0) >= limit
 
 
 # -----------------------------------------------------------------------------
@@ -80,12 +87,15 @@ def apply_rate_limit(
         limit (int): Max allowed attempts
         period (int): Time window in seconds
     """
+    key = _make_key(identifier, action)
     client = get_redis_client()
     if not client:
+        if is_redis_degraded():
+            _local_counters.incr(key, period)
+            return
         logger.warning("Redis unavailable — skipping rate limit increment (fail-open).")
         return
 
-    key = _make_key(identifier, action)
     try:
         # Use pipeline for atomic increment + expiry
         pipe = client.pipeline()
@@ -104,3 +114,4 @@ def apply_rate_limit(
             )
     except Exception as e:
         logger.error(f"Failed to apply rate limit for {key}: {e}", exc_info=True)
+        _local_counters.incr(key, period)
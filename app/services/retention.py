@@ -0,0 +1,573 @@
+# =============================================================================
+# FILE: app/services/retention.py
+# DESCRIPTION: Retention and archival for the append-only audit and trace
+#              tables (audit_logs, trace_events, schema_event, dispute_log).
+#
+#              Rows older than the table's retention age are moved out of the
+#              hot table in bounded chunks, oldest first. Each chunk is a
+#              short transaction: a key-only range scan on the time index,
+#              then INSERT ... SELECT into <table>_archive (or a zstd Parquet
+#              file under RETENTION_ARCHIVE_ROOT) and a DELETE by primary key.
+#              Locks are held for one chunk at a time, never for a whole run.
+#
+#              On MySQL, archive tables are range-partitioned by month when
+#              the server supports it. Partitions are added ahead of the rows
+#              being archived, and purging old archive months drops whole
+#              partitions instead of deleting rows.
+#
+#              history() pages through hot and archived rows as one ordered
+#              stream, so audits do not need to know where a row lives.
+# =============================================================================
+
+from __future__ import annotations
+
+import heapq
+import os
+import time
+import uuid
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from importlib import import_module
+from pathlib import Path
+from typing import Any
+
+from flask import current_app
+from sqlalchemy import JSON, DateTime, and_, delete, func, insert, literal, or_, select, text
+
+from app.extensions import db
+from app.models.archive import ARCHIVE_TABLES, ARCHIVE_TIME_COLUMNS
+from app.services import columnar_export
+from app.utils import json_codec
+from app.utils.pagination import (
+    DEFAULT_LIMIT,
+    KeysetPage,
+    decode_cursor,
+    encode_cursor,
+    keyset_predicate,
+)
+
+try:  # pragma: no cover - depends on the environment
+    import pyarrow.parquet as pq
+except Exception:  # pragma: no cover
+    pq = None
+
+CHUNK_ROWS = 2_000
+# Parquet archives are written sorted by (time, id) in row groups of at most
+# this many rows; history() reads only the row groups a page can draw from.
+PARQUET_ROW_GROUP_ROWS = 10_000
+TARGETS = ("table", "parquet")
+MAX_PARTITION = "pmax"
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    """One hot table, its default retention age and where its rows age out from."""
+
+    name: str
+    model_path: str  # "module:Class", imported lazily
+    max_age_days: int  # overridden per table by RETENTION_DAYS
+
+    @property
+    def table(self):
+        module, _, cls = self.model_path.partition(":")
+        return getattr(import_module(module), cls).__table__
+
+    @property
+    def archive(self):
+        return ARCHIVE_TABLES[self.name]
+
+    @property
+    def time_col(self) -> str:
+        return ARCHIVE_TIME_COLUMNS[self.name]
+
+    @property
+    def dataset(self) -> columnar_export.Dataset:
+        return columnar_export.Dataset(
+            self.name, self.model_path, self.time_col, "user_id", ("id", "id")
+        )
+
+
+POLICIES = {
+    p.name: p
+    for p in (
+        RetentionPolicy("audit_logs", "app.models.audit_log:AuditLog", 365),
+        RetentionPolicy("trace_events", "app.models.trace_events:TraceEvent", 90),
+        RetentionPolicy("schema_event", "app.models.schema_event:SchemaEvent", 180),
+        RetentionPolicy("dispute_log", "app.models.dispute_log:DisputeLog", 730),
+    )
+}
+
+
+def max_age_days(policy: RetentionPolicy) -> int:
+    overrides = current_app.config.get("RETENTION_DAYS") or {}
+    return int(overrides.get(policy.name, policy.max_age_days))
+
+
+def archive_root() -> Path:
+    return Path(
+        current_app.config.get("RETENTION_ARCHIVE_ROOT")
+        or os.path.join(current_app.instance_path, "archive")
+    )
+
+
+# -----------------------------------------------------------------------------
+# MySQL range partitioning of the archive tables (one partition per month)
+# -----------------------------------------------------------------------------
+def _month(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def _next_month(month: date) -> date:
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"p{month:%Y%m}"
+
+
+def _months(first: date, last: date) -> list[date]:
+    months, month = [], _month(first)
+    while month <= last:
+        months.append(month)
+        month = _next_month(month)
+    return months
+
+
+def partition_definitions(months: Iterable[date]) -> str:
+    """Monthly RANGE COLUMNS partitions followed by the catch-all pmax."""
+    parts = [
+        f"PARTITION {partition_name(m)} VALUES LESS THAN ('{_next_month(m).isoformat()}')"
+        for m in months
+    ]
+    parts.append(f"PARTITION {MAX_PARTITION} VALUES LESS THAN (MAXVALUE)")
+    return "(" + ", ".join(parts) + ")"
+
+
+def partitioning_available(connection) -> bool:
+    dialect = connection.dialect
+    if dialect.name not in ("mysql", "mariadb"):
+        return False
+    if not getattr(dialect, "is_mariadb", False) and (dialect.server_version_info or (0,)) >= (8,):
+        return True  # native InnoDB partitioning
+    status = connection.execute(
+        text("SELECT PLUGIN_STATUS FROM information_schema.PLUGINS WHERE PLUGIN_NAME = 'partition'")
+    ).scalar()
+    return status == "ACTIVE"
+
+
+def archive_partitions(connection, policy: RetentionPolicy) -> list[date]:
+    """Months the archive table is partitioned into (empty when not partitioned)."""
+    if connection.dialect.name not in ("mysql", "mariadb"):
+        return []
+    names = connection.execute(
+        text(
+            "SELECT PARTITION_NAME FROM information_schema.PARTITIONS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table "
+            "AND PARTITION_NAME IS NOT NULL ORDER BY PARTITION_ORDINAL_POSITION"
+        ),
+        {"table": policy.archive.name},
+    ).scalars()
+    return [datetime.strptime(n, "p%Y%m").date() for n in names if n != MAX_PARTITION]
+
+
+def _is_partitioned(connection, policy: RetentionPolicy) -> bool:
+    if connection.dialect.name not in ("mysql", "mariadb"):
+        return False
+    return bool(
+        connection.execute(
+            text(
+                "SELECT COUNT(*) FROM information_schema.PARTITIONS "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table "
+                "AND PARTITION_NAME IS NOT NULL"
+            ),
+            {"table": policy.archive.name},
+        ).scalar()
+    )
+
+
+def partition_archive(name: str) -> bool:
+    """
+    Range-partition ``name``'s archive table by month (MySQL only, when the
+    server supports it). Existing archive rows get partitions for their months.
+    Returns whether the table is partitioned afterwards.
+    """
+    policy = POLICIES[name]
+    connection = db.session.connection()
+    if not partitioning_available(connection):
+        return False
+    if _is_partitioned(connection, policy):
+        return True
+    column = policy.archive.c[policy.time_col]
+    first, last = db.session.execute(select(func.min(column), func.max(column))).one()
+    months = _months(first.date(), last.date()) if first is not None else []
+    db.session.execute(
+        text(
+            f"ALTER TABLE {policy.archive.name} "
+            f"PARTITION BY RANGE COLUMNS({policy.time_col}) {partition_definitions(months)}"
+        )
+    )
+    return True
+
+
+def ensure_partitions(policy: RetentionPolicy, first: datetime, last: datetime) -> None:
+    """Split pmax so rows from ``first`` through ``last`` land in monthly partitions."""
+    connection = db.session.connection()
+    existing = archive_partitions(connection, policy)
+    start = _next_month(existing[-1]) if existing else _month(first)
+    months = _months(start, last.date())
+    if months:
+        db.session.execute(
+            text(
+                f"ALTER TABLE {policy.archive.name} REORGANIZE PARTITION {MAX_PARTITION} "
+                f"INTO {partition_definitions(months)}"
+            )
+        )
+
+
+# -----------------------------------------------------------------------------
+# Archiving
+# -----------------------------------------------------------------------------
+def chunk_stmt(policy: RetentionPolicy, cutoff: datetime, after=None, limit: int = CHUNK_ROWS):
+    """(time, id) keys of the next ``limit`` expired rows after ``after``, oldest first."""
+    table = policy.table
+    time_col, id_col = table.c[policy.time_col], table.c.id
+    stmt = select(time_col, id_col).where(time_col < cutoff)
+    if after is not None:
+        stmt = stmt.where(or_(time_col > after[0], and_(time_col == after[0], id_col > after[1])))
+    return stmt.order_by(time_col, id_col).limit(limit)
+
+
+def _move_to_table(policy: RetentionPolicy, ids: list, archived_at: datetime) -> None:
+    hot = policy.table
+    rows = select(*hot.columns, literal(archived_at, DateTime).label("archived_at")).where(
+        hot.c.id.in_(ids)
+    )
+    db.session.execute(
+        insert(policy.archive).from_select([*hot.columns.keys(), "archived_at"], rows)
+    )
+
+
+def _write_parquet(policy: RetentionPolicy, ids: list, path: Path) -> None:
+    dataset = policy.dataset
+    table = policy.table
+    stmt = (
+        columnar_export.dataset_statement(dataset)
+        .where(table.c.id.in_(ids))
+        .order_by(table.c[policy.time_col], table.c.id)
+    )
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Dot-prefixed until complete, so dataset readers never see a partial file
+    partial = path.with_name(f".{path.name}.tmp")
+    with pq.ParquetWriter(partial, dataset.schema(), compression="zstd") as writer:
+        for batch in columnar_export.iter_batches(stmt, dataset):
+            writer.write_batch(batch, row_group_size=PARQUET_ROW_GROUP_ROWS)
+    os.replace(partial, path)
+
+
+def archive_expired(
+    name: str,
+    *,
+    target: str | None = None,
+    now: datetime | None = None,
+    root: str | os.PathLike | None = None,
+    chunk_rows: int = CHUNK_ROWS,
+    max_chunks: int | None = None,
+    pause: float = 0.0,
+) -> dict:
+    """
+    Move rows of ``name`` older than its retention age into the archive
+    ``target`` ("table" or "parquet", default RETENTION_TARGET), ``chunk_rows``
+    at a time, committing after every chunk. ``pause`` seconds between chunks
+    give replicas room to catch up.
+    """
+    target = target or current_app.config.get("RETENTION_TARGET", "table")
+    if target not in TARGETS:
+        raise ValueError(f"target must be one of {', '.join(TARGETS)}")
+    if target == "parquet" and pq is None:
+        raise columnar_export.ArrowUnavailable("pyarrow is required for Parquet archives")
+    policy = POLICIES[name]
+    now = now or datetime.utcnow()
+    cutoff = now - timedelta(days=max_age_days(policy))
+    run = f"{now:%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:6]}"
+    directory = Path(root or archive_root()) / name
+    partitioned = target == "table" and _is_partitioned(db.session.connection(), policy)
+
+    summary = {"table": name, "target": target, "cutoff": cutoff, "rows": 0, "chunks": 0}
+    after = None
+    while max_chunks is None or summary["chunks"] < max_chunks:
+        keys = db.session.execute(chunk_stmt(policy, cutoff, after, chunk_rows)).all()
+        if not keys:
+            break
+        ids = [key[1] for key in keys]
+        try:
+            if partitioned:
+                ensure_partitions(policy, keys[0][0], keys[-1][0])
+            if target == "table":
+                _move_to_table(policy, ids, now)
+            else:
+                # A crash after the file lands but before the DELETE commits
+                # leaves rows in both places; history() keeps the hot copy.
+                _write_parquet(
+                    policy, ids, directory / f"part-{run}-{summary['chunks']:05d}.parquet"
+                )
+            db.session.execute(delete(policy.table).where(policy.table.c.id.in_(ids)))
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        summary["rows"] += len(ids)
+        summary["chunks"] += 1
+        after = tuple(keys[-1])
+        if pause:
+            time.sleep(pause)
+    return summary
+
+
+def archive_all(names: Iterable[str] | None = None, **options) -> list[dict]:
+    return [archive_expired(name, **options) for name in (names or POLICIES)]
+
+
+def purge_archive(
+    name: str, older_than_days: int, *, now: datetime | None = None, chunk_rows: int = CHUNK_ROWS
+) -> dict:
+    """
+    Permanently drop archived rows older than ``older_than_days`` from the
+    archive table: whole monthly partitions where possible, then the rest in
+    chunks.
+    """
+    policy = POLICIES[name]
+    archive = policy.archive
+    cutoff = (now or datetime.utcnow()) - timedelta(days=older_than_days)
+    connection = db.session.connection()
+    dropped = [
+        partition_name(m)
+        for m in archive_partitions(connection, policy)
+        if _next_month(m) <= cutoff.date()
+    ]
+    if dropped:
+        db.session.execute(text(f"ALTER TABLE {archive.name} DROP PARTITION {', '.join(dropped)}"))
+
+    time_col = archive.c[policy.time_col]
+    rows = 0
+    while True:
+        ids = (
+            db.session.execute(
+                select(archive.c.id).where(time_col < cutoff).order_by(time_col).limit(chunk_rows)
+            )
+            .scalars()
+            .all()
+        )
+        if not ids:
+            break
+        rows += db.session.execute(
+            delete(archive).where(archive.c.id.in_(ids), time_col < cutoff)
+        ).rowcount
+        db.session.commit()
+    return {"table": name, "cutoff": cutoff, "rows": rows, "partitions": dropped}
+
+
+def retention_status(now: datetime | None = None) -> list[dict]:
+    """Per table: retention age, rows still hot, rows past due and rows archived."""
+    now = now or datetime.utcnow()
+    connection = db.session.connection()
+    report = []
+    for policy in POLICIES.values():
+        days = max_age_days(policy)
+        hot = policy.table
+        directory = archive_root() / policy.name
+        report.append(
+            {
+                "table": policy.name,
+                "max_age_days": days,
+                "hot_rows": db.session.execute(select(func.count()).select_from(hot)).scalar(),
+                "expired_rows": db.session.execute(
+                    select(func.count()).where(hot.c[policy.time_col] < now - timedelta(days=days))
+                ).scalar(),
+                "archived_rows": db.session.execute(
+                    select(func.count()).select_from(policy.archive)
+                ).scalar(),
+                "parquet_files": (
+                    len(list(directory.glob("*.parquet"))) if directory.is_dir() else 0
+                ),
+                "partitions": len(archive_partitions(connection, policy)),
+            }
+        )
+    return report
+
+
+# -----------------------------------------------------------------------------
+# Reading across hot and archived rows
+# -----------------------------------------------------------------------------
+def _sql_rows(table, policy, start, end, filters, cursor, limit, descending, archived):
+    time_col, id_col = table.c[policy.time_col], table.c.id
+    stmt = select(*(table.c[key] for key in policy.table.columns.keys())).where(
+        time_col.isnot(None)
+    )
+    if start is not None:
+        stmt = stmt.where(time_col >= start)
+    if end is not None:
+        stmt = stmt.where(time_col <= end)
+    for key, value in filters.items():
+        stmt = stmt.where(table.c[key] == value)
+    if cursor:
+        stmt = stmt.where(keyset_predicate(time_col, id_col, cursor, descending))
+    order = (time_col.desc(), id_col.desc()) if descending else (time_col.asc(), id_col.asc())
+    rows = db.session.execute(stmt.order_by(*order).limit(limit)).mappings()
+    return [{**row, "archived": archived} for row in rows]
+
+
+def _row_groups(directory: Path, time_col: str) -> list[tuple]:
+    """(min time, max time, path, row group) for every finished archive file, from footers."""
+    groups = []
+    for path in directory.glob("*.parquet"):
+        parquet_file = pq.ParquetFile(path)
+        column = parquet_file.schema_arrow.get_field_index(time_col)
+        metadata = parquet_file.metadata
+        for index in range(metadata.num_row_groups):
+            stats = metadata.row_group(index).column(column).statistics
+            if stats is None or not stats.has_min_max:
+                continue  # only NULL timestamps: not part of the history
+            groups.append((stats.min, stats.max, path, index))
+    return groups
+
+
+def _parquet_rows(policy, root, start, end, filters, cursor, limit, descending):
+    """
+    Up to ``limit`` matching Parquet archive rows in page order. Row groups
+    are pruned by their footer time range (window and cursor) and read
+    nearest-first, stopping once no remaining group can beat the rows
+    already found, so a page reads a few row groups, not the whole archive.
+    """
+    directory = Path(root) / policy.name
+    if pq is None or not directory.is_dir():
+        return []
+    pc, field = columnar_export.pc, columnar_export.pc.field
+    time_col = policy.time_col
+    time_field, id_field = field(time_col), field("id")
+    condition = time_field.is_valid()
+    low, high = start, end
+    if start is not None:
+        condition &= time_field >= start
+    if end is not None:
+        condition &= time_field <= end
+    for key, value in filters.items():
+        condition &= field(key) == value
+    if cursor:
+        value, last_id = decode_cursor(cursor, policy.table.c[time_col])
+        if descending:
+            condition &= (time_field < value) | ((time_field == value) & (id_field < last_id))
+            high = value if high is None else min(high, value)
+        else:
+            condition &= (time_field > value) | ((time_field == value) & (id_field > last_id))
+            low = value if low is None else max(low, value)
+
+    groups = [
+        group
+        for group in _row_groups(directory, time_col)
+        if (low is None or group[1] >= low) and (high is None or group[0] <= high)
+    ]
+    # Nearest first: by the edge of each group's range that the page starts from
+    groups.sort(key=lambda group: group[1] if descending else group[0], reverse=descending)
+
+    order = "descending" if descending else "ascending"
+    sort_keys = [(time_col, order), ("id", order)]
+    found = None
+    for group_min, group_max, path, index in groups:
+        if found is not None and found.num_rows >= limit:
+            # Rows are ordered by time first: a group entirely past the
+            # limit-th row found so far cannot contribute to this page
+            edge = found.column(time_col)[limit - 1].as_py()
+            if (group_max < edge) if descending else (group_min > edge):
+                break
+        table = pq.ParquetFile(path).read_row_group(index).filter(condition)
+        if table.num_rows:
+            found = table if found is None else columnar_export.pa.concat_tables([found, table])
+            found = found.take(pc.sort_indices(found, sort_keys)).slice(0, limit)
+    if found is None:
+        return []
+
+    json_columns = [c.name for c in policy.table.columns if isinstance(c.type, JSON)]
+    rows = found.to_pylist()
+    for row in rows:
+        for key in json_columns:
+            if row[key] is not None:
+                row[key] = json_codec.loads(row[key])
+        row["archived"] = True
+    return rows
+
+
+def history(
+    name: str,
+    *,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    filters: Mapping[str, Any] | None = None,
+    cursor: str | None = None,
+    limit: int = DEFAULT_LIMIT,
+    descending: bool = True,
+    root: str | os.PathLike | None = None,
+) -> KeysetPage:
+    """
+    One keyset page of ``name``'s rows, hot and archived alike, ordered by
+    (time column, id). ``filters`` are column == value conditions. Each row
+    is a dict with an extra ``archived`` flag; follow ``next_cursor`` for
+    the next page.
+
+    Every source (hot table, archive table, Parquet archive) is read with
+    the same predicate and limit and the results are merged, so each page
+    costs a few index range scans (and, for Parquet, footer reads plus the
+    row groups that overlap the page) no matter how much has been archived.
+    Rows without a timestamp are not part of the history.
+    """
+    policy = POLICIES[name]
+    filters = dict(filters or {})
+    unknown = set(filters) - set(policy.table.columns.keys())
+    if unknown:
+        raise ValueError(f"unknown column(s): {', '.join(sorted(unknown))}")
+
+    args = (start, end, filters, cursor, limit + 1, descending)
+    sources = [
+        _sql_rows(policy.table, policy, *args, archived=False),
+        _sql_rows(policy.archive, policy, *args, archived=True),
+        _parquet_rows(policy, root or archive_root(), *args),
+    ]
+
+    def sort_key(row):
+        return row[policy.time_col], row["id"]
+
+    items, last_key = [], None
+    # Stable merge: on a duplicate key (see archive_expired) the hot row wins
+    for row in heapq.merge(*sources, key=sort_key, reverse=descending):
+        if sort_key(row) == last_key:
+            continue
+        last_key = sort_key(row)
+        items.append(row)
+        if len(items) > limit:
+            break
+
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = encode_cursor(*sort_key(items[-1]))
+    return KeysetPage(items=items, next_cursor=next_cursor)
+
+
+__all__ = [
+    "CHUNK_ROWS",
+    "POLICIES",
+    "RetentionPolicy",
+    "TARGETS",
+    "archive_all",
+    "archive_expired",
+    "archive_partitions",
+    "chunk_stmt",
+    "ensure_partitions",
+    "history",
+    "max_age_days",
+    "partition_archive",
+    "partition_definitions",
+    "partitioning_available",
+    "purge_archive",
+    "retention_status",
+]
@@ -0,0 +1,280 @@
+# =============================================================================
+# FILE: app/services/streaming_export.py
+# DESCRIPTION: Streaming exports of transactions and ledger entries.
+#              Rows are read through a server-side cursor (yield_per, which
+#              also sets stream_results) as plain Core rows, so neither the
+#              result set nor an identity map is held in memory, and are
+#              serialized as NDJSON or CSV into a chunked response.
+#
+#              Exports are resumable: rows come out in ascending
+#              (sort column, id) order, and a request with ?limit=N is cut at
+#              a key boundary found up front with a key-only query. The
+#              cursor for the next window goes out in the X-Export-Next-Cursor
+#              header (absent once the export is complete) and is passed back
+#              as ?cursor= to continue.
+# =============================================================================
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator, Mapping
+from dataclasses import dataclass
+from datetime import datetime, time
+from decimal import Decimal, InvalidOperation
+from typing import Any
+
+from flask import Response, stream_with_context
+from sqlalchemy import JSON, Text, and_, or_, select, type_coerce
+
+from app.extensions import db
+from app.models.ledger import LedgerEntry
+from app.models.transactions import Transaction
+from app.utils.export import iter_csv, iter_ndjson
+from app.utils.pagination import encode_cursor, keyset_predicate
+
+YIELD_PER = 1_000
+MAX_EXPORT_LIMIT = 1_000_000
+NEXT_CURSOR_HEADER = "X-Export-Next-Cursor"
+MIMETYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+@dataclass
+class ExportParams:
+    format: str = "ndjson"
+    start: datetime | None = None
+    end: datetime | None = None
+    cursor: str | None = None
+    limit: int | None = None
+    min_amount: Decimal | None = None
+    max_amount: Decimal | None = None
+    category: str | None = None
+    pending: bool | None = None
+
+
+def _parse_when(raw: str, name: str, end_of_day: bool = False) -> datetime:
+    try:
+        value = datetime.fromisoformat(raw)
+    except ValueError:
+        raise ValueError(f"{name} must be an ISO-8601 date or datetime") from None
+    if end_of_day and len(raw) == 10:  # a bare date includes that whole day
+        value = datetime.combine(value.date(), time.max)
+    return value
+
+
+def _parse_amount(raw: str, name: str) -> Decimal:
+    try:
+        return Decimal(raw)
+    except InvalidOperation:
+        raise ValueError(f"{name} must be a number") from None
+
+
+def parse_export_args(args: Mapping[str, str], formats=MIMETYPES) -> ExportParams:
+    """Read ?format=&start=&end=&cursor=&limit=&min_amount=&max_amount=&category=&pending=."""
+    params = ExportParams(
+        format=args.get("format", next(iter(formats))),
+        cursor=args.get("cursor") or None,
+        category=args.get("category") or None,
+    )
+    if params.format not in formats:
+        raise ValueError(f"format must be one of {', '.join(formats)}")
+    if args.get("start"):
+        params.start = _parse_when(args["start"], "start")
+    if args.get("end"):
+        params.end = _parse_when(args["end"], "end", end_of_day=True)
+    if args.get("limit"):
+        try:
+            params.limit = int(args["limit"])
+        except ValueError:
+            raise ValueError("limit must be an integer") from None
+        if not 1 <= params.limit <= MAX_EXPORT_LIMIT:
+            raise ValueError(f"limit must be between 1 and {MAX_EXPORT_LIMIT}")
+    if args.get("min_amount"):
+        params.min_amount = _parse_amount(args["min_amount"], "min_amount")
+    if args.get("max_amount"):
+        params.max_amount = _parse_amount(args["max_amount"], "max_amount")
+    if args.get("pending") in ("true", "false"):
+        params.pending = args["pending"] == "true"
+    return params
+
+
+@dataclass
+class ExportSpec:
+    """What one export streams: its columns, key order and row shaping."""
+
+    name: str
+    columns: list
+    sort_col: Any
+    id_col: Any
+    to_record: Callable[[Mapping], dict]
+
+    @property
+    def fieldnames(self) -> list[str]:
+        # amount_exact is folded into amount by _exact_amount
+        return [c.key for c in self.columns if c.key != "amount_exact"]
+
+    def select(self, params: ExportParams):
+        """SELECT of the columns; CSV reads JSON columns as their stored text."""
+        if params.format != "csv":
+            return select(*self.columns)
+        return select(
+            *(
+                type_coerce(c, Text).label(c.key) if isinstance(c.type, JSON) else c
+                for c in self.columns
+            )
+        )
+
+
+def _exact_amount(row: Mapping) -> dict:
+    record = dict(row)
+    # Exact cents win; rows written before the cents column fall back to the float
+    exact = record.pop("amount_exact")
+    if exact is not None:
+        record["amount"] = exact
+    return record
+
+
+TRANSACTIONS = ExportSpec(
+    name="transactions",
+    columns=[
+        Transaction.id,
+        Transaction.user_id,
+        Transaction.account_id,
+        Transaction.date,
+        Transaction.amount,
+        Transaction.amount_exact,
+        Transaction.currency,
+        Transaction.name,
+        Transaction.category,
+        Transaction.is_pending,
+        Transaction.mcc,
+        Transaction.fraud_score,
+        Transaction.cluster,
+        Transaction.category_hierarchy,
+        Transaction.location,
+        Transaction.payment_meta,
+    ],
+    sort_col=Transaction.date,
+    id_col=Transaction.id,
+    to_record=_exact_amount,
+)
+
+# Ledger entries are append-only, so id order is received order and the
+# primary key alone is the resume key.
+LEDGER = ExportSpec(
+    name="ledger",
+    columns=[
+        LedgerEntry.id,
+        LedgerEntry.borrower_id,
+        LedgerEntry.card_id,
+        LedgerEntry.received_at,
+        LedgerEntry.amount,
+        LedgerEntry.amount_exact,
+        LedgerEntry.method,
+        LedgerEntry.reconciled,
+    ],
+    sort_col=LedgerEntry.id,
+    id_col=LedgerEntry.id,
+    to_record=_exact_amount,
+)
+
+
+def transactions_statement(user_id: str | None, params: ExportParams):
+    stmt = TRANSACTIONS.select(params)
+    if user_id:
+        stmt = stmt.where(Transaction.user_id == user_id)
+    if params.start:
+        stmt = stmt.where(Transaction.date >= params.start)
+    if params.end:
+        stmt = stmt.where(Transaction.date <= params.end)
+    if params.category:
+        stmt = stmt.where(Transaction.category == params.category)
+    if params.pending is not None:
+        stmt = stmt.where(Transaction.is_pending == params.pending)
+    if params.min_amount is not None:
+        stmt = stmt.where(Transaction.amount >= float(params.min_amount))
+    if params.max_amount is not None:
+        stmt = stmt.where(Transaction.amount <= float(params.max_amount))
+    return stmt
+
+
+def ledger_statement(borrower_id: str | None, params: ExportParams):
+    stmt = LEDGER.select(params)
+    if borrower_id:
+        stmt = stmt.where(LedgerEntry.borrower_id == borrower_id)
+    if params.start:
+        stmt = stmt.where(LedgerEntry.received_at >= params.start)
+    if params.end:
+        stmt = stmt.where(LedgerEntry.received_at <= params.end)
+    if params.min_amount is not None:
+        stmt = stmt.where(LedgerEntry.amount >= float(params.min_amount))
+    if params.max_amount is not None:
+        stmt = stmt.where(LedgerEntry.amount <= float(params.max_amount))
+    return stmt
+
+
+def export_window(stmt, sort_col, id_col, params: ExportParams) -> tuple[Any, str | None]:
+    """
+    Order ``stmt`` by (sort_col, id_col), start it after ``params.cursor``
+    and, with a limit, end it at the limit-th key. Returns (statement, next cursor).
+    """
+    if params.cursor:
+        stmt = stmt.where(keyset_predicate(sort_col, id_col, params.cursor, descending=False))
+    if sort_col is id_col:
+        stmt = stmt.order_by(id_col.asc())
+    else:
+        stmt = stmt.order_by(sort_col.asc(), id_col.asc())
+    if not params.limit:
+        return stmt, None
+
+    keys = stmt.with_only_columns(sort_col, id_col).offset(params.limit - 1).limit(2)
+    edge = db.session.execute(keys).all()
+    if len(edge) < 2:
+        return stmt, None
+    value, last_id = edge[0]
+    # Bound by key rather than LIMIT: rows inserted meanwhile inside the window
+    # are exported now instead of being skipped by the next cursor.
+    stmt = stmt.where(or_(sort_col < value, and_(sort_col == value, id_col <= last_id)))
+    return stmt, encode_cursor(value, last_id)
+
+
+def iter_records(stmt, spec: ExportSpec) -> Iterator[dict]:
+    """Rows of ``stmt`` as dicts, fetched YIELD_PER at a time from a server-side cursor."""
+    result = db.session.execute(stmt.execution_options(yield_per=YIELD_PER))
+    try:
+        for row in result.mappings():
+            yield spec.to_record(row)
+    finally:
+        result.close()
+
+
+def export_response(stmt, spec: ExportSpec, params: ExportParams) -> Response:
+    """Chunked NDJSON/CSV response streaming one export window of ``stmt``."""
+    stmt, next_cursor = export_window(stmt, spec.sort_col, spec.id_col, params)
+    records = iter_records(stmt, spec)
+    if params.format == "csv":
+        body = iter_csv(records, spec.fieldnames)
+    else:
+        body = iter_ndjson(records)
+
+    headers = {
+        "Content-Disposition": f"attachment;filename={spec.name}.{params.format}",
+        "X-Accel-Buffering": "no",  # let reverse proxies pass chunks through
+        "Access-Control-Expose-Headers": NEXT_CURSOR_HEADER,
+    }
+    if next_cursor:
+        headers[NEXT_CURSOR_HEADER] = next_cursor
+    return Response(stream_with_context(body), mimetype=MIMETYPES[params.format], headers=headers)
+
+
+__all__ = [
+    "LEDGER",
+    "NEXT_CURSOR_HEADER",
+    "TRANSACTIONS",
+    "ExportParams",
+    "ExportSpec",
+    "export_response",
+    "export_window",
+    "iter_records",
+    "ledger_statement",
+    "parse_export_args",
+    "transactions_statement",
+]
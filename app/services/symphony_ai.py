@@ -13,6 +13,7 @@ from pathlib import Path
 from flask import current_app
 
 from app.models import User
+from app.utils.ai_risk_log import record_ai_risk_log
 from app.utils.redis_utils import get_redis_client
 
 ROLE_WEIGHTS = {
@@ -22,9 +23,6 @@ ROLE_WEIGHTS = {
     "admin": 1.0,
 }
 
-# Initialize global Redis client
-redis_client = get_redis_client()
-
 # 🧠 Grant Decision Subroutines
 
 
@@ -34,6 +32,10 @@ def extract_org_id(instruction):
 
 
 def simulate_grant_approval_risk(redis_keys):
+    # Resolved per call so importing this module never touches Redis
+    redis_client = get_redis_client()
+    if redis_client is None:
+        return 0
     score = 100
     for key in redis_keys:
         value = redis_client.get(key)
@@ -114,23 +116,22 @@ class SymphonyAI:
         for t in threads:
             t.join()
 
-        # 🧾 Log orchestration to Redis
-        log_key = f"grants_composed:{datetime.utcnow().timestamp()}"
+        # 🧾 Log orchestration to Redis (time-ordered index, see ai_risk_log)
+        now = datetime.utcnow()
+        log_key = f"grants_composed:{now.timestamp()}"
         client = getattr(current_app, "redis_client", None) or get_redis_client()
 
         if client:
             try:
-                client.setex(
-                    log_key,
-                    86400 * 30,
-                    json.dumps(
-                        {
-                            "instruction": instruction,
-                            "results": self.results,
-                            "timestamp": datetime.utcnow().isoformat(),
-                            "user_role": role or "anonymous",
-                        }
-                    ),
+                record_ai_risk_log(
+                    client,
+                    {
+                        "instruction": instruction,
+                        "results": self.results,
+                        "timestamp": now.isoformat(),
+                        "user_role": role or "anonymous",
+                    },
+                    ts=now.timestamp(),
                 )
             except Exception as log_error:
                 current_app.logger.error(
@@ -3,17 +3,26 @@
 from collections import defaultdict
 from datetime import datetime, timedelta
 
+from app.utils.money import cents_array, from_cents, to_cents
+
+
+def _txn_cents(txn) -> int:
+    """Exact cents for a transaction, preferring the integer-cents column."""
+    exact = getattr(txn, "amount_exact", None)
+    return to_cents(exact if exact is not None else txn.amount)
+
 
 def compute_vault_summary(vault_txns):
-    total = sum(t.amount for t in vault_txns)
-    deposits = sum(t.amount for t in vault_txns if t.amount > 0)
-    withdrawals = sum(abs(t.amount) for t in vault_txns if t.amount < 0)
+    # Integer cents summed as an int64 array: exact, and no per-row Decimal math
+    amounts = cents_array(_txn_cents(t) for t in vault_txns)
+    deposits = int(amounts[amounts > 0].sum())
+    withdrawals = -int(amounts[amounts < 0].sum())
 
     return {
-        "total_balance": total,
-        "total_deposits": deposits,
-        "total_withdrawals": withdrawals,
-        "txn_count": len(vault_txns),
+        "total_balance": float(from_cents(int(amounts.sum()))),
+        "total_deposits": float(from_cents(deposits)),
+        "total_withdrawals": float(from_cents(withdrawals)),
+        "txn_count": len(amounts),
     }
 
 
@@ -6,13 +6,14 @@
 
 import datetime
 import functools
-import json
 import logging
 import threading
 from collections.abc import Callable
 from time import sleep
 from typing import Any
 
+from app.utils import json_codec
+
 logger = logging.getLogger(__name__)
 
 # --- In-Memory Store & Locks ---
@@ -59,9 +60,9 @@ def _attempt_flush_queue(client: Any) -> int:
                     if meta:
                         payload.update(meta)
                     if hasattr(pipe, "setex"):
-                        pipe.setex(key, ttl_s, json.dumps(payload))
+                        pipe.setex(key, ttl_s, json_codec.dumps(payload))
                     else:
-                        pipe.set(key, json.dumps(payload), ex=int(ttl_s))
+                        pipe.set(key, json_codec.dumps(payload), ex=int(ttl_s))
 
                 for attempt in range(1, 3):
                     try:
@@ -91,12 +92,12 @@ def _attempt_flush_queue(client: Any) -> int:
                     if meta:
                         payload.update(meta)
                     if hasattr(client, "setex"):
-                        client.setex(key, ttl_s, json.dumps(payload))
+                        client.setex(key, ttl_s, json_codec.dumps(payload))
                     elif hasattr(client, "set"):
                         try:
-                            client.set(key, json.dumps(payload), ex=int(ttl_s))
+                            client.set(key, json_codec.dumps(payload), ex=int(ttl_s))
                         except TypeError:
-                            client.set(key, json.dumps(payload), int(ttl_s))
+                            client.set(key, json_codec.dumps(payload), int(ttl_s))
 
                 _emit_queue.clear()
                 logger.info("🟢 Flushed %d queued TTL emits (serial fallback).", count)
@@ -146,8 +147,14 @@ def ttl_emit(
     r: Any | None = None,
     ttl: int = 60,
     meta: dict[str, Any] | None = None,
+    defer: bool = False,
 ) -> None:
-    """Emit a TTL-backed trace to Redis + in-memory store."""
+    """
+    Emit a TTL-backed trace to Redis + in-memory store.
+
+    With ``defer=True`` no client is resolved: the emit is recorded in memory
+    and queued for the next flush (used from inside the Redis client itself).
+    """
     global _in_progress, _warned_no_redis
 
     if _in_progress:
@@ -166,7 +173,7 @@ def ttl_emit(
                 "meta": meta,
             }
 
-        resolved = _resolve_client(client, r)
+        resolved = None if defer else _resolve_client(client, r)
         if resolved is None:
             if not _warned_no_redis:
                 logger.warning("TTL emit queued: no Redis available")
@@ -190,24 +197,24 @@ def ttl_emit(
 
         try:
             if hasattr(resolved, "setex"):
-                resolved.setex(key, ttl, json.dumps(payload))
+                resolved.setex(key, ttl, json_codec.dumps(payload))
                 return
 
             if hasattr(resolved, "set"):
                 try:
-                    resolved.set(key, json.dumps(payload), ex=int(ttl))
+                    resolved.set(key, json_codec.dumps(payload), ex=int(ttl))
                     return
                 except TypeError:
-                    resolved.set(key, json.dumps(payload), int(ttl))
+                    resolved.set(key, json_codec.dumps(payload), int(ttl))
                     return
 
             if hasattr(resolved, "pipeline") and callable(resolved.pipeline):
                 try:
                     pipe = resolved.pipeline()
                     if hasattr(pipe, "setex"):
-                        pipe.setex(key, ttl, json.dumps(payload))
+                        pipe.setex(key, ttl, json_codec.dumps(payload))
                     else:
-                        pipe.set(key, json.dumps(payload), ex=int(ttl))
+                        pipe.set(key, json_codec.dumps(payload), ex=int(ttl))
                     pipe.execute()
                     return
                 except Exception:
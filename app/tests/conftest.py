@@ -1,7 +1,12 @@
 # /home/srpihhllc/PlaidBridgeOpenBankingApi/app/tests/conftest.py
 
+from contextlib import contextmanager
+
 import pytest
+from flask import Flask
+from sqlalchemy import event
 
+from app import models  # noqa: F401 - register every table on db.metadata
 from app import create_app
 from app.extensions import db
 
@@ -54,4 +59,37 @@ def client(app):
         db.create_all()
         yield app.test_client()
         db.session.remove()
-        db.drop_all()
\ No newline at end of file
+        db.drop_all()
+
+
+@pytest.fixture
+def sqlite_app():
+    """Bare Flask app on in-memory SQLite with every model table, inside an app context."""
+    flask_app = Flask(__name__)
+    flask_app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite://"
+    db.init_app(flask_app)
+    with flask_app.app_context():
+        db.create_all()
+        yield flask_app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def count_statements():
+    """``with count_statements() as stmts:`` collects the SQL sent to db.engine."""
+
+    @contextmanager
+    def counting():
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(db.engine, "before_cursor_execute", record)
+        try:
+            yield statements
+        finally:
+            event.remove(db.engine, "before_cursor_execute", record)
+
+    return counting
@@ -0,0 +1,60 @@
+# =============================================================================
+# FILE: app/tests/test_benchmark_compare.py
+# DESCRIPTION: Regression verdicts of `python -m benchmarks.compare`: time
+#              threshold with a noise floor, SQL statement growth, and cases
+#              that start or stop failing.
+# =============================================================================
+
+import json
+
+from benchmarks import compare
+
+
+def _run(**results):
+    return {"benchmark": "suite", "meta": {"commit": None}, "results": results}
+
+
+def _case(median, queries=1, low=None):
+    return {"median_ms": median, "min_ms": low if low is not None else median, "queries": queries}
+
+
+def test_verdicts():
+    base = _run(
+        slow=_case(100),
+        noisy=_case(0.2),
+        fast=_case(100),
+        chatty=_case(10, queries=1),
+        broken=_case(5),
+        fixed={"error": "KeyError: 'x'"},
+        gone=_case(1),
+    )
+    head = _run(
+        slow=_case(130),
+        noisy=_case(0.9),
+        fast=_case(50),
+        chatty=_case(10, queries=40),
+        broken={"error": "TypeError: boom"},
+        fixed=_case(4),
+        new=_case(1),
+    )
+    verdicts = {r["case"]: r["verdict"] for r in compare.compare(base, head, threshold=20)}
+    assert verdicts == {
+        "slow": "REGRESSION",
+        "noisy": "ok",  # +350% but under the 1 ms noise floor
+        "fast": "improved",
+        "chatty": "REGRESSION",
+        "broken": "REGRESSION",
+        "fixed": "fixed",
+        "gone": "removed",
+        "new": "added",
+    }
+
+
+def test_main_exit_code_and_stat(tmp_path, capsys):
+    base, head = tmp_path / "base.json", tmp_path / "head.json"
+    base.write_text(json.dumps(_run(view=_case(100, low=90))))
+    head.write_text(json.dumps(_run(view=_case(150, low=95))))
+
+    assert compare.main([str(base), str(head)]) == 1
+    assert "1 regression(s) in 1 cases" in capsys.readouterr().out
+    assert compare.main([str(base), str(head), "--stat", "min"]) == 0
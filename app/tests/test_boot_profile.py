@@ -0,0 +1,123 @@
+# =============================================================================
+# FILE: app/tests/test_boot_profile.py
+# DESCRIPTION: Startup-time guards: no network/DB work at import, factory step
+#              timings recorded, boot-profile CLI, and an opt-in cold-start budget.
+# =============================================================================
+
+import importlib
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from app.utils.boot_profile import BootProfile, app_module_timings, parse_importtime
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+# Whole create_app() call in a fresh interpreter. It measures ~1.2 s on a
+# single-core dev container, but wall-clock time is too noisy on shared CI
+# runners, so the budget check only runs when BOOT_TIME_BUDGET_MS is set.
+BOOT_BUDGET_MS = os.getenv("BOOT_TIME_BUDGET_MS")
+
+LAZY_MODULES = [
+    "app.services.plaid_api",
+    "app.services.symphony_ai",
+    "app.utils.log_parser",
+    "app.agents.tracer",
+    "app.compliance",
+    "app.cockpit.api.login_trace",
+]
+
+
+@pytest.mark.parametrize("module_name", LAZY_MODULES)
+def test_module_import_does_no_io(monkeypatch, module_name):
+    """Importing these modules must not build clients or query the database."""
+    import app.utils.redis_utils as redis_utils
+
+    def _forbidden(*_args, **_kwargs):
+        raise AssertionError(f"{module_name} touched Redis at import time")
+
+    monkeypatch.setattr(redis_utils, "get_redis_client", _forbidden)
+    monkeypatch.delenv("PLAID_CLIENT_ID", raising=False)
+    monkeypatch.delenv("PLAID_SECRET", raising=False)
+    monkeypatch.delitem(sys.modules, module_name, raising=False)
+
+    # Outside an app context: any query at import would raise here.
+    importlib.import_module(module_name)
+
+
+def test_plaid_client_missing_credentials_raises_on_use(monkeypatch):
+    monkeypatch.delitem(sys.modules, "app.services.plaid_api", raising=False)
+    plaid_api = importlib.import_module("app.services.plaid_api")
+    monkeypatch.setattr(plaid_api, "PLAID_CLIENT_ID", None)
+    plaid_api.get_plaid_client.cache_clear()
+    with pytest.raises(RuntimeError):
+        plaid_api.get_plaid_client()
+
+
+def test_boot_profile_records_steps():
+    profile = BootProfile()
+    with profile.step("one"):
+        pass
+    with profile.step("two"):
+        pass
+    profile.finish()
+    data = profile.as_dict()
+    assert [s["step"] for s in data["steps"]] == ["one", "two"]
+    assert data["total_ms"] >= sum(s["ms"] for s in data["steps"])
+    assert data["untimed_ms"] >= 0
+    # The clock stops at finish()
+    assert profile.as_dict()["total_ms"] == data["total_ms"]
+
+
+def test_parse_importtime_filters_app_modules():
+    stderr = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |   json\n"
+        "import time:      5000 |       9000 | app.services.plaid_api\n"
+        "import time:       300 |        300 |     app.utils.log_parser\n"
+    )
+    rows = parse_importtime(stderr)
+    assert len(rows) == 3
+    own = app_module_timings(rows)
+    assert [r.module for r in own] == ["app.services.plaid_api", "app.utils.log_parser"]
+
+
+def test_factory_exposes_step_timings(app):
+    steps = [name for name, _ms in app.boot_profile.steps]
+    for expected in ("flask", "json_provider", "template_cache", "config", "models", "cli"):
+        assert expected in steps
+    # total covers the whole factory, not just the timed steps
+    assert app.boot_profile.total_ms >= sum(ms for _name, ms in app.boot_profile.steps)
+
+
+def test_boot_profile_cli_json(app):
+    runner = app.test_cli_runner()
+    result = runner.invoke(args=["boot-profile", "--no-imports", "--as-json"])
+    assert result.exit_code == 0, result.output
+    payload = json.loads(result.output)
+    assert payload["factory"]["steps"]
+
+
+@pytest.mark.skipif(not BOOT_BUDGET_MS, reason="set BOOT_TIME_BUDGET_MS to check the boot budget")
+def test_cold_start_within_budget():
+    """Fresh interpreter: the whole create_app() call must stay under the budget."""
+    probe = (
+        "import json, time; from app import create_app; t0 = time.perf_counter(); "
+        "a = create_app(env_name='testing'); "
+        "print(json.dumps({'wall_ms': (time.perf_counter() - t0) * 1000, "
+        "'factory': a.boot_profile.as_dict()}))"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", probe],
+        cwd=str(PROJECT_ROOT),
+        capture_output=True,
+        text=True,
+        timeout=300,
+    )
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    assert result["wall_ms"] < float(BOOT_BUDGET_MS), result
@@ -0,0 +1,143 @@
+# =============================================================================
+# FILE: app/tests/test_columnar_export.py
+# DESCRIPTION: Columnar exports: partitioned Parquet layout, typed columns,
+#              incremental runs past the watermark, redo of a staged run, and
+#              the Arrow IPC endpoint.
+# =============================================================================
+
+import datetime
+import zlib
+
+import pytest
+from flask import Flask
+from flask_login import LoginManager
+
+import app.models  # noqa: F401 - register every table on db.metadata
+from app.blueprints.export_routes import export_bp
+from app.extensions import db
+from app.models.ledger import LedgerEntry
+from app.models.transactions import Transaction
+from app.models.user import User
+from app.services import columnar_export
+
+pa = pytest.importorskip("pyarrow")
+pads = pytest.importorskip("pyarrow.dataset")
+
+BASE = datetime.datetime(2025, 5, 1, 12, 0)
+
+
+@pytest.fixture
+def arrow_app():
+    flask_app = Flask(__name__)
+    flask_app.config.update(SQLALCHEMY_DATABASE_URI="sqlite://", SECRET_KEY="test")
+    db.init_app(flask_app)
+    login_manager = LoginManager(flask_app)
+    login_manager.user_loader(lambda uid: db.session.get(User, uid))
+    flask_app.register_blueprint(export_bp)
+    with flask_app.app_context():
+        db.create_all()
+        for uid, admin in (("u-a", True), ("u-b", False)):
+            db.session.add(
+                User(id=uid, email=f"{uid}@example.com", password_hash="x", is_admin=admin)
+            )
+        _add_transactions(0, 30)
+    yield flask_app
+    with flask_app.app_context():
+        db.drop_all()
+
+
+@pytest.fixture
+def in_app(arrow_app):
+    with arrow_app.app_context():
+        yield
+        db.session.remove()
+
+
+def _add_transactions(first, count):
+    for i in range(first, first + count):
+        db.session.add(
+            Transaction(
+                id=f"t-{i:04d}",
+                user_id="u-a" if i % 3 else "u-b",
+                amount=1.1 * (i + 1),
+                date=BASE + datetime.timedelta(hours=10 * i),
+                created_at=BASE + datetime.timedelta(seconds=i),
+                location={"city": "Reno"},
+            )
+        )
+    db.session.commit()
+
+
+def _read(root, name):
+    return pads.dataset(root / name, format="parquet", partitioning="hive").to_table()
+
+
+def test_partitioned_parquet_layout_and_types(in_app, tmp_path):
+    result = columnar_export.export_parquet("transactions", tmp_path, buckets=4)
+    assert result["rows"] == 30
+
+    table = _read(tmp_path, "transactions")
+    assert table.num_rows == 30
+    assert table.schema.field("amount_cents").type == pa.int64()
+    assert table.schema.field("date").type == pa.timestamp("us")
+    row = table.filter(pa.compute.equal(table["id"], "t-0002")).to_pylist()[0]
+    assert row["amount_cents"] == 330 and row["location"].replace(" ", "") == '{"city":"Reno"}'
+
+    bucket_b = zlib.crc32(b"u-b") % 4
+    path = tmp_path / "transactions" / "day=2025-05-01" / f"bucket={bucket_b}"
+    assert [p.name.startswith(f"part-{result['run']}") for p in path.iterdir()] == [True]
+    assert not (tmp_path / ".staging").exists()
+
+
+def test_incremental_runs_only_read_new_rows(in_app, tmp_path):
+    columnar_export.export_parquet("transactions", tmp_path)
+    assert columnar_export.export_parquet("transactions", tmp_path)["rows"] == 0
+
+    _add_transactions(30, 5)
+    second = columnar_export.export_parquet("transactions", tmp_path)
+    assert second["rows"] == 5
+    ids = _read(tmp_path, "transactions")["id"].to_pylist()
+    assert sorted(ids) == [f"t-{i:04d}" for i in range(35)]
+    assert columnar_export.load_state(tmp_path)["datasets"]["transactions"]["rows"] == 35
+
+    rebuilt = columnar_export.export_parquet("transactions", tmp_path, full=True)
+    assert rebuilt["rows"] == 35
+    assert _read(tmp_path, "transactions").num_rows == 35
+
+
+def test_staged_run_is_published_on_recovery(in_app, tmp_path, monkeypatch):
+    db.session.add_all(LedgerEntry(borrower_id="u-b", amount=i) for i in range(1, 4))
+    db.session.commit()
+    # Crash right after the redo log is written, before publishing
+    monkeypatch.setattr(
+        columnar_export, "_publish", lambda root, pending: (_ for _ in ()).throw(OSError)
+    )
+    with pytest.raises(OSError):
+        columnar_export.export_parquet("ledger_entries", tmp_path)
+    assert columnar_export.load_state(tmp_path)["pending"]["dataset"] == "ledger_entries"
+
+    monkeypatch.undo()
+    state = columnar_export.recover(tmp_path)
+    assert state["pending"] is None and state["datasets"]["ledger_entries"]["rows"] == 3
+    assert sorted(_read(tmp_path, "ledger_entries")["amount_cents"].to_pylist()) == [
+        100,
+        200,
+        300,
+    ]
+
+
+def test_arrow_ipc_endpoint(arrow_app):
+    client = arrow_app.test_client()
+    with client.session_transaction() as sess:
+        sess["_user_id"] = "u-a"
+    response = client.get("/export/arrow/transactions?user_id=u-b&limit=4")
+    assert response.status_code == 200
+    assert response.mimetype == columnar_export.ARROW_STREAM_MIMETYPE
+    table = pa.ipc.open_stream(response.get_data()).read_all()
+    assert table["id"].to_pylist() == ["t-0000", "t-0003", "t-0006", "t-0009"]
+    assert response.headers["X-Export-Next-Cursor"]
+
+    assert client.get("/export/arrow/nope").status_code == 404
+    with client.session_transaction() as sess:
+        sess["_user_id"] = "u-b"
+    assert client.get("/export/arrow/transactions").status_code == 403
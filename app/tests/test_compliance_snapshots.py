@@ -0,0 +1,117 @@
+# =============================================================================
+# FILE: app/tests/test_compliance_snapshots.py
+# DESCRIPTION: Batch lender compliance engine: rules evaluated with grouped
+#              SQL, snapshots persisted, incremental refresh, bounded
+#              statement count.
+# =============================================================================
+
+import datetime
+
+import pytest
+
+from app import compliance
+from app.extensions import db
+from app.models import ComplianceSnapshot, FinancialAuditLog, LoanAgreement, User
+
+T0 = datetime.datetime(2025, 5, 1)
+
+
+def _seed(lenders):
+    """lenders: {lender_id: [violation_count per agreement]}"""
+    for user_id, role in [("borrower", "borrower"), *((lid, "lender") for lid in lenders)]:
+        db.session.add(
+            User(id=user_id, email=f"{user_id}@example.com", password_hash="x", role=role)
+        )
+    for lender_id, violations in lenders.items():
+        for n, count in enumerate(violations):
+            db.session.add(
+                LoanAgreement(
+                    lender_id=lender_id,
+                    borrower_id="borrower",
+                    terms=f"terms {n}",
+                    violation_count=count,
+                    updated_at=T0,
+                )
+            )
+    db.session.commit()
+
+
+def test_rules_evaluated_and_snapshotted(sqlite_app):
+    _seed({"clean": [0, 0], "risky": [1, 0], "predatory": [2, 1, 4]})
+
+    summary = compliance.refresh_compliance_snapshots()
+    assert summary == {"evaluated": 3, "refreshed": 3, "locked": 1, "removed": 0}
+
+    snaps = {s["lender_id"]: s for s in compliance.get_compliance_snapshots()}
+    assert snaps["clean"]["status"] == "compliant"
+    assert snaps["risky"]["status"] == "at_risk"
+    assert snaps["risky"]["violations_total"] == 1
+    assert snaps["predatory"]["status"] == "locked"
+    assert snaps["predatory"]["total_agreements"] == 3
+    assert db.session.get(User, "predatory").is_locked
+    assert FinancialAuditLog.query.filter_by(action_type="ACCOUNT_LOCKED").count() == 1
+
+
+@pytest.mark.parametrize("lenders", [4, 60])
+def test_statement_count_does_not_grow_with_lenders(sqlite_app, count_statements, lenders):
+    _seed({f"lender-{n:03d}": [n % 2, 0] for n in range(lenders)})
+    with count_statements() as statements:
+        summary = compliance.refresh_compliance_snapshots()
+    assert summary["refreshed"] == lenders
+    # probe, snapshots, rollup, uncounted violations, snapshot insert, user update,
+    # audit insert, mark counted
+    assert len(statements) <= 8
+
+
+def test_refresh_is_incremental_and_idempotent(sqlite_app, count_statements):
+    _seed({"a": [0], "b": [1]})
+    compliance.refresh_compliance_snapshots()
+
+    with count_statements() as statements:
+        summary = compliance.refresh_compliance_snapshots()
+    assert summary["refreshed"] == 0
+    assert len(statements) == 2  # change probe + snapshot read, no writes
+    assert db.session.get(User, "b").violation_count == 1
+
+    agreement = LoanAgreement.query.filter_by(lender_id="a").one()
+    agreement.violation_count = 1
+    agreement.updated_at = T0 + datetime.timedelta(hours=1)
+    db.session.commit()
+
+    summary = compliance.refresh_compliance_snapshots()
+    assert summary["refreshed"] == 1
+    assert db.session.get(ComplianceSnapshot, "a").status == "at_risk"
+    assert db.session.get(User, "b").violation_count == 1  # untouched
+
+
+def test_new_violation_counts_when_another_clears(sqlite_app):
+    _seed({"swap": [1, 0]})
+    compliance.refresh_compliance_snapshots()
+    assert db.session.get(User, "swap").violation_count == 1
+
+    first, second = LoanAgreement.query.filter_by(lender_id="swap").order_by(LoanAgreement.id)
+    first.violation_count, second.violation_count = 0, 1
+    db.session.commit()
+    compliance.refresh_compliance_snapshots()
+    assert db.session.get(User, "swap").violation_count == 2
+    assert FinancialAuditLog.query.filter_by(action_type="VIOLATION_LOGGED").count() == 2
+
+    # The first agreement was struck already; violating again adds nothing
+    first.violation_count = 3
+    db.session.commit()
+    compliance.refresh_compliance_snapshots()
+    assert db.session.get(User, "swap").violation_count == 2
+    assert all(a.violation_counted for a in LoanAgreement.query.filter_by(lender_id="swap"))
+
+
+def test_check_lender_compliance_reads_snapshot(sqlite_app):
+    _seed({"solo": [1]})
+    result = compliance.check_lender_compliance("solo")
+    assert result == {
+        "lender_id": "solo",
+        "violations_total": 1,
+        "is_locked": False,
+        "total_agreements": 1,
+        "status": "at_risk",
+    }
+    assert compliance.check_lender_compliance("missing") == {"error": "Lender not found"}
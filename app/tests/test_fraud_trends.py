@@ -0,0 +1,125 @@
+# =============================================================================
+# FILE: app/tests/test_fraud_trends.py
+# DESCRIPTION: Fraud trend analysis: joined per (day, category) rollup, stored
+#              high-water mark so reruns only read new reports, legacy result
+#              shape, and a statement count that does not grow with reports.
+# =============================================================================
+
+import datetime
+
+import pytest
+
+from app import compliance_ai
+from app.extensions import db
+from app.models import FraudReport, FraudTrendBucket, FraudTrendWatermark, Transaction, User
+
+NOW = datetime.datetime(2025, 6, 30, 12, 0)
+
+
+@pytest.fixture
+def sqlite_app(sqlite_app):
+    db.session.add(User(id="u1", email="u1@example.com", password_hash="x", role="borrower"))
+    db.session.commit()
+    return sqlite_app
+
+
+def _report(n, description, age_days=0, linked=True):
+    txn_id = None
+    if linked:
+        txn_id = f"txn-{n}"
+        db.session.add(
+            Transaction(
+                id=txn_id,
+                user_id="u1",
+                amount=10.0,
+                date=NOW,
+                description=description,
+            )
+        )
+    db.session.add(
+        FraudReport(
+            id=f"report-{n:05d}",
+            user_id="u1",
+            transaction_id=txn_id,
+            created_at=NOW - datetime.timedelta(days=age_days),
+        )
+    )
+
+
+def test_categories_from_joined_transactions(sqlite_app):
+    for n in range(7):
+        _report(n, "Wire transfer out")
+    _report(7, "Coffee")
+    _report(8, None)
+    _report(9, "  ", linked=True)
+    _report(10, "", linked=False)
+    _report(11, "Wire stale", age_days=45)  # outside the 30 day window
+    db.session.commit()
+
+    result = compliance_ai.predict_fraud_trends(now=NOW)
+    assert result["status"] == "high risk"
+    assert result["high_risk_category"] == "Wire"
+    assert result["cases_analyzed"] == 11
+    assert result["categories"] == {"Wire": 7, "Coffee": 1, "Unknown": 3}
+
+    series = compliance_ai.fraud_trend_series(days=60, now=NOW)
+    assert {"day": "2025-05-16", "category": "Wire", "cases": 1} in series
+    assert sum(row["cases"] for row in series) == 12
+
+
+def test_low_and_moderate_risk(sqlite_app):
+    assert compliance_ai.predict_fraud_trends(now=NOW) == {
+        "status": "low risk",
+        "trend": "No significant fraud patterns detected",
+    }
+    _report(1, "Card present")
+    db.session.commit()
+    assert compliance_ai.predict_fraud_trends(now=NOW)["status"] == "moderate risk"
+
+
+@pytest.mark.parametrize("reports", [5, 200])
+def test_statement_count_does_not_grow_with_reports(sqlite_app, count_statements, reports):
+    for n in range(reports):
+        _report(n, f"Merchant{n % 4} purchase", age_days=n % 10)
+    db.session.commit()
+
+    with count_statements() as statements:
+        summary = compliance_ai.refresh_fraud_trends()
+    assert summary == {"processed": reports, "buckets": min(reports, 20)}
+    # watermark, top probe, rollup, watermark insert, buckets read, bucket insert
+    assert len(statements) <= 7
+
+
+def test_reruns_only_process_new_reports(sqlite_app, count_statements):
+    for n in range(3):
+        _report(n, "Atm withdrawal")
+    db.session.commit()
+    compliance_ai.refresh_fraud_trends()
+
+    with count_statements() as statements:
+        summary = compliance_ai.refresh_fraud_trends()
+    assert summary == {"processed": 0, "buckets": 0}
+    assert len(statements) == 2  # watermark read + high-water probe
+
+    _report(3, "Atm withdrawal")
+    _report(4, "Online order")
+    db.session.commit()
+    assert compliance_ai.refresh_fraud_trends() == {"processed": 2, "buckets": 2}
+
+    bucket = db.session.get(FraudTrendBucket, (NOW.date(), "Atm"))
+    assert bucket.cases == 4
+    mark = db.session.get(FraudTrendWatermark, compliance_ai.WATERMARK_SOURCE)
+    assert mark.reports_processed == 5
+    assert mark.last_created_at == NOW
+
+    assert compliance_ai.refresh_fraud_trends(rebuild=True) == {"processed": 5, "buckets": 2}
+    assert db.session.get(FraudTrendBucket, (NOW.date(), "Atm")).cases == 4
+
+
+def test_lost_watermark_race_writes_nothing(sqlite_app, monkeypatch):
+    _report(1, "Atm withdrawal")
+    db.session.commit()
+    monkeypatch.setattr(compliance_ai, "_advance_watermark", lambda *a: False)
+
+    assert compliance_ai.refresh_fraud_trends() == {"processed": 0, "buckets": 0}
+    assert FraudTrendBucket.query.count() == 0
@@ -0,0 +1,194 @@
+# =============================================================================
+# FILE: app/tests/test_http_client.py
+# DESCRIPTION: Shared outbound HTTP client against a local stub server:
+#              keep-alive reuse, retries on idempotent calls only, timeouts,
+#              per-vendor concurrency caps and latency metrics.
+# =============================================================================
+
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+from flask import Flask
+
+from app.services import fintech_api
+from app.utils import http_client
+
+
+class _Stub(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    disable_nagle_algorithm = True  # headers and body go out as separate writes
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def _reply(self, status, body=b"{}", headers=()):
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _handle(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        with self.server.lock:
+            self.server.hits[self.path] = self.server.hits.get(self.path, 0) + 1
+            hits = self.server.hits[self.path]
+            self.server.in_flight += 1
+            self.server.peak = max(self.server.peak, self.server.in_flight)
+        try:
+            if self.path == "/flaky" and hits <= 2:
+                self._reply(503)
+            elif self.path == "/throttled" and hits == 1:
+                self._reply(429, headers=[("Retry-After", "1")])
+            elif self.path == "/slow":
+                time.sleep(0.3)
+                self._reply(200)
+            else:
+                self._reply(200, body or b'{"ok": true}')
+        finally:
+            with self.server.lock:
+                self.server.in_flight -= 1
+
+    do_GET = do_POST = _handle
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Stub)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.connections, server.hits, server.in_flight, server.peak = 0, {}, 0, 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    http_client.reset_http_client()
+    yield server, f"http://127.0.0.1:{server.server_address[1]}"
+    http_client.reset_http_client()
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def http_app():
+    flask_app = Flask(__name__)
+    flask_app.config.update(
+        HTTP_BACKOFF_BASE=0.01,
+        HTTP_CONCURRENCY_WAIT=0.05,
+        HTTP_VENDORS={
+            "stub": {"read_timeout": 0.1, "retries": 2},
+            "capped": {"max_concurrency": 2},
+            "single": {"max_concurrency": 1},
+        },
+    )
+    http_client.reset_http_client()
+    with flask_app.app_context():
+        yield flask_app
+    http_client.reset_http_client()
+
+
+def test_keep_alive_reuses_one_connection(stub, http_app):
+    server, base = stub
+    for _ in range(20):
+        assert http_client.get("stub", f"{base}/ok").json() == {"ok": True}
+    assert server.connections == 1
+
+    stats = http_client.http_stats()
+    host = stats["hosts"][f"http://127.0.0.1:{server.server_address[1]}"]
+    assert (host["connections"], host["requests"]) == (1, 20)
+    vendor = stats["vendors"]["stub"]
+    assert vendor["requests"] == vendor["attempts"] == 20
+    assert vendor["statuses"] == {"2xx": 20} and vendor["latency"]["max_ms"] > 0
+
+
+def test_retries_idempotent_calls_only(stub, http_app):
+    server, base = stub
+    assert http_client.post("stub", f"{base}/flaky", json={}).status_code == 503
+    assert server.hits["/flaky"] == 1
+
+    assert http_client.get("stub", f"{base}/flaky").status_code == 200
+    assert server.hits["/flaky"] == 3
+    assert http_client.http_stats()["vendors"]["stub"]["retries"] == 1
+
+
+def test_read_timeout_is_retried_for_get_not_post(stub, http_app):
+    server, base = stub
+    with pytest.raises(requests.exceptions.ReadTimeout):
+        http_client.get("stub", f"{base}/slow")
+    assert server.hits["/slow"] == 3
+
+    with pytest.raises(requests.exceptions.ReadTimeout):
+        http_client.post("stub", f"{base}/slow")
+    assert server.hits["/slow"] == 4
+    assert http_client.http_stats()["vendors"]["stub"]["errors"] == 2
+
+
+def test_refused_connection_is_retried_even_for_post(http_app):
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    with pytest.raises(requests.exceptions.ConnectionError):
+        http_client.post("stub", f"http://127.0.0.1:{port}/gone")
+    assert http_client.http_stats()["vendors"]["stub"]["attempts"] == 3
+
+
+def test_vendor_concurrency_cap(stub, http_app):
+    server, base = stub
+    outcomes = []
+
+    def call():
+        with http_app.app_context():
+            try:
+                outcomes.append(http_client.get("capped", f"{base}/slow").status_code)
+            except http_client.VendorBusy:
+                outcomes.append("busy")
+
+    threads = [threading.Thread(target=call) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert server.peak <= 2
+    assert sorted(outcomes, key=str) == [200, 200, "busy", "busy", "busy"]
+    assert http_client.http_stats()["vendors"]["capped"]["rejected"] == 3
+
+
+def test_slot_is_released_while_backing_off(stub, http_app):
+    server, base = stub
+    statuses = []
+
+    def throttled_call():
+        with http_app.app_context():
+            statuses.append(http_client.get("single", f"{base}/throttled").status_code)
+
+    retrying = threading.Thread(target=throttled_call)
+    retrying.start()
+    deadline = time.monotonic() + 5
+    while not http_client.http_stats()["vendors"].get("single", {}).get("retries"):
+        assert time.monotonic() < deadline
+        time.sleep(0.005)
+
+    # The only slot is free during the 1 s Retry-After sleep
+    assert http_client.get("single", f"{base}/ok").status_code == 200
+    retrying.join()
+    assert statuses == [200]
+    assert server.hits["/throttled"] == 2
+    assert http_client.http_stats()["vendors"]["single"]["rejected"] == 0
+
+
+def test_vendor_integration_goes_through_the_pool(stub, http_app, monkeypatch):
+    server, base = stub
+    monkeypatch.setattr(fintech_api, "TINK_BASE_URL", base)
+    for _ in range(3):
+        assert fintech_api.verify_via_tink({"account": "acc-1"}) == {"account": "acc-1"}
+    assert server.connections == 1
+    assert http_client.http_stats()["vendors"]["tink"]["statuses"] == {"2xx": 3}
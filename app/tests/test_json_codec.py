@@ -0,0 +1,85 @@
+# =============================================================================
+# FILE: app/tests/test_json_codec.py
+# DESCRIPTION: Unit tests for app/utils/json_codec.py
+# =============================================================================
+
+import datetime
+import decimal
+import json
+import uuid
+
+import pytest
+from flask import Flask, jsonify
+
+from app.utils import json_codec
+
+
+def test_roundtrip_matches_stdlib():
+    payload = {"a": 1, "b": [1.5, "x", None, True], "nested": {"ü": "ñ"}}
+    encoded = json_codec.dumps(payload)
+    assert json.loads(encoded) == payload
+    assert json_codec.loads(encoded) == payload
+    assert json_codec.loads(encoded.encode("utf-8")) == payload
+
+
+def test_native_types_encoded():
+    uid = uuid.UUID("12345678-1234-5678-1234-567812345678")
+    payload = {
+        "when": datetime.datetime(2024, 5, 1, 12, 30, 0),
+        "day": datetime.date(2024, 5, 1),
+        "amount": decimal.Decimal("10.25"),
+        "id": uid,
+    }
+    decoded = json.loads(json_codec.dumps(payload))
+    assert decoded == {
+        "when": "2024-05-01T12:30:00",
+        "day": "2024-05-01",
+        "amount": "10.25",
+        "id": str(uid),
+    }
+
+
+def test_stable_hash_ignores_key_order():
+    assert json_codec.stable_hash({"a": 1, "b": 2}) == json_codec.stable_hash({"b": 2, "a": 1})
+    assert json_codec.stable_hash({"a": 1}) != json_codec.stable_hash({"a": 2})
+
+
+def test_stable_hash_falls_back_to_str():
+    class Opaque:
+        def __str__(self):
+            return "opaque"
+
+    assert json_codec.stable_hash({"x": Opaque()}) == json_codec.stable_hash({"x": "opaque"})
+
+
+def test_loads_raises_value_error_on_bad_input():
+    with pytest.raises(ValueError):
+        json_codec.loads("{not json")
+
+
+def test_flask_provider_installed():
+    app = Flask(__name__)
+    json_codec.init_json_provider(app)
+
+    @app.route("/payload")
+    def payload():
+        return jsonify({"amount": decimal.Decimal("1.10"), "day": datetime.date(2024, 1, 2)})
+
+    resp = app.test_client().get("/payload")
+    assert resp.mimetype == "application/json"
+    # Same RFC 822 date format as Flask's DefaultJSONProvider
+    assert resp.get_json() == {"amount": "1.10", "day": "Tue, 02 Jan 2024 00:00:00 GMT"}
+
+
+def test_flask_provider_sorts_keys_like_default():
+    app = Flask(__name__)
+    json_codec.init_json_provider(app)
+
+    @app.route("/payload")
+    def payload():
+        return {"zeta": 1, "alpha": {"y": 2, "b": 3}}
+
+    body = app.test_client().get("/payload").get_data(as_text=True)
+    assert body == '{"alpha":{"b":3,"y":2},"zeta":1}'
+    with app.app_context():
+        assert app.json.dumps({"b": 1, "a": 2}) == '{"a":2,"b":1}'
@@ -0,0 +1,136 @@
+# =============================================================================
+# FILE: app/tests/test_lender_risk_rollup.py
+# DESCRIPTION: Lender risk heatmap rollup (SQL GROUP BY) and the time-ordered
+#              AI risk log index.
+# =============================================================================
+
+import datetime
+
+from sqlalchemy import create_engine, insert
+
+from app.cockpit.tiles import lender_risk_tile
+from app.models.schema_event import SchemaEvent
+from app.utils import ai_risk_log, json_codec
+
+
+def _event(user_id, event_type, ts):
+    return {"user_id": user_id, "event_type": event_type, "timestamp": ts}
+
+
+def test_rollup_groups_by_lender_day_and_type():
+    engine = create_engine("sqlite://")
+    SchemaEvent.__table__.create(engine)
+    day1 = datetime.datetime(2025, 3, 1, 9)
+    day2 = datetime.datetime(2025, 3, 2, 18)
+    rows = [
+        _event("L1", "LENDER_RISK_ALERT", day1),
+        _event("L1", "LENDER_RISK_ALERT", day1 + datetime.timedelta(hours=5)),
+        _event("L1", "LENDER_SELF_LINKED", day2),
+        _event("L2", "LENDER_SELF_LINKED", day2),
+        _event("L2", "REVISION_APPLIED", day2),  # not a heatmap event
+        _event("L2", "LENDER_RISK_ALERT", datetime.datetime(2024, 1, 1)),  # out of window
+    ]
+    with engine.begin() as conn:
+        conn.execute(insert(SchemaEvent.__table__), rows)
+        stmt = lender_risk_tile.lender_risk_rollup_stmt(datetime.datetime(2025, 2, 1))
+        result = sorted(tuple(r) for r in conn.execute(stmt))
+
+    assert result == [
+        ("L1", "2025-03-01", "LENDER_RISK_ALERT", 2),
+        ("L1", "2025-03-02", "LENDER_SELF_LINKED", 1),
+        ("L2", "2025-03-02", "LENDER_SELF_LINKED", 1),
+    ]
+
+
+def test_heatmap_folds_rollup_rows(monkeypatch):
+    rollup = [
+        {"lender": "L1", "day": "2025-03-02", "event_type": "LENDER_SELF_LINKED", "events": 1},
+        {"lender": "L1", "day": "2025-03-01", "event_type": "LENDER_RISK_ALERT", "events": 2},
+        {"lender": "L2", "day": "2025-03-02", "event_type": "LENDER_SELF_LINKED", "events": 4},
+    ]
+    monkeypatch.setattr(lender_risk_tile, "lender_risk_rollup", lambda days: rollup)
+
+    assert lender_risk_tile.get_lender_risk_heatmap() == {
+        "2025-03-01": {"alerts": 2, "links": 0},
+        "2025-03-02": {"alerts": 0, "links": 5},
+    }
+    assert lender_risk_tile.get_lender_risk_heatmap(lender="L2") == {
+        "2025-03-02": {"alerts": 0, "links": 4},
+    }
+
+
+class FakeIndexRedis:
+    """Strings + one sorted set; enough for the AI risk log index."""
+
+    def __init__(self):
+        self.data = {}
+        self.zsets = {}
+        self.scans = 0
+
+    def setex(self, key, ttl, value):
+        self.data[key] = value.encode() if isinstance(value, str) else value
+
+    def zadd(self, key, mapping):
+        self.zsets.setdefault(key, {}).update(mapping)
+
+    def zremrangebyscore(self, key, low, high):
+        zset = self.zsets.get(key, {})
+        for member in [m for m, s in zset.items() if s <= float(high)]:
+            del zset[member]
+
+    def zrem(self, key, *members):
+        for member in members:
+            self.zsets.get(key, {}).pop(member, None)
+
+    def zrevrangebyscore(self, key, high, low, start=0, num=-1):
+        items = sorted(self.zsets.get(key, {}).items(), key=lambda kv: kv[1], reverse=True)
+        items = [m for m, s in items if float(low) <= s <= float(high)]
+        return items[start:] if num < 0 else items[start : start + num]
+
+    def set(self, key, value, nx=False):
+        if nx and key in self.data:
+            return None
+        self.data[key] = str(value).encode()
+        return True
+
+    def scan_iter(self, match=None, count=None):
+        self.scans += 1
+        prefix = match.rstrip("*")
+        return [k for k in self.data if k.startswith(prefix)]
+
+    def mget(self, keys):
+        return [self.data.get(k) for k in keys]
+
+    def pipeline(self):
+        return self
+
+    def execute(self):
+        return []
+
+
+def test_ai_risk_logs_read_newest_first_and_by_window():
+    client = FakeIndexRedis()
+    for ts in (100.0, 200.0, 300.0):
+        ai_risk_log.record_ai_risk_log(client, {"ts": ts}, ts=ts)
+
+    assert [log["ts"] for log in ai_risk_log.recent_ai_risk_logs(client, limit=2)] == [300.0, 200.0]
+    window = ai_risk_log.recent_ai_risk_logs(client, since=150, until=250)
+    assert [log["ts"] for log in window] == [200.0]
+    assert client.scans == 0
+
+
+def test_ai_risk_logs_prune_expired_and_backfill_legacy_keys():
+    client = FakeIndexRedis()
+    # Written before the index existed: reads never scan for it
+    client.setex("grants_composed:50.5", 60, json_codec.dumps({"ts": 50.5}))
+    assert ai_risk_log.recent_ai_risk_logs(client) == []
+    assert client.scans == 0
+
+    assert ai_risk_log.backfill_ai_risk_log_index(client) == 1
+    assert ai_risk_log.backfill_ai_risk_log_index(client) is None
+    assert client.scans == 1
+    assert ai_risk_log.recent_ai_risk_logs(client) == [{"ts": 50.5}]
+
+    del client.data["grants_composed:50.5"]  # TTL expired
+    assert ai_risk_log.recent_ai_risk_logs(client) == []
+    assert client.zsets[ai_risk_log.INDEX_KEY] == {}
@@ -0,0 +1,54 @@
+# =============================================================================
+# FILE: app/tests/test_load_harness.py
+# DESCRIPTION: Load harness bookkeeping (`python -m benchmarks.load`):
+#              nearest-rank percentiles, per-endpoint summaries, request-mix
+#              parsing and saturation detection across a ramp.
+# =============================================================================
+
+import pytest
+
+from benchmarks import load
+
+
+def test_percentile_nearest_rank():
+    values = sorted(float(v) for v in range(1, 101))
+    assert load.percentile(values, 50) == 50.0
+    assert load.percentile(values, 95) == 95.0
+    assert load.percentile(values, 99) == 99.0
+    assert load.percentile([1.0, 2.0, 3.0, 4.0, 5.0, 6.0], 50) == 3.0
+    assert load.percentile([7.0], 99) == 7.0
+    assert load.percentile([], 50) is None
+
+
+def test_summarize_per_endpoint():
+    samples = [("ping", 1.0, 200, 0)] * 8 + [("login", 100.0, 503, 2), ("login", 50.0, 200, 4)]
+    summary = load.summarize(samples, elapsed=2.0)
+
+    assert summary["requests"] == 10 and summary["rps"] == 5.0
+    assert summary["errors"] == 1
+    login = summary["endpoints"]["login"]
+    assert login["statuses"] == {"503": 1, "200": 1}
+    assert (login["p50_ms"], login["p99_ms"]) == (50.0, 100.0)
+    assert login["queries_per_request"] == 3.0
+    assert summary["endpoints"]["ping"]["p95_ms"] == 1.0
+
+
+def test_parse_mix():
+    known = ("login", "ping")
+    assert load.parse_mix("login=1, ping", known) == {"login": 1.0, "ping": 1.0}
+    with pytest.raises(ValueError, match="unknown endpoint"):
+        load.parse_mix("checkout=1", known)
+    with pytest.raises(ValueError, match="empty"):
+        load.parse_mix("login=0", known)
+
+
+def test_saturation_knee_and_slo():
+    steps = [
+        {"concurrency": 1, "rps": 100.0, "p95_ms": 10.0},
+        {"concurrency": 2, "rps": 190.0, "p95_ms": 12.0},
+        {"concurrency": 4, "rps": 260.0, "p95_ms": 30.0},
+        {"concurrency": 8, "rps": 270.0, "p95_ms": 80.0},  # +4%: past the knee
+    ]
+    assert load.saturation(steps, knee_pct=10, slo_p95_ms=None)["concurrency"] == 4
+    assert load.saturation(steps, knee_pct=10, slo_p95_ms=20)["concurrency"] == 2
+    assert load.saturation(steps, knee_pct=10, slo_p95_ms=5)["concurrency"] is None
@@ -0,0 +1,164 @@
+# =============================================================================
+# FILE: app/tests/test_mfa_atomic.py
+# DESCRIPTION: MFA state transitions as single Lua calls: exactly-once
+#              consumption under concurrent verify, lockout, one round trip
+#              per verify, and batched audit-trail persistence.
+#              Runs against MFA_TEST_REDIS_URL when set, else fakeredis with
+#              Lua support; skipped when neither is available.
+# =============================================================================
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.extensions import db
+from app.models import MFACode, User
+from app.services import mfa_service
+
+
+def _redis():
+    url = os.getenv("MFA_TEST_REDIS_URL")
+    if url:
+        import redis
+
+        return redis.Redis.from_url(url)
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    return fakeredis.FakeRedis()
+
+
+def _count_commands(client):
+    """Record the name of every command ``client`` sends."""
+    client.commands = []
+    send = client.execute_command
+
+    def execute_command(*args, **options):
+        client.commands.append(args[0])
+        return send(*args, **options)
+
+    client.execute_command = execute_command
+    return client
+
+
+@pytest.fixture
+def redis_client(monkeypatch):
+    client = _count_commands(_redis())
+    client.flushdb()
+    monkeypatch.setattr(mfa_service, "_client", lambda: client)
+    monkeypatch.setattr(mfa_service, "_scripts", {})
+    # No background flusher: tests flush the audit queue explicitly
+    monkeypatch.setattr(mfa_service, "_flusher", object())
+    yield client
+    client.flushdb()
+
+
+@pytest.fixture
+def sqlite_app(sqlite_app):
+    db.session.add(User(id="u1", email="u1@example.com", password_hash="x"))
+    db.session.commit()
+    yield sqlite_app
+    mfa_service._take(sqlite_app)
+
+
+@pytest.fixture
+def user(sqlite_app):
+    return db.session.get(User, "u1")
+
+
+def test_issue_verify_consumes_once(redis_client, user):
+    code = mfa_service.generate_mfa_code(user, persist=False)
+    assert mfa_service.verify_mfa_code(user, code) is True
+    assert mfa_service.verify_mfa_code(user, code) is False
+
+    newer = mfa_service.generate_mfa_code(user, persist=False)
+    older = mfa_service.generate_mfa_code(user, persist=False)
+    if newer != older:
+        assert mfa_service.verify_mfa_code(user, newer) is False  # replaced
+    assert mfa_service.verify_mfa_code(user, older) is True
+
+
+def test_verify_is_one_round_trip(redis_client, user):
+    code = mfa_service.generate_mfa_code(user, persist=False)
+    mfa_service.verify_mfa_code(user, "000000", max_failures=5)  # loads the script
+
+    redis_client.commands.clear()
+    assert mfa_service.verify_mfa_code(user, code, max_failures=5) is True
+    assert redis_client.commands == ["EVALSHA"]
+
+
+def test_lockout_burns_code_and_blocks_issue(redis_client, user):
+    code = mfa_service.generate_mfa_code(user, persist=False)
+    for _ in range(3):
+        assert mfa_service.verify_mfa_code(user, "000000", max_failures=3) is False
+    # Locked out: the right code no longer works and no new code is issued
+    assert mfa_service.verify_mfa_code(user, code, max_failures=3) is False
+    assert mfa_service.generate_mfa_code(user, persist=False) is None
+
+    fails_key = mfa_service._keys(user.id)[1]
+    assert int(redis_client.get(fails_key)) == 3  # locked attempts not counted
+    assert 0 < redis_client.ttl(fails_key) <= mfa_service.FAIL_WINDOW_SECONDS
+
+
+@pytest.mark.parametrize("threads", [32])
+def test_concurrent_verify_consumes_exactly_once(redis_client, sqlite_app, threads):
+    for round_ in range(20):
+        code = mfa_service.generate_mfa_code(
+            db.session.get(User, "u1"), persist=False, max_failures=1000
+        )
+        barrier = threading.Barrier(threads)
+
+        def attempt(n):
+            barrier.wait()
+            with sqlite_app.app_context():
+                submitted = code if n % 2 else "000000"
+                return mfa_service.verify_mfa_code(
+                    db.session.get(User, "u1"), submitted, max_failures=1000
+                )
+
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            results = list(pool.map(attempt, range(threads)))
+        assert results.count(True) == 1, f"round {round_}: {results.count(True)} successes"
+
+
+def test_concurrent_failures_lock_out_exactly_at_limit(redis_client, sqlite_app):
+    code = mfa_service.generate_mfa_code(db.session.get(User, "u1"), persist=False)
+    barrier = threading.Barrier(16)
+
+    def attempt(_):
+        barrier.wait()
+        with sqlite_app.app_context():
+            return mfa_service.verify_mfa_code(db.session.get(User, "u1"), "000000", max_failures=5)
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        assert not any(pool.map(attempt, range(16)))
+    assert int(redis_client.get(mfa_service._keys("u1")[1])) == 5
+    assert mfa_service.verify_mfa_code(db.session.get(User, "u1"), code, max_failures=5) is False
+
+
+def test_audit_trail_written_in_batches(redis_client, user, count_statements):
+    codes = [mfa_service.generate_mfa_code(user, max_failures=100) for _ in range(5)]
+    mfa_service.verify_mfa_code(user, "000000", max_failures=100)
+    mfa_service.verify_mfa_code(user, codes[-1], max_failures=100)
+    assert MFACode.query.count() == 0  # nothing written on the request path
+
+    with count_statements() as statements:
+        assert mfa_service.flush_mfa_audit() == 6
+
+    assert [s.split()[0] for s in statements] == ["INSERT", "UPDATE"]
+    assert sorted(r.code for r in MFACode.query) == sorted(codes)
+    assert mfa_service.flush_mfa_audit() == 0
+
+
+def test_failed_flush_requeues(redis_client, user, monkeypatch):
+    mfa_service.generate_mfa_code(user)
+
+    def broken(events):
+        raise RuntimeError("db down")
+
+    with monkeypatch.context() as patched:
+        patched.setattr(mfa_service, "_write_audit", broken)
+        with pytest.raises(RuntimeError):
+            mfa_service.flush_mfa_audit()
+    assert mfa_service.flush_mfa_audit() == 1
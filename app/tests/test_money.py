@@ -0,0 +1,110 @@
+# =============================================================================
+# FILE: app/tests/test_money.py
+# DESCRIPTION: Unit tests for app/utils/money.py (integer-cents money layer).
+# =============================================================================
+
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import Column, Float, Integer, create_engine, select
+from sqlalchemy.orm import Session, declarative_base
+
+from app.services.discrepancy import statement_total
+from app.services.vault_analytics import compute_vault_summary
+from app.utils.money import (
+    MoneyCents,
+    amount_cents_array,
+    cents,
+    cents_array,
+    from_cents,
+    sum_amounts,
+    sum_exact,
+    sync_exact,
+    to_cents,
+)
+
+Base = declarative_base()
+
+
+class Entry(Base):
+    __tablename__ = "entries"
+
+    id = Column(Integer, primary_key=True)
+    amount = Column(Float, nullable=False)
+    amount_exact = Column("amount_cents", MoneyCents(), nullable=True)
+
+
+sync_exact(Entry.amount, Entry.amount_exact)
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as s:
+        yield s
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [(0.1, 10), ("19.99", 1999), (Decimal("-2.005"), -201), (3, 300), (0.285, 29)],
+)
+def test_to_cents_is_exact(value, expected):
+    assert to_cents(value) == expected
+
+
+@pytest.mark.parametrize("value", [None, "abc", float("nan"), True])
+def test_to_cents_rejects_non_amounts(value):
+    with pytest.raises(ValueError):
+        to_cents(value)
+
+
+def test_float_sum_drift_is_gone():
+    values = [0.1] * 10
+    assert sum(values) != 1.0
+    assert sum_amounts(values) == Decimal("1.00")
+    assert amount_cents_array(values).dtype.name == "int64"
+
+
+def test_int_means_units_for_amounts_and_cents_for_cents_array():
+    assert to_cents(3) == 300
+    assert amount_cents_array([3]).tolist() == [300]
+    assert cents_array([300]).tolist() == [300]
+    with pytest.raises(TypeError):
+        cents_array([0.1])
+
+
+def test_type_decorator_stores_bigint_and_returns_decimal(session):
+    session.add(Entry(amount=12.34))
+    session.commit()
+
+    raw = session.execute(select(cents(Entry.amount_exact))).scalar_one()
+    assert raw == 1234
+    assert session.execute(select(Entry.amount_exact)).scalar_one() == Decimal("12.34")
+
+
+def test_dual_write_and_sql_sum(session):
+    session.add_all([Entry(amount=0.1) for _ in range(10)] + [Entry(amount=-0.3)])
+    session.commit()
+
+    assert sum_exact(session, Entry.amount_exact) == Decimal("0.70")
+    assert sum_exact(session, Entry.amount_exact, Entry.amount > 0) == Decimal("1.00")
+
+
+def test_from_cents_round_trips():
+    assert from_cents(to_cents("1234567.89")) == Decimal("1234567.89")
+
+
+def test_statement_total_and_vault_summary():
+    statements = [{"amount": "10.10"}, {"amount": 0.2}, {"amount": "bad"}, {"other": 1}]
+    assert statement_total(statements) == Decimal("10.30")
+
+    class Txn:
+        def __init__(self, amount):
+            self.amount = amount
+
+    summary = compute_vault_summary([Txn(0.1), Txn(0.2), Txn(-0.3)])
+    assert summary["total_balance"] == 0.0
+    assert summary["total_deposits"] == 0.3
+    assert summary["total_withdrawals"] == 0.3
+    assert summary["txn_count"] == 3
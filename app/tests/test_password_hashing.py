@@ -0,0 +1,122 @@
+# =============================================================================
+# FILE: app/tests/test_password_hashing.py
+# DESCRIPTION: Pooled password hashing: verification in worker processes,
+#              fast rejection at the in-flight cap, transparent rehash to the
+#              configured method on successful login, and cost metrics.
+# =============================================================================
+
+import threading
+import time
+
+import pytest
+from werkzeug.security import generate_password_hash
+
+from app.extensions import db
+from app.models import User
+from app.services import password_hashing as hashing
+
+CHEAP = "pbkdf2:sha256:1000"
+TARGET = "pbkdf2:sha256:2000"
+
+
+@pytest.fixture
+def sqlite_app(sqlite_app):
+    sqlite_app.config.update(
+        PASSWORD_HASH_METHOD=TARGET,
+        PASSWORD_HASH_WORKERS=1,
+        PASSWORD_HASH_QUEUE_DEPTH=0,
+    )
+    hashing.shutdown_pool()
+    db.session.add(
+        User(id="u1", email="u1@example.com", password_hash=generate_password_hash("pw", CHEAP))
+    )
+    db.session.commit()
+    yield sqlite_app
+    hashing.shutdown_pool()
+
+
+def test_method_normalization():
+    assert hashing.normalize_method("scrypt") == "scrypt:32768:8:1"
+    assert hashing.normalize_method("pbkdf2:sha512") == (
+        f"pbkdf2:sha512:{hashing.DEFAULT_PBKDF2_ITERATIONS}"
+    )
+    pwhash = generate_password_hash("pw", "scrypt:16384:8:1")
+    assert hashing.needs_rehash(pwhash, "scrypt")
+    assert not hashing.needs_rehash(pwhash, "scrypt:16384:8:1")
+
+
+def test_verify_in_pool_and_rehash_on_success(sqlite_app):
+    user = db.session.get(User, "u1")
+    assert hashing.verify_and_upgrade(user, "wrong") is False
+    assert hashing.method_of(user.password_hash) == CHEAP
+
+    assert hashing.verify_and_upgrade(user, "pw") is True
+    db.session.expire_all()
+    user = db.session.get(User, "u1")
+    assert hashing.method_of(user.password_hash) == TARGET
+    assert hashing.verify_and_upgrade(user, "pw") is True
+    assert hashing.verify_and_upgrade(None, "pw") is False
+
+    stats = hashing.hash_stats()
+    assert stats["workers"] == 1
+    assert stats["rehashed"] == 1
+    assert stats["methods"][CHEAP]["verify"]["count"] == 2
+    assert stats["methods"][TARGET]["hash"]["count"] == 1
+    assert stats["methods"][TARGET]["verify"]["cost"]["max_ms"] > 0
+    assert stats["in_flight"] == 0
+
+
+def test_rejects_immediately_at_capacity(sqlite_app):
+    def hold_slot():
+        with sqlite_app.app_context():
+            hashing.hash_password("x", "pbkdf2:sha256:3000000")
+
+    busy = threading.Thread(target=hold_slot)
+    hashing.verify_password(generate_password_hash("warm", CHEAP), "warm")  # start worker
+    busy.start()
+    deadline = time.monotonic() + 5
+    while hashing.hash_stats()["in_flight"] == 0 and time.monotonic() < deadline:
+        time.sleep(0.005)
+
+    start = time.perf_counter()
+    with pytest.raises(hashing.HashingOverloaded):
+        hashing.verify_password(db.session.get(User, "u1").password_hash, "pw")
+    assert time.perf_counter() - start < 0.05
+    assert hashing.hash_stats()["rejected"] == 1
+
+    # A busy pool defers the upgrade but never fails the login
+    busy.join()
+    assert hashing.verify_and_upgrade(db.session.get(User, "u1"), "pw") is True
+
+
+def test_inline_mode_without_workers(sqlite_app):
+    sqlite_app.config["PASSWORD_HASH_WORKERS"] = 0
+    hashing.shutdown_pool()
+    pwhash = hashing.hash_password("pw")
+    assert hashing.method_of(pwhash) == TARGET
+    assert hashing.verify_password(pwhash, "pw") is True
+    assert hashing.hash_stats()["workers"] == 0
+
+
+def test_default_queue_lets_concurrent_logins_wait(sqlite_app, monkeypatch):
+    monkeypatch.setenv("UWSGI_THREADS", "4")
+    monkeypatch.delenv("PASSWORD_HASH_QUEUE_DEPTH", raising=False)
+    del sqlite_app.config["PASSWORD_HASH_QUEUE_DEPTH"]
+    assert hashing.pool_settings(sqlite_app.config).max_in_flight == 5
+
+    pwhash = generate_password_hash("pw", "pbkdf2:sha256:200000")
+    results = []
+
+    def login():
+        with sqlite_app.app_context():
+            results.append(hashing.verify_password(pwhash, "pw"))
+
+    threads = [threading.Thread(target=login) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [True, True, True]
+    assert hashing.hash_stats()["rejected"] == 0
+    assert hashing.hash_stats()["max_in_flight"] == 5
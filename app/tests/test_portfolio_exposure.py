@@ -0,0 +1,160 @@
+# =============================================================================
+# FILE: app/tests/test_portfolio_exposure.py
+# DESCRIPTION: Portfolio exposure service: running totals maintained on
+#              CreditLedger / PaymentLog flushes, SQL-side portfolio and
+#              delinquency aggregates, batch violations and what-if.
+# =============================================================================
+
+import datetime
+from decimal import Decimal
+
+import pytest
+
+from app.extensions import db
+from app.models import CreditLedger, PaymentLog, PortfolioExposure, User
+from app.services import portfolio_exposure as exposure
+from app.services.lending_cognition import CreditReflexManager
+
+NOW = datetime.datetime(2025, 6, 30)
+
+
+@pytest.fixture
+def sqlite_app(sqlite_app):
+    exposure.track_exposure()
+    return sqlite_app
+
+
+def _borrower(user_id, limit, used, paid=(), last_payment_ts=None, opened_days_ago=0):
+    db.session.add(User(id=user_id, email=f"{user_id}@example.com", password_hash="x"))
+    db.session.add(
+        CreditLedger(
+            user_id=user_id,
+            card_id=f"card-{user_id}",
+            credit_limit=limit,
+            balance_used=used,
+            last_payment_ts=last_payment_ts,
+            created_at=NOW - datetime.timedelta(days=opened_days_ago),
+        )
+    )
+    for n, amount in enumerate(paid):
+        db.session.add(
+            PaymentLog(
+                user_id=user_id,
+                payment_processor_id=f"pp-{user_id}-{n}",
+                amount=amount,
+                status="succeeded",
+                transaction_type="ach",
+                created_at=NOW - datetime.timedelta(days=5),
+            )
+        )
+
+
+def test_running_totals_follow_writes(sqlite_app):
+    _borrower("a", 1000, 250.10, paid=[100.05, 0.1])
+    db.session.commit()
+
+    row = db.session.get(PortfolioExposure, "a")
+    assert (row.cards, row.payments) == (1, 2)
+    assert row.credit_limit == Decimal("1000.00")
+    assert row.balance_used == Decimal("250.10")
+    assert row.repaid == Decimal("100.15")
+
+    db.session.add(
+        PaymentLog(
+            user_id="a",
+            payment_processor_id="pp-failed",
+            amount=500,
+            status="failed",
+            transaction_type="ach",
+        )
+    )
+    card = CreditLedger.query.filter_by(user_id="a").one()
+    card.balance_used = 50
+    db.session.commit()
+
+    db.session.expire_all()
+    row = db.session.get(PortfolioExposure, "a")
+    assert row.balance_used == Decimal("50.00")
+    assert row.repaid == Decimal("100.15")  # failed payment excluded
+
+    db.session.delete(card)
+    db.session.commit()
+    db.session.expire_all()
+    assert db.session.get(PortfolioExposure, "a").cards == 0
+
+
+def test_portfolio_summary_and_buckets(sqlite_app, count_statements):
+    _borrower("current", 1000, 100, paid=[900])
+    _borrower("late", 1000, 400, last_payment_ts=NOW - datetime.timedelta(days=45))
+    _borrower("very-late", 2000, 1500, opened_days_ago=120)
+    _borrower("paid-off", 500, 0, opened_days_ago=400)
+    db.session.commit()
+
+    with count_statements() as statements:
+        summary = exposure.portfolio_summary(now=NOW)
+    assert len(statements) == 1
+    assert summary["borrowers"] == 4
+    assert summary["credit_limit"] == "4500.00"
+    assert summary["outstanding_principal"] == "2000.00"
+    assert summary["utilization"] == round(2000 / 4500, 4)
+    assert summary["violations"] == 3  # everyone but "current"
+    assert summary["delinquency"]["current"]["borrowers"] == 2
+    assert summary["delinquency"]["dpd_30"] == {
+        "borrowers": 1,
+        "outstanding_principal": "400.00",
+    }
+    assert summary["delinquency"]["dpd_60"]["borrowers"] == 0
+    assert summary["delinquency"]["dpd_90"]["outstanding_principal"] == "1500.00"
+
+    late = exposure.user_exposures(bucket="dpd_90", now=NOW)
+    assert [row["user_id"] for row in late] == ["very-late"]
+
+
+def test_batch_violations_match_legacy_rule(sqlite_app):
+    _borrower("ok", 1000, 0, paid=[800])  # exposure 200 == 20%: not a violation
+    _borrower("over", 1000, 0, paid=[799.99])
+    db.session.commit()
+
+    assert exposure.credit_violations() == {"over"}
+    assert CreditReflexManager.detect_credit_violation("ok") is False
+    assert CreditReflexManager.detect_credit_violation("over") is True
+    assert CreditReflexManager.detect_credit_violation("nobody") is False
+
+
+def test_what_if_batch_reads_without_writing(sqlite_app, count_statements):
+    _borrower("a", 1000, 500, paid=[100])
+    _borrower("b", 1000, 200, paid=[900])
+    db.session.commit()
+
+    with count_statements() as statements:
+        result = exposure.what_if(
+            {"a": {"payment": "700"}, "b": {"credit_limit": 4000, "balance_used": 300}, "c": {}},
+            now=NOW,
+        )
+    assert all(s.lstrip().upper().startswith("SELECT") for s in statements)
+    assert len(statements) == 2
+
+    by_user = {u["user_id"]: u for u in result["users"]}
+    assert by_user["a"]["before"]["violation"] is True
+    assert by_user["a"]["after"]["violation"] is False
+    assert by_user["b"]["after"]["utilization"] == 0.1
+    assert by_user["b"]["after"]["violation"] is True  # limit 5000, repaid 900
+    assert by_user["c"]["after"]["credit_limit"] == "0.00"
+
+    assert result["portfolio"]["before"]["violations"] == 1
+    assert result["portfolio"]["after"]["violations"] == 1
+    assert result["portfolio"]["after"]["credit_limit"] == "6000.00"
+    assert result["portfolio"]["after"]["outstanding_principal"] == "1000.00"
+    assert db.session.get(PortfolioExposure, "a").repaid == Decimal("100.00")
+
+
+def test_rebuild_recovers_from_bulk_writes(sqlite_app):
+    _borrower("a", 1000, 500)
+    db.session.commit()
+    db.session.execute(CreditLedger.__table__.update().values(balance_used=0, balance_used_cents=0))
+    db.session.commit()
+    assert db.session.get(PortfolioExposure, "a").balance_used == Decimal("500.00")
+
+    assert exposure.rebuild_exposure() == 1
+    db.session.expire_all()
+    assert db.session.get(PortfolioExposure, "a").balance_used == Decimal("0.00")
@@ -0,0 +1,55 @@
+# =============================================================================
+# FILE: app/tests/test_query_plans.py
+# DESCRIPTION: Query-plan regression suite. Every hot query in
+#              app/utils/query_plans.py must be served by an index; a plan that
+#              falls back to a full table scan (or an unindexed sort) fails.
+#              Runs on SQLite always and on MySQL when QUERY_PLAN_MYSQL_URI is set.
+# =============================================================================
+
+import os
+
+import pytest
+from sqlalchemy import create_engine
+
+import app.models  # noqa: F401 - register every table on db.metadata
+from app.extensions import db
+from app.utils.query_plans import explain, full_scans, hot_queries, sorts_outside_index
+
+HOT_QUERIES = hot_queries()
+
+
+def _engines():
+    yield pytest.param("sqlite://", id="sqlite")
+    mysql_uri = os.getenv("QUERY_PLAN_MYSQL_URI")
+    yield pytest.param(
+        mysql_uri,
+        id="mysql",
+        marks=pytest.mark.skipif(not mysql_uri, reason="QUERY_PLAN_MYSQL_URI not set"),
+    )
+
+
+@pytest.fixture(scope="module", params=list(_engines()))
+def connection(request):
+    engine = create_engine(request.param)
+    if engine.dialect.name == "sqlite":
+        db.metadata.create_all(engine)
+    with engine.connect() as conn:
+        yield conn
+    engine.dispose()
+
+
+@pytest.mark.parametrize("query", HOT_QUERIES, ids=[q.name for q in HOT_QUERIES])
+def test_hot_query_uses_index(connection, query):
+    plan = explain(connection, query.build())
+    assert full_scans(plan) == [], f"{query.name} regressed to a full scan: {plan}"
+    if query.index_ordered:
+        assert not sorts_outside_index(plan), f"{query.name} sorts outside the index: {plan}"
+
+
+def test_full_scan_is_detected():
+    assert full_scans(["SCAN trace_events"]) == ["trace_events"]
+    assert full_scans(["SCAN trace_events USING INDEX ix_trace_events_timestamp"]) == []
+    assert full_scans({"query_block": {"table": {"table_name": "t", "access_type": "ALL"}}}) == [
+        "t"
+    ]
+    assert sorts_outside_index(["SCAN t", "USE TEMP B-TREE FOR ORDER BY"])
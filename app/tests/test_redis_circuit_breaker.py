@@ -0,0 +1,231 @@
+# =============================================================================
+# FILE: app/tests/test_redis_circuit_breaker.py
+# DESCRIPTION: Fault-injection tests for the Redis circuit breaker and the
+#              degraded-mode fallbacks. A local TCP stand-in speaks just enough
+#              RESP to answer PING and can be switched to drop connections.
+# =============================================================================
+
+import socket
+import threading
+import time
+
+import pytest
+
+from app.services import rate_limiter
+from app.telemetry import ttl_emit as ttl_emit_module
+from app.utils import redis_utils
+from app.utils.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+class FlakyRedisServer:
+    """Minimal RESP server; with ``dropping`` set it closes every connection."""
+
+    def __init__(self):
+        self.dropping = False
+        self.accepted = 0
+        self._conns = []
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind(("127.0.0.1", 0))
+        self._sock.listen(16)
+        self.port = self._sock.getsockname()[1]
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+
+    @property
+    def url(self):
+        return f"redis://127.0.0.1:{self.port}/0"
+
+    def _accept_loop(self):
+        while True:
+            try:
+                conn, _ = self._sock.accept()
+            except OSError:
+                return
+            self.accepted += 1
+            if self.dropping:
+                conn.close()
+                continue
+            self._conns.append(conn)
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _serve(self, conn):
+        stream = conn.makefile("rb")
+        try:
+            while True:
+                header = stream.readline()
+                if not header:
+                    return
+                args = []
+                for _ in range(int(header[1:])):
+                    size = int(stream.readline()[1:])
+                    args.append(stream.read(size + 2)[:-2])
+                command = args[0].upper()
+                if command == b"PING":
+                    conn.sendall(b"+PONG\r\n")
+                elif command == b"GET":
+                    conn.sendall(b"$-1\r\n")
+                else:
+                    conn.sendall(b"+OK\r\n")
+        except (OSError, ValueError):
+            return
+
+    def drop_all(self):
+        self.dropping = True
+        for conn in self._conns:
+            try:
+                conn.shutdown(socket.SHUT_RDWR)
+                conn.close()
+            except OSError:
+                pass
+        self._conns.clear()
+
+    def recover(self):
+        self.dropping = False
+
+    def close(self):
+        self.drop_all()
+        self._sock.close()
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def server():
+    srv = FlakyRedisServer()
+    yield srv
+    srv.close()
+
+
+@pytest.fixture
+def clock(monkeypatch, server):
+    fake = FakeClock()
+    monkeypatch.setenv("REDIS_STORAGE_URI", server.url)
+    monkeypatch.setenv("REDIS_CONNECT_TIMEOUT", "1")
+    monkeypatch.setenv("REDIS_SOCKET_TIMEOUT", "1")
+    monkeypatch.delenv("DISABLE_REDIS", raising=False)
+    breaker = CircuitBreaker(
+        "redis",
+        failure_threshold=3,
+        reset_timeout=30,
+        on_transition=redis_utils._on_breaker_transition,
+        clock=fake,
+    )
+    monkeypatch.setattr(redis_utils, "_BREAKER", breaker)
+    monkeypatch.setattr(redis_utils, "_emit_boot_pulses", lambda client: None)
+    rate_limiter._local_counters.clear()
+    redis_utils.reset_redis_client()
+    yield fake
+    redis_utils.reset_redis_client()
+
+
+def _breaker_pulse():
+    return ttl_emit_module._ttl_data.get(redis_utils.REDIS_BREAKER_KEY, {}).get("status")
+
+
+def test_breaker_opens_and_fails_fast(server, clock):
+    server.drop_all()
+    for _ in range(3):
+        assert redis_utils.get_redis_client() is None
+
+    assert redis_utils.get_breaker_state()["state"] == OPEN
+    assert _breaker_pulse() == OPEN
+
+    attempts = server.accepted
+    started = time.perf_counter()
+    for _ in range(50):
+        assert redis_utils.get_redis_client() is None
+    assert time.perf_counter() - started < 0.5
+    assert server.accepted == attempts
+
+
+def test_half_open_trial_closes_breaker_on_recovery(server, clock):
+    server.drop_all()
+    for _ in range(3):
+        redis_utils.get_redis_client()
+    assert redis_utils.is_redis_degraded()
+
+    server.recover()
+    clock.now += 31
+    assert redis_utils._BREAKER.state == HALF_OPEN
+
+    client = redis_utils.get_redis_client()
+    assert client is not None
+    assert client.ping() is True
+    assert redis_utils.get_breaker_state()["state"] == CLOSED
+    assert _breaker_pulse() == CLOSED
+    assert not redis_utils.is_redis_degraded()
+
+
+def test_failed_trial_reopens(server, clock):
+    server.drop_all()
+    for _ in range(3):
+        redis_utils.get_redis_client()
+
+    clock.now += 31
+    assert redis_utils.get_redis_client() is None
+    assert redis_utils.get_breaker_state()["state"] == OPEN
+    assert redis_utils.get_breaker_state()["retry_in"] == 30
+
+
+def test_connection_drop_after_startup_trips_breaker(server, clock):
+    client = redis_utils.get_redis_client()
+    assert client is not None
+
+    server.drop_all()
+    for _ in range(10):
+        try:
+            client.get("k")
+        except Exception:
+            pass
+        if redis_utils.is_redis_degraded():
+            break
+
+    assert redis_utils.get_breaker_state()["state"] == OPEN
+    assert redis_utils.get_redis_client() is None
+
+
+def test_degraded_rate_limiting_uses_local_counters(server, clock):
+    server.drop_all()
+    for _ in range(3):
+        redis_utils.get_redis_client()
+
+    for _ in range(5):
+        rate_limiter.apply_rate_limit("10.0.0.1", "login", is_failure=True, limit=5, period=60)
+
+    assert rate_limiter.is_rate_limited("10.0.0.1", "login", limit=5, period=60)
+    assert not rate_limiter.is_rate_limited("10.0.0.2", "login", limit=5, period=60)
+
+
+def test_degraded_webhook_dedupe_is_local(server, clock):
+    from app.webhooks import views
+
+    views._local_idempotency.clear()
+    server.drop_all()
+    for _ in range(3):
+        redis_utils.get_redis_client()
+
+    body = b'{"borrower_id": 1, "card_id": 2, "amount": 5}'
+    assert views._is_duplicate_event(None, "ACH", body) is False
+    assert views._is_duplicate_event(None, "ACH", body) is True
+
+
+def test_pool_exhaustion_does_not_trip_breaker(server, clock, monkeypatch):
+    monkeypatch.setenv("REDIS_MAX_CONNECTIONS", "1")
+    client = redis_utils.get_redis_client()
+    held = client.connection_pool.get_connection()
+    for _ in range(5):
+        with pytest.raises(redis_utils.PoolExhaustedError):
+            client.get("k")
+    assert redis_utils.get_breaker_state()["state"] == CLOSED
+
+    # Checking out the idle connection again says nothing about Redis health
+    client.connection_pool.release(held)
+    redis_utils._BREAKER.record_failure()
+    assert client.get("k") is None
+    assert redis_utils.get_breaker_state()["consecutive_failures"] == 1
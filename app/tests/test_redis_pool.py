@@ -0,0 +1,111 @@
+# =============================================================================
+# FILE: app/tests/test_redis_pool.py
+# DESCRIPTION: Unit tests for the process-wide Redis pool in
+#              app/utils/redis_utils.py (no live Redis required).
+# =============================================================================
+
+import pytest
+from redis.connection import Connection
+
+from app.utils import redis_utils
+
+
+class _PooledFakeRedis:
+    """Redis stand-in that checks connections out of the real pool per command."""
+
+    ping_ok = True
+
+    def __init__(self, connection_pool):
+        self.connection_pool = connection_pool
+
+    def _run(self):
+        conn = self.connection_pool.get_connection()
+        self.connection_pool.release(conn)
+
+    def ping(self):
+        self._run()
+        if not self.ping_ok:
+            raise ConnectionError("down")
+        return True
+
+    def get(self, key):
+        self._run()
+        return None
+
+
+@pytest.fixture
+def pulses(monkeypatch):
+    emitted = []
+    monkeypatch.setenv("REDIS_STORAGE_URI", "redis://localhost:6379/0")
+    monkeypatch.delenv("DISABLE_REDIS", raising=False)
+    monkeypatch.delenv("REDIS_MAX_CONNECTIONS", raising=False)
+    monkeypatch.setattr(Connection, "connect", lambda self: None)
+    monkeypatch.setattr(Connection, "can_read", lambda self, timeout=0: False)
+    monkeypatch.setattr(redis_utils, "Redis", _PooledFakeRedis)
+    monkeypatch.setattr(_PooledFakeRedis, "ping_ok", True)
+    monkeypatch.setattr(redis_utils, "ttl_emit", lambda **kw: emitted.append(kw["key"]))
+    monkeypatch.setattr(redis_utils, "flush_emit_queue", lambda client: 0)
+    redis_utils.reset_redis_client()
+    yield emitted
+    redis_utils.reset_redis_client()
+
+
+def test_client_is_shared_and_pulses_emitted_once(pulses):
+    first = redis_utils.get_redis_client()
+    second = redis_utils.get_redis_client()
+
+    assert first is not None
+    assert first is second
+    assert pulses.count(redis_utils.REDIS_PING_SUCCESS_KEY) == 1
+    assert pulses.count(redis_utils.REDIS_PING_KEY) == 1
+
+
+def test_pool_is_health_checked_and_sized_per_thread(pulses, monkeypatch):
+    monkeypatch.setenv("REDIS_POOL_THREADS", "16")
+    monkeypatch.setenv("REDIS_CONNECTIONS_PER_THREAD", "2")
+    client = redis_utils.get_redis_client()
+
+    pool = client.connection_pool
+    assert pool.max_connections == 33
+    assert pool.connection_kwargs["health_check_interval"] == 30
+
+
+def test_pool_size_keeps_default_floor(pulses, monkeypatch):
+    monkeypatch.setenv("REDIS_POOL_THREADS", "2")
+    assert redis_utils.get_redis_client().connection_pool.max_connections == 20
+
+
+def test_explicit_max_connections_wins(pulses, monkeypatch):
+    monkeypatch.setenv("REDIS_MAX_CONNECTIONS", "3")
+    assert redis_utils.get_redis_client().connection_pool.max_connections == 3
+
+
+def test_pool_stats_report_connection_reuse(pulses):
+    client = redis_utils.get_redis_client()
+    for _ in range(9):
+        client.get("k")
+
+    stats = redis_utils.get_pool_stats()
+    assert stats["active"] is True
+    assert stats["checkouts"] == 10
+    assert stats["created"] == 1
+    assert stats["in_use"] == 0
+    assert stats["reuse_ratio"] == 0.9
+
+
+def test_fork_rebuilds_client_in_child(pulses):
+    parent = redis_utils.get_redis_client()
+    redis_utils._after_fork_in_child()
+
+    child = redis_utils.get_redis_client()
+    assert child is not parent
+    assert pulses.count(redis_utils.REDIS_PING_SUCCESS_KEY) == 2
+
+
+def test_failed_ping_is_not_cached(pulses, monkeypatch):
+    monkeypatch.setattr(_PooledFakeRedis, "ping_ok", False)
+    assert redis_utils.get_redis_client() is None
+    assert redis_utils.get_pool_stats()["active"] is False
+
+    monkeypatch.setattr(_PooledFakeRedis, "ping_ok", True)
+    assert redis_utils.get_redis_client() is not None
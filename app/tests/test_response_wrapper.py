@@ -0,0 +1,141 @@
+# =============================================================================
+# FILE: app/tests/test_response_wrapper.py
+# DESCRIPTION: Unit tests for app/middleware/response_wrapper.py
+# =============================================================================
+
+import json
+
+import pytest
+from flask import Flask, Response, jsonify
+from flask_jwt_extended import create_access_token
+
+from app.extensions import db
+from app.middleware.response_wrapper import enveloped, init_response_handling
+from app.models import User
+
+
+@pytest.fixture
+def app():
+    """Provide a minimal Flask app with the response envelope middleware."""
+    app = Flask(__name__)
+    app.config.update(TESTING=True)
+    init_response_handling(app)
+
+    @app.route("/api/items")
+    @enveloped
+    def items():
+        return [{"id": 1}, {"id": 2}]
+
+    @app.route("/api/created", methods=["POST"])
+    @enveloped
+    def created():
+        return {"id": 7, "message": "Created"}, 201, {"X-Extra": "1"}
+
+    @app.route("/api/legacy")
+    @enveloped
+    def legacy():
+        return jsonify({"id": 3})
+
+    @app.route("/api/legacy-error")
+    @enveloped
+    def legacy_error():
+        return jsonify({"message": "boom"}), 500
+
+    @app.route("/api/raw")
+    def raw():
+        return {"raw": True}
+
+    return app
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def test_view_return_value_enveloped_without_reparsing(client, monkeypatch):
+    """dict/list returns are enveloped at return time; get_json is never called."""
+    calls = []
+    original = Response.get_json
+
+    def spy(self, *args, **kwargs):
+        calls.append(self)
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(Response, "get_json", spy)
+
+    resp = client.get("/api/items")
+    assert calls == []
+
+    body = json.loads(resp.data)
+    assert resp.status_code == 200
+    assert body["status"] == "success"
+    assert body["data"] == [{"id": 1}, {"id": 2}]
+    assert "duration_ms" in body["meta"]
+
+
+def test_status_and_headers_preserved(client):
+    resp = client.post("/api/created")
+    body = resp.get_json()
+    assert resp.status_code == 201
+    assert resp.headers["X-Extra"] == "1"
+    assert body["message"] == "Created"
+    assert body["data"]["id"] == 7
+
+
+def test_legacy_jsonify_response_still_wrapped(client):
+    body = client.get("/api/legacy").get_json()
+    assert body["status"] == "success"
+    assert body["data"] == {"id": 3}
+
+    resp = client.get("/api/legacy-error")
+    assert resp.status_code == 500
+    assert resp.get_json()["code"] == "HTTP_500"
+    assert resp.get_json()["message"] == "boom"
+
+
+def test_views_without_opt_in_untouched(client):
+    assert client.get("/api/raw").get_json() == {"raw": True}
+
+
+@pytest.fixture
+def factory_client(monkeypatch):
+    """create_app() (which registers grants) plus the real login-trace blueprint."""
+    from app import create_app
+    from app.blueprints import grants_routes
+    from app.cockpit.api import login_trace
+
+    flask_app = create_app(env_name="testing")
+    flask_app.register_blueprint(login_trace.login_trace_api)
+
+    class _NoTrace:
+        def get(self, key):
+            return None
+
+    def fail(grant_type, payload):
+        raise ValueError("unknown grant type")
+
+    monkeypatch.setattr(login_trace, "get_redis_client", _NoTrace)
+    monkeypatch.setattr(grants_routes, "compose_grant", fail)
+    with flask_app.app_context():
+        db.create_all()
+        # The JWT user loader resolves int(sub), so the caller needs a numeric id
+        db.session.add(User(id="1", email="grants@example.com", password_hash="x"))
+        db.session.commit()
+        token = create_access_token(identity="1")
+        yield flask_app.test_client(), token
+        db.session.remove()
+        db.drop_all()
+
+
+def test_create_app_keeps_legacy_api_contracts(factory_client):
+    """The factory only times requests; existing /api shapes are unchanged."""
+    client, token = factory_client
+
+    assert client.get("/api/login-trace/1").get_json() == {"status": "no recent login"}
+
+    resp = client.post(
+        "/api/grants/compose/nope", json={}, headers={"Authorization": f"Bearer {token}"}
+    )
+    assert resp.status_code == 500
+    assert resp.get_json() == {"error": "unknown grant type"}
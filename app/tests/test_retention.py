@@ -0,0 +1,205 @@
+# =============================================================================
+# FILE: app/tests/test_retention.py
+# DESCRIPTION: Retention and archival: chunked moves into archive tables and
+#              Parquet files, history pages across hot and archived rows,
+#              archive purges, MySQL partition DDL and the admin history route.
+# =============================================================================
+
+import datetime
+
+import pytest
+from flask import Flask
+from flask_login import LoginManager
+from sqlalchemy import func, insert, select
+
+import app.models  # noqa: F401 - register every table on db.metadata
+from app.blueprints.retention_routes import retention_bp
+from app.extensions import db
+from app.models.audit_log import AuditLog
+from app.models.schema_event import SchemaEvent
+from app.models.user import User
+from app.services import retention
+from app.utils.json_codec import init_json_provider
+
+NOW = datetime.datetime(2025, 6, 30, 12, 0)
+
+
+@pytest.fixture
+def retention_app(tmp_path):
+    flask_app = Flask(__name__)
+    flask_app.config.update(
+        SQLALCHEMY_DATABASE_URI="sqlite://",
+        SECRET_KEY="test",
+        RETENTION_DAYS={"schema_event": 10, "audit_logs": 10},
+        RETENTION_ARCHIVE_ROOT=str(tmp_path / "archive"),
+    )
+    db.init_app(flask_app)
+    init_json_provider(flask_app)
+    login_manager = LoginManager(flask_app)
+    login_manager.user_loader(lambda uid: db.session.get(User, uid))
+    flask_app.register_blueprint(retention_bp)
+    with flask_app.app_context():
+        db.create_all()
+        for uid, admin in (("u-a", True), ("u-b", False)):
+            db.session.add(
+                User(id=uid, email=f"{uid}@example.com", password_hash="x", is_admin=admin)
+            )
+        # One event a day for 25 days: 15 are past the 10 day retention age
+        for i in range(25):
+            db.session.add(
+                SchemaEvent(
+                    user_id="u-a" if i % 2 else "u-b",
+                    event_type="REVISION_APPLIED",
+                    timestamp=NOW - datetime.timedelta(days=24 - i, hours=1),
+                )
+            )
+        db.session.commit()
+    yield flask_app
+    with flask_app.app_context():
+        db.drop_all()
+
+
+@pytest.fixture
+def in_app(retention_app):
+    with retention_app.app_context():
+        yield
+        db.session.remove()
+
+
+def _count(table):
+    return db.session.execute(select(func.count()).select_from(table)).scalar()
+
+
+def _all_history(name, **kwargs):
+    ids, flags, cursor = [], [], None
+    while True:
+        page = retention.history(name, cursor=cursor, **kwargs)
+        ids += [row["id"] for row in page.items]
+        flags += [row["archived"] for row in page.items]
+        if not page.has_more:
+            return ids, flags
+        cursor = page.next_cursor
+
+
+def test_archive_moves_expired_rows_in_chunks(in_app):
+    result = retention.archive_expired("schema_event", now=NOW, chunk_rows=4)
+    assert (result["rows"], result["chunks"]) == (15, 4)
+
+    policy = retention.POLICIES["schema_event"]
+    assert _count(policy.table) == 10 and _count(policy.archive) == 15
+    oldest_hot = db.session.execute(select(func.min(SchemaEvent.timestamp))).scalar()
+    assert oldest_hot >= result["cutoff"]
+    archived = db.session.execute(select(policy.archive).order_by(policy.archive.c.id)).all()
+    assert [row.id for row in archived] == list(range(1, 16))
+    assert {row.archived_at for row in archived} == {NOW}
+
+    assert retention.archive_expired("schema_event", now=NOW)["rows"] == 0
+
+
+def test_history_reads_across_hot_and_archive(in_app):
+    before = _all_history("schema_event", limit=4)
+    retention.archive_expired("schema_event", now=NOW, chunk_rows=4)
+
+    ids, flags = _all_history("schema_event", limit=4)
+    assert ids == before[0] == list(range(25, 0, -1))
+    assert flags == [False] * 10 + [True] * 15
+
+    ids, _ = _all_history("schema_event", limit=3, descending=False, filters={"user_id": "u-b"})
+    assert ids == list(range(1, 26, 2))
+    start = NOW - datetime.timedelta(days=13)
+    page = retention.history("schema_event", start=start, end=NOW, limit=100)
+    assert [row["id"] for row in page.items] == list(range(25, 12, -1))
+
+    with pytest.raises(ValueError):
+        retention.history("schema_event", filters={"nope": 1})
+
+
+def test_parquet_archive_and_history(in_app, tmp_path):
+    pytest.importorskip("pyarrow.parquet")
+    for i in range(12):
+        db.session.add(
+            AuditLog(
+                user_id="u-a",
+                event_type="mock_bank_transfer_audit",
+                payload={"n": i},
+                created_at=NOW - datetime.timedelta(days=20 - i),
+            )
+        )
+    db.session.commit()
+
+    result = retention.archive_expired("audit_logs", target="parquet", now=NOW, chunk_rows=5)
+    assert (result["rows"], result["chunks"]) == (10, 2)
+    assert len(list((tmp_path / "archive" / "audit_logs").glob("part-*.parquet"))) == 2
+    assert _count(AuditLog.__table__) == 2
+
+    # A crash between writing a file and deleting its rows leaves both copies
+    policy = retention.POLICIES["audit_logs"]
+    row = {"user_id": "u-a", "event_type": "mock_bank_transfer_audit", "payload": {"n": 2}}
+    created_at = NOW - datetime.timedelta(days=18)
+    db.session.execute(insert(AuditLog.__table__), [{**row, "id": 3, "created_at": created_at}])
+    db.session.commit()
+    ids, flags = _all_history("audit_logs", limit=4, descending=False)
+    assert ids == list(range(1, 13))
+    assert flags == [True, True, False] + [True] * 7 + [False] * 2
+
+    page = retention.history("audit_logs", limit=1, descending=False)
+    assert page.items[0]["payload"] == {"n": 0}
+    assert page.items[0]["created_at"] == NOW - datetime.timedelta(days=20)
+    assert _count(policy.archive) == 0
+
+
+def test_parquet_history_reads_only_the_row_groups_it_needs(in_app, monkeypatch):
+    pq = pytest.importorskip("pyarrow.parquet")
+    retention.archive_expired("schema_event", target="parquet", now=NOW, chunk_rows=3)
+    reads = []
+    read_row_group = pq.ParquetFile.read_row_group
+
+    def counting_read(self, index, *args, **kwargs):
+        reads.append(index)
+        return read_row_group(self, index, *args, **kwargs)
+
+    monkeypatch.setattr(pq.ParquetFile, "read_row_group", counting_read)
+    # Five files of three archived rows; ten rows are still hot
+    ids, _ = _all_history("schema_event", limit=4, descending=False)
+    assert ids == list(range(1, 26))
+    # 7 pages: each row group read about once, not every file on every page
+    assert len(reads) <= 5 + 7
+
+    reads.clear()
+    page = retention.history("schema_event", limit=2, descending=False)
+    assert [row["id"] for row in page.items] == [1, 2] and len(reads) == 1
+    page = retention.history("schema_event", limit=2, descending=True)
+    assert [row["id"] for row in page.items] == [25, 24] and len(reads) == 2
+
+
+def test_purge_archive(in_app):
+    retention.archive_expired("schema_event", now=NOW)
+    result = retention.purge_archive("schema_event", 20, now=NOW, chunk_rows=2)
+    assert result["rows"] == 5 and result["partitions"] == []
+    assert _count(retention.POLICIES["schema_event"].archive) == 10
+
+
+def test_partition_definitions():
+    months = [datetime.date(2024, 11, 1), datetime.date(2024, 12, 1)]
+    assert retention.partition_definitions(months) == (
+        "(PARTITION p202411 VALUES LESS THAN ('2024-12-01'), "
+        "PARTITION p202412 VALUES LESS THAN ('2025-01-01'), "
+        "PARTITION pmax VALUES LESS THAN (MAXVALUE))"
+    )
+
+
+def test_history_route(retention_app):
+    client = retention_app.test_client()
+    with client.session_transaction() as sess:
+        sess["_user_id"] = "u-a"
+    response = client.get("/retention/schema_event/history?user_id=u-a&limit=5&order=asc")
+    assert response.status_code == 200
+    data = response.get_json()["data"]
+    assert [row["id"] for row in data["items"]] == [2, 4, 6, 8, 10]
+    assert data["next_cursor"]
+
+    assert client.get("/retention/nope/history").status_code == 404
+    assert client.get("/retention/schema_event/history?cursor=@@").status_code == 400
+    with client.session_transaction() as sess:
+        sess["_user_id"] = "u-b"
+    assert client.get("/retention/schema_event/history").status_code == 403
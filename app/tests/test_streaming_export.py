@@ -0,0 +1,147 @@
+# =============================================================================
+# FILE: app/tests/test_streaming_export.py
+# DESCRIPTION: Streaming NDJSON/CSV exports: owner scoping, filters, exact
+#              amounts, CSV layout, and resuming a windowed export through the
+#              X-Export-Next-Cursor header without gaps or duplicates.
+# =============================================================================
+
+import csv
+import datetime
+import io
+import json
+
+import pytest
+from flask import Flask
+from flask_login import LoginManager
+
+import app.models  # noqa: F401 - register every table on db.metadata
+from app.blueprints.export_routes import export_bp
+from app.extensions import db
+from app.models.ledger import LedgerEntry
+from app.models.transactions import Transaction
+from app.models.user import User
+from app.services.streaming_export import NEXT_CURSOR_HEADER
+from app.utils.export import iter_ndjson
+
+BASE = datetime.datetime(2025, 3, 1, 9, 30)
+
+
+@pytest.fixture
+def export_app():
+    flask_app = Flask(__name__)
+    flask_app.config.update(SQLALCHEMY_DATABASE_URI="sqlite://", SECRET_KEY="test")
+    db.init_app(flask_app)
+    login_manager = LoginManager(flask_app)
+    login_manager.user_loader(lambda uid: db.session.get(User, uid))
+    flask_app.register_blueprint(export_bp)
+    with flask_app.app_context():
+        db.create_all()
+        _seed()
+    # Requests push their own app context, so flask_login's g is per request
+    yield flask_app
+    with flask_app.app_context():
+        db.drop_all()
+
+
+def _seed():
+    for uid, admin in (("u-owner", False), ("u-other", False), ("u-admin", True)):
+        db.session.add(User(id=uid, email=f"{uid}@example.com", password_hash="x", is_admin=admin))
+    for i in range(25):
+        db.session.add(
+            Transaction(
+                id=f"t-{i:03d}",
+                user_id="u-owner" if i % 5 else "u-other",
+                amount=0.1 * (i + 1),
+                # pairs share a timestamp so the id tie-break matters
+                date=BASE + datetime.timedelta(days=i // 2),
+                category="Food" if i % 2 else "Travel",
+                location={"city": "Austin"},
+            )
+        )
+        db.session.add(LedgerEntry(borrower_id="u-other", amount=i + 0.5))
+    db.session.commit()
+
+
+def _client(flask_app, uid):
+    client = flask_app.test_client()
+    with client.session_transaction() as sess:
+        sess["_user_id"] = uid
+        sess["_fresh"] = True
+    return client
+
+
+def _lines(response):
+    return [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+
+def test_ndjson_export_is_scoped_ordered_and_exact(export_app):
+    response = _client(export_app, "u-owner").get("/export/transactions")
+    assert response.status_code == 200
+    assert response.is_streamed
+    assert response.mimetype == "application/x-ndjson"
+    assert NEXT_CURSOR_HEADER not in response.headers
+
+    rows = _lines(response)
+    assert len(rows) == 20 and {r["user_id"] for r in rows} == {"u-owner"}
+    assert [(r["date"], r["id"]) for r in rows] == sorted((r["date"], r["id"]) for r in rows)
+    first = rows[0]
+    assert first["id"] == "t-001" and first["amount"] == "0.20"  # exact cents, not 0.2000001
+    assert first["location"] == {"city": "Austin"}
+    assert "amount_exact" not in first
+
+
+def test_filters(export_app):
+    client = _client(export_app, "u-owner")
+    rows = _lines(client.get("/export/transactions?start=2025-03-02&end=2025-03-03&category=Food"))
+    assert [r["id"] for r in rows] == ["t-003"]
+    rows = _lines(client.get("/export/transactions?min_amount=2.15&max_amount=2.45"))
+    assert [r["id"] for r in rows] == ["t-021", "t-022", "t-023"]
+
+
+def test_windowed_export_resumes_without_gaps(export_app):
+    client = _client(export_app, "u-owner")
+    full = [r["id"] for r in _lines(client.get("/export/transactions"))]
+
+    seen, cursor, windows = [], "", 0
+    while True:
+        response = client.get(f"/export/transactions?limit=6&cursor={cursor}")
+        windows += 1
+        seen += [r["id"] for r in _lines(response)]
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if not cursor:
+            break
+    assert seen == full
+    assert windows == 4  # 6 + 6 + 6 + 2
+
+
+def test_csv_export(export_app):
+    response = _client(export_app, "u-owner").get("/export/transactions?format=csv")
+    assert response.mimetype == "text/csv"
+    reader = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+    assert len(reader) == 20
+    assert reader[0]["amount"] == "0.20"
+    assert json.loads(reader[0]["location"]) == {"city": "Austin"}
+    assert reader[0]["date"] == "2025-03-01T09:30:00"
+
+
+def test_ledger_admin_scope(export_app):
+    assert _lines(_client(export_app, "u-owner").get("/export/ledger")) == []
+    admin = _client(export_app, "u-admin")
+    rows = _lines(admin.get("/export/ledger?user_id=u-other&limit=10"))
+    assert [r["id"] for r in rows] == list(range(1, 11))
+    assert len(_lines(admin.get("/export/ledger"))) == 25
+
+
+@pytest.mark.parametrize(
+    "query", ["format=xml", "start=yesterday", "limit=0", "min_amount=lots", "cursor=@@"]
+)
+def test_bad_arguments_are_rejected(export_app, query):
+    response = _client(export_app, "u-owner").get(f"/export/transactions?{query}")
+    assert response.status_code == 400
+
+
+def test_ndjson_chunks_are_bounded():
+    chunks = list(iter_ndjson(({"i": i, "pad": "x" * 100} for i in range(2_000)), 4_096))
+    assert len(chunks) > 40
+    assert max(len(c) for c in chunks) < 4_096 + 200
+    assert sum(c.count(b"\n") for c in chunks) == 2_000
@@ -0,0 +1,112 @@
+# =============================================================================
+# FILE: app/tests/test_synthetic_data.py
+# DESCRIPTION: Synthetic dataset generator and columnar bulk loader: row
+#              counts, seed reproducibility, cents/units agreement, ORM
+#              round-trip of bulk-written JSON columns and column defaults.
+# =============================================================================
+
+from datetime import date
+
+import numpy as np
+import pytest
+from sqlalchemy import func, select
+
+from app.cockpit.lib import vault_queries
+from app.extensions import db
+from app.models import BorrowerCard, SchemaEvent, Transaction, User
+from app.models.borrower_card import parse_card_expiry
+from app.models.vault_transaction import VaultTransaction
+from app.services.synthetic_data import SyntheticConfig, SyntheticDataGenerator, seed_synthetic
+from app.utils.bulk_insert import _mysql_field, bulk_insert, prepare_rows
+
+SMALL = SyntheticConfig(
+    users=40, transactions=2_000, vault_transactions=300, schema_events=200, batch_size=700
+)
+
+
+def test_seed_counts_and_statements(sqlite_app, count_statements):
+    with count_statements() as statements:
+        counts = seed_synthetic(SMALL)
+
+    assert counts["users"] == 40
+    assert counts["transactions"] == 2_000
+    assert counts["vault_transactions"] == 300
+    assert counts["schema_event"] == 200
+    assert db.session.scalar(select(func.count()).select_from(Transaction)) == 2_000
+    # one executemany per batch, never per row
+    assert len([s for s in statements if s.startswith("INSERT")]) == 3 + 3 + 1 + 1
+
+
+def test_same_seed_same_rows():
+    def sample(config):
+        generator = SyntheticDataGenerator(config)
+        *_, population = generator.users()
+        return generator.transactions(population, 0, 500)
+
+    first, second = sample(SMALL), sample(SMALL)
+    other = sample(SyntheticConfig(**{**SMALL.__dict__, "seed": 7}))
+    for column in ("id", "user_id", "amount_cents", "date", "name"):
+        assert list(first[column]) == list(second[column])
+    assert list(first["amount_cents"]) != list(other["amount_cents"])
+
+
+def test_amounts_agree_with_cents():
+    generator = SyntheticDataGenerator(SMALL)
+    *_, population = generator.users()
+    batch = generator.transactions(population, 0, 1_000)
+    cents = np.asarray(batch["amount_cents"])
+    assert np.array_equal(np.round(np.asarray(batch["amount"]) * 100).astype(np.int64), cents)
+    assert (cents > 0).any() and (cents < 0).any()  # deposits and spend
+
+
+def test_bulk_rows_load_through_orm(sqlite_app):
+    seed_synthetic(SMALL)
+    txn = db.session.scalars(select(Transaction).where(Transaction.mcc.isnot(None))).first()
+    assert float(txn.amount_exact) == txn.amount
+    assert isinstance(txn.category_hierarchy, list)
+    assert isinstance(txn.location, dict) and "city" in txn.location
+    assert db.session.scalars(select(VaultTransaction)).first().status
+    assert db.session.scalars(select(SchemaEvent)).first().event_type
+
+
+def test_seeded_cards_have_expires_on(sqlite_app):
+    seed_synthetic(SMALL)
+    cards = db.session.scalars(select(BorrowerCard)).all()
+    assert cards
+    for card in cards:
+        assert card.expires_on is not None
+        assert card.expires_on == parse_card_expiry(card.expiration_date)
+
+    # every synthetic card expires by the end of 2030
+    metrics = vault_queries.vault_card_metrics(today=date(2031, 1, 1))
+    assert metrics["total"] == len(cards)
+    assert metrics["expired"] == sum(not card.revoked for card in cards)
+
+
+def test_bulk_insert_fills_python_defaults(sqlite_app):
+    columns = {
+        "id": ["u-1", "u-2"],
+        "email": ["a@example.com", "b@example.com"],
+        "username": ["a", "b"],
+        "password_hash": ["x", "x"],
+    }
+    with db.engine.begin() as conn:
+        assert bulk_insert(conn, User.__table__, columns) == 2
+    users = db.session.scalars(select(User).order_by(User.email)).all()
+    assert [u.is_admin for u in users] == [False, False]
+    assert users[0].uuid and users[0].uuid != users[1].uuid  # callable default, per row
+
+    with pytest.raises(ValueError, match="unknown columns"):
+        prepare_rows(User.__table__, {"nope": [1]}, db.engine.dialect)
+    with pytest.raises(ValueError, match="different lengths"):
+        prepare_rows(User.__table__, {"id": [1], "email": []}, db.engine.dialect)
+
+
+def test_load_data_fields_escape_backslashes_and_quote_text():
+    assert _mysql_field(None) == r"\N"
+    assert _mysql_field(True) == "1"
+    assert _mysql_field(12) == "12"
+    # Literal "\N", "NULL" and backslashes stay text under ESCAPED BY '\\'
+    assert _mysql_field("\\N") == '"\\\\N"'
+    assert _mysql_field("NULL") == '"NULL"'
+    assert _mysql_field('C:\\tmp "x"\n') == '"C:\\\\tmp \\"x\\"\\n"'
@@ -0,0 +1,114 @@
+# =============================================================================
+# FILE: app/tests/test_template_cache.py
+# DESCRIPTION: Jinja bytecode cache shared across app instances,
+#              `flask templates precompile` (including failure on syntax
+#              errors) and per-template render timing.
+# =============================================================================
+
+import pytest
+from flask import Flask, render_template, render_template_string
+from jinja2 import Environment
+
+from app.cli.templates import templates
+from app.utils import template_cache
+
+
+def _make_app(template_dir, cache_dir):
+    flask_app = Flask(__name__, template_folder=str(template_dir))
+    flask_app.config.update(
+        TEMPLATE_BYTECODE_CACHE=True, TEMPLATE_BYTECODE_CACHE_DIR=str(cache_dir)
+    )
+    template_cache.init_template_cache(flask_app)
+    return flask_app
+
+
+@pytest.fixture
+def template_dir(tmp_path):
+    folder = tmp_path / "templates"
+    (folder / "admin").mkdir(parents=True)
+    (folder / "base.html").write_text("<title>{% block title %}{% endblock %}</title>")
+    (folder / "admin" / "page.html").write_text(
+        '{% extends "base.html" %}{% block title %}{{ name }}{% endblock %}'
+    )
+    return folder
+
+
+def _precompile(flask_app):
+    # with_appcontext reuses any app context already pushed, so push ours
+    with flask_app.app_context():
+        return flask_app.test_cli_runner().invoke(templates, ["precompile"])
+
+
+@pytest.fixture
+def compile_calls(monkeypatch):
+    calls = []
+    compile_source = Environment.compile
+
+    def compile(self, source, name=None, filename=None, *args, **kwargs):
+        calls.append(name)
+        return compile_source(self, source, name, filename, *args, **kwargs)
+
+    monkeypatch.setattr(Environment, "compile", compile)
+    return calls
+
+
+def test_precompile_populates_shared_cache(template_dir, tmp_path, compile_calls):
+    cache_dir = tmp_path / "bytecode"
+    first = _make_app(template_dir, cache_dir)
+    result = _precompile(first)
+    assert result.exit_code == 0, result.output
+    assert "Compiled 2 templates" in result.output
+    assert len(list(cache_dir.iterdir())) == 2
+    assert sorted(compile_calls) == ["admin/page.html", "base.html"]
+
+    # A fresh worker renders from bytecode without compiling anything
+    compile_calls.clear()
+    worker = _make_app(template_dir, cache_dir)
+    with worker.test_request_context():
+        assert render_template("admin/page.html", name="Vault") == "<title>Vault</title>"
+    assert compile_calls == []
+
+    # Edited sources get a new checksum and are recompiled
+    (template_dir / "base.html").write_text("<h1>{% block title %}{% endblock %}</h1>")
+    recycled = _make_app(template_dir, cache_dir)
+    with recycled.test_request_context():
+        assert render_template("admin/page.html", name="Vault") == "<h1>Vault</h1>"
+    assert compile_calls == ["base.html"]
+
+
+def test_precompile_fails_on_syntax_error(template_dir, tmp_path):
+    (template_dir / "broken.html").write_text("{% if x %}never closed")
+    (template_dir / "filtered.html").write_text("{{ x|no_such_filter }}")
+    flask_app = _make_app(template_dir, tmp_path / "bytecode")
+
+    result = _precompile(flask_app)
+    assert result.exit_code == 1
+    assert "broken.html:1" in result.output
+    assert "no_such_filter" in result.output
+    assert "2 templates failed to compile" in result.output
+
+
+def test_render_time_recorded_per_template(template_dir, tmp_path, monkeypatch):
+    samples = []
+    monkeypatch.setattr(
+        template_cache,
+        "record_timing_sample",
+        lambda name, seconds, labels: samples.append((name, labels["template"], seconds)),
+    )
+    flask_app = _make_app(template_dir, tmp_path / "bytecode")
+    with flask_app.test_request_context():
+        render_template("admin/page.html", name="x")
+        render_template_string("{{ 1 + 1 }}")
+
+    assert [(name, template) for name, template, _ in samples] == [
+        (template_cache.RENDER_METRIC, "admin/page.html"),
+        (template_cache.RENDER_METRIC, "<string>"),
+    ]
+    assert all(seconds >= 0 for _, _, seconds in samples)
+
+
+def test_cache_off_when_testing(template_dir):
+    flask_app = Flask(__name__, template_folder=str(template_dir))
+    flask_app.testing = True
+    template_cache.init_template_cache(flask_app)
+    assert flask_app.jinja_env.bytecode_cache is None
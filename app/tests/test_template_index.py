@@ -0,0 +1,147 @@
+# =============================================================================
+# FILE: app/tests/test_template_index.py
+# DESCRIPTION: Shared template index: AST facts (url_for targets, template
+#              edges, variables), incremental refresh by mtime/hash,
+#              persistence across processes, and the three template audits
+#              served from a single pass.
+# =============================================================================
+
+import os
+from unittest.mock import MagicMock
+
+import pytest
+from flask import Flask
+from jinja2 import Environment
+
+from app.cockpit import template_tracer
+from app.utils import nav_audit, template_audit, template_index
+from app.utils.template_index import TemplateIndex, get_template_index
+
+
+@pytest.fixture
+def template_dir(tmp_path):
+    folder = tmp_path / "templates"
+    (folder / "admin").mkdir(parents=True)
+    (folder / "base.html").write_text(
+        "{% block content %}{% endblock %}{% include ['footer.html', 'blank.html'] %}"
+    )
+    (folder / "footer.html").write_text("<a href=\"{{ url_for('main.home') }}\">{{ year }}</a>")
+    (folder / "navbar.html").write_text(
+        "{{ url_for('main.home') }} {{ url_for('auth.gone') }} {{ url_for(dynamic) }}"
+    )
+    (folder / "admin" / "page.html").write_text(
+        '{% extends "base.html" %}{% import "macros.html" as m %}'
+        "{% block content %}{% for row in rows %}{{ row }}{{ url_for('admin.page') }}"
+        "{% endfor %}{{ user.email }}{% endblock %}"
+    )
+    (folder / "macros.html").write_text("{% macro x() %}{% endmacro %}")
+    return folder
+
+
+@pytest.fixture
+def flask_app(template_dir, tmp_path, monkeypatch):
+    monkeypatch.setattr(template_index, "_indexes", {})
+    flask_app = Flask(__name__, template_folder=str(template_dir))
+    flask_app.config["TEMPLATE_INDEX_PATH"] = str(tmp_path / "index.json")
+    flask_app.add_url_rule("/", "main.home", lambda: "home")
+    flask_app.add_url_rule("/admin", "admin.page", lambda: "admin")
+    return flask_app
+
+
+@pytest.fixture
+def parses(monkeypatch):
+    names = []
+    parse = Environment.parse
+
+    def counting_parse(self, source, name=None, filename=None):
+        names.append(str(filename))
+        return parse(self, source, name, filename)
+
+    monkeypatch.setattr(Environment, "parse", counting_parse)
+    return names
+
+
+def test_index_records_ast_facts(template_dir):
+    index = TemplateIndex(env=Flask(__name__).jinja_env)
+    index.refresh([str(template_dir)])
+    page = index.get_path(template_dir / "admin" / "page.html")
+
+    assert page.name == "admin/page.html"
+    assert page.url_for == ["admin.page"]
+    assert page.extends == ["base.html"]
+    assert page.imports == ["macros.html"]
+    assert page.variables == ["rows", "user"]  # not the loop variable or url_for global
+    assert index.get_path(template_dir / "base.html").includes == ["footer.html", "blank.html"]
+    assert index.get_path(template_dir / "navbar.html").url_for == ["main.home", "auth.gone"]
+    assert index.dependents("base.html") == ["admin/page.html"]
+    assert index.has("admin/page.html") and index.has("page.html")
+    assert not index.has("missing.html")
+
+
+def test_refresh_parses_only_changed_files(template_dir, tmp_path, parses):
+    store = str(tmp_path / "index.json")
+    index = TemplateIndex(store)
+    assert index.refresh([str(template_dir)])["parsed"] == 5
+    assert sorted(os.path.basename(p) for p in parses) == [
+        "base.html",
+        "footer.html",
+        "macros.html",
+        "navbar.html",
+        "page.html",
+    ]
+
+    parses.clear()
+    assert index.refresh([str(template_dir)])["unchanged"] == 5
+    assert parses == []
+
+    footer = template_dir / "footer.html"
+    footer.write_text("{{ url_for('main.about') }}")
+    stat = os.stat(footer)
+    os.utime(template_dir / "macros.html", ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    (template_dir / "navbar.html").unlink()
+    (template_dir / "broken.html").write_text("{% if %}{{ url_for('main.x') }}")
+
+    stats = index.refresh([str(template_dir)])
+    assert stats == {"files": 5, "parsed": 2, "touched": 1, "unchanged": 2, "removed": 1}
+    assert sorted(os.path.basename(p) for p in parses) == ["broken.html", "footer.html"]
+    broken = index.get_path(template_dir / "broken.html")
+    assert broken.syntax_error and broken.url_for == ["main.x"]  # regex fallback
+
+    # A fresh process reuses the persisted index without parsing
+    parses.clear()
+    reloaded = TemplateIndex(store)
+    assert reloaded.refresh([str(template_dir)])["unchanged"] == 5
+    assert parses == []
+    assert reloaded.get_path(footer).url_for == ["main.about"]
+
+
+def test_all_audits_share_one_pass(flask_app, template_dir, parses, monkeypatch):
+    monkeypatch.setattr(template_audit, "emit_schema_trace", lambda **kwargs: None)
+
+    with flask_app.app_context():
+        nav = nav_audit.audit_navbar(flask_app)
+        templates = nav_audit.audit_templates(flask_app)
+        summary = template_audit.audit_template_wiring(MagicMock())
+        index = get_template_index(flask_app, [template_tracer.TEMPLATES_DIR])
+        assert template_tracer.template_exists("cockpit/cockpit_dashboard.html", index)
+
+    own = [p for p in parses if p.startswith(str(template_dir))]
+    assert len(own) == len(set(own)) == 5  # each template parsed once for all audits
+    assert nav["endpoints_in_nav"] == ["auth.gone", "main.home"]
+    assert nav["missing_endpoints"] == ["auth.gone"]
+    assert templates["missing_endpoints"] == ["auth.gone"]
+    assert summary["templates_scanned"] == 5
+    assert summary["endpoints_found"] == 4
+    assert summary["missing_endpoints"] == 1
+
+    parses.clear()
+    with flask_app.app_context():
+        nav_audit.audit_templates(flask_app)
+        template_audit.audit_template_wiring(MagicMock())
+    assert parses == []
+
+
+def test_navbar_missing_raises(flask_app, template_dir):
+    (template_dir / "navbar.html").unlink()
+    with flask_app.app_context(), pytest.raises(FileNotFoundError):
+        nav_audit.audit_navbar(flask_app)
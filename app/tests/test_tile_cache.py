@@ -0,0 +1,316 @@
+# =============================================================================
+# FILE: app/tests/test_tile_cache.py
+# DESCRIPTION: Tests for the cockpit tile cache: LRU bound, single-flight,
+#              stale-while-revalidate, metrics, shared tier and invalidation.
+# =============================================================================
+
+import datetime
+import threading
+import time
+
+import pytest
+from sqlalchemy import Column, Integer, String, create_engine
+from sqlalchemy.orm import Session, declarative_base
+
+from app.cockpit.lib import ttl
+
+
+class FakeSharedRedis:
+    """Dict-backed stand-in for the handful of commands the shared tier uses."""
+
+    def __init__(self):
+        self.data = {}
+        self.sets = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def mget(self, *keys):
+        return [self.data.get(key) for key in keys]
+
+    def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, 0)) + 1).encode()
+        return int(self.data[key])
+
+    def set(self, key, value, nx=False, px=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    def setex(self, key, ttl_seconds, value):
+        self.data[key] = value if isinstance(value, bytes) else str(value).encode()
+
+    def sadd(self, key, member):
+        self.sets.setdefault(key, set()).add(member)
+
+    def smembers(self, key):
+        return set(self.sets.get(key, ()))
+
+    def expire(self, key, seconds):
+        return True
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+            self.sets.pop(key, None)
+
+    def pipeline(self):
+        return _Pipeline(self)
+
+
+class _Pipeline:
+    def __init__(self, client):
+        self._client = client
+        self._calls = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self._calls.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    def execute(self):
+        return [getattr(self._client, n)(*a, **kw) for n, a, kw in self._calls]
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    fresh = ttl.TileCache(max_entries=3)
+    monkeypatch.setattr(ttl, "_tile_cache", fresh)
+    monkeypatch.setattr(ttl, "_shared_client", lambda: None)
+    return fresh
+
+
+def test_local_tier_is_lru_bounded(cache):
+    calls = []
+
+    @ttl.ttl_cache(seconds=60, name="bounded")
+    def tile(n):
+        calls.append(n)
+        return n * 2
+
+    for n in range(5):
+        assert tile(n) == n * 2
+    assert len(cache) == 3
+
+    tile(4)  # most recent: still cached
+    tile(0)  # evicted: recomputed
+    assert calls == [0, 1, 2, 3, 4, 0]
+
+
+def test_concurrent_misses_compute_once(cache):
+    started = threading.Event()
+    release = threading.Event()
+    computes = []
+
+    @ttl.ttl_cache(seconds=60, name="slow")
+    def tile():
+        computes.append(1)
+        started.set()
+        release.wait(5)
+        return {"value": 42}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(tile())) for _ in range(8)]
+    threads[0].start()
+    started.wait(5)
+    for t in threads[1:]:
+        t.start()
+    time.sleep(0.05)
+    release.set()
+    for t in threads:
+        t.join(5)
+
+    assert computes == [1]
+    assert results == [{"value": 42}] * 8
+    stats = ttl.tile_cache_stats()["tiles"]["slow"]
+    assert stats["computes"] == 1
+    assert stats["misses"] == 1
+    assert stats["waits"] == 7
+
+
+def test_stale_value_served_while_one_caller_revalidates(cache, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(ttl.time, "time", lambda: clock[0])
+    version = [1]
+    refreshing = threading.Event()
+    release = threading.Event()
+
+    @ttl.ttl_cache(seconds=10, stale_seconds=30, name="swr")
+    def tile():
+        if version[0] > 1:
+            refreshing.set()
+            release.wait(5)
+        return version[0]
+
+    assert tile() == 1
+    clock[0] += 15  # expired but inside the stale window
+    version[0] = 2
+
+    leader = threading.Thread(target=tile)
+    leader.start()
+    refreshing.wait(5)
+    assert tile() == 1  # served stale while the leader recomputes
+    release.set()
+    leader.join(5)
+    assert tile() == 2
+
+    stats = ttl.tile_cache_stats()["tiles"]["swr"]
+    assert stats["stale_hits"] == 1
+    assert stats["computes"] == 2
+
+
+def test_refresh_failure_falls_back_to_stale(cache, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(ttl.time, "time", lambda: clock[0])
+    fail = [False]
+
+    @ttl.ttl_cache(seconds=10, stale_seconds=30, name="flaky")
+    def tile():
+        if fail[0]:
+            raise RuntimeError("db down")
+        return "ok"
+
+    assert tile() == "ok"
+    clock[0] += 15
+    fail[0] = True
+    assert tile() == "ok"
+    clock[0] += 60  # past the stale window: error propagates
+    with pytest.raises(RuntimeError):
+        tile()
+    assert ttl.tile_cache_stats()["tiles"]["flaky"]["errors"] == 2
+
+
+def test_shared_tier_reused_across_workers(cache, monkeypatch):
+    shared = FakeSharedRedis()
+    monkeypatch.setattr(ttl, "_shared_client", lambda: shared)
+    computes = []
+
+    @ttl.ttl_cache(seconds=60, name="shared_tile", shared=True)
+    def tile(limit=5):
+        computes.append(limit)
+        return [{"n": i} for i in range(limit)]
+
+    assert tile(limit=2) == [{"n": 0}, {"n": 1}]
+    cache.drop(["shared_tile"])  # simulate another worker with a cold local tier
+    assert tile(limit=2) == [{"n": 0}, {"n": 1}]
+
+    assert computes == [2]
+    assert ttl.tile_cache_stats()["tiles"]["shared_tile"]["shared_hits"] == 1
+
+
+def test_unencodable_results_stay_local(cache, monkeypatch):
+    shared = FakeSharedRedis()
+    monkeypatch.setattr(ttl, "_shared_client", lambda: shared)
+
+    @ttl.ttl_cache(seconds=60, name="objects", shared=True)
+    def tile():
+        return object()
+
+    first = tile()
+    assert tile() is first
+    assert shared.data == {}
+
+
+def test_invalidate_by_tag_clears_both_tiers(cache, monkeypatch):
+    shared = FakeSharedRedis()
+    monkeypatch.setattr(ttl, "_shared_client", lambda: shared)
+    value = [1]
+
+    @ttl.ttl_cache(seconds=60, name="tagged", shared=True, tags=("events",))
+    def tile():
+        return value[0]
+
+    @ttl.invalidates("events")
+    def write_event(v):
+        value[0] = v
+
+    assert tile() == 1
+    assert shared.data
+    write_event(2)
+    assert list(shared.data) == ["cockpit:tile:gen:tagged"] and shared.sets == {}
+    assert tile() == 2
+
+
+def test_invalidation_during_refresh_is_not_undone(cache, monkeypatch):
+    shared = FakeSharedRedis()
+    monkeypatch.setattr(ttl, "_shared_client", lambda: shared)
+    value = [1]
+    computing = threading.Event()
+    release = threading.Event()
+
+    @ttl.ttl_cache(seconds=60, name="racy", shared=True, tags=("events",))
+    def tile():
+        read = value[0]
+        computing.set()
+        release.wait(5)
+        return read
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(tile()))
+    leader.start()
+    computing.wait(5)
+    value[0] = 2
+    ttl.invalidate_tiles("events")  # the write lands while the leader computes
+    release.set()
+    leader.join(5)
+
+    assert results == [1]  # its own callers get what it computed
+    assert len(cache) == 0
+    assert not any(key.startswith("cockpit:tile:racy:") for key in shared.data)
+    assert tile() == 2
+
+    # A worker that missed the invalidation cannot publish its old result either
+    stale_skey = ttl._shared_key(("racy", (), ()))
+    ttl._shared_put(shared, "racy", stale_skey, 1, time.time(), 60, generation=0)
+    cache.drop(["racy"])
+    assert tile() == 2
+
+
+def test_shared_tier_keeps_local_types(cache, monkeypatch):
+    shared = FakeSharedRedis()
+    monkeypatch.setattr(ttl, "_shared_client", lambda: shared)
+
+    @ttl.ttl_cache(seconds=60, name="typed", shared=True)
+    def tile(kind):
+        return {"pair": (1, 2)} if kind == "tuple" else {"at": datetime.datetime(2025, 1, 1)}
+
+    for kind in ("tuple", "datetime"):
+        first = tile(kind)
+        cache.drop(["typed"])  # a cold worker must recompute, not read a JSON copy
+        assert tile(kind) == first
+        assert type(next(iter(tile(kind).values()))) is type(next(iter(first.values())))
+    assert not any(key.startswith("cockpit:tile:typed:") for key in shared.data)
+
+
+def test_invalidate_on_write_fires_after_commit(cache):
+    Base = declarative_base()
+
+    class Widget(Base):
+        __tablename__ = "widgets"
+        id = Column(Integer, primary_key=True)
+        name = Column(String(20))
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    ttl.invalidate_on_write(Widget, "widgets")
+
+    @ttl.ttl_cache(seconds=60, name="widget_count", tags=("widgets",))
+    def widget_count():
+        with Session(engine) as s:
+            return s.query(Widget).count()
+
+    assert widget_count() == 0
+    with Session(engine) as s:
+        s.add(Widget(name="a"))
+        s.flush()
+        s.rollback()
+    assert widget_count() == 0
+    assert ttl.tile_cache_stats()["tiles"]["widget_count"]["hits"] == 1
+
+    with Session(engine) as s:
+        s.add(Widget(name="b"))
+        s.commit()
+    assert widget_count() == 1
@@ -0,0 +1,215 @@
+# =============================================================================
+# FILE: app/tests/test_vault_pages.py
+# DESCRIPTION: Cockpit vault/card page loaders: keyset pagination, filtering,
+#              and a fixed SQL statement count per page regardless of how many
+#              rows exist (no per-row lazy loads); card expiry metrics.
+# =============================================================================
+
+import datetime
+
+import pytest
+
+from app.cockpit.lib import vault_queries
+from app.cockpit.tiles import vault_transaction_tile
+from app.extensions import db
+from app.models.borrower_card import BorrowerCard
+from app.models.user import User
+from app.models.vault_transaction import VaultTransaction
+from app.utils.pagination import InvalidCursor, PageParams
+
+BASE = datetime.datetime(2025, 1, 1)
+
+
+def _seed(users, txns_per_user):
+    for u in range(users):
+        user = User(
+            id=f"user-{u:04d}",
+            username=f"borrower{u:04d}",
+            email=f"b{u}@example.com",
+            password_hash="x",
+            role="borrower",
+        )
+        db.session.add(user)
+        db.session.add(
+            BorrowerCard(
+                user_id=user.id,
+                card_number=f"4000{u:012d}",
+                expiration_date="12/30",
+                cvv="123",
+                score=550 + (u * 7) % 300,
+                color="green",
+                issued_at=BASE + datetime.timedelta(days=u),
+                revoked=(u % 5 == 0),
+            )
+        )
+        for t in range(txns_per_user):
+            db.session.add(
+                VaultTransaction(
+                    user_id=user.id,
+                    transaction_id=f"tx-{u}-{t}",
+                    amount=10.0 + t,
+                    status="pending" if t % 2 else "settled",
+                    created_at=BASE + datetime.timedelta(hours=u * txns_per_user + t),
+                )
+            )
+    db.session.commit()
+    db.session.expunge_all()
+
+
+def _touch_tile(data):
+    return [(row["borrower"]["username"], row["card_last4"]) for row in data["items"]]
+
+
+@pytest.mark.parametrize("users", [3, 40])
+def test_statement_count_is_independent_of_rows(sqlite_app, count_statements, monkeypatch, users):
+    _seed(users, txns_per_user=3)
+    monkeypatch.setattr(vault_transaction_tile, "get_redis_client", lambda: None)
+    params = PageParams(sort="created_at", descending=True, cursor=None, limit=25)
+    # created_at and issued_at are nullable: a page that runs out of non-NULL
+    # rows also reads the NULL segment (one more statement, still per page)
+    null_segment = 1 if users * 3 <= 25 else 0
+
+    with count_statements() as stmts:
+        page = vault_queries.vault_transaction_page(params)
+        [tx.user.username for tx in page.items]
+    assert len(stmts) == 1 + null_segment
+
+    with count_statements() as stmts:
+        _touch_tile(vault_transaction_tile.get_vault_transaction_tile(limit=25))
+    assert len(stmts) == 2 + null_segment
+
+    card_params = PageParams(sort="issued_at", descending=True, cursor=None, limit=25)
+    with count_statements() as stmts:
+        page = vault_queries.borrower_card_page(card_params)
+        [card.user.username for card in page.items]
+    assert len(stmts) == 1 + (1 if users <= 25 else 0)
+
+    with count_statements() as stmts:
+        metrics = vault_queries.vault_card_metrics()
+    assert len(stmts) == 1
+    assert metrics["total"] == users
+
+
+def test_keyset_pages_cover_every_row_once(sqlite_app):
+    _seed(12, txns_per_user=4)
+    seen, cursor = [], None
+    while True:
+        params = PageParams(sort="amount", descending=False, cursor=cursor, limit=7)
+        page = vault_queries.vault_transaction_page(params)
+        seen.extend((tx.amount, tx.id) for tx in page.items)
+        if not page.has_more:
+            break
+        cursor = page.next_cursor
+
+    assert len(seen) == 48
+    assert seen == sorted(seen)
+    assert len(set(seen)) == 48
+
+
+def test_filters_and_datetime_cursor(sqlite_app):
+    _seed(10, txns_per_user=4)
+    params = PageParams(sort="created_at", descending=True, cursor=None, limit=5)
+    first = vault_queries.vault_transaction_page(params, status="pending", min_amount=11)
+    assert all(tx.status == "pending" and tx.amount >= 11 for tx in first.items)
+
+    params.cursor = first.next_cursor
+    second = vault_queries.vault_transaction_page(params, status="pending", min_amount=11)
+    assert second.items[0].created_at < first.items[-1].created_at
+
+    cards = vault_queries.borrower_card_page(
+        PageParams(sort="score", descending=True, cursor=None, limit=50),
+        include_revoked=False,
+    )
+    scores = [card.score for card in cards.items]
+    assert scores == sorted(scores, reverse=True)
+    assert not any(card.revoked for card in cards.items)
+
+
+@pytest.mark.parametrize("descending", [True, False])
+def test_null_sort_values_page_last(sqlite_app, descending):
+    _seed(3, txns_per_user=4)
+    db.session.execute(
+        VaultTransaction.__table__.update()
+        .where(VaultTransaction.id % 3 == 0)
+        .values(created_at=None)
+    )
+    db.session.commit()
+
+    seen, cursor = [], None
+    while True:
+        params = PageParams(sort="created_at", descending=descending, cursor=cursor, limit=3)
+        page = vault_queries.vault_transaction_page(params)
+        seen.extend((tx.created_at, tx.id) for tx in page.items)
+        if not page.has_more:
+            break
+        cursor = page.next_cursor
+
+    assert sorted(tx_id for _, tx_id in seen) == list(range(1, 13))
+    dated = [key for key in seen if key[0] is not None]
+    assert seen[: len(dated)] == sorted(dated, reverse=descending)
+    assert [tx_id for _, tx_id in seen[len(dated) :]] == sorted(
+        (tx_id for tx_id in range(1, 13) if tx_id % 3 == 0), reverse=descending
+    )
+
+
+def test_garbage_cursor_rejected(sqlite_app):
+    params = PageParams(sort="created_at", descending=True, cursor="not-a-cursor", limit=5)
+    with pytest.raises(InvalidCursor):
+        vault_queries.vault_transaction_page(params)
+
+
+def _card(n, expiration, revoked=False, last_used_at=None):
+    return BorrowerCard(
+        user_id="user-0000",
+        card_number=f"5000{n:012d}",
+        expiration_date=expiration,
+        cvv="123",
+        score=700,
+        color="green",
+        revoked=revoked,
+        last_used_at=last_used_at,
+    )
+
+
+def test_expires_on_tracks_expiration_string(sqlite_app):
+    card = _card(1, "02/28")
+    assert card.expires_on == datetime.date(2028, 2, 29)
+    card.expiration_date = "13/27"
+    assert card.expires_on is None
+
+
+def test_card_metrics_buckets_and_cache(sqlite_app, count_statements):
+    _seed(1, txns_per_user=0)  # user-0000 (its card is revoked)
+    today = datetime.date(2025, 6, 10)
+    long_ago = datetime.datetime(2024, 1, 1)
+    db.session.add_all(
+        [
+            _card(1, "05/25"),  # expired
+            _card(2, "06/25"),  # expiring (ends 2025-06-30)
+            _card(3, "07/25"),  # active: ends 2025-07-31, 51 days out
+            _card(4, "12/27", last_used_at=long_ago),  # dormant
+            _card(5, "12/27", last_used_at=datetime.datetime(2025, 6, 1)),  # active
+            _card(6, "01/20", revoked=True),  # revoked wins over expired
+        ]
+    )
+    db.session.commit()
+
+    with count_statements() as stmts:
+        metrics = vault_queries.vault_card_metrics(today=today)
+        assert vault_queries.vault_card_metrics(today=today) == metrics
+    assert len(stmts) == 1  # second call served from the tile cache
+    assert metrics == {
+        "active": 2,  # card 5 and card 3 (expires 2025-07-31)
+        "expiring": 1,
+        "expired": 1,
+        "dormant": 1,
+        "revoked": 2,
+        "total": 7,
+    }
+
+    soon = vault_queries.cards_expiring_soon(within_days=60, today=today).all()
+    assert [c.card_number[-1] for c in soon] == ["2", "3"]
+
+    db.session.add(_card(7, "06/25"))
+    db.session.commit()  # invalidates the cached metrics
+    assert vault_queries.vault_card_metrics(today=today)["expiring"] == 2
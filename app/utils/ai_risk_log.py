@@ -0,0 +1,98 @@
+# =============================================================================
+# FILE: app/utils/ai_risk_log.py
+# DESCRIPTION: Time-ordered index for AI risk evaluation logs in Redis.
+#              Each log is still stored under `grants_composed:<ts>`; a sorted
+#              set scored by timestamp lets readers fetch the newest N or a
+#              time window with ZREVRANGEBYSCORE + MGET instead of KEYS.
+#              Logs written before the index existed are indexed once by
+#              `flask cockpit:ai-risk-index`, never on the read path.
+# =============================================================================
+
+from __future__ import annotations
+
+import time
+
+from app.utils import json_codec
+
+LOG_PREFIX = "grants_composed:"
+INDEX_KEY = "grants_composed:index"
+BACKFILL_MARKER_KEY = "grants_composed:index:backfilled"
+RETENTION_SECONDS = 86400 * 30
+
+
+def record_ai_risk_log(client, payload: dict, ts: float | None = None) -> str:
+    """Store ``payload`` and index it by ``ts`` (epoch seconds). Returns the key."""
+    ts = time.time() if ts is None else ts
+    key = f"{LOG_PREFIX}{ts}"
+    pipe = client.pipeline()
+    pipe.setex(key, RETENTION_SECONDS, json_codec.dumps(payload))
+    pipe.zadd(INDEX_KEY, {key: ts})
+    # Entries past retention have expired already; drop them from the index
+    pipe.zremrangebyscore(INDEX_KEY, "-inf", ts - RETENTION_SECONDS)
+    pipe.execute()
+    return key
+
+
+def backfill_ai_risk_log_index(client, force: bool = False) -> int | None:
+    """
+    Index logs written before the sorted set existed (one SCAN, not KEYS).
+
+    Runs once per Redis: the first caller claims BACKFILL_MARKER_KEY with
+    SET NX and later calls return None without scanning unless ``force``.
+    Returns the number of keys indexed.
+    """
+    if not client.set(BACKFILL_MARKER_KEY, time.time(), nx=True) and not force:
+        return None
+    scores = {}
+    for raw_key in client.scan_iter(match=f"{LOG_PREFIX}*", count=500):
+        key = raw_key.decode() if isinstance(raw_key, bytes) else raw_key
+        try:
+            scores[key] = float(key[len(LOG_PREFIX) :])
+        except ValueError:
+            continue  # the index itself, or a foreign key
+    if scores:
+        client.zadd(INDEX_KEY, scores)
+    return len(scores)
+
+
+def recent_ai_risk_logs(
+    client,
+    limit: int | None = 20,
+    since: float | None = None,
+    until: float | None = None,
+) -> list[dict]:
+    """Newest-first decoded logs, optionally bounded to [since, until] (limit=None: all)."""
+    if client is None:
+        return []
+    keys = client.zrevrangebyscore(
+        INDEX_KEY,
+        "+inf" if until is None else until,
+        "-inf" if since is None else since,
+        start=0,
+        num=-1 if limit is None else limit,
+    )
+    if not keys:
+        return []
+
+    logs, expired = [], []
+    for key, raw in zip(keys, client.mget(keys)):
+        if raw is None:
+            expired.append(key)
+            continue
+        try:
+            logs.append(json_codec.loads(raw))
+        except ValueError:
+            continue
+    if expired:
+        client.zrem(INDEX_KEY, *expired)
+    return logs
+
+
+__all__ = [
+    "BACKFILL_MARKER_KEY",
+    "INDEX_KEY",
+    "LOG_PREFIX",
+    "backfill_ai_risk_log_index",
+    "recent_ai_risk_logs",
+    "record_ai_risk_log",
+]
@@ -9,6 +9,8 @@ from typing import Any
 
 from flask import Response, g, jsonify
 
+from app.middleware.response_wrapper import mark_enveloped
+
 logger = logging.getLogger(__name__)
 
 
@@ -58,7 +60,8 @@ def format_response(
             data,
         )
 
-    return jsonify(response_payload), http_status_code
+    # Marked so the response middleware never re-parses an envelope we built
+    return mark_enveloped(jsonify(response_payload)), http_status_code
 
 
 def success_response(
@@ -0,0 +1,121 @@
+# =============================================================================
+# FILE: app/utils/boot_profile.py
+# DESCRIPTION: Startup profiling helpers.
+#              - BootProfile: per-step wall-clock timings for create_app()
+#              - profile_imports(): per-module import cost via `-X importtime`
+#              Used by `flask boot-profile` and the startup budget test.
+# =============================================================================
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+
+# Snippet executed in a fresh interpreter so nothing is already cached in
+# sys.modules; TESTING keeps create_app off the production database.
+_IMPORT_PROBE = (
+    "import os; os.environ.setdefault('FLASK_ENV', 'testing'); "
+    "from app import create_app; create_app(env_name=os.environ.get('BOOT_PROFILE_ENV'))"
+)
+
+
+@dataclass
+class BootProfile:
+    """Ordered per-step timings recorded while the application factory runs."""
+
+    started_at: float = field(default_factory=time.perf_counter)
+    steps: list[tuple[str, float]] = field(default_factory=list)
+    finished_at: float | None = None
+
+    @contextmanager
+    def step(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.steps.append((name, (time.perf_counter() - start) * 1000))
+
+    def finish(self) -> None:
+        """Stop the clock; ``total_ms`` then covers the whole factory run."""
+        self.finished_at = time.perf_counter()
+
+    @property
+    def total_ms(self) -> float:
+        """Wall time from construction to ``finish()`` (or now), timed or not."""
+        end = self.finished_at if self.finished_at is not None else time.perf_counter()
+        return (end - self.started_at) * 1000
+
+    def as_dict(self) -> dict:
+        total = self.total_ms
+        timed = sum(ms for _, ms in self.steps)
+        return {
+            "steps": [{"step": name, "ms": round(ms, 2)} for name, ms in self.steps],
+            "untimed_ms": round(max(total - timed, 0.0), 2),
+            "total_ms": round(total, 2),
+        }
+
+
+@dataclass(frozen=True)
+class ImportTiming:
+    module: str
+    self_us: int
+    cumulative_us: int
+
+
+def parse_importtime(stderr: str) -> list[ImportTiming]:
+    """Parse `python -X importtime` output into ImportTiming rows."""
+    rows: list[ImportTiming] = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:") :].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            self_us, cumulative_us = int(parts[0]), int(parts[1])
+        except ValueError:
+            continue  # header row
+        rows.append(ImportTiming(parts[2].strip(), self_us, cumulative_us))
+    return rows
+
+
+def profile_imports(env_name: str | None = None, timeout: int = 300) -> list[ImportTiming]:
+    """
+    Import the app and run create_app() in a subprocess under -X importtime.
+
+    Returns one ImportTiming per imported module, in import order.
+    """
+    project_root = Path(__file__).resolve().parents[2]
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(project_root), env.get("PYTHONPATH")]))
+    if env_name:
+        env["BOOT_PROFILE_ENV"] = env_name
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _IMPORT_PROBE],
+        cwd=str(project_root),
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=timeout,
+    )
+    return parse_importtime(proc.stderr)
+
+
+def app_module_timings(rows: list[ImportTiming], prefix: str = "app") -> list[ImportTiming]:
+    """Filter to first-party modules, most expensive (self time) first."""
+    own = [r for r in rows if r.module == prefix or r.module.startswith(prefix + ".")]
+    return sorted(own, key=lambda r: r.self_us, reverse=True)
+
+
+__all__ = [
+    "BootProfile",
+    "ImportTiming",
+    "app_module_timings",
+    "parse_importtime",
+    "profile_imports",
+]
@@ -0,0 +1,204 @@
+# =============================================================================
+# FILE: app/utils/bulk_insert.py
+# DESCRIPTION: Columnar bulk loading for seeders, archival and backfills.
+#              Rows arrive as {column name: sequence} (NumPy arrays or lists)
+#              and are written through the fastest path the dialect offers:
+#                - postgresql   COPY ... FROM STDIN (CSV) via psycopg2
+#                - mysql        LOAD DATA LOCAL INFILE when requested and the
+#                               connection allows it, else executemany (which
+#                               PyMySQL rewrites into multi-row INSERTs)
+#                - others       DBAPI executemany in chunks (SQLite)
+#              No ORM objects or per-row dicts are built. Values go through
+#              each column type's dialect bind processor, so JSON, DateTime
+#              and Boolean columns are stored as the ORM would store them.
+#              Python-side column defaults are filled for omitted columns.
+#              MoneyCents columns take integer cents, never float units.
+# =============================================================================
+
+from __future__ import annotations
+
+import csv
+import io
+import logging
+import os
+import tempfile
+from collections.abc import Mapping, Sequence
+from typing import Any
+
+from sqlalchemy import JSON, Table
+
+from app.utils.money import MoneyCents
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK = 50_000
+
+
+def _as_list(values: Any) -> list:
+    # numpy arrays convert to Python scalars (datetime64[us] -> datetime) in C
+    return values.tolist() if hasattr(values, "tolist") else list(values)
+
+
+def _column_values(column, values: list, dialect) -> list:
+    if isinstance(column.type, MoneyCents):
+        # Already integer cents; MoneyCents' own binder would read ints as units
+        return [None if v is None else int(v) for v in values]
+    processor = column.type.dialect_impl(dialect).bind_processor(dialect)
+    if not processor:
+        return values
+    if isinstance(column.type, JSON):
+        # Generators share one dict/list per distinct value: serialize each once
+        serialized: dict[int, Any] = {}
+        out = []
+        for v in values:
+            key = id(v)
+            if key not in serialized:
+                serialized[key] = processor(v)
+            out.append(serialized[key])
+        return out
+    return [processor(v) for v in values]
+
+
+def _default_values(column, n: int) -> list | None:
+    """Python-side default for an omitted column, one per row when it must be unique."""
+    default = column.default
+    if default is None or not (default.is_scalar or default.is_callable):
+        return None
+    if default.is_scalar:
+        return [default.arg] * n
+    if column.primary_key or column.unique:
+        return [default.arg(None) for _ in range(n)]
+    return [default.arg(None)] * n
+
+
+def prepare_rows(table: Table, columns: Mapping[str, Sequence], dialect) -> tuple[list, list]:
+    """Column names and bind-processed row tuples for ``table``."""
+    lengths = {len(v) for v in columns.values()}
+    if len(lengths) != 1:
+        raise ValueError(f"{table.name}: columns have different lengths {sorted(lengths)}")
+    n = lengths.pop()
+
+    unknown = set(columns) - set(table.c.keys())
+    if unknown:
+        raise ValueError(f"{table.name}: unknown columns {', '.join(sorted(unknown))}")
+
+    names, data = [], []
+    for column in table.columns:
+        if column.key in columns:
+            values = _as_list(columns[column.key])
+        else:
+            values = _default_values(column, n)
+            if values is None:
+                continue
+        names.append(column.name)
+        data.append(_column_values(column, values, dialect))
+    return names, list(zip(*data))
+
+
+def bulk_insert(
+    connection,
+    table: Table,
+    columns: Mapping[str, Sequence],
+    chunk_size: int = DEFAULT_CHUNK,
+    load_data: bool = False,
+) -> int:
+    """
+    Insert the columnar batch ``columns`` into ``table`` on ``connection``
+    (a SQLAlchemy Connection inside the caller's transaction). Returns the
+    number of rows written.
+    """
+    dialect = connection.dialect
+    names, rows = prepare_rows(table, columns, dialect)
+    if not rows:
+        return 0
+
+    if dialect.name == "postgresql" and dialect.driver == "psycopg2":
+        _copy_postgres(connection, table, names, rows)
+    elif dialect.name == "mysql" and load_data and _load_data_mysql(connection, table, names, rows):
+        pass
+    else:
+        _executemany(connection, table, names, rows, chunk_size)
+    return len(rows)
+
+
+def _placeholders(dialect, count: int) -> str:
+    marker = "?" if dialect.paramstyle == "qmark" else "%s"
+    return ", ".join([marker] * count)
+
+
+def _executemany(connection, table, names, rows, chunk_size) -> None:
+    preparer = connection.dialect.identifier_preparer
+    statement = (
+        f"INSERT INTO {preparer.format_table(table)} "
+        f"({', '.join(preparer.quote(n) for n in names)}) "
+        f"VALUES ({_placeholders(connection.dialect, len(names))})"
+    )
+    for start in range(0, len(rows), chunk_size):
+        connection.exec_driver_sql(statement, rows[start : start + chunk_size])
+
+
+def _csv_value(value):
+    if value is None:
+        return r"\N"
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    return value
+
+
+def _copy_postgres(connection, table, names, rows) -> None:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows([_csv_value(v) for v in row] for row in rows)
+    buffer.seek(0)
+    preparer = connection.dialect.identifier_preparer
+    cursor = connection.connection.dbapi_connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {preparer.format_table(table)} "
+            f"({', '.join(preparer.quote(n) for n in names)}) "
+            "FROM STDIN WITH (FORMAT csv, NULL '\\N')",
+            buffer,
+        )
+    finally:
+        cursor.close()
+
+
+# LOAD DATA's default ESCAPED BY '\\' applies inside quoted fields too, and an
+# unquoted NULL reads as SQL NULL, so text is always quoted and escaped here
+# rather than written by the csv module.
+_MYSQL_ESCAPES = str.maketrans({"\\": "\\\\", '"': '\\"', "\n": "\\n", "\r": "\\r", "\0": "\\0"})
+
+
+def _mysql_field(value) -> str:
+    """One LOAD DATA field: bare \\N / numbers, everything else quoted and escaped."""
+    if value is None:
+        return r"\N"
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    if isinstance(value, bytes):
+        value = value.decode("utf-8")
+    return '"' + str(value).translate(_MYSQL_ESCAPES) + '"'
+
+
+def _load_data_mysql(connection, table, names, rows) -> bool:
+    """LOAD DATA LOCAL INFILE; False (caller falls back) when the server refuses it."""
+    preparer = connection.dialect.identifier_preparer
+    with tempfile.NamedTemporaryFile(
+        "w", suffix=".csv", delete=False, newline="", encoding="utf-8"
+    ) as fh:
+        fh.writelines(",".join(map(_mysql_field, row)) + "\n" for row in rows)
+    try:
+        connection.exec_driver_sql(
+            f"LOAD DATA LOCAL INFILE %s INTO TABLE {preparer.format_table(table)} "
+            "CHARACTER SET utf8mb4 FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' "
+            "ESCAPED BY '\\\\' "
+            f"LINES TERMINATED BY '\\n' ({', '.join(preparer.quote(n) for n in names)})",
+            (fh.name,),
+        )
+        return True
+    except Exception as e:
+        logger.warning("LOAD DATA LOCAL INFILE unavailable (%s); using executemany", e)
+        return False
+    finally:
+        os.unlink(fh.name)
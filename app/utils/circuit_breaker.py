@@ -0,0 +1,159 @@
+# =============================================================================
+# FILE: app/utils/circuit_breaker.py
+# DESCRIPTION: Thread-safe closed/open/half-open circuit breaker. Used to
+#              fast-fail Redis calls while the server is unreachable instead
+#              of paying a socket timeout on every request.
+# =============================================================================
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Classic three-state breaker.
+
+    - closed: calls pass; ``failure_threshold`` consecutive failures open it.
+    - open: calls are refused until ``reset_timeout`` seconds have passed.
+    - half_open: a single trial call is let through; success closes the
+      breaker, failure re-opens it for another ``reset_timeout``.
+
+    ``on_transition(name, old_state, new_state, snapshot)`` is invoked outside
+    the breaker lock on every state change.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 3,
+        reset_timeout: float = 30.0,
+        on_transition: Callable[[str, str, str, dict[str, Any]], None] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.reset_timeout = float(reset_timeout)
+        self.on_transition = on_transition
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._rejected = 0
+
+    # ------------------------------------------------------------------
+    # State
+    # ------------------------------------------------------------------
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+                return HALF_OPEN
+            return self._state
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            retry_in = 0.0
+            if self._state == OPEN:
+                retry_in = max(0.0, self.reset_timeout - (self._clock() - self._opened_at))
+            return {
+                "name": self.name,
+                "state": self._state,
+                "consecutive_failures": self._failures,
+                "failure_threshold": self.failure_threshold,
+                "reset_timeout": self.reset_timeout,
+                "retry_in": round(retry_in, 2),
+                "rejected": self._rejected,
+            }
+
+    # ------------------------------------------------------------------
+    # Call protocol
+    # ------------------------------------------------------------------
+    def allow(self) -> bool:
+        """Return True if a call may proceed; False while the breaker is open."""
+        transition = None
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            if self._state == OPEN:
+                if self._clock() - self._opened_at < self.reset_timeout:
+                    self._rejected += 1
+                    return False
+                transition = self._set_state(HALF_OPEN)
+            if self._trial_in_flight:
+                self._rejected += 1
+                allowed = False
+            else:
+                self._trial_in_flight = True
+                allowed = True
+        self._notify(transition)
+        return allowed
+
+    def record_success(self) -> None:
+        transition = None
+        with self._lock:
+            self._failures = 0
+            self._trial_in_flight = False
+            if self._state != CLOSED:
+                transition = self._set_state(CLOSED)
+        self._notify(transition)
+
+    def record_failure(self) -> None:
+        transition = None
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._state == HALF_OPEN or (
+                self._state == CLOSED and self._failures >= self.failure_threshold
+            ):
+                self._opened_at = self._clock()
+                transition = self._set_state(OPEN)
+            elif self._state == OPEN:
+                self._opened_at = self._clock()
+        self._notify(transition)
+
+    def cancel_trial(self) -> None:
+        """Give up a half-open trial that never reached the dependency."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def reset(self) -> None:
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+            self._rejected = 0
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+    def _set_state(self, new_state: str) -> tuple[str, str]:
+        old_state, self._state = self._state, new_state
+        return old_state, new_state
+
+    def _notify(self, transition: tuple[str, str] | None) -> None:
+        if transition is None:
+            return
+        old_state, new_state = transition
+        logger.warning("Circuit %s: %s -> %s", self.name, old_state, new_state)
+        if self.on_transition is None:
+            return
+        try:
+            self.on_transition(self.name, old_state, new_state, self.snapshot())
+        except Exception:
+            logger.debug("Circuit transition hook failed.", exc_info=True)
+
+
+__all__ = ["CLOSED", "HALF_OPEN", "OPEN", "CircuitBreaker"]
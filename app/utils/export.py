@@ -1,8 +1,17 @@
 # /home/srpihhllc/PlaidBridgeOpenBankingApi/app/utils/export.py
 
 import csv
+import datetime
 import io
 import json
+from collections.abc import Iterable, Iterator
+
+from app.utils import json_codec
+
+# Bytes buffered before a chunk is handed to the WSGI server
+CHUNK_BYTES = 64 * 1024
+
+CARD_EVENT_FIELDS = ["event_type", "by", "card_id", "timestamp", "reason", "method"]
 
 
 def serialize_logs_as_json(logs):
@@ -13,7 +22,7 @@ def serialize_logs_as_csv(logs):
     output = io.StringIO()
     writer = csv.DictWriter(
         output,
-        fieldnames=["event_type", "by", "card_id", "timestamp", "reason", "method"],
+        fieldnames=CARD_EVENT_FIELDS,
     )
     writer.writeheader()
     for log in logs:
@@ -28,3 +37,66 @@ def serialize_logs_as_csv(logs):
             }
         )
     return output.getvalue()
+
+
+# -----------------------------------------------------------------------------
+# Streaming serializers: each yields UTF-8 chunks of about CHUNK_BYTES, so an
+# export of any size holds one chunk (plus the rows being fetched) in memory.
+# -----------------------------------------------------------------------------
+def iter_ndjson(records: Iterable[dict], chunk_bytes: int = CHUNK_BYTES) -> Iterator[bytes]:
+    """One JSON object per line."""
+    buffer = bytearray()
+    for record in records:
+        buffer += json_codec.dumpb(record)
+        buffer += b"\n"
+        if len(buffer) >= chunk_bytes:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
+
+def iter_json_array(records: Iterable[dict], chunk_bytes: int = CHUNK_BYTES) -> Iterator[bytes]:
+    """A single JSON array, written element by element."""
+    buffer = bytearray(b"[")
+    separator = b""
+    for record in records:
+        buffer += separator + json_codec.dumpb(record)
+        separator = b","
+        if len(buffer) >= chunk_bytes:
+            yield bytes(buffer)
+            buffer.clear()
+    buffer += b"]"
+    yield bytes(buffer)
+
+
+_CSV_PASSTHROUGH = {str, int, float, bool}
+
+
+def _csv_cell(value):
+    if type(value) in _CSV_PASSTHROUGH:
+        return value
+    if value is None:
+        return ""
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return json_codec.dumps(value)
+    return value
+
+
+def iter_csv(
+    records: Iterable[dict], fieldnames: list[str], chunk_bytes: int = CHUNK_BYTES
+) -> Iterator[bytes]:
+    """Header row, then one row per record; nested values are written as JSON."""
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow(fieldnames)
+    for record in records:
+        writer.writerow([_csv_cell(record.get(name)) for name in fieldnames])
+        if output.tell() >= chunk_bytes:
+            yield output.getvalue().encode("utf-8")
+            output.seek(0)
+            output.truncate()
+    if output.tell():
+        yield output.getvalue().encode("utf-8")
@@ -0,0 +1,340 @@
+# =============================================================================
+# FILE: app/utils/http_client.py
+# DESCRIPTION: Shared HTTP client for outbound vendor calls.
+#              One requests.Session per process (rebuilt after fork) whose
+#              adapter keeps a keep-alive connection pool per host, so
+#              repeat calls skip the TCP and TLS handshakes. Every call is
+#              made on behalf of a vendor, which sets its timeouts, retry
+#              budget and how many calls may be in flight at once.
+#
+#              Retries use full-jitter exponential backoff. Connections that
+#              were refused or timed out are always retried (the request never
+#              reached the vendor); other errors, read timeouts and
+#              429/502/503/504 responses only for idempotent calls
+#              (GET/HEAD/PUT/DELETE/OPTIONS, or idempotent=True). A caller
+#              over the vendor's concurrency cap waits up to
+#              HTTP_CONCURRENCY_WAIT seconds, then gets VendorBusy; a slot
+#              is held per attempt and released during backoff sleeps.
+#              Per-vendor latency and per-host pool metrics: http_stats().
+#
+# Config (app config, else environment):
+#   HTTP_POOL_MAXSIZE       keep-alive connections kept per host
+#   HTTP_CONCURRENCY_WAIT   seconds to wait for a vendor slot
+#   HTTP_BACKOFF_BASE       first retry backoff ceiling, seconds (doubles)
+#   HTTP_BACKOFF_MAX        backoff ceiling, seconds
+#   HTTP_VENDORS            {vendor: {connect_timeout, read_timeout,
+#                            retries, max_concurrency}} overrides
+# =============================================================================
+
+from __future__ import annotations
+
+import logging
+import os
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, replace
+from typing import Any
+
+import requests
+from flask import current_app, has_app_context
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_MAXSIZE = 10
+DEFAULT_CONCURRENCY_WAIT = 2.0
+DEFAULT_BACKOFF_BASE = 0.2
+DEFAULT_BACKOFF_MAX = 5.0
+SAMPLES_PER_VENDOR = 1024
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "PUT", "DELETE", "OPTIONS"})
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+
+
+class VendorBusy(requests.exceptions.RequestException):
+    """Raised when a vendor's concurrency cap stayed full for the whole wait."""
+
+
+@dataclass(frozen=True)
+class Vendor:
+    name: str
+    connect_timeout: float = 3.05
+    read_timeout: float = 10.0
+    retries: int = 2
+    max_concurrency: int = 8
+
+
+VENDORS = {
+    v.name: v
+    for v in (
+        Vendor("truelayer"),
+        Vendor("tink"),
+        Vendor("treasury_prime"),
+        Vendor("reflectorai", max_concurrency=4),
+        Vendor("pythonanywhere", retries=1, max_concurrency=2),
+    )
+}
+
+
+def _config_value(name: str, default: Any) -> Any:
+    if has_app_context():
+        return current_app.config.get(name, os.getenv(name, default))
+    return os.getenv(name, default)
+
+
+def register_vendor(name: str, **settings: Any) -> Vendor:
+    """Add a vendor, or change the defaults of an existing one."""
+    VENDORS[name] = replace(VENDORS.get(name, Vendor(name)), **settings)
+    return VENDORS[name]
+
+
+def vendor_settings(name: str) -> Vendor:
+    vendor = VENDORS.get(name) or Vendor(name)
+    overrides = (_config_value("HTTP_VENDORS", None) or {}).get(name)
+    return replace(vendor, **overrides) if overrides else vendor
+
+
+# -----------------------------------------------------------------------------
+# Session, slots and stats (per process; rebuilt after fork)
+# -----------------------------------------------------------------------------
+_lock = threading.Lock()
+_session: requests.Session | None = None
+_session_pid: int | None = None
+_slots: dict[tuple[str, int], threading.BoundedSemaphore] = {}
+_stats: dict[str, dict[str, Any]] = {}
+
+
+def _new_session() -> requests.Session:
+    maxsize = int(_config_value("HTTP_POOL_MAXSIZE", DEFAULT_POOL_MAXSIZE))
+    # Retries are ours (jitter, idempotency, metrics), so urllib3's are off
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=maxsize, max_retries=0)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session() -> requests.Session:
+    """This process's pooled session."""
+    global _session, _session_pid
+    if _session_pid == os.getpid():
+        return _session
+    with _lock:
+        if _session_pid != os.getpid():
+            if _session_pid is not None:
+                # Inherited across fork: the sockets are the parent's; drop them unclosed
+                _slots.clear()
+                _stats.clear()
+            _session = _new_session()
+            _session_pid = os.getpid()
+    return _session
+
+
+def reset_http_client() -> None:
+    """Close this process's pooled connections and clear metrics."""
+    global _session, _session_pid
+    with _lock:
+        if _session is not None and _session_pid == os.getpid():
+            _session.close()
+        _session = None
+        _session_pid = None
+        _slots.clear()
+        _stats.clear()
+
+
+def _slot(vendor: Vendor) -> threading.BoundedSemaphore:
+    key = (vendor.name, vendor.max_concurrency)
+    with _lock:
+        if key not in _slots:
+            _slots[key] = threading.BoundedSemaphore(max(1, vendor.max_concurrency))
+        return _slots[key]
+
+
+def _vendor_stats(name: str) -> dict[str, Any]:
+    stats = _stats.get(name)
+    if stats is None:
+        stats = _stats.setdefault(
+            name,
+            {
+                "requests": 0,
+                "attempts": 0,
+                "retries": 0,
+                "errors": 0,
+                "rejected": 0,
+                "statuses": {},
+                "latency_ms": deque(maxlen=SAMPLES_PER_VENDOR),
+            },
+        )
+    return stats
+
+
+def _record(name: str, **changes: Any) -> None:
+    with _lock:
+        stats = _vendor_stats(name)
+        for key, value in changes.items():
+            if key == "latency_ms":
+                stats["latency_ms"].append(value)
+            elif key == "status":
+                bucket = f"{value // 100}xx"
+                stats["statuses"][bucket] = stats["statuses"].get(bucket, 0) + 1
+            else:
+                stats[key] += value
+
+
+# -----------------------------------------------------------------------------
+# Requests
+# -----------------------------------------------------------------------------
+def _backoff(attempt: int, response: requests.Response | None) -> float:
+    ceiling = float(_config_value("HTTP_BACKOFF_MAX", DEFAULT_BACKOFF_MAX))
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    if retry_after and retry_after.isdigit():
+        return min(float(retry_after), ceiling)
+    base = float(_config_value("HTTP_BACKOFF_BASE", DEFAULT_BACKOFF_BASE))
+    return random.uniform(0, min(ceiling, base * 2**attempt))
+
+
+def _never_sent(exc: requests.exceptions.RequestException) -> bool:
+    """Connect timeouts and refused or unresolvable connections never reached the vendor."""
+    if isinstance(exc, requests.exceptions.ConnectTimeout):
+        return True
+    reason = getattr(exc.args[0], "reason", None) if exc.args else None
+    return isinstance(reason, NewConnectionError)
+
+
+def request(
+    vendor: str,
+    method: str,
+    url: str,
+    *,
+    idempotent: bool | None = None,
+    **kwargs: Any,
+) -> requests.Response:
+    """
+    ``requests.request`` through the pooled session on behalf of ``vendor``.
+
+    ``timeout`` defaults to the vendor's (connect, read) timeouts. The last
+    response is returned even if its status was retryable; connection and
+    timeout errors propagate as requests exceptions once retries run out.
+    """
+    settings = vendor_settings(vendor)
+    method = method.upper()
+    if idempotent is None:
+        idempotent = method in IDEMPOTENT_METHODS
+    kwargs.setdefault("timeout", (settings.connect_timeout, settings.read_timeout))
+    wait = float(_config_value("HTTP_CONCURRENCY_WAIT", DEFAULT_CONCURRENCY_WAIT))
+
+    session = get_session()
+    slot = _slot(settings)
+    attempt = 0
+    while True:
+        # The slot covers one attempt; it is given back while backing off
+        if not slot.acquire(timeout=wait):
+            _record(vendor, rejected=1)
+            raise VendorBusy(f"{vendor}: {settings.max_concurrency} calls already in flight")
+        response = None
+        try:
+            if attempt == 0:
+                _record(vendor, requests=1)
+            started = time.perf_counter()
+            try:
+                response = session.request(method, url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as exc:
+                retry = attempt < settings.retries and (idempotent or _never_sent(exc))
+                _record(vendor, attempts=1, errors=0 if retry else 1)
+                if not retry:
+                    raise
+            else:
+                _record(
+                    vendor,
+                    attempts=1,
+                    latency_ms=(time.perf_counter() - started) * 1000,
+                    status=response.status_code,
+                )
+                retry = (
+                    idempotent
+                    and attempt < settings.retries
+                    and response.status_code in RETRY_STATUSES
+                )
+                if not retry:
+                    return response
+                response.close()  # hand the connection back before sleeping
+        finally:
+            slot.release()
+        delay = _backoff(attempt, response)
+        attempt += 1
+        _record(vendor, retries=1)
+        logger.info("%s %s %s: retry %d in %.2fs", vendor, method, url, attempt, delay)
+        time.sleep(delay)
+
+
+def get(vendor: str, url: str, **kwargs: Any) -> requests.Response:
+    return request(vendor, "GET", url, **kwargs)
+
+
+def post(vendor: str, url: str, **kwargs: Any) -> requests.Response:
+    return request(vendor, "POST", url, **kwargs)
+
+
+# -----------------------------------------------------------------------------
+# Metrics
+# -----------------------------------------------------------------------------
+def _summary(values) -> dict[str, float]:
+    if not values:
+        return {"avg_ms": 0.0, "p50_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0}
+    ordered = sorted(values)
+    return {
+        "avg_ms": round(sum(ordered) / len(ordered), 2),
+        "p50_ms": round(ordered[len(ordered) // 2], 2),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 2),
+        "max_ms": round(ordered[-1], 2),
+    }
+
+
+def _pool_stats() -> dict[str, dict[str, int]]:
+    session = _session if _session_pid == os.getpid() else None
+    if session is None:
+        return {}
+    pools = {}
+    for adapter in {id(a): a for a in session.adapters.values()}.values():
+        manager = getattr(adapter, "poolmanager", None)
+        if manager is None:
+            continue
+        for key in manager.pools.keys():
+            pool = manager.pools[key]
+            pools[f"{pool.scheme}://{pool.host}:{pool.port}"] = {
+                "connections": pool.num_connections,
+                "requests": pool.num_requests,
+                "idle": pool.pool.qsize() if pool.pool is not None else 0,
+            }
+    return pools
+
+
+def http_stats() -> dict[str, Any]:
+    """Per-vendor call counts and latency, and per-host connection reuse."""
+    with _lock:
+        vendors = {
+            name: {
+                **{k: v for k, v in stats.items() if k not in ("latency_ms", "statuses")},
+                "statuses": dict(stats["statuses"]),
+                "latency": _summary(stats["latency_ms"]),
+            }
+            for name, stats in _stats.items()
+        }
+    return {"pid": os.getpid(), "vendors": vendors, "hosts": _pool_stats()}
+
+
+__all__ = [
+    "VENDORS",
+    "Vendor",
+    "VendorBusy",
+    "get",
+    "get_session",
+    "http_stats",
+    "post",
+    "register_vendor",
+    "request",
+    "reset_http_client",
+    "vendor_settings",
+]
@@ -0,0 +1,227 @@
+# =============================================================================
+# FILE: app/utils/json_codec.py
+# DESCRIPTION: Central JSON codec for responses, telemetry and Redis payloads.
+#              Uses orjson or msgspec when installed and falls back to the
+#              stdlib json module, with the same output rules in every mode:
+#              compact separators, UTF-8, ISO-8601 datetimes, Decimal/UUID as
+#              strings. Flask responses keep Flask's RFC 822 (HTTP-date)
+#              format for dates and datetimes.
+# =============================================================================
+
+from __future__ import annotations
+
+import dataclasses
+import datetime
+import decimal
+import enum
+import hashlib
+import json
+import logging
+import uuid
+from typing import Any
+
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.http import http_date
+
+logger = logging.getLogger(__name__)
+
+try:  # pragma: no cover - depends on the environment
+    import orjson as _orjson
+except Exception:  # pragma: no cover
+    _orjson = None
+
+try:  # pragma: no cover - depends on the environment
+    import msgspec as _msgspec
+except Exception:  # pragma: no cover
+    _msgspec = None
+
+if _orjson is not None:
+    BACKEND = "orjson"
+elif _msgspec is not None:
+    BACKEND = "msgspec"
+else:
+    BACKEND = "stdlib"
+
+
+def _default(obj: Any) -> Any:
+    """Encode types the fast backends (and stdlib) do not handle natively."""
+    if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
+        return obj.isoformat()
+    if isinstance(obj, decimal.Decimal):
+        return str(obj)
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    if isinstance(obj, enum.Enum):
+        return obj.value
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if isinstance(obj, bytes):
+        return obj.decode("utf-8", errors="replace")
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    if hasattr(obj, "to_dict") and callable(obj.to_dict):
+        return obj.to_dict()
+    if hasattr(obj, "__html__"):
+        return str(obj.__html__())
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _http_default(obj: Any) -> Any:
+    """Flask's wire format: dates and datetimes as RFC 822 (HTTP) dates."""
+    if isinstance(obj, datetime.date):
+        return http_date(obj)
+    return _default(obj)
+
+
+def _hash_default(obj: Any) -> Any:
+    """Like ``_default``, but unknown types are hashed by their ``str()``."""
+    try:
+        return _default(obj)
+    except TypeError:
+        return str(obj)
+
+
+def _stdlib_dumps(obj: Any, sort_keys: bool, default=_default) -> str:
+    return json.dumps(
+        obj,
+        default=default,
+        ensure_ascii=False,
+        separators=(",", ":"),
+        sort_keys=sort_keys,
+    )
+
+
+# ``_encode(obj, sort_keys, default, native_dates)``: with native_dates=False,
+# dates/datetimes/times are handed to ``default`` instead of the backend.
+if _orjson is not None:
+    _ORJSON_OPTS = _orjson.OPT_NON_STR_KEYS | _orjson.OPT_SERIALIZE_NUMPY
+
+    def _encode(obj: Any, sort_keys: bool, default, native_dates: bool = True) -> bytes:
+        opts = _ORJSON_OPTS
+        if sort_keys:
+            opts |= _orjson.OPT_SORT_KEYS
+        if not native_dates:
+            opts |= _orjson.OPT_PASSTHROUGH_DATETIME
+        try:
+            return _orjson.dumps(obj, default=default, option=opts)
+        except TypeError:
+            # e.g. integers wider than 64 bits; stdlib handles those
+            return _stdlib_dumps(obj, sort_keys, default).encode("utf-8")
+
+    def _loads(data: str | bytes | bytearray) -> Any:
+        return _orjson.loads(data)
+
+elif _msgspec is not None:
+    _ENCODERS: dict = {}
+    _DECODER = _msgspec.json.Decoder()
+
+    def _encode(obj: Any, sort_keys: bool, default, native_dates: bool = True) -> bytes:
+        if not native_dates:
+            # msgspec always encodes dates itself
+            return _stdlib_dumps(obj, sort_keys, default).encode("utf-8")
+        encoder = _ENCODERS.get((default, sort_keys))
+        if encoder is None:
+            order = "sorted" if sort_keys else None
+            encoder = _ENCODERS[(default, sort_keys)] = _msgspec.json.Encoder(
+                enc_hook=default, order=order
+            )
+        try:
+            return encoder.encode(obj)
+        except (TypeError, _msgspec.EncodeError):
+            return _stdlib_dumps(obj, sort_keys, default).encode("utf-8")
+
+    def _loads(data: str | bytes | bytearray) -> Any:
+        return _DECODER.decode(data)
+
+else:
+
+    def _encode(obj: Any, sort_keys: bool, default, native_dates: bool = True) -> bytes:
+        return _stdlib_dumps(obj, sort_keys, default).encode("utf-8")
+
+    def _loads(data: str | bytes | bytearray) -> Any:
+        return json.loads(data)
+
+
+def dumpb(obj: Any, *, sort_keys: bool = False) -> bytes:
+    """Serialize ``obj`` to UTF-8 JSON bytes."""
+    return _encode(obj, sort_keys, _default)
+
+
+def dumps(obj: Any, *, sort_keys: bool = False) -> str:
+    """Serialize ``obj`` to a JSON string."""
+    return dumpb(obj, sort_keys=sort_keys).decode("utf-8")
+
+
+def loads(data: str | bytes | bytearray | memoryview) -> Any:
+    """Deserialize JSON from str/bytes (Redis returns either)."""
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    try:
+        return _loads(data)
+    except ValueError:
+        raise
+    except Exception as exc:
+        # Normalize backend-specific decode errors to ValueError like json.loads
+        raise ValueError(str(exc)) from exc
+
+
+def stable_hash(obj: Any) -> str:
+    """SHA-256 of the canonical (sorted-key) encoding of ``obj``.
+
+    Values the codec cannot encode are hashed by their ``str()``, as the
+    ``json.dumps(..., default=str)`` callers this replaced did.
+    """
+    return hashlib.sha256(_encode(obj, True, _hash_default)).hexdigest()
+
+
+# =============================================================================
+# Flask integration
+# =============================================================================
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by the central codec.
+
+    Dates and datetimes keep Flask's RFC 822 wire format and keys stay sorted
+    (the inherited ``sort_keys = True``), so API clients see the same output
+    as with ``DefaultJSONProvider``.
+    """
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if kwargs.keys() - {"sort_keys"}:
+            # Caller asked for formatting options (indent, ...); defer to stdlib
+            kwargs.setdefault("default", _http_default)
+            return json.dumps(obj, **kwargs)
+        sort_keys = kwargs.get("sort_keys", self.sort_keys)
+        return _encode(obj, sort_keys, _http_default, native_dates=False).decode("utf-8")
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        if kwargs:
+            return json.loads(s, **kwargs)
+        return loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        if self._app.debug:
+            # Keep Flask's pretty-printed output while debugging
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            _encode(obj, self.sort_keys, _http_default, native_dates=False),
+            mimetype=self.mimetype,
+        )
+
+
+def init_json_provider(app) -> None:
+    """Install the codec-backed JSON provider on ``app``."""
+    app.json_provider_class = FastJSONProvider
+    app.json = FastJSONProvider(app)
+    logger.debug("JSON provider installed (backend=%s)", BACKEND)
+
+
+__all__ = [
+    "BACKEND",
+    "FastJSONProvider",
+    "dumpb",
+    "dumps",
+    "init_json_provider",
+    "loads",
+    "stable_hash",
+]
@@ -0,0 +1,76 @@
+# =============================================================================
+# FILE: app/utils/local_store.py
+# DESCRIPTION: Process-local TTL key store used as the degraded-mode fallback
+#              for Redis-backed counters and idempotency keys while Redis is
+#              unreachable. Per-process only: limits and dedupe are best-effort
+#              across workers until Redis is back.
+# =============================================================================
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable
+
+
+class LocalTTLStore:
+    """Tiny dict-backed subset of the Redis API: get / incr / set_nx with expiry."""
+
+    def __init__(self, max_keys: int = 10_000, clock: Callable[[], float] = time.monotonic):
+        self.max_keys = max_keys
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._data: dict[str, tuple[int, float]] = {}
+
+    def _live(self, key: str, now: float) -> tuple[int, float] | None:
+        entry = self._data.get(key)
+        if entry is not None and entry[1] <= now:
+            del self._data[key]
+            return None
+        return entry
+
+    def _make_room(self, now: float) -> None:
+        if len(self._data) < self.max_keys:
+            return
+        for key in [k for k, (_, exp) in self._data.items() if exp <= now]:
+            del self._data[key]
+        while len(self._data) >= self.max_keys:
+            # Oldest insertion first (dicts preserve insertion order)
+            del self._data[next(iter(self._data))]
+
+    def get(self, key: str) -> int | None:
+        with self._lock:
+            entry = self._live(key, self._clock())
+            return entry[0] if entry else None
+
+    def incr(self, key: str, ttl: int) -> int:
+        """Increment ``key``; the expiry window starts on the first increment."""
+        with self._lock:
+            now = self._clock()
+            entry = self._live(key, now)
+            if entry is None:
+                self._make_room(now)
+                entry = (0, now + ttl)
+            value = entry[0] + 1
+            self._data[key] = (value, entry[1])
+            return value
+
+    def set_nx(self, key: str, ttl: int) -> bool:
+        """Set ``key`` if absent; returns True when it was created."""
+        with self._lock:
+            now = self._clock()
+            if self._live(key, now) is not None:
+                return False
+            self._make_room(now)
+            self._data[key] = (1, now + ttl)
+            return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+__all__ = ["LocalTTLStore"]
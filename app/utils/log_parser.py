@@ -10,7 +10,10 @@ from pathlib import Path
 sys.path.append("app/utils")
 from app.utils.redis_utils import get_redis_client
 
-client = get_redis_client()
+
+def _get_client():
+    """Resolve the Redis client on demand; nothing connects at import time."""
+    return get_redis_client()
 
 
 def parse_log_line(line: str) -> dict[str, str] | None:
@@ -56,6 +59,7 @@ def parse_log_line(line: str) -> dict[str, str] | None:
 
 
 def scan_trace_keys(pattern: str = "trace:*") -> list[str]:
+    client = _get_client()
     if client is None:
         return []
 
@@ -64,6 +68,7 @@ def scan_trace_keys(pattern: str = "trace:*") -> list[str]:
 
 
 def get_ranked_trace_keys(pattern: str = "trace:*", rank: bool = True) -> list[str]:
+    client = _get_client()
     if client is None:
         return []
 
@@ -97,6 +102,7 @@ if __name__ == "__main__":
     if len(sys.argv) == 2:
         cli_mode(sys.argv[1])
     else:
+        client = _get_client()
         if client is None:
             print("❌ No Redis client available.")
             sys.exit(1)
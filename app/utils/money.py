@@ -0,0 +1,152 @@
+# =============================================================================
+# FILE: app/utils/money.py
+# DESCRIPTION: Exact money representation for ledger models.
+#              - to_cents()/from_cents(): Decimal-exact conversion to integer
+#                minor units (hundredths) and back
+#              - MoneyCents: SQLAlchemy TypeDecorator storing BIGINT cents and
+#                exposing Decimal values
+#              - sync_exact(): dual-write legacy Float columns into the exact
+#                column while both exist
+#              - sum_exact()/cents_array()/amount_cents_array(): aggregate in
+#                SQL or as int64 arrays
+#              Functions named *amount* take monetary amounts (an int is whole
+#              units, as in to_cents()); *cents* functions take integer cents.
+# =============================================================================
+
+from __future__ import annotations
+
+import operator
+from collections.abc import Iterable
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from typing import Any
+
+from sqlalchemy import BigInteger, event, func, type_coerce
+from sqlalchemy.types import TypeDecorator
+
+# All ledger tables store two decimal places; the row's `currency` column
+# carries the ISO code. Currencies with other exponents are stored scaled by
+# 100 as well so every column shares one exact scale.
+CENTS_PER_UNIT = 100
+_QUANT = Decimal("0.01")
+
+
+def to_cents(value: Any) -> int:
+    """
+    Convert a monetary value to integer cents, rounding half-up.
+
+    Floats go through ``str()`` first, so 0.1 becomes 10 rather than the
+    binary expansion of 0.1 * 100.
+    """
+    if value is None:
+        raise ValueError("amount is required")
+    if isinstance(value, bool):
+        raise ValueError("amount must be numeric")
+    if isinstance(value, int):
+        return value * CENTS_PER_UNIT
+    try:
+        amount = value if isinstance(value, Decimal) else Decimal(str(value).strip())
+    except (InvalidOperation, ValueError) as exc:
+        raise ValueError(f"invalid amount: {value!r}") from exc
+    if not amount.is_finite():
+        raise ValueError(f"invalid amount: {value!r}")
+    return int(amount.quantize(_QUANT, rounding=ROUND_HALF_UP) * CENTS_PER_UNIT)
+
+
+def from_cents(cents: int) -> Decimal:
+    """Integer cents -> Decimal with two places."""
+    return (Decimal(int(cents)) / CENTS_PER_UNIT).quantize(_QUANT)
+
+
+class MoneyCents(TypeDecorator):
+    """
+    BIGINT column of integer cents, exposed to Python as an exact Decimal.
+
+    Binds int (treated as whole units), float, str or Decimal values.
+    """
+
+    impl = BigInteger
+    cache_ok = True
+
+    def process_bind_param(self, value: Any, dialect: Any) -> int | None:
+        if value is None:
+            return None
+        return to_cents(value)
+
+    def process_result_value(self, value: Any, dialect: Any) -> Decimal | None:
+        if value is None:
+            return None
+        return from_cents(value)
+
+    def process_literal_param(self, value: Any, dialect: Any) -> str:
+        return "NULL" if value is None else str(to_cents(value))
+
+    @property
+    def python_type(self) -> type:
+        return Decimal
+
+
+def cents(column: Any) -> Any:
+    """The raw BIGINT cents of a MoneyCents column, for SQL math and arrays."""
+    return type_coerce(column, BigInteger)
+
+
+def sync_exact(legacy_attr: Any, exact_attr: Any) -> None:
+    """
+    Keep ``exact_attr`` in step with writes to the legacy Float ``legacy_attr``.
+
+    Used while both columns exist: existing code keeps writing the float and
+    the exact column is filled in the same flush.
+    """
+    exact_key = exact_attr.key
+
+    @event.listens_for(legacy_attr, "set", propagate=True)
+    def _mirror(target: Any, value: Any, oldvalue: Any, initiator: Any) -> None:
+        try:
+            setattr(target, exact_key, None if value is None else from_cents(to_cents(value)))
+        except ValueError:
+            setattr(target, exact_key, None)
+
+
+# -----------------------------------------------------------------------------
+# Aggregates
+# -----------------------------------------------------------------------------
+def sum_exact(session: Any, column: Any, *criteria: Any) -> Decimal:
+    """SUM a MoneyCents column in SQL as BIGINT cents and return a Decimal."""
+    query = session.query(func.coalesce(func.sum(cents(column)), 0))
+    if criteria:
+        query = query.filter(*criteria)
+    return from_cents(int(query.scalar() or 0))
+
+
+def cents_array(values: Iterable[int]):
+    """
+    int64 NumPy array of integer cents (e.g. to_cents() results or rows
+    selected through ``cents(column)``). Non-integers raise TypeError.
+    """
+    import numpy as np
+
+    return np.fromiter(map(operator.index, values), dtype=np.int64)
+
+
+def amount_cents_array(amounts: Iterable[Any]):
+    """int64 NumPy array of cents for monetary ``amounts``, via to_cents()."""
+    return cents_array(to_cents(v) for v in amounts)
+
+
+def sum_amounts(amounts: Iterable[Any]) -> Decimal:
+    """Exact total of monetary ``amounts`` via an int64 array."""
+    return from_cents(int(amount_cents_array(amounts).sum()))
+
+
+__all__ = [
+    "CENTS_PER_UNIT",
+    "MoneyCents",
+    "amount_cents_array",
+    "cents",
+    "cents_array",
+    "from_cents",
+    "sum_amounts",
+    "sum_exact",
+    "sync_exact",
+    "to_cents",
+]
@@ -3,31 +3,25 @@
 """
 Template navigation auditor.
 
-Scans navbar.html and all templates for url_for() endpoint references,
-then reports which endpoints are missing from the Flask app registry.
+Reports the url_for() endpoints referenced by navbar.html and by all
+templates, and which of them are missing from the Flask app registry.
+Endpoint references come from the shared template index
+(app.utils.template_index), so only changed templates are re-read.
 
 Designed for operator clarity, safe logging, and mypy correctness.
 """
 
 import os
-import re
 from typing import Any
 
 from flask import current_app
 
-# Matches url_for('blueprint.endpoint') or url_for("blueprint.endpoint")
-URL_FOR_REGEX = re.compile(r"url_for\(\s*['\"]([\w\.]+)['\"]")
+from app.utils.template_index import get_template_index
 
 
-def _extract_endpoints_from_html(html: str) -> set[str]:
-    """Return all url_for() endpoint references found in a template."""
-    return set(URL_FOR_REGEX.findall(html))
-
-
-def _read_file(path: str) -> str:
-    """Read a UTF‑8 file safely."""
-    with open(path, encoding="utf-8") as f:
-        return f.read()
+def _template_root(app) -> str:
+    """Absolute path of the app's own template folder."""
+    return os.path.abspath(os.path.join(app.root_path, app.template_folder))
 
 
 def audit_navbar(app) -> dict[str, Any]:
@@ -35,8 +29,8 @@ def audit_navbar(app) -> dict[str, Any]:
     Audit the navbar.html file for referenced endpoints and report which
     ones are missing from the Flask app's view registry.
     """
-    template_folder = app.template_folder
-    navbar_path = os.path.join(template_folder, "navbar.html")
+    template_root = _template_root(app)
+    navbar_path = os.path.join(template_root, "navbar.html")
 
     result: dict[str, Any] = {
         "file": navbar_path,
@@ -44,8 +38,13 @@ def audit_navbar(app) -> dict[str, Any]:
         "missing_endpoints": [],
     }
 
-    html = _read_file(navbar_path)
-    endpoints = sorted(_extract_endpoints_from_html(html))
+    info = get_template_index(app, [template_root]).get_path(navbar_path)
+    if info is None:
+        raise FileNotFoundError(navbar_path)
+    if info.read_error:
+        raise OSError(f"{navbar_path}: {info.read_error}")
+
+    endpoints = sorted(set(info.url_for))
     result["endpoints_in_nav"] = endpoints
 
     missing = [ep for ep in endpoints if ep not in app.view_functions]
@@ -56,26 +55,19 @@ def audit_navbar(app) -> dict[str, Any]:
 
 def audit_templates(app) -> dict[str, Any]:
     """
-    Recursively scan all templates for url_for() endpoint references.
+    Collect url_for() endpoint references across all templates.
     Returns a structured report of referenced endpoints and missing ones.
     """
-    template_root = app.template_folder
+    template_root = _template_root(app)
     all_eps: set[str] = set()
 
-    for root, _dirs, files in os.walk(template_root):
-        for fn in files:
-            if not fn.endswith(".html"):
-                continue
-
-            full_path = os.path.join(root, fn)
-
-            try:
-                html = _read_file(full_path)
-                all_eps |= _extract_endpoints_from_html(html)
-
-            except Exception as e:
-                # Non‑fatal: log and continue
-                current_app.logger.debug(f"Template scan skipped {full_path}: {e}")
+    index = get_template_index(app, [template_root])
+    for info in index.templates([template_root], suffixes=(".html",)):
+        if info.read_error:
+            # Non‑fatal: log and continue
+            current_app.logger.debug(f"Template scan skipped {info.path}: {info.read_error}")
+            continue
+        all_eps.update(info.url_for)
 
     missing = sorted(ep for ep in all_eps if ep not in app.view_functions)
 
@@ -0,0 +1,157 @@
+# =============================================================================
+# FILE: app/utils/pagination.py
+# DESCRIPTION: Keyset (seek) pagination for ORM queries.
+#              Pages are addressed by an opaque cursor holding the last row's
+#              (sort value, id) instead of an OFFSET, so every page costs the
+#              same index range scan no matter how deep the operator scrolls.
+#              Rows whose sort value is NULL form a trailing segment ordered
+#              by id (NULLs last in both directions, on every dialect); their
+#              cursors carry a null sort value.
+# =============================================================================
+
+from __future__ import annotations
+
+import base64
+import datetime
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import and_, or_
+from sqlalchemy.types import Date, DateTime
+
+from app.utils import json_codec
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+
+
+class InvalidCursor(ValueError):
+    """Raised when a cursor cannot be decoded for the requested sort."""
+
+
+@dataclass
+class PageParams:
+    sort: str
+    descending: bool
+    cursor: str | None
+    limit: int
+
+
+@dataclass
+class KeysetPage:
+    items: list
+    next_cursor: str | None
+
+    @property
+    def has_more(self) -> bool:
+        return self.next_cursor is not None
+
+
+def parse_page_args(args: Any, sorts: dict, default_sort: str) -> PageParams:
+    """Read ?sort=&order=&cursor=&limit= from ``args``; unknown sorts fall back."""
+    sort = args.get("sort", default_sort)
+    if sort not in sorts:
+        sort = default_sort
+    try:
+        limit = int(args.get("limit", DEFAULT_LIMIT))
+    except (TypeError, ValueError):
+        limit = DEFAULT_LIMIT
+    return PageParams(
+        sort=sort,
+        descending=args.get("order", "desc") != "asc",
+        cursor=args.get("cursor") or None,
+        limit=max(1, min(limit, MAX_LIMIT)),
+    )
+
+
+def encode_cursor(sort_value: Any, row_id: Any) -> str:
+    raw = json_codec.dumpb([sort_value, row_id])
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str, sort_col: Any) -> tuple[Any, Any]:
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        sort_value, row_id = json_codec.loads(raw)
+    except (ValueError, TypeError) as exc:
+        raise InvalidCursor(token) from exc
+
+    col_type = getattr(sort_col, "type", None)
+    if sort_value is not None and isinstance(col_type, (DateTime, Date)):
+        try:
+            sort_value = datetime.datetime.fromisoformat(sort_value)
+        except (TypeError, ValueError) as exc:
+            raise InvalidCursor(token) from exc
+        if isinstance(col_type, Date) and not isinstance(col_type, DateTime):
+            sort_value = sort_value.date()
+    return sort_value, row_id
+
+
+def keyset_predicate(sort_col: Any, id_col: Any, cursor: str, descending: bool = True) -> Any:
+    """
+    WHERE clause selecting the rows strictly after ``cursor`` in (sort_col, id_col)
+    order. A cursor with a NULL sort value selects the rest of the NULL segment.
+    """
+    value, last_id = decode_cursor(cursor, sort_col)
+    if value is None:
+        return and_(sort_col.is_(None), id_col < last_id if descending else id_col > last_id)
+    if descending:
+        return or_(sort_col < value, and_(sort_col == value, id_col < last_id))
+    return or_(sort_col > value, and_(sort_col == value, id_col > last_id))
+
+
+def keyset_paginate(
+    query: Any,
+    sort_col: Any,
+    id_col: Any,
+    *,
+    descending: bool = True,
+    cursor: str | None = None,
+    limit: int = DEFAULT_LIMIT,
+) -> KeysetPage:
+    """
+    Apply ORDER BY (sort_col, id_col) and the cursor predicate to ``query``
+    and fetch one page (``limit`` rows plus one to detect a next page).
+
+    ``id_col`` breaks ties. When ``sort_col`` is nullable, rows with a NULL
+    sort value follow all others, ordered by ``id_col``: each segment is its
+    own index range scan, so a page that runs past the last non-NULL value
+    tops itself up from the NULL segment with a second statement.
+    """
+    nullable = sort_col is not id_col and getattr(sort_col, "nullable", True)
+    in_null_segment = False
+    if cursor:
+        in_null_segment = decode_cursor(cursor, sort_col)[0] is None
+    id_order = id_col.desc() if descending else id_col.asc()
+
+    rows = []
+    if not in_null_segment:
+        segment = query.filter(sort_col.isnot(None)) if nullable else query
+        if cursor:
+            segment = segment.filter(keyset_predicate(sort_col, id_col, cursor, descending))
+        order = sort_col.desc() if descending else sort_col.asc()
+        rows = segment.order_by(order, id_order).limit(limit + 1).all()
+    if nullable and len(rows) <= limit:
+        segment = query.filter(sort_col.is_(None))
+        if in_null_segment:
+            segment = segment.filter(keyset_predicate(sort_col, id_col, cursor, descending))
+        rows += segment.order_by(id_order).limit(limit + 1 - len(rows)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, sort_col.key), getattr(last, id_col.key))
+    return KeysetPage(items=rows, next_cursor=next_cursor)
+
+
+__all__ = [
+    "InvalidCursor",
+    "KeysetPage",
+    "PageParams",
+    "decode_cursor",
+    "encode_cursor",
+    "keyset_paginate",
+    "keyset_predicate",
+    "parse_page_args",
+]
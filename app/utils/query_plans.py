@@ -0,0 +1,242 @@
+# =============================================================================
+# FILE: app/utils/query_plans.py
+# DESCRIPTION: Catalogue of hot ORM queries plus EXPLAIN helpers used by the
+#              query-plan regression tests. SQLite plans come from
+#              EXPLAIN QUERY PLAN, MySQL plans from EXPLAIN FORMAT=JSON.
+# =============================================================================
+
+from __future__ import annotations
+
+import datetime
+import json
+import re
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import desc, select
+
+# SQLite reports a full table scan as "SCAN <table>" (no index clause)
+_SQLITE_SCAN = re.compile(r"^SCAN (\w+)\b(?! USING (?:COVERING )?INDEX)")
+
+
+@dataclass(frozen=True)
+class HotQuery:
+    name: str
+    table: str
+    build: Callable[[], Any]
+    # ORDER BY must be satisfied by the index (no temp sort / filesort)
+    index_ordered: bool = True
+
+
+def _since() -> datetime.datetime:
+    return datetime.datetime(2025, 1, 1)
+
+
+def hot_queries() -> list[HotQuery]:
+    """Access paths the cockpit and subscriber views hit on every render."""
+    from app.cockpit.lib.vault_queries import cards_expiring_soon_stmt
+    from app.cockpit.tiles.lender_risk_tile import lender_risk_rollup_stmt
+    from app.compliance_ai import fraud_trend_rollup_stmt
+    from app.models.audit_log import AuditLog
+    from app.models.bank_transaction import BankTransaction
+    from app.models.schema_event import SchemaEvent
+    from app.models.trace_events import TraceEvent
+    from app.models.transactions import Transaction
+    from app.models.vault_transaction import VaultTransaction
+    from app.services.retention import POLICIES, chunk_stmt
+
+    lender_events = ["LENDER_SELF_LINKED", "LENDER_SELF_LINK_BLOCKED", "LENDER_RISK_ALERT"]
+
+    return [
+        HotQuery(
+            "transactions_by_user_recent",
+            "transactions",
+            lambda: select(Transaction)
+            .where(Transaction.user_id == "u1")
+            .order_by(Transaction.date.desc()),
+        ),
+        HotQuery(
+            "transactions_by_user_date_range",
+            "transactions",
+            lambda: select(Transaction)
+            .where(Transaction.user_id == "u1", Transaction.date >= _since())
+            .order_by(Transaction.date),
+        ),
+        HotQuery(
+            "schema_events_latest",
+            "schema_event",
+            lambda: select(SchemaEvent).order_by(SchemaEvent.timestamp.desc()).limit(20),
+        ),
+        HotQuery(
+            "schema_events_lender_feed",
+            "schema_event",
+            lambda: select(SchemaEvent)
+            .where(SchemaEvent.event_type.in_(lender_events))
+            .order_by(desc(SchemaEvent.timestamp))
+            .limit(20),
+            # IN-list over several event types: one index range per type, then a
+            # small sort of the matched rows
+            index_ordered=False,
+        ),
+        HotQuery(
+            "schema_events_window",
+            "schema_event",
+            lambda: select(SchemaEvent)
+            .where(SchemaEvent.timestamp >= _since())
+            .order_by(SchemaEvent.timestamp.asc()),
+        ),
+        HotQuery(
+            "vault_transactions_by_user",
+            "vault_transactions",
+            lambda: select(VaultTransaction)
+            .where(VaultTransaction.user_id == "u1")
+            .order_by(VaultTransaction.created_at.desc()),
+        ),
+        HotQuery(
+            "vault_transactions_by_status",
+            "vault_transactions",
+            lambda: select(VaultTransaction)
+            .where(VaultTransaction.status == "pending")
+            .order_by(VaultTransaction.created_at.desc()),
+        ),
+        HotQuery(
+            "audit_logs_by_user",
+            "audit_logs",
+            lambda: select(AuditLog)
+            .where(AuditLog.user_id == "u1")
+            .order_by(AuditLog.created_at.desc())
+            .limit(50),
+        ),
+        HotQuery(
+            "audit_logs_by_event_type",
+            "audit_logs",
+            lambda: select(AuditLog)
+            .where(AuditLog.event_type == "mock_bank_transfer_audit")
+            .order_by(AuditLog.created_at.desc())
+            .limit(50),
+        ),
+        HotQuery(
+            "trace_events_latest",
+            "trace_events",
+            lambda: select(TraceEvent).order_by(TraceEvent.timestamp.desc()).limit(100),
+        ),
+        HotQuery(
+            "trace_events_by_type",
+            "trace_events",
+            lambda: select(TraceEvent)
+            .where(TraceEvent.event_type == "LOGIN_FAILED")
+            .order_by(TraceEvent.timestamp.desc())
+            .limit(100),
+        ),
+        HotQuery(
+            "lender_risk_rollup",
+            "schema_event",
+            lambda: lender_risk_rollup_stmt(_since()),
+            # GROUP BY (lender, day, type) needs its own grouping pass
+            index_ordered=False,
+        ),
+        HotQuery(
+            "borrower_cards_expiring_soon",
+            "borrower_cards",
+            lambda: cards_expiring_soon_stmt(_since().date()),
+        ),
+        HotQuery(
+            "fraud_trend_increment",
+            "fraud_reports",
+            lambda: fraud_trend_rollup_stmt((_since(), "r1")),
+            # GROUP BY (day, category) needs its own grouping pass
+            index_ordered=False,
+        ),
+        HotQuery(
+            "bank_transfers_latest",
+            "bank_transactions",
+            lambda: select(BankTransaction).order_by(BankTransaction.timestamp.desc()).limit(200),
+        ),
+        # Retention: expired-row chunks off the hot table, audit pages off the archive
+        *(
+            HotQuery(
+                f"retention_chunk_{policy.name}",
+                policy.name,
+                lambda policy=policy: chunk_stmt(policy, _since(), (_since(), 1)),
+            )
+            for policy in POLICIES.values()
+        ),
+        *(
+            HotQuery(
+                f"archive_history_by_user_{policy.name}",
+                policy.archive.name,
+                lambda archive=policy.archive, column=policy.time_col: select(archive)
+                .where(archive.c.user_id == "u1")
+                .order_by(archive.c[column].desc(), archive.c.id.desc())
+                .limit(51),
+            )
+            for policy in POLICIES.values()
+        ),
+    ]
+
+
+# -----------------------------------------------------------------------------
+# EXPLAIN
+# -----------------------------------------------------------------------------
+def _positional(compiled: Any) -> tuple:
+    return tuple(compiled.params[name] for name in (compiled.positiontup or ()))
+
+
+def explain(connection: Any, stmt: Any) -> Any:
+    """
+    Return the plan for ``stmt`` on ``connection``.
+
+    SQLite: list of EXPLAIN QUERY PLAN detail strings.
+    MySQL: the parsed EXPLAIN FORMAT=JSON document.
+    """
+    dialect = connection.dialect
+    # Expand IN (...) lists so the statement can go through exec_driver_sql
+    compiled = stmt.compile(dialect=dialect, compile_kwargs={"render_postcompile": True})
+    params = _positional(compiled)
+
+    if dialect.name == "sqlite":
+        rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params).fetchall()
+        return [row[-1] for row in rows]
+    if dialect.name in ("mysql", "mariadb"):
+        row = connection.exec_driver_sql(f"EXPLAIN FORMAT=JSON {compiled}", params).fetchone()
+        return json.loads(row[0])
+    raise NotImplementedError(f"EXPLAIN not supported for dialect {dialect.name!r}")
+
+
+def _mysql_table_nodes(node: Any):
+    if isinstance(node, dict):
+        if "table_name" in node and "access_type" in node:
+            yield node
+        for value in node.values():
+            yield from _mysql_table_nodes(value)
+    elif isinstance(node, list):
+        for value in node:
+            yield from _mysql_table_nodes(value)
+
+
+def full_scans(plan: Any) -> list[str]:
+    """Tables the plan reads with a full scan (no index access)."""
+    if isinstance(plan, list):
+        return [m.group(1) for m in (_SQLITE_SCAN.match(line) for line in plan) if m]
+    return [n["table_name"] for n in _mysql_table_nodes(plan) if n["access_type"] == "ALL"]
+
+
+def _mysql_filesort(node: Any) -> bool:
+    if isinstance(node, dict):
+        if node.get("using_filesort"):
+            return True
+        return any(_mysql_filesort(value) for value in node.values())
+    if isinstance(node, list):
+        return any(_mysql_filesort(value) for value in node)
+    return False
+
+
+def sorts_outside_index(plan: Any) -> bool:
+    """True when ORDER BY needs a temp B-tree (SQLite) or filesort (MySQL)."""
+    if isinstance(plan, list):
+        return any(line.startswith("USE TEMP B-TREE FOR ORDER BY") for line in plan)
+    return _mysql_filesort(plan)
+
+
+__all__ = ["HotQuery", "explain", "full_scans", "hot_queries", "sorts_outside_index"]
@@ -1,8 +1,11 @@
 # =============================================================================
 # FILE: app/utils/redis_utils.py
 # DESCRIPTION: Cockpit‑grade Redis client with health pulses, startup‑emit
-#              buffering, and connection‑failure metrics. Defensive about SSL
-#              kwargs and provides DISABLE_REDIS guard for migrations/CLI.
+#              buffering, and connection‑failure metrics. One fork-safe,
+#              health-checked ConnectionPool is shared per process, behind a
+#              circuit breaker that fails fast while Redis is unreachable.
+#              Defensive about SSL kwargs and provides DISABLE_REDIS guard
+#              for migrations/CLI.
 #              Normalizes URIs to avoid passing unsupported 'ssl' kwargs and
 #              guarantees a clean Redis PING on init when available.
 # =============================================================================
@@ -12,15 +15,20 @@ from __future__ import annotations
 import json
 import logging
 import os
+import threading
 from datetime import UTC
 from typing import Any, cast
 from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
 
 import requests
 from flask import current_app, has_app_context
-from redis import Redis
+from redis import ConnectionPool, Redis
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import TimeoutError as RedisTimeoutError
 
 from app.constants.telemetry_keys import (
+    REDIS_BREAKER_KEY,
+    REDIS_BREAKER_TTL,
     REDIS_FAIL_TTL,
     REDIS_PING_KEY,
     REDIS_PING_SUCCESS_KEY,
@@ -30,6 +38,8 @@ from app.constants.telemetry_keys import (
     REDIS_QUEUE_FLUSH_TTL,
 )
 from app.telemetry.ttl_emit import flush_emit_queue, ttl_emit
+from app.utils import http_client
+from app.utils.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
 
 logger = logging.getLogger(__name__)
 
@@ -123,31 +133,344 @@ def _masked_endpoint(uri: str) -> str:
         return "<unparseable-uri>"
 
 
+# -------------------------------------------------------------------------
+# Circuit breaker
+# -------------------------------------------------------------------------
+def _on_breaker_transition(name: str, old: str, new: str, snapshot: dict[str, Any]) -> None:
+    # Deferred: resolving a client here would re-enter the pool that tripped.
+    ttl_emit(
+        key=REDIS_BREAKER_KEY,
+        status=new,
+        ttl=REDIS_BREAKER_TTL,
+        meta={"previous": old, "consecutive_failures": snapshot["consecutive_failures"]},
+        defer=True,
+    )
+
+
+def _new_breaker() -> CircuitBreaker:
+    return CircuitBreaker(
+        "redis",
+        failure_threshold=int(os.getenv("REDIS_BREAKER_THRESHOLD", "3")),
+        reset_timeout=float(os.getenv("REDIS_BREAKER_RESET_SECONDS", "30")),
+        on_transition=_on_breaker_transition,
+    )
+
+
+_BREAKER = _new_breaker()
+
+
+def get_breaker_state() -> dict[str, Any]:
+    """Snapshot of the Redis circuit breaker (state, failures, retry_in)."""
+    return _BREAKER.snapshot()
+
+
+def is_redis_degraded() -> bool:
+    """True while the breaker is open or probing; callers use local fallbacks."""
+    return _BREAKER.state != CLOSED
+
+
+# -------------------------------------------------------------------------
+# Process-wide connection pool
+# -------------------------------------------------------------------------
+class PoolExhaustedError(RedisConnectionError):
+    """Every connection in this process's pool is checked out (Redis itself may be fine)."""
+
+
+class _GuardedConnectionPool(ConnectionPool):
+    """
+    ConnectionPool that fails fast while the circuit is open, feeds connect
+    failures into the breaker and counts checkouts for reuse reporting.
+
+    Only socket-level outcomes reach the breaker: a full pool raises
+    PoolExhaustedError without counting as a failure, and a success is
+    recorded when a connection was actually (re)established, or for the
+    half-open trial, not for every checkout of an idle connection.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+
+    def make_connection(self):  # type: ignore[override]
+        if self._created_connections >= self.max_connections:
+            raise PoolExhaustedError(f"Too many connections ({self.max_connections} in use)")
+        connection = super().make_connection()
+        connection.register_connect_callback(self._on_connect)
+        return connection
+
+    def _on_connect(self, connection: Any) -> None:
+        connection._breaker_connected = True
+
+    def get_connection(self, *args: Any, **kwargs: Any):  # type: ignore[override]
+        if not _BREAKER.allow():
+            raise RedisConnectionError("Redis circuit open; failing fast")
+        trial = _BREAKER.state == HALF_OPEN
+        self.checkouts += 1
+        try:
+            connection = super().get_connection(*args, **kwargs)
+        except PoolExhaustedError:
+            if trial:
+                _BREAKER.cancel_trial()
+            raise
+        except (RedisConnectionError, RedisTimeoutError, OSError):
+            _BREAKER.record_failure()
+            raise
+        if trial or getattr(connection, "_breaker_connected", False):
+            connection._breaker_connected = False
+            _BREAKER.record_success()
+        return connection
+
+
+# One pool + client per process. uWSGI forks workers from the master, so the
+# owning PID is recorded and the state is dropped in the child after a fork.
+_LOCK = threading.Lock()
+_POOL: _GuardedConnectionPool | None = None
+_CLIENT: Redis[Any] | None = None
+_CLIENT_PID: int | None = None
+
+
+def _after_fork_in_child() -> None:
+    global _LOCK, _POOL, _CLIENT, _CLIENT_PID, _BREAKER
+    _LOCK = threading.Lock()
+    _POOL = None
+    _CLIENT = None
+    _CLIENT_PID = None
+    _BREAKER = _new_breaker()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+DEFAULT_MAX_CONNECTIONS = 20
+
+
+def _config_value(name: str, default: int) -> int:
+    if has_app_context():
+        return int(current_app.config.get(name, os.getenv(name, default)))
+    return int(os.getenv(name, default))
+
+
+def uwsgi_threads() -> int | None:
+    """Threads per uwsgi worker from the running uwsgi options, if any."""
+    try:
+        import uwsgi  # type: ignore[import-not-found]
+    except ImportError:
+        return None
+    raw = uwsgi.opt.get("threads")
+    if isinstance(raw, bytes):
+        raw = raw.decode()
+    return int(raw) if raw else None
+
+
+def _pool_size() -> int:
+    """
+    Max connections for this process's pool.
+
+    REDIS_MAX_CONNECTIONS wins when set; otherwise size for the worker's
+    thread count (REDIS_POOL_THREADS, UWSGI_THREADS or the uwsgi option)
+    times REDIS_CONNECTIONS_PER_THREAD, plus one for background emits, but
+    never below the historical default of 20. The pool does not block, so
+    a checkout beyond the limit fails instead of waiting; pipelines,
+    background emits and tile fan-out need headroom over one per thread.
+    """
+    explicit = os.getenv("REDIS_MAX_CONNECTIONS", "").strip()
+    if explicit:
+        return max(1, int(explicit))
+    threads = int(
+        os.getenv("REDIS_POOL_THREADS") or os.getenv("UWSGI_THREADS") or uwsgi_threads() or 2
+    )
+    per_thread = int(os.getenv("REDIS_CONNECTIONS_PER_THREAD", "2"))
+    return max(DEFAULT_MAX_CONNECTIONS, threads * per_thread + 1)
+
+
+def _build_pool(url: str) -> _GuardedConnectionPool:
+    return cast(
+        _GuardedConnectionPool,
+        _GuardedConnectionPool.from_url(
+            url,
+            decode_responses=True,
+            socket_connect_timeout=_config_value("REDIS_CONNECT_TIMEOUT", 5),
+            socket_timeout=_config_value("REDIS_SOCKET_TIMEOUT", 5),
+            health_check_interval=_config_value("REDIS_HEALTH_CHECK_INTERVAL", 30),
+            max_connections=_pool_size(),
+        ),
+    )
+
+
+def _emit_boot_pulses(client: Redis[Any]) -> None:
+    """Ping-success pulses and queued-emit flush; runs once per process."""
+    try:
+        ttl_emit(
+            key=REDIS_PING_SUCCESS_KEY,
+            status="success",
+            ttl=REDIS_PING_TTL,
+            client=client,
+        )
+        ttl_emit(
+            key=REDIS_PING_SUCCESS_TS_KEY,
+            status=_get_utc_timestamp(),
+            ttl=REDIS_PING_TTL,
+            client=client,
+        )
+        flushed = flush_emit_queue(client)
+        logger.info("Flushed %d queued TTL emits.", flushed)
+        ttl_emit(
+            key=REDIS_QUEUE_FLUSH_KEY,
+            status="success",
+            ttl=REDIS_QUEUE_FLUSH_TTL,
+            client=client,
+        )
+        ttl_emit(key=REDIS_PING_KEY, status="success", ttl=REDIS_PING_TTL, client=client)
+    except Exception:
+        logger.debug("Best-effort telemetry/flush failed (continuing).", exc_info=True)
+
+
+def _is_foreign_client(client: Any) -> bool:
+    """True for a pooled client built by another process or before a reset."""
+    pool = getattr(client, "connection_pool", None)
+    return isinstance(pool, _GuardedConnectionPool) and client is not _CLIENT
+
+
+def _process_client(raw_url: str) -> Redis[Any] | None:
+    global _POOL, _CLIENT, _CLIENT_PID
+
+    pid = os.getpid()
+    client = _CLIENT
+    if client is not None and _CLIENT_PID == pid:
+        return client
+
+    url, tls_enabled = _normalize_redis_uri(raw_url)
+
+    # Failure telemetry is deferred (queued) and emitted after the lock is
+    # released, so it never re-enters get_redis_client() mid-connect.
+    failure: str | None = None
+    with _LOCK:
+        if _CLIENT is not None and _CLIENT_PID == pid:
+            return _CLIENT
+
+        try:
+            pool = _build_pool(url)
+            client = Redis(connection_pool=pool)
+        except TypeError as te:
+            REDIS_CONNECT_FAILURES_COUNTER.inc()
+            logger.error(
+                "Redis TypeError during connect (likely ssl kwarg issue): %s",
+                te,
+                exc_info=True,
+            )
+            failure = f"type_error:{te}"
+            _BREAKER.record_failure()
+        except Exception as e:
+            REDIS_CONNECT_FAILURES_COUNTER.inc()
+            logger.error(
+                "Redis connection/ping failed for %s: %s",
+                _masked_endpoint(raw_url),
+                e,
+                exc_info=True,
+            )
+            failure = f"error:{e}"
+            _BREAKER.record_failure()
+        else:
+            try:
+                client.ping()
+            except Exception as ping_exc:
+                # Ping failed — increment metric and emit a TTL trace, but do not raise.
+                # The pool is discarded so the next call retries from scratch.
+                REDIS_CONNECT_FAILURES_COUNTER.inc()
+                logger.warning("Redis ping failed for %s: %s", _masked_endpoint(url), ping_exc)
+                pool.disconnect()
+                failure = f"ping_error:{ping_exc}"
+                if not isinstance(ping_exc, (RedisConnectionError, RedisTimeoutError, OSError)):
+                    # Connection-level errors were already counted by the pool
+                    _BREAKER.record_failure()
+            else:
+                _POOL, _CLIENT, _CLIENT_PID = pool, client, pid
+
+    if failure is not None:
+        try:
+            ttl_emit(key=REDIS_PING_KEY, status=failure, ttl=REDIS_FAIL_TTL, defer=True)
+        except Exception:
+            pass
+        return None
+
+    logger.info(
+        "🟢 Redis pool ready. endpoint=%s tls=%s max_connections=%d pid=%d",
+        _masked_endpoint(url),
+        tls_enabled,
+        pool.max_connections,
+        pid,
+    )
+    _emit_boot_pulses(client)
+    return client
+
+
+def get_pool_stats() -> dict[str, Any]:
+    """Connection reuse metrics for this process's pool."""
+    pid = os.getpid()
+    pool = _POOL
+    if pool is None or _CLIENT_PID != pid:
+        return {"pid": pid, "active": False}
+
+    created = int(getattr(pool, "_created_connections", 0))
+    checkouts = pool.checkouts
+    return {
+        "pid": pid,
+        "active": True,
+        "max_connections": pool.max_connections,
+        "created": created,
+        "in_use": len(getattr(pool, "_in_use_connections", ())),
+        "available": len(getattr(pool, "_available_connections", ())),
+        "checkouts": checkouts,
+        "reuse_ratio": round(1 - created / checkouts, 4) if checkouts else 0.0,
+    }
+
+
+def reset_redis_client() -> None:
+    """Disconnect and drop the process-wide client (tests, config reloads)."""
+    global _POOL, _CLIENT, _CLIENT_PID
+    with _LOCK:
+        if _POOL is not None and _CLIENT_PID == os.getpid():
+            try:
+                _POOL.disconnect()
+            except Exception:
+                logger.debug("Redis pool disconnect failed.", exc_info=True)
+        _POOL = None
+        _CLIENT = None
+        _CLIENT_PID = None
+    _BREAKER.reset()
+
+
 # -------------------------------------------------------------------------
 # Core factory with caching
 # -------------------------------------------------------------------------
 def get_redis_client() -> Redis[Any] | None:
     """
-    Returns a cached Redis client if available, otherwise creates one.
+    Returns the process-wide Redis client, creating it on first use.
 
-    Behavior changes compared with the previous implementation:
     - In test environments (FLASK_ENV=testing) or when DISABLE_REDIS is set,
       this will return None if REDIS_STORAGE_URI is not provided. Tests must
       install a stub by monkeypatching app.utils.redis_utils.get_redis_client
       or by setting REDIS_STORAGE_URI for integration tests that need a real Redis.
-    - Network calls (Redis.from_url and ping) are guarded and best-effort;
-      failures return None and emit non-fatal telemetry.
+    - All callers share one health-checked ConnectionPool per process; the
+      connectivity ping and boot pulses run once, when the pool is built.
+    - Network calls are guarded and best-effort; failures return None and
+      emit non-fatal telemetry.
+    - While the circuit breaker is open this returns None immediately, so
+      callers take their degraded path instead of waiting on a socket timeout.
     """
     # Explicit CLI/migration guard
     if os.environ.get("DISABLE_REDIS"):
         logger.info("DISABLE_REDIS set; skipping Redis client creation.")
         return None
 
+    if _BREAKER.state == OPEN:
+        return None
+
     # Prefer an already-cached client attached to the Flask app context
     if has_app_context():
         cached = getattr(current_app, "redis_client", None)
-        if cached is not None:
-            # Tell mypy that the cached attribute is a Redis (or None)
+        if cached is not None and not _is_foreign_client(cached):
             # Changed from cast(Redis[Any] | None, cached) to avoid generic class error
             return cast(Any, cached)
 
@@ -164,107 +487,13 @@ def get_redis_client() -> Redis[Any] | None:
         logger.debug("REDIS_STORAGE_URI not set; get_redis_client returning None.")
         return None
 
-    url, tls_enabled = _normalize_redis_uri(raw_url)
+    client = _process_client(raw_url)
 
-    kwargs: dict[str, Any] = {
-        "decode_responses": True,
-        "socket_connect_timeout": (
-            current_app.config.get("REDIS_CONNECT_TIMEOUT", 5)
-            if has_app_context()
-            else int(os.getenv("REDIS_CONNECT_TIMEOUT", 5))
-        ),
-        "socket_timeout": (
-            current_app.config.get("REDIS_SOCKET_TIMEOUT", 5)
-            if has_app_context()
-            else int(os.getenv("REDIS_SOCKET_TIMEOUT", 5))
-        ),
-        "max_connections": int(os.getenv("REDIS_MAX_CONNECTIONS", "20")),
-    }
+    # Cache for reuse on the app object when possible
+    if client is not None and has_app_context():
+        current_app.redis_client = client
 
-    try:
-        # Create client lazily and validate connectivity.
-        client = Redis.from_url(url, **kwargs)
-
-        try:
-            client.ping()
-        except Exception as ping_exc:
-            # Ping failed — increment metric and emit a TTL trace, but do not raise.
-            REDIS_CONNECT_FAILURES_COUNTER.inc()
-            logger.warning("Redis ping failed for %s: %s", _masked_endpoint(url), ping_exc)
-            try:
-                ttl_emit(
-                    key=REDIS_PING_KEY,
-                    status=f"ping_error:{ping_exc}",
-                    ttl=REDIS_FAIL_TTL,
-                )
-            except Exception:
-                pass
-            return None
-
-        # Successful ping: emit pulses and flush queue (best-effort)
-        logger.info(
-            "🟢 Redis ping successful—client checked out. endpoint=%s tls=%s",
-            _masked_endpoint(url),
-            tls_enabled,
-        )
-        try:
-            ttl_emit(
-                key=REDIS_PING_SUCCESS_KEY,
-                status="success",
-                ttl=REDIS_PING_TTL,
-                client=client,
-            )
-            ttl_emit(
-                key=REDIS_PING_SUCCESS_TS_KEY,
-                status=_get_utc_timestamp(),
-                ttl=REDIS_PING_TTL,
-                client=client,
-            )
-            flushed = flush_emit_queue(client)
-            logger.info("Flushed %d queued TTL emits.", flushed)
-            ttl_emit(
-                key=REDIS_QUEUE_FLUSH_KEY,
-                status="success",
-                ttl=REDIS_QUEUE_FLUSH_TTL,
-                client=client,
-            )
-            ttl_emit(key=REDIS_PING_KEY, status="success", ttl=REDIS_PING_TTL, client=client)
-        except Exception:
-            logger.debug("Best-effort telemetry/flush failed (continuing).", exc_info=True)
-
-        # Cache for reuse on the app object when possible
-        if has_app_context():
-            # Use setattr to avoid mypy complaining about unknown Flask attributes
-            current_app.redis_client = client
-
-        return client
-
-    except TypeError as te:
-        REDIS_CONNECT_FAILURES_COUNTER.inc()
-        logger.error(
-            "Redis TypeError during connect (likely ssl kwarg issue): %s",
-            te,
-            exc_info=True,
-        )
-        try:
-            ttl_emit(key=REDIS_PING_KEY, status=f"type_error:{te}", ttl=REDIS_FAIL_TTL)
-        except Exception:
-            pass
-        return None
-
-    except Exception as e:
-        REDIS_CONNECT_FAILURES_COUNTER.inc()
-        logger.error(
-            "Redis connection/ping failed for %s: %s",
-            _masked_endpoint(raw_url),
-            e,
-            exc_info=True,
-        )
-        try:
-            ttl_emit(key=REDIS_PING_KEY, status=f"error:{e}", ttl=REDIS_FAIL_TTL)
-        except Exception:
-            pass
-        return None
+    return client
 
 
 # -------------------------------------------------------------------------
@@ -322,14 +551,14 @@ def call_reflector_ai(payload: dict) -> dict[str, Any]:
         current_app.logger.error("ReflectorAI API not configured.")
         return {"error": "API not configured"}
     try:
-        resp = requests.post(
+        resp = http_client.post(
+            "reflectorai",
             endpoint,
             headers={
                 "Content-Type": "application/json",
                 "Authorization": f"Bearer {api_key}",
             },
             json=payload,
-            timeout=10,
         )
         resp.raise_for_status()
         try:
@@ -6,7 +6,6 @@
 #              context-safety and optional Redis-based dedupe.
 # =============================================================================
 import functools
-import json
 import logging
 import os
 import time
@@ -14,6 +13,8 @@ from collections.abc import Callable
 from datetime import UTC, datetime
 from typing import Any, TypeVar
 
+from app.utils import json_codec
+
 logger = logging.getLogger(__name__)
 
 # --- Configuration & Global State ---
@@ -151,6 +152,12 @@ if PROMETHEUS_CLIENT_ENABLED:
         ["method", "endpoint"],
         buckets=_LATENCY_BUCKETS,
     )
+    _TEMPLATE_RENDER_HISTOGRAM = Histogram(
+        "template_render_duration_seconds",
+        "Jinja render_template latency",
+        ["template"],
+        buckets=_LATENCY_BUCKETS,
+    )
     _HTTP_ERROR_404_COUNTER = Counter("http_error_404_v1", "HTTP 404 errors (v1)")
     _HTTP_ERROR_401_COUNTER = Counter("http_error_401_v1", "HTTP 401 errors (v1)")
     _METRIC_LOOKUP.update(
@@ -160,6 +167,7 @@ if PROMETHEUS_CLIENT_ENABLED:
             "identity_events_total": _IDENTITY_EVENT_COUNTER,
             "redis_health_status": _REDIS_HEALTH_GAUGE,
             "http_request_duration_seconds": _API_LATENCY_HISTOGRAM,
+            "template_render_duration_seconds": _TEMPLATE_RENDER_HISTOGRAM,
             "http_error_404_v1": _HTTP_ERROR_404_COUNTER,
             "http_error_401_v1": _HTTP_ERROR_401_COUNTER,
         }
@@ -181,6 +189,9 @@ else:
         "histogram",
         ("method", "endpoint"),
     )
+    _TEMPLATE_RENDER_HISTOGRAM = MockMetric(
+        "template_render_duration_seconds", "Template render latency", "histogram", ("template",)
+    )
     _HTTP_ERROR_404_COUNTER = MockMetric("http_error_404_v1", "HTTP 404 errors (v1)", "counter")
     _HTTP_ERROR_401_COUNTER = MockMetric("http_error_401_v1", "HTTP 401 errors (v1)", "counter")
 
@@ -189,6 +200,7 @@ _METRIC_LOOKUP.setdefault("db_failure_count", _DB_FAILURE_COUNTER)
 _METRIC_LOOKUP.setdefault("identity_events_total", _IDENTITY_EVENT_COUNTER)
 _METRIC_LOOKUP.setdefault("redis_health_status", _REDIS_HEALTH_GAUGE)
 _METRIC_LOOKUP.setdefault("http_request_duration_seconds", _API_LATENCY_HISTOGRAM)
+_METRIC_LOOKUP.setdefault("template_render_duration_seconds", _TEMPLATE_RENDER_HISTOGRAM)
 _METRIC_LOOKUP.setdefault("http_error_404_v1", _HTTP_ERROR_404_COUNTER)
 _METRIC_LOOKUP.setdefault("http_error_401_v1", _HTTP_ERROR_401_COUNTER)
 
@@ -306,7 +318,7 @@ def ttl_pulse_emit(
             key,
             status,
             ttl_seconds,
-            json.dumps(payload),
+            json_codec.dumps(payload),
         )
         return
     try:
@@ -315,10 +327,10 @@ def ttl_pulse_emit(
             logger.error("TTL_EMIT: Redis client is None; skipping emit.")
             return
         try:
-            redis.setex(key, ttl_seconds, json.dumps(payload))
+            redis.setex(key, ttl_seconds, json_codec.dumps(payload))
         except TypeError:
             # fallback for clients that use different signature
-            redis.set(key, json.dumps(payload), ex=ttl_seconds)
+            redis.set(key, json_codec.dumps(payload), ex=ttl_seconds)
         logger.debug(f"TTL_EMIT (Redis): {key} ttl={ttl_seconds}s")
     except Exception as e:
         logger.error(f"CRITICAL: TTL emit failed for key '{key}': {e}")
@@ -349,7 +361,7 @@ def log_db_failure(
         "timestamp": datetime.now(UTC).isoformat(),
         "app_id": APP_ID,
     }
-    logger.critical(json.dumps(structured))
+    logger.critical(json_codec.dumps(structured))
     ttl_pulse_emit(
         f"ttl_pulse:db_failure:{APP_ID}:{context.replace('/', '_')}",
         "FAILURE",
@@ -384,7 +396,7 @@ def log_identity_event(
     }
 
     if MOCK_MODE or not _REDIS_AVAILABLE:
-        logger.info(f"Identity Event (Mock): {json.dumps(event)}")
+        logger.info(f"Identity Event (Mock): {json_codec.dumps(event)}")
         return
 
     try:
@@ -392,7 +404,7 @@ def log_identity_event(
         if redis is None:
             logger.error("Identity event: Redis client is None; skipping stream push.")
             return
-        redis.lpush("identity_events_stream", json.dumps(event))
+        redis.lpush("identity_events_stream", json_codec.dumps(event))
         try:
             redis.ltrim("identity_events_stream", 0, 4999)
         except Exception:
@@ -490,7 +502,7 @@ def record_lifecycle_event(
             "context": context,
             "pid": os.getpid(),
         }
-        logger.critical(json.dumps(structured))
+        logger.critical(json_codec.dumps(structured))
         logger.info(f"✅ {evt.capitalize()} telemetry event recorded.")
     finally:
         if did_push:
@@ -691,24 +703,16 @@ def register_cli_teardown(app):
         return
 
 
-def _get_safe_redis_client():
+def _get_safe_redis_client(pulse_key: str | None = None, ttl: int = TTL_SUCCESS):
     """
-    Safely retrieves a Redis client, returning None if connection fails.
-    Used for TTL pulse emission and non-critical telemetry.
+    Safely retrieves the shared Redis client, returning None if unavailable.
+    Used for TTL pulse emission and non-critical telemetry; when ``pulse_key``
+    is given a TTL pulse is written under it.
     """
-    import os
-
     try:
-        import redis
-
-        client = redis.Redis(
-            host=os.getenv("REDIS_HOST", "localhost"),
-            port=int(os.getenv("REDIS_PORT", 6379)),
-            db=int(os.getenv("REDIS_DB", 0)),
-            decode_responses=True,
-        )
-        # Test connection
-        client.ping()
+        client = get_redis_client()
+        if client is not None and pulse_key:
+            client.setex(pulse_key, ttl, datetime.now(UTC).isoformat())
         return client
     except Exception:
         # Fail silently - Redis is optional for telemetry
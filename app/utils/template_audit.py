@@ -3,23 +3,22 @@
 # DESCRIPTION: Cockpit-grade template wiring audit for route-template alignment,
 #              endpoint validity, and Jinja context checks with schema-based TTL
 #              telemetry for cockpit dashboards.
+#              url_for() targets come from the shared template index
+#              (app.utils.template_index), so only changed templates are read.
 # =============================================================================
 
 import json
 import logging
-import os
-import re
 from typing import Any
 
 import redis
 from flask import current_app
 
 from app.telemetry.ttl_emit import emit_schema_trace
+from app.utils.template_index import get_template_index, template_roots
 
 _logger = logging.getLogger(__name__)
 
-URL_FOR_RE = re.compile(r"url_for\(\s*[\"']([^\"']+)[\"']")
-
 
 def audit_template_wiring(redis_client: redis.Redis) -> dict[str, int]:
     """
@@ -81,23 +80,9 @@ def audit_template_wiring(redis_client: redis.Redis) -> dict[str, int]:
                 )
 
         # ---------------------------------------------------------------------
-        # Collect ALL template directories Flask knows about
+        # ALL template directories Flask knows about (app + blueprint folders)
         # ---------------------------------------------------------------------
-        template_dirs: set[str] = set()
-
-        # 1. Global template folder (app/templates)
-        if hasattr(current_app, "jinja_loader") and hasattr(current_app.jinja_loader, "searchpath"):
-            for p in current_app.jinja_loader.searchpath:
-                if os.path.isdir(p):
-                    template_dirs.add(p)
-
-        # 2. Blueprint template folders
-        for _, bp in current_app.blueprints.items():
-            if bp.template_folder:
-                bp_path = os.path.join(bp.root_path, bp.template_folder)
-                if os.path.isdir(bp_path):
-                    template_dirs.add(bp_path)
-
+        template_dirs = template_roots(current_app)
         if not template_dirs:
             _logger.warning("⚠️ No template directories found via Flask loader.")
             summary["errors"] += 1
@@ -107,28 +92,19 @@ def audit_template_wiring(redis_client: redis.Redis) -> dict[str, int]:
         # ---------------------------------------------------------------------
         endpoints = {rule.endpoint for rule in current_app.url_map.iter_rules()}
         missing: dict[str, set[str]] = {}
+        index = get_template_index(current_app, template_dirs)
+
+        for info in index.templates(template_dirs, suffixes=(".html", ".jinja2")):
+            summary["templates_scanned"] += 1
+            if info.read_error:
+                _logger.warning("⚠️ Could not read template %s: %s", info.path, info.read_error)
+                summary["errors"] += 1
+                continue
 
-        for tdir in template_dirs:
-            for root, _, files in os.walk(tdir):
-                for fname in files:
-                    if not fname.endswith((".html", ".jinja2")):
-                        continue
-
-                    summary["templates_scanned"] += 1
-                    path = os.path.join(root, fname)
-
-                    try:
-                        with open(path, encoding="utf-8", errors="ignore") as fh:
-                            text = fh.read()
-                    except Exception as read_err:
-                        _logger.warning("⚠️ Could not read template %s: %s", path, read_err)
-                        summary["errors"] += 1
-                        continue
-
-                    for ep in URL_FOR_RE.findall(text):
-                        summary["endpoints_found"] += 1
-                        if ep not in endpoints:
-                            missing.setdefault(path, set()).add(ep)
+            for ep in info.url_for:
+                summary["endpoints_found"] += 1
+                if ep not in endpoints:
+                    missing.setdefault(info.path, set()).add(ep)
 
         # ---------------------------------------------------------------------
         # Missing Endpoint Telemetry
@@ -0,0 +1,108 @@
+# =============================================================================
+# FILE: app/utils/template_cache.py
+# DESCRIPTION: Jinja bytecode cache shared by every worker on the host, a
+#              deploy-time precompile pass (`flask templates precompile`),
+#              and per-template render timing.
+#              Compiled templates are stored under TEMPLATE_BYTECODE_CACHE_DIR
+#              (default: <instance_path>/jinja_bytecode), keyed by template
+#              name and source checksum, so a fresh or recycled uwsgi worker
+#              loads bytecode instead of re-parsing every template.
+# =============================================================================
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+
+from flask import Flask, before_render_template, template_rendered
+from jinja2 import FileSystemBytecodeCache, TemplateSyntaxError
+
+from app.utils.telemetry import record_timing_sample
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_SUBDIR = "jinja_bytecode"
+RENDER_METRIC = "template_render_duration_seconds"
+DEFAULT_SLOW_RENDER_MS = 250
+
+_render_starts = threading.local()
+
+
+def cache_dir(flask_app: Flask) -> str:
+    return flask_app.config.get("TEMPLATE_BYTECODE_CACHE_DIR") or os.path.join(
+        flask_app.instance_path, DEFAULT_CACHE_SUBDIR
+    )
+
+
+def init_template_cache(flask_app: Flask) -> None:
+    """Attach the bytecode cache (on by default outside tests) and render timing."""
+    if flask_app.config.get("TEMPLATE_BYTECODE_CACHE", not flask_app.testing):
+        path = cache_dir(flask_app)
+        try:
+            os.makedirs(path, exist_ok=True)
+        except OSError as e:
+            logger.warning("Jinja bytecode cache disabled: cannot create %s (%s)", path, e)
+        else:
+            flask_app.jinja_env.bytecode_cache = FileSystemBytecodeCache(path)
+
+    before_render_template.connect(_render_started, flask_app)
+    template_rendered.connect(_render_finished, flask_app)
+
+
+# -----------------------------------------------------------------------------
+# Render timing (signals fire around each render_template call)
+# -----------------------------------------------------------------------------
+def _render_started(sender, template, context, **extra):
+    stack = getattr(_render_starts, "stack", None)
+    if stack is None:
+        stack = _render_starts.stack = []
+    stack.append(time.perf_counter())
+
+
+def _render_finished(sender, template, context, **extra):
+    stack = getattr(_render_starts, "stack", None)
+    if not stack:
+        return
+    elapsed = time.perf_counter() - stack.pop()
+    name = template.name or "<string>"
+    record_timing_sample(RENDER_METRIC, elapsed, {"template": name})
+    slow_ms = sender.config.get("TEMPLATE_SLOW_RENDER_MS", DEFAULT_SLOW_RENDER_MS)
+    if elapsed * 1000 >= slow_ms:
+        logger.warning("Slow template render: %s took %.1f ms", name, elapsed * 1000)
+
+
+# -----------------------------------------------------------------------------
+# Precompile
+# -----------------------------------------------------------------------------
+def precompile_templates(flask_app: Flask, clear: bool = False) -> dict:
+    """
+    Compile every template the app can load (app and blueprint folders),
+    writing bytecode to the cache when one is configured. Syntax errors are
+    collected rather than raised: {"compiled", "errors", "cache_dir", "ms"}.
+    """
+    env = flask_app.jinja_env
+    cache = env.bytecode_cache
+    if clear and cache is not None:
+        cache.clear()
+
+    start = time.perf_counter()
+    compiled, errors = 0, []
+    for name in env.list_templates():
+        try:
+            # Skip the in-memory cache so every template goes through the loader
+            env.loader.load(env, name)
+        except TemplateSyntaxError as e:
+            errors.append({"template": name, "line": e.lineno, "error": e.message})
+        except UnicodeDecodeError as e:
+            errors.append({"template": name, "line": None, "error": str(e)})
+        else:
+            compiled += 1
+
+    return {
+        "compiled": compiled,
+        "errors": errors,
+        "cache_dir": getattr(cache, "directory", None),
+        "ms": round((time.perf_counter() - start) * 1000, 1),
+    }
@@ -0,0 +1,314 @@
+# =============================================================================
+# FILE: app/utils/template_index.py
+# DESCRIPTION: Shared, incremental index of the Jinja templates used by the
+#              template audits (template_audit, nav_audit, cockpit template
+#              tracer). Each template is parsed once into its Jinja AST and
+#              the index records:
+#                - url_for() endpoint targets (constant names, in source order)
+#                - extends / include / import edges
+#                - undeclared context variables (environment globals excluded)
+#              Entries are keyed by absolute path and revalidated by
+#              mtime/size, then content hash, so a refresh re-reads and
+#              re-parses only files that actually changed. The index is
+#              persisted as JSON (TEMPLATE_INDEX_PATH, else next to the Jinja
+#              bytecode cache when one is configured; in-memory otherwise).
+# =============================================================================
+
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+from dataclasses import dataclass, field
+
+from flask import current_app, has_app_context
+from jinja2 import Environment, TemplateSyntaxError, meta, nodes
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+INDEX_FILENAME = "template_index.json"
+
+# Fallback for templates that do not parse
+URL_FOR_RE = re.compile(r"url_for\(\s*[\"']([^\"']+)[\"']")
+
+
+@dataclass
+class TemplateInfo:
+    path: str
+    root: str
+    name: str
+    mtime_ns: int
+    size: int
+    digest: str
+    url_for: list[str] = field(default_factory=list)
+    extends: list[str] = field(default_factory=list)
+    includes: list[str] = field(default_factory=list)
+    imports: list[str] = field(default_factory=list)
+    variables: list[str] = field(default_factory=list)
+    syntax_error: str | None = None
+    read_error: str | None = None
+
+
+def _const_names(node) -> list[str]:
+    """Template names from an extends/include/import target (constants only)."""
+    if isinstance(node, nodes.Const) and isinstance(node.value, str):
+        return [node.value]
+    if isinstance(node, (nodes.List, nodes.Tuple)):
+        return [n for item in node.items for n in _const_names(item)]
+    return []
+
+
+def parse_template(env: Environment, source: str, name: str, path: str) -> dict:
+    """Extract the indexed facts from one template's source."""
+    try:
+        ast = env.parse(source, name, path)
+    except TemplateSyntaxError as e:
+        return {"url_for": URL_FOR_RE.findall(source), "syntax_error": f"{e.lineno}: {e.message}"}
+
+    url_for = [
+        call.args[0].value
+        for call in ast.find_all(nodes.Call)
+        if isinstance(call.node, nodes.Name)
+        and call.node.name == "url_for"
+        and call.args
+        and isinstance(call.args[0], nodes.Const)
+        and isinstance(call.args[0].value, str)
+    ]
+    return {
+        "url_for": url_for,
+        "extends": [n for node in ast.find_all(nodes.Extends) for n in _const_names(node.template)],
+        "includes": [
+            n for node in ast.find_all(nodes.Include) for n in _const_names(node.template)
+        ],
+        "imports": [
+            n
+            for node in ast.find_all((nodes.Import, nodes.FromImport))
+            for n in _const_names(node.template)
+        ],
+        "variables": sorted(v for v in _context_variables(ast) if v not in env.globals),
+    }
+
+
+def _context_variables(ast) -> set[str]:
+    try:
+        return meta.find_undeclared_variables(ast)
+    except TemplateSyntaxError:
+        # Unknown filter/test in this environment: approximate from the AST
+        loaded = {n.name for n in ast.find_all(nodes.Name) if n.ctx == "load"}
+        stored = {n.name for n in ast.find_all(nodes.Name) if n.ctx in ("store", "param")}
+        return loaded - stored
+
+
+class TemplateIndex:
+    """Template facts keyed by absolute path; see refresh()."""
+
+    def __init__(self, store_path: str | None = None, env: Environment | None = None):
+        self.store_path = store_path
+        self.env = env or Environment()
+        self.entries: dict[str, TemplateInfo] = {}
+        self.last_refresh: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    # -------------------------------------------------------------------------
+    # Persistence
+    # -------------------------------------------------------------------------
+    def _load(self) -> None:
+        if not self.store_path or not os.path.exists(self.store_path):
+            return
+        try:
+            with open(self.store_path, encoding="utf-8") as fh:
+                data = json.load(fh)
+            if data.get("version") != INDEX_VERSION:
+                return
+            self.entries = {path: TemplateInfo(**entry) for path, entry in data["entries"].items()}
+        except Exception as e:
+            logger.warning("Template index at %s unreadable; rebuilding (%s)", self.store_path, e)
+            self.entries = {}
+
+    def _save(self) -> None:
+        if not self.store_path:
+            return
+        folder = os.path.dirname(self.store_path) or "."
+        try:
+            os.makedirs(folder, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                "w", dir=folder, prefix=INDEX_FILENAME, suffix=".tmp", delete=False
+            ) as fh:
+                json.dump(
+                    {
+                        "version": INDEX_VERSION,
+                        "entries": {p: dataclasses.asdict(e) for p, e in self.entries.items()},
+                    },
+                    fh,
+                )
+            os.replace(fh.name, self.store_path)
+        except OSError as e:
+            logger.warning("Could not persist template index to %s: %s", self.store_path, e)
+
+    # -------------------------------------------------------------------------
+    # Refresh
+    # -------------------------------------------------------------------------
+    def refresh(self, roots: list[str]) -> dict[str, int]:
+        """
+        Bring entries under ``roots`` up to date. Unchanged files cost one
+        stat; touched-but-identical files one read; only edited files are
+        parsed. Returns {"files", "parsed", "touched", "unchanged", "removed"}.
+        """
+        roots = [os.path.abspath(r) for r in roots]
+        stats = {"files": 0, "parsed": 0, "touched": 0, "unchanged": 0, "removed": 0}
+        with self._lock:
+            seen: set[str] = set()
+            dirty = False
+            for root in roots:
+                for dirpath, _dirs, files in os.walk(root):
+                    for fname in files:
+                        path = os.path.join(dirpath, fname)
+                        if path in seen:
+                            continue
+                        seen.add(path)
+                        stats["files"] += 1
+                        status = self._update(root, path)
+                        stats[status] += 1
+                        dirty |= status != "unchanged"
+
+            for path in [p for p, e in self.entries.items() if e.root in roots and p not in seen]:
+                del self.entries[path]
+                stats["removed"] += 1
+                dirty = True
+
+            if dirty:
+                self._save()
+            self.last_refresh = stats
+        return stats
+
+    def _update(self, root: str, path: str) -> str:
+        """Re-index one file if needed: "parsed", "touched" or "unchanged"."""
+        entry = self.entries.get(path)
+        try:
+            st = os.stat(path)
+        except OSError:
+            return "unchanged"
+        stamp = (st.st_mtime_ns, st.st_size)
+        if entry and entry.root == root and (entry.mtime_ns, entry.size) == stamp:
+            return "unchanged"
+
+        name = os.path.relpath(path, root).replace(os.sep, "/")
+        try:
+            with open(path, "rb") as fh:
+                raw = fh.read()
+        except OSError as e:
+            self.entries[path] = TemplateInfo(
+                path, root, name, st.st_mtime_ns, st.st_size, "", read_error=str(e)
+            )
+            return "parsed"
+
+        digest = hashlib.sha1(raw).hexdigest()
+        if entry and entry.root == root and entry.digest == digest:
+            # Touched but identical: keep the parsed facts
+            entry.mtime_ns, entry.size = stamp
+            return "touched"
+
+        try:
+            source = raw.decode("utf-8")
+        except UnicodeDecodeError as e:
+            self.entries[path] = TemplateInfo(
+                path, root, name, st.st_mtime_ns, st.st_size, digest, read_error=str(e)
+            )
+            return "parsed"
+        self.entries[path] = TemplateInfo(
+            path,
+            root,
+            name,
+            st.st_mtime_ns,
+            st.st_size,
+            digest,
+            **parse_template(self.env, source, name, path),
+        )
+        return "parsed"
+
+    # -------------------------------------------------------------------------
+    # Queries
+    # -------------------------------------------------------------------------
+    def templates(self, roots=None, suffixes=None) -> list[TemplateInfo]:
+        roots = {os.path.abspath(r) for r in roots} if roots else None
+        return sorted(
+            (
+                e
+                for e in self.entries.values()
+                if (roots is None or e.root in roots)
+                and (suffixes is None or e.path.endswith(tuple(suffixes)))
+            ),
+            key=lambda e: e.path,
+        )
+
+    def get_path(self, path: str) -> TemplateInfo | None:
+        return self.entries.get(os.path.abspath(path))
+
+    def has(self, template_name: str) -> bool:
+        """True when a template with this name (or bare file name) is indexed."""
+        return any(
+            e.name == template_name or os.path.basename(e.path) == template_name
+            for e in self.entries.values()
+        )
+
+    def dependents(self, template_name: str) -> list[str]:
+        """Names of templates that extend, include or import ``template_name``."""
+        return sorted(
+            e.name
+            for e in self.entries.values()
+            if template_name in (*e.extends, *e.includes, *e.imports)
+        )
+
+
+# =============================================================================
+# Shared per-process indexes
+# =============================================================================
+_indexes: dict[str | None, TemplateIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def template_roots(app) -> list[str]:
+    """Every template folder Flask knows about: the app's, then blueprints'."""
+    roots: list[str] = []
+    loader = getattr(app, "jinja_loader", None)
+    for path in getattr(loader, "searchpath", None) or []:
+        roots.append(os.path.abspath(path))
+    for bp in app.blueprints.values():
+        if bp.template_folder:
+            roots.append(os.path.abspath(os.path.join(bp.root_path, bp.template_folder)))
+    return [r for r in dict.fromkeys(roots) if os.path.isdir(r)]
+
+
+def index_store_path(app) -> str | None:
+    configured = app.config.get("TEMPLATE_INDEX_PATH")
+    if configured:
+        return configured
+    cache = getattr(app.jinja_env, "bytecode_cache", None)
+    directory = getattr(cache, "directory", None)
+    return os.path.join(directory, INDEX_FILENAME) if directory else None
+
+
+def get_template_index(app=None, roots: list[str] | None = None) -> TemplateIndex:
+    """
+    The process-wide index for ``app`` (default: current_app), refreshed for
+    ``roots`` (default: template_roots(app)).
+    """
+    if app is None and has_app_context():
+        app = current_app._get_current_object()
+    store_path = index_store_path(app) if app is not None else None
+    with _indexes_lock:
+        index = _indexes.get(store_path)
+        if index is None:
+            env = app.jinja_env if app is not None else None
+            index = _indexes[store_path] = TemplateIndex(store_path, env)
+    if roots is None:
+        roots = template_roots(app) if app is not None else []
+    index.refresh(roots)
+    return index
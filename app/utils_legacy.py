@@ -20,10 +20,11 @@ from datetime import datetime
 from io import BytesIO
 from typing import Any
 
-import requests
 from fpdf import FPDF
 from PyPDF2 import PdfReader, PdfWriter
 
+from app.utils import http_client
+
 # ==========================
 # PythonAnywhere API Monitoring
 # ==========================
@@ -34,10 +35,10 @@ def get_pythonanywhere_cpu_quota() -> dict[str, Any]:
     username = "srpihhllc"
     token = os.getenv("API_TOKEN")
 
-    response = requests.get(
+    response = http_client.get(
+        "pythonanywhere",
         f"https://www.pythonanywhere.com/api/v0/user/{username}/cpu/",
         headers={"Authorization": f"Token {token}"} if token else {},
-        timeout=10,
     )
 
     if response.status_code == 200:
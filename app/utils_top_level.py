@@ -5,10 +5,11 @@ import datetime
 import os
 from io import BytesIO
 
-import requests
 from fpdf import FPDF
 from PyPDF2 import PdfReader, PdfWriter
 
+from app.utils import http_client
+
 # ==========================
 # PythonAnywhere API Monitoring
 # ==========================
@@ -19,7 +20,8 @@ def get_pythonanywhere_cpu_quota():
     username = "srpihhllc"
     token = os.getenv("API_TOKEN")  # Uses environment variable for security
 
-    response = requests.get(
+    response = http_client.get(
+        "pythonanywhere",
         f"https://www.pythonanywhere.com/api/v0/user/{username}/cpu/",
         headers={"Authorization": f"Token {token}"},
     )
@@ -75,7 +75,6 @@
 
 import hashlib
 import hmac
-import json
 from datetime import datetime
 
 from flask import Blueprint, current_app, jsonify, request
@@ -84,7 +83,9 @@ from app import db
 from app.models.borrower_card import BorrowerCard
 from app.models.user import User
 from app.models.vault_transaction import VaultTransaction
-from app.utils.redis_utils import get_redis_client
+from app.utils import json_codec
+from app.utils.local_store import LocalTTLStore
+from app.utils.redis_utils import get_redis_client, is_redis_degraded
 from app.utils.telemetry import log_identity_event
 
 webhooks_bp = Blueprint("webhooks", __name__, url_prefix="/webhooks")
@@ -96,6 +97,9 @@ WEBHOOK_TTL_SECONDS = 3600  # 1 hour TTL for traces & idempotency keys
 IDEMPOTENCY_PREFIX = "webhook:idempotency"
 TRACE_PREFIX = "webhook:trace"
 
+# Degraded-mode idempotency keys (per process) used while Redis is unreachable
+_local_idempotency = LocalTTLStore()
+
 # Optional shared secrets (read from config)
 ACH_WEBHOOK_SECRET_CONFIG_KEY = "ACH_WEBHOOK_SECRET"
 PLAID_WEBHOOK_SECRET_CONFIG_KEY = "PLAID_WEBHOOK_SECRET"
@@ -222,10 +226,14 @@ def _is_duplicate_event(redis, provider: str, raw_body: bytes) -> bool:
     """
     Uses a hash of the request body as an idempotency key.
     If key exists in Redis, event is considered already processed.
+    While Redis is degraded (circuit open) keys are tracked process-locally.
     """
     body_hash = _get_body_hash(raw_body)
     key = f"{IDEMPOTENCY_PREFIX}:{provider}:{body_hash}"
 
+    if redis is None:
+        return is_redis_degraded() and not _local_idempotency.set_nx(key, WEBHOOK_TTL_SECONDS)
+
     try:
         created = redis.set(key, "1", nx=True, ex=WEBHOOK_TTL_SECONDS)
         # If set() returns True/1 => new key created => not duplicate
@@ -239,8 +247,8 @@ def _is_duplicate_event(redis, provider: str, raw_body: bytes) -> bool:
             payload={},
             status="redis_unavailable",
         )
-        # Do NOT treat as duplicate on Redis failure; process normally
-        return False
+        # Redis failed mid-call: fall back to the process-local key set
+        return not _local_idempotency.set_nx(key, WEBHOOK_TTL_SECONDS)
 
 
 # -----------------------------------------------------------------------------
@@ -259,11 +267,9 @@ def _emit_webhook_trace(event_type: str, provider: str, payload: dict, status: s
         "ip": request.remote_addr,
     }
 
-    # Safe payload hash (no PII)
+    # Safe payload hash (no PII); canonical encoding hashed in one pass
     try:
-        payload_hash = hashlib.sha256(
-            json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
-        ).hexdigest()
+        payload_hash = json_codec.stable_hash(payload)
     except Exception:
         payload_hash = None
     trace["payload_hash"] = payload_hash
@@ -271,7 +277,7 @@ def _emit_webhook_trace(event_type: str, provider: str, payload: dict, status: s
     try:
         redis = get_redis_client()
         key = f"{TRACE_PREFIX}:{provider}:{event_type}:{trace['timestamp']}"
-        redis.setex(key, WEBHOOK_TTL_SECONDS, json.dumps(trace))
+        redis.setex(key, WEBHOOK_TTL_SECONDS, json_codec.dumps(trace))
     except Exception as exc:
         current_app.logger.warning(
             f"⚠️ Redis unavailable during webhook trace emit: {exc}", exc_info=True
@@ -330,7 +336,7 @@ def ach_listener():
             status="redis_unavailable",
         )
 
-    if redis and _is_duplicate_event(redis, "ACH", raw_body):
+    if _is_duplicate_event(redis, "ACH", raw_body):
         _emit_webhook_trace(
             event_type="WEBHOOK_ACH_RECORDED",
             provider="ACH",
@@ -493,7 +499,7 @@ def plaid_listener():
             status="redis_unavailable",
         )
 
-    if redis and _is_duplicate_event(redis, "Plaid", raw_body):
+    if _is_duplicate_event(redis, "Plaid", raw_body):
         _emit_webhook_trace(
             event_type="WEBHOOK_PLAID_RECORDED",
             provider="Plaid",
@@ -640,7 +646,7 @@ def reconcile_payments():
             status="redis_unavailable",
         )
 
-    if redis and _is_duplicate_event(redis, "Reconcile", raw_body):
+    if _is_duplicate_event(redis, "Reconcile", raw_body):
         _emit_webhook_trace(
             event_type="WEBHOOK_RECONCILE_SUCCESS",
             provider="Reconcile",
@@ -0,0 +1,5 @@
+# =============================================================================
+# FILE: benchmarks/__init__.py
+# DESCRIPTION: Offline micro-benchmarks for hot paths. Each module is runnable
+#              with `python -m benchmarks.<module>` and prints JSON results.
+# =============================================================================
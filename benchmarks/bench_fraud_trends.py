@@ -0,0 +1,150 @@
+# =============================================================================
+# FILE: benchmarks/bench_fraud_trends.py
+# DESCRIPTION: Fraud trend analysis over synthetic fraud reports: the legacy
+#              per-report Transaction lookup loop versus the joined GROUP BY
+#              rollup, a first (full) refresh, and an incremental rerun after
+#              a small batch of new reports.
+#
+# Usage:
+#   python -m benchmarks.bench_fraud_trends [--reports 100000] [--new 1000]
+#                                           [--db /tmp/fraud.sqlite]
+# =============================================================================
+
+import argparse
+import datetime
+import json
+import time
+
+import numpy as np
+from flask import Flask
+from sqlalchemy import insert
+
+import app.models  # noqa: F401 - register every table on db.metadata
+from app import compliance_ai
+from app.extensions import db
+from app.models import FraudReport, Transaction, User
+
+CATEGORIES = ("Wire", "Atm", "Card", "Online", "Crypto", "Check", "Payroll", "Refund")
+HISTORY_DAYS = 90
+CHUNK = 20_000
+
+
+def _populate(reports: int, offset: int, now: datetime.datetime, rng, span: int) -> None:
+    # created_at spread uniformly over the ``span`` seconds before ``now``
+    for start in range(offset, offset + reports, CHUNK):
+        n = min(CHUNK, offset + reports - start)
+        kinds = rng.integers(0, len(CATEGORIES), n).tolist()
+        ages = rng.integers(0, span, n).tolist()
+        linked = (rng.random(n) > 0.05).tolist()
+        txns, rows = [], []
+        for i, (kind, age, has_txn) in enumerate(zip(kinds, ages, linked)):
+            seq = start + i
+            txn_id = f"txn-{seq:08d}" if has_txn else None
+            if has_txn:
+                txns.append(
+                    {
+                        "id": txn_id,
+                        "user_id": "u1",
+                        "amount": 10.0,
+                        "date": now,
+                        "description": f"{CATEGORIES[kind]} payment {seq}",
+                    }
+                )
+            rows.append(
+                {
+                    "id": f"report-{seq:08d}",
+                    "user_id": "u1",
+                    "transaction_id": txn_id,
+                    "category": "fraud",
+                    "severity": "medium",
+                    "status": "open",
+                    "created_at": now - datetime.timedelta(seconds=int(age)),
+                }
+            )
+        if txns:
+            db.session.execute(insert(Transaction.__table__), txns)
+        db.session.execute(insert(FraudReport.__table__), rows)
+        db.session.commit()
+
+
+def _legacy(now: datetime.datetime, days: float) -> dict:
+    # Mirrors the previous body: every report, then one lookup per report
+    cases = FraudReport.query.filter(
+        FraudReport.created_at >= now - datetime.timedelta(days=days)
+    ).all()
+    counts = {}
+    for case in cases:
+        txn = db.session.get(Transaction, case.transaction_id) if case.transaction_id else None
+        category = txn.description.split()[0] if txn else "Unknown"
+        counts[category] = counts.get(category, 0) + 1
+    db.session.expunge_all()
+    return counts
+
+
+def _timed(fn, *args, **kwargs) -> tuple[float, object]:
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return round((time.perf_counter() - start) * 1000, 1), result
+
+
+def main(argv=None) -> dict:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--reports", type=int, default=100_000)
+    parser.add_argument("--new", type=int, default=1_000, help="Reports added before the rerun")
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--db", default="", help="SQLite file (default: in-memory)")
+    args = parser.parse_args(argv)
+
+    flask_app = Flask(__name__)
+    flask_app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{args.db}" if args.db else "sqlite://"
+    db.init_app(flask_app)
+    now = datetime.datetime(2025, 6, 30, 22, 0)
+    rng = np.random.default_rng(11)
+
+    with flask_app.app_context():
+        db.create_all()
+        db.session.add(User(id="u1", email="u1@example.com", password_hash="x", role="borrower"))
+        db.session.commit()
+        populate_ms, _ = _timed(_populate, args.reports, 0, now, rng, HISTORY_DAYS * 86400)
+
+        legacy_ms, legacy = _timed(_legacy, now, args.days)
+        full_ms, full = _timed(compliance_ai.refresh_fraud_trends)
+        noop_ms, _ = _timed(compliance_ai.refresh_fraud_trends)
+
+        # New reports land in the hour after the first refresh
+        now += datetime.timedelta(hours=1)
+        _populate(args.new, args.reports, now, rng, 3600)
+        rerun_ms, rerun = _timed(compliance_ai.refresh_fraud_trends)
+        predict_ms, predicted = _timed(compliance_ai.predict_fraud_trends, days=args.days, now=now)
+
+        # Whole-day buckets: compare against the legacy count over the same days
+        window_start = (now - datetime.timedelta(days=args.days - 1)).replace(hour=0, minute=0)
+        legacy_window = _legacy(now, (now - window_start).total_seconds() / 86400)
+        assert predicted["categories"] == legacy_window, "rollup disagrees with legacy counts"
+
+        db.session.remove()
+        db.drop_all()
+
+    results = {
+        "benchmark": "fraud_trends",
+        "reports": args.reports,
+        "new_reports": args.new,
+        "days": args.days,
+        "populate_ms": populate_ms,
+        "legacy_per_report_lookup_ms": legacy_ms,
+        "legacy_cases": sum(legacy.values()),
+        "full_refresh_ms": full_ms,
+        "full_refresh_buckets": full["buckets"],
+        "noop_rerun_ms": noop_ms,
+        "incremental_rerun_ms": rerun_ms,
+        "incremental_processed": rerun["processed"],
+        "predict_ms": predict_ms,
+        "speedup_full": round(legacy_ms / full_ms, 1) if full_ms else None,
+        "speedup_incremental": round(legacy_ms / rerun_ms, 1) if rerun_ms else None,
+    }
+    print(json.dumps(results, indent=2))
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# =============================================================================
+# FILE: benchmarks/bench_json_codec.py
+# DESCRIPTION: Encode/decode throughput of app.utils.json_codec versus stdlib
+#              json on the payload shapes we actually emit: ttl_emit pulses,
+#              webhook traces, identity events and transaction list pages.
+#
+# Usage:
+#   python -m benchmarks.bench_json_codec [--iterations 20000]
+# =============================================================================
+
+import argparse
+import datetime
+import json
+import time
+
+from app.utils import json_codec
+
+
+def _payloads() -> dict[str, object]:
+    now = datetime.datetime(2024, 6, 1, 12, 0, 0, tzinfo=datetime.UTC)
+    return {
+        "ttl_emit": {
+            "status": "ok",
+            "timestamp": now.isoformat(timespec="seconds"),
+            "value": "redis client ready",
+            "domain": "boot",
+            "pid": 4242,
+        },
+        "webhook_trace": {
+            "event_type": "WEBHOOK_ACH_RECORDED",
+            "provider": "ach",
+            "status": "recorded",
+            "timestamp": 1717243200,
+            "ip": "203.0.113.7",
+            "payload_hash": "9f" * 32,
+        },
+        "identity_event": {
+            "event_type": "LOGIN_SUCCESS",
+            "user_id": 1234,
+            "timestamp": now.isoformat(),
+            "meta": {"ip": "198.51.100.4", "user_agent": "Mozilla/5.0", "details": {"mfa": True}},
+            "app_id": "default_app",
+        },
+        "transaction_page": [
+            {
+                "id": i,
+                "user_id": 17,
+                "amount": round(i * 1.37, 2),
+                "date": (now - datetime.timedelta(days=i)).date().isoformat(),
+                "description": f"POS PURCHASE MERCHANT {i % 40}",
+                "category": "groceries",
+                "status": "posted",
+            }
+            for i in range(200)
+        ],
+    }
+
+
+def _rate(fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return round(iterations / (time.perf_counter() - start), 1)
+
+
+def main(argv=None) -> dict:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=20_000)
+    args = parser.parse_args(argv)
+
+    results: dict[str, object] = {"benchmark": "json_codec", "backend": json_codec.BACKEND}
+    for name, payload in _payloads().items():
+        iterations = args.iterations
+        if name == "transaction_page":
+            iterations = max(iterations // 50, 1)
+        encoded = json.dumps(payload)
+        results[name] = {
+            "iterations": iterations,
+            "stdlib_encode_ops": _rate(lambda p=payload: json.dumps(p), iterations),
+            "codec_encode_ops": _rate(lambda p=payload: json_codec.dumps(p), iterations),
+            "stdlib_decode_ops": _rate(lambda e=encoded: json.loads(e), iterations),
+            "codec_decode_ops": _rate(lambda e=encoded: json_codec.loads(e), iterations),
+            "stdlib_sorted_hash_ops": _rate(
+                lambda p=payload: json.dumps(p, sort_keys=True, default=str).encode("utf-8"),
+                iterations,
+            ),
+            "codec_stable_hash_ops": _rate(lambda p=payload: json_codec.stable_hash(p), iterations),
+        }
+    print(json.dumps(results, indent=2))
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+# =============================================================================
+# FILE: benchmarks/bench_login_storm.py
+# DESCRIPTION: Load test for login bursts against one uwsgi-like process
+#              (a fixed pool of request threads, 2 by default as in
+#              uwsgi.ini). Closed-loop clients hammer /login while a probe
+#              measures /ping latency. Compares no storm, inline
+#              check_password_hash, and the pooled hashing service with fast
+#              rejection (app.services.password_hashing).
+#
+# Usage:
+#   python -m benchmarks.bench_login_storm [--clients 16] [--seconds 5]
+#                                          [--threads 2] [--method scrypt]
+#                                          [--workers 1] [--queue-depth 0]
+# =============================================================================
+
+import argparse
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import Flask, request
+from werkzeug.security import check_password_hash, generate_password_hash
+
+from app.services import password_hashing as hashing
+
+PROBE_INTERVAL = 0.02
+
+
+def _make_app(method: str, pooled: bool, workers: int, depth: int) -> Flask:
+    flask_app = Flask(__name__)
+    flask_app.config.update(
+        PASSWORD_HASH_METHOD=method,
+        PASSWORD_HASH_WORKERS=workers,
+        PASSWORD_HASH_QUEUE_DEPTH=depth,
+    )
+    stored = generate_password_hash("correct horse", method=method)
+
+    @flask_app.post("/login")
+    def login():
+        password = request.form.get("password", "")
+        if not pooled:
+            return ("ok", 200) if check_password_hash(stored, password) else ("no", 401)
+        try:
+            ok = hashing.verify_password(stored, password)
+        except hashing.HashingOverloaded:
+            return "busy", 503, {"Retry-After": "1"}
+        return ("ok", 200) if ok else ("no", 401)
+
+    @flask_app.get("/ping")
+    def ping():
+        return "pong"
+
+    return flask_app
+
+
+def _percentiles(samples: list[float]) -> dict:
+    if not samples:
+        return {"n": 0}
+    ordered = sorted(samples)
+
+    def pick(q):
+        return round(ordered[min(len(ordered) - 1, int(len(ordered) * q))], 2)
+
+    return {"n": len(ordered), "p50_ms": pick(0.5), "p95_ms": pick(0.95), "p99_ms": pick(0.99)}
+
+
+def _phase(flask_app: Flask, threads: int, clients: int, seconds: float, backoff: float) -> dict:
+    """Run the storm; every request goes through ``threads`` server threads."""
+    server = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="uwsgi")
+    stop = threading.Event()
+    statuses = {}
+    lock = threading.Lock()
+
+    def handle(method, path, **kwargs):
+        with flask_app.test_client() as client:
+            return client.open(path, method=method, **kwargs).status_code
+
+    def storm():
+        while not stop.is_set():
+            status = server.submit(
+                handle, "POST", "/login", data={"password": "correct horse"}
+            ).result()
+            with lock:
+                statuses[status] = statuses.get(status, 0) + 1
+            if status == 503:
+                stop.wait(backoff)  # clients honour Retry-After, scaled down
+
+    storm_threads = [threading.Thread(target=storm, daemon=True) for _ in range(clients)]
+    for thread in storm_threads:
+        thread.start()
+
+    latencies = []
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        server.submit(handle, "GET", "/ping").result()
+        latencies.append((time.perf_counter() - start) * 1000)
+        time.sleep(PROBE_INTERVAL)
+
+    stop.set()
+    for thread in storm_threads:
+        thread.join()
+    server.shutdown()
+    return {
+        "ping": _percentiles(latencies),
+        "logins": {str(k): v for k, v in sorted(statuses.items())},
+        "logins_ok_per_s": round(statuses.get(200, 0) / seconds, 1),
+    }
+
+
+def main(argv=None) -> dict:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=16, help="Concurrent login clients")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--threads", type=int, default=2, help="Request threads per process")
+    parser.add_argument("--method", default="scrypt")
+    parser.add_argument("--workers", type=int, default=1, help="Hashing pool processes")
+    parser.add_argument("--queue-depth", type=int, default=0)
+    parser.add_argument("--backoff", type=float, default=0.05, help="Client wait after a 503")
+    args = parser.parse_args(argv)
+
+    inline_app = _make_app(args.method, False, args.workers, args.queue_depth)
+    pooled_app = _make_app(args.method, True, args.workers, args.queue_depth)
+
+    with inline_app.app_context():
+        start = time.perf_counter()
+        check_password_hash(generate_password_hash("x", args.method), "x")
+        single_ms = round((time.perf_counter() - start) * 1000 / 2, 1)
+
+    results = {
+        "benchmark": "login_storm",
+        "method": hashing.normalize_method(args.method),
+        "single_hash_ms": single_ms,
+        "request_threads": args.threads,
+        "login_clients": args.clients,
+        "hash_workers": args.workers,
+        "queue_depth": args.queue_depth,
+        "no_storm": _phase(inline_app, args.threads, 0, min(args.seconds, 2.0), args.backoff),
+        "inline": _phase(inline_app, args.threads, args.clients, args.seconds, args.backoff),
+    }
+    with pooled_app.app_context():
+        hashing.shutdown_pool()
+        results["pooled"] = _phase(
+            pooled_app, args.threads, args.clients, args.seconds, args.backoff
+        )
+        results["pooled"]["hash_stats"] = hashing.hash_stats()
+        hashing.shutdown_pool()
+
+    print(json.dumps(results, indent=2))
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# =============================================================================
+# FILE: benchmarks/bench_response_envelope.py
+# DESCRIPTION: Latency/CPU comparison of the legacy re-parse envelope
+#              (a jsonify() body wrapped by @enveloped) versus the single-pass return-value envelope, using a
+#              10k-row transaction list.
+#
+# Usage:
+#   python -m benchmarks.bench_response_envelope [--rows 10000] [--repeat 20]
+# =============================================================================
+
+import argparse
+import json
+import statistics
+import time
+from datetime import date, timedelta
+
+from flask import Flask, jsonify
+
+from app.middleware.response_wrapper import enveloped, init_response_handling
+
+
+def _make_rows(count: int) -> list[dict]:
+    start = date(2024, 1, 1)
+    return [
+        {
+            "id": i,
+            "user_id": i % 500,
+            "amount": round((i * 37 % 10_000) / 100, 2),
+            "date": (start + timedelta(days=i % 365)).isoformat(),
+            "description": f"Merchant {i % 250} purchase",
+            "category": ("groceries", "fuel", "travel", "utilities")[i % 4],
+            "status": "posted",
+        }
+        for i in range(count)
+    ]
+
+
+def _build_app(rows: list[dict]) -> Flask:
+    app = Flask(__name__)
+    init_response_handling(app)
+
+    @app.route("/api/legacy/transactions")
+    @enveloped
+    def legacy():
+        # Pre-change behaviour: the view serializes, the envelope parses the
+        # body back out and serializes a second time.
+        return jsonify(rows)
+
+    @app.route("/api/transactions")
+    @enveloped
+    def single_pass():
+        return rows
+
+    return app
+
+
+def _measure(client, path: str, repeat: int) -> dict:
+    wall, cpu = [], []
+    for _ in range(repeat):
+        w0, c0 = time.perf_counter(), time.process_time()
+        resp = client.get(path)
+        body = resp.get_data()
+        wall.append((time.perf_counter() - w0) * 1000)
+        cpu.append((time.process_time() - c0) * 1000)
+        assert resp.status_code == 200, path
+    assert json.loads(body)["status"] == "success"
+    return {
+        "p50_ms": round(statistics.median(wall), 3),
+        "mean_ms": round(statistics.fmean(wall), 3),
+        "cpu_mean_ms": round(statistics.fmean(cpu), 3),
+        "bytes": len(body),
+    }
+
+
+def main(argv=None) -> dict:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    app = _build_app(_make_rows(args.rows))
+    client = app.test_client()
+    results = {
+        "benchmark": "response_envelope",
+        "rows": args.rows,
+        "repeat": args.repeat,
+        "legacy_reparse": _measure(client, "/api/legacy/transactions", args.repeat),
+        "single_pass": _measure(client, "/api/transactions", args.repeat),
+    }
+    print(json.dumps(results, indent=2))
+    return results
+
+
+if __name__ == "__main__":
+    main()
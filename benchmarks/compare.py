@@ -0,0 +1,103 @@
+# =============================================================================
+# FILE: benchmarks/compare.py
+# DESCRIPTION: Regression report between two `benchmarks.suite` result files
+#              (e.g. the merge base and the branch head). A case regresses
+#              when its median (or --stat min) grows by more than --threshold
+#              percent *and* by more than --min-ms (noise floor for
+#              sub-millisecond cases), when it issues more SQL statements, or
+#              when it starts failing.
+#              Exits 1 when anything regressed so CI can gate on it.
+#
+# Usage:
+#   python -m benchmarks.compare base.json head.json [--threshold 20]
+#                                [--min-ms 1.0] [--stat median|min] [--json]
+# =============================================================================
+
+import argparse
+import json
+import sys
+
+
+def _load(path: str) -> dict:
+    with open(path, encoding="utf-8") as fh:
+        data = json.load(fh)
+    if "results" not in data:
+        raise SystemExit(f"{path}: not a benchmarks.suite result file")
+    return data
+
+
+def compare(
+    base: dict, head: dict, threshold: float = 20.0, min_ms: float = 1.0, stat: str = "median"
+) -> list[dict]:
+    """One row per case in either run, with its verdict."""
+    key = f"{stat}_ms"
+    rows = []
+    base_results, head_results = base["results"], head["results"]
+    for case in sorted(set(base_results) | set(head_results)):
+        before, after = base_results.get(case), head_results.get(case)
+        row = {"case": case, "base_ms": None, "head_ms": None, "delta_pct": None}
+        if before is None or after is None:
+            row["verdict"] = "added" if before is None else "removed"
+        elif "error" in after:
+            row["verdict"] = "still failing" if "error" in before else "REGRESSION"
+            row["note"] = after["error"]
+        elif "error" in before:
+            row["head_ms"] = after[key]
+            row["verdict"] = "fixed"
+        else:
+            row["base_ms"], row["head_ms"] = before[key], after[key]
+            delta = after[key] - before[key]
+            if before[key]:
+                row["delta_pct"] = round(delta / before[key] * 100, 1)
+            slower = delta > min_ms and (row["delta_pct"] is None or row["delta_pct"] > threshold)
+            faster = -delta > min_ms and (row["delta_pct"] or 0) < -threshold
+            more_queries = after.get("queries", 0) > before.get("queries", 0)
+            if more_queries:
+                row["note"] = f"queries {before.get('queries')} -> {after.get('queries')}"
+            row["verdict"] = (
+                "REGRESSION" if slower or more_queries else "improved" if faster else "ok"
+            )
+        rows.append(row)
+    return rows
+
+
+def _fmt(value, suffix="") -> str:
+    return "-" if value is None else f"{value}{suffix}"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("base")
+    parser.add_argument("head")
+    parser.add_argument("--threshold", type=float, default=20.0, help="Allowed slowdown, percent")
+    parser.add_argument("--min-ms", type=float, default=1.0, help="Ignore slowdowns below this")
+    parser.add_argument("--stat", choices=("median", "min"), default="median")
+    parser.add_argument("--json", action="store_true", help="Print rows as JSON")
+    args = parser.parse_args(argv)
+
+    base, head = _load(args.base), _load(args.head)
+    rows = compare(base, head, args.threshold, args.min_ms, args.stat)
+    regressions = [r for r in rows if r["verdict"] == "REGRESSION"]
+
+    if args.json:
+        print(json.dumps({"rows": rows, "regressions": len(regressions)}, indent=2))
+    else:
+        print(
+            f"base {base['meta'].get('commit') or args.base} -> "
+            f"head {head['meta'].get('commit') or args.head} "
+            f"({args.stat}, threshold {args.threshold}%, noise floor {args.min_ms} ms)"
+        )
+        width = max([len(r["case"]) for r in rows] + [4])
+        print(f"{'case':<{width}}  {'base ms':>10}  {'head ms':>10}  {'delta':>8}  verdict")
+        for r in rows:
+            print(
+                f"{r['case']:<{width}}  {_fmt(r['base_ms']):>10}  {_fmt(r['head_ms']):>10}  "
+                f"{_fmt(r['delta_pct'], '%'):>8}  {r['verdict']}"
+                + (f"  ({r['note']})" if r.get("note") else "")
+            )
+        print(f"{len(regressions)} regression(s) in {len(rows)} cases")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
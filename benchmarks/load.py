@@ -0,0 +1,350 @@
+# =============================================================================
+# FILE: benchmarks/load.py
+# DESCRIPTION: In-process load harness. Drives the create_app() WSGI app
+#              directly (werkzeug test clients, one per simulated client
+#              thread) over a file-backed SQLite database and fakeredis, with
+#              a weighted request mix:
+#                - login       POST /api/v1/auth/login (real password hashing)
+#                - dashboard   GET  /sub/dashboard (session login)
+#                - webhook     POST /webhooks/ach (unique events)
+#                - tradelines  GET  /api/v1/tradelines (JWT)
+#                - ping        GET  /api/v1/ping (framework floor)
+#              Clients run closed-loop. A ramp profile (--ramp 1,2,4,8) runs
+#              one step per concurrency level and reports, per step and per
+#              endpoint, throughput, p50/p95/p99 latency, status counts and
+#              SQL statements per request; the saturation point is the last
+#              step that still added --knee percent throughput (or held the
+#              --slo-p95-ms target). --set KEY=VALUE overrides app config,
+#              e.g. PASSWORD_HASH_WORKERS=4, to compare worker settings.
+#
+# Usage:
+#   python -m benchmarks.load [--ramp 1,2,4,8,16] [--duration 5]
+#                             [--mix login=1,dashboard=4,webhook=3,tradelines=4]
+#                             [--set PASSWORD_HASH_WORKERS=2] [--slo-p95-ms 250]
+# =============================================================================
+
+import argparse
+import itertools
+import json
+import logging
+import math
+import os
+import random
+import tempfile
+import threading
+import time
+
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event, insert, update
+
+from app.extensions import db
+from app.models import Tradeline, User
+from app.services.password_hashing import hash_password
+from benchmarks.suite import SCALES, SEED, build_app, seed_dataset, seed_user_id
+
+PASSWORD = "bench-password-1"
+DEFAULT_MIX = "login=1,dashboard=4,webhook=3,tradelines=4,ping=1"
+TRADELINES_PER_USER = 5
+
+
+# =============================================================================
+# Per-thread SQL statement counting
+# =============================================================================
+class ThreadQueryCounter:
+    """Statements per thread; the test client runs each request on the caller's thread."""
+
+    def __init__(self, engine):
+        self._local = threading.local()
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args):
+        self._local.count = getattr(self._local, "count", 0) + 1
+
+    @property
+    def count(self) -> int:
+        return getattr(self._local, "count", 0)
+
+
+# =============================================================================
+# Request mix
+# =============================================================================
+def _endpoints(users: int) -> dict:
+    """name -> fn(client, rng, seq) issuing one request and returning the response."""
+
+    def login(client, rng, seq):
+        email = f"user{rng.randrange(1, users):05d}@example.com"
+        return client.post("/api/v1/auth/login", json={"email": email, "password": PASSWORD})
+
+    def dashboard(client, rng, seq):
+        return client.get("/sub/dashboard")
+
+    def webhook(client, rng, seq):
+        owner = rng.randrange(users)
+        payload = {
+            "borrower_id": seed_user_id(owner),
+            "card_id": str(owner + 1),
+            "amount": round(10 + seq / 100, 2),
+        }
+        return client.post("/webhooks/ach", json=payload)
+
+    def tradelines(client, rng, seq):
+        return client.get("/api/v1/tradelines?limit=20", headers=client.bench_auth)
+
+    def ping(client, rng, seq):
+        return client.get("/api/v1/ping")
+
+    return {
+        "login": login,
+        "dashboard": dashboard,
+        "webhook": webhook,
+        "tradelines": tradelines,
+        "ping": ping,
+    }
+
+
+def parse_mix(spec: str, known) -> dict[str, float]:
+    mix = {}
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        name, _, weight = part.partition("=")
+        if name not in known:
+            raise ValueError(f"unknown endpoint {name!r} (known: {', '.join(known)})")
+        mix[name] = float(weight or 1)
+    if not mix or sum(mix.values()) <= 0:
+        raise ValueError("request mix is empty")
+    return mix
+
+
+def _seed_load_data(sizes: dict) -> None:
+    """Suite dataset plus what the mix needs: subscribers with a real password, tradelines."""
+    seed_dataset(sizes)
+    users = sizes["users"]
+    db.session.execute(
+        update(User)
+        .where(User.id != seed_user_id(0))
+        .values(role="subscriber", password_hash=hash_password(PASSWORD))
+    )
+    db.session.execute(
+        insert(Tradeline.__table__),
+        [
+            {
+                "user_id": seed_user_id(i % users),
+                "vendor_name": f"Vendor {i % 13}",
+                "tradeline_type": "revolving",
+                "credit_limit": 1_000 * (1 + i % 20),
+                "status": "active",
+            }
+            for i in range(users * TRADELINES_PER_USER)
+        ],
+    )
+    db.session.commit()
+
+
+def _client(flask_app, index: int, users: int):
+    """A test client logged in (session + JWT) as one seeded subscriber."""
+    client = flask_app.test_client()
+    uid = seed_user_id(1 + index % max(1, users - 1))
+    with client.session_transaction() as sess:
+        sess["_user_id"] = uid
+        sess["_fresh"] = True
+    with flask_app.app_context():
+        client.bench_auth = {"Authorization": f"Bearer {create_access_token(identity=uid)}"}
+    return client
+
+
+# =============================================================================
+# Measurement
+# =============================================================================
+def percentile(sorted_values: list[float], q: float) -> float | None:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return None
+    rank = max(1, min(len(sorted_values), math.ceil(q / 100 * len(sorted_values))))
+    return sorted_values[rank - 1]
+
+
+def summarize(samples: list[tuple[str, float, int, int]], elapsed: float) -> dict:
+    """Aggregate (endpoint, ms, status, queries) samples overall and per endpoint."""
+
+    def block(rows):
+        latencies = sorted(ms for _, ms, _, _ in rows)
+        statuses: dict[str, int] = {}
+        for _, _, status, _ in rows:
+            statuses[str(status)] = statuses.get(str(status), 0) + 1
+        return {
+            "requests": len(rows),
+            "rps": round(len(rows) / elapsed, 1) if elapsed else None,
+            "p50_ms": _round(percentile(latencies, 50)),
+            "p95_ms": _round(percentile(latencies, 95)),
+            "p99_ms": _round(percentile(latencies, 99)),
+            "max_ms": _round(latencies[-1] if latencies else None),
+            "errors": sum(n for s, n in statuses.items() if s.startswith("5")),
+            "statuses": statuses,
+            "queries_per_request": (
+                round(sum(q for *_, q in rows) / len(rows), 1) if rows else None
+            ),
+        }
+
+    endpoints: dict[str, list] = {}
+    for row in samples:
+        endpoints.setdefault(row[0], []).append(row)
+    return {
+        **block(samples),
+        "endpoints": {name: block(rows) for name, rows in sorted(endpoints.items())},
+    }
+
+
+def _round(value):
+    return None if value is None else round(value, 2)
+
+
+def run_step(clients, mix, duration: float, counter, sequence, users: int) -> dict:
+    """Run every client closed-loop for ``duration`` seconds."""
+    endpoints = _endpoints(users)
+    names, weights = list(mix), list(mix.values())
+    samples: list[tuple[str, float, int, int]] = []
+    lock = threading.Lock()
+    start_gate = threading.Barrier(len(clients) + 1)
+    deadline = [0.0]
+
+    def worker(index, client):
+        rng = random.Random(SEED + index)
+        local = []
+        start_gate.wait()
+        while time.perf_counter() < deadline[0]:
+            name = rng.choices(names, weights)[0]
+            before = counter.count
+            started = time.perf_counter()
+            try:
+                status = endpoints[name](client, rng, next(sequence)).status_code
+            except Exception:
+                status = 599  # the app raised through the test client
+            local.append(
+                (name, (time.perf_counter() - started) * 1000, status, counter.count - before)
+            )
+        with lock:
+            samples.extend(local)
+
+    threads = [
+        threading.Thread(target=worker, args=(i, c), daemon=True) for i, c in enumerate(clients)
+    ]
+    for thread in threads:
+        thread.start()
+    deadline[0] = time.perf_counter() + duration
+    began = time.perf_counter()
+    start_gate.wait()
+    for thread in threads:
+        thread.join()
+    return summarize(samples, time.perf_counter() - began)
+
+
+def saturation(steps: list[dict], knee_pct: float, slo_p95_ms: float | None) -> dict:
+    """Last concurrency that still scaled (and met the p95 SLO when one is given)."""
+    best = None
+    previous_rps = None
+    for step in steps:
+        if slo_p95_ms is not None and (step["p95_ms"] or 0) > slo_p95_ms:
+            break
+        if previous_rps is not None and step["rps"] < previous_rps * (1 + knee_pct / 100):
+            break
+        best, previous_rps = step, step["rps"]
+    return {
+        "concurrency": best["concurrency"] if best else None,
+        "rps": best["rps"] if best else None,
+        "p95_ms": best["p95_ms"] if best else None,
+    }
+
+
+def _parse_overrides(pairs: list[str]) -> dict:
+    overrides = {}
+    for pair in pairs:
+        key, _, raw = pair.partition("=")
+        try:
+            overrides[key] = json.loads(raw)
+        except ValueError:
+            overrides[key] = raw
+    return overrides
+
+
+def main(argv=None) -> dict:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ramp", default="1,2,4,8", help="Concurrent clients per step")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per step")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="endpoint=weight,...")
+    parser.add_argument("--scale", default="small", choices=sorted(SCALES))
+    parser.add_argument("--set", action="append", default=[], metavar="KEY=VALUE")
+    parser.add_argument("--knee", type=float, default=10.0, help="Min %% throughput gain")
+    parser.add_argument("--slo-p95-ms", type=float, default=None)
+    parser.add_argument("--db", default="", help="SQLite file (default: temporary file)")
+    parser.add_argument("--out", default="", help="Also write the JSON results to this file")
+    parser.add_argument("--verbose", action="store_true", help="Keep application logging")
+    args = parser.parse_args(argv)
+
+    ramp = [int(n) for n in args.ramp.split(",") if n.strip()]
+    try:
+        mix = parse_mix(args.mix, _endpoints(1))
+    except ValueError as e:
+        parser.error(str(e))
+    overrides = _parse_overrides(args.set)
+    sizes = SCALES[args.scale]
+
+    if not args.verbose:
+        logging.disable(logging.ERROR)
+    workdir = tempfile.TemporaryDirectory(prefix="bench-load-")
+    path = args.db or os.path.join(workdir.name, "load.sqlite")
+    flask_app, redis_kind = build_app(f"sqlite:///{path}")
+    flask_app.config.update(overrides)
+
+    steps = []
+    with flask_app.app_context():
+        engine = db.engine
+
+        @event.listens_for(engine, "connect")
+        def _sqlite_pragmas(dbapi_conn, _record):
+            # WAL lets readers proceed during writes; writers wait instead of failing
+            dbapi_conn.execute("PRAGMA journal_mode=WAL")
+            dbapi_conn.execute("PRAGMA busy_timeout=5000")
+
+        engine.dispose()
+        _seed_load_data(sizes)
+        counter = ThreadQueryCounter(engine)
+        db.session.remove()
+
+    sequence = itertools.count()
+    for concurrency in ramp:
+        clients = [_client(flask_app, i, sizes["users"]) for i in range(concurrency)]
+        step = run_step(clients, mix, args.duration, counter, sequence, sizes["users"])
+        steps.append({"concurrency": concurrency, **step})
+        print(
+            f"clients={concurrency:<4} rps={step['rps']:<8} p50={step['p50_ms']}ms "
+            f"p95={step['p95_ms']}ms p99={step['p99_ms']}ms errors={step['errors']}",
+            flush=True,
+        )
+
+    logging.disable(logging.NOTSET)
+    with flask_app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+    workdir.cleanup()
+
+    report = {
+        "benchmark": "load",
+        "meta": {
+            "database": "sqlite-file",
+            "redis": redis_kind,
+            "scale": args.scale,
+            "duration_s": args.duration,
+            "mix": mix,
+            "config": overrides,
+        },
+        "saturation": saturation(steps, args.knee, args.slo_p95_ms),
+        "steps": steps,
+    }
+    print(json.dumps(report, indent=2))
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2, sort_keys=True)
+    return report
+
+
+if __name__ == "__main__":
+    main()
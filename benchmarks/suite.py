@@ -0,0 +1,482 @@
+# =============================================================================
+# FILE: benchmarks/suite.py
+# DESCRIPTION: End-to-end benchmark suite over deterministic seeded datasets.
+#              Runs against SQLite and fakeredis (no Redis when fakeredis is
+#              not installed) at one or more scales and times:
+#                - ingest.plaid_sync        sync_user_transactions_from_plaid
+#                - analytics.category       compute_category_summary (incl. load)
+#                - fraud.batch              analyze_transactions_batch
+#                - vault.process_reconciled process_reconciled_vaults
+#                - webhooks.ach / .plaid    POST /webhooks/* (new + replayed)
+#                - cockpit.*                the main cockpit views
+#              Each case reports median/min/max wall time, SQL statements and
+#              rows handled; a case that raises is reported with its error so
+#              the rest of the suite still runs. Diff two result files with
+#              `python -m benchmarks.compare`.
+#
+# Usage:
+#   python -m benchmarks.suite [--scales small,medium] [--repeat 5]
+#                              [--only webhooks,cockpit] [--out results.json]
+# =============================================================================
+
+import argparse
+import datetime
+import json
+import logging
+import platform
+import random
+import statistics
+import subprocess
+import time
+from unittest import mock
+
+import numpy as np
+from sqlalchemy import delete, event, insert, update
+
+import app.models  # noqa: F401 - register every table on db.metadata
+from app import create_app
+from app.extensions import db
+from app.models import BankAccount, BankTransaction, BorrowerCard, Transaction, User
+from app.models.vault_transaction import VaultTransaction
+from app.utils.redis_utils import reset_redis_client
+
+SCALES = {
+    "small": {"users": 20, "transactions": 2_000, "vault": 200, "webhooks": 100, "views": 20},
+    "medium": {"users": 200, "transactions": 20_000, "vault": 2_000, "webhooks": 500, "views": 50},
+    "large": {
+        "users": 1_000,
+        "transactions": 200_000,
+        "vault": 10_000,
+        "webhooks": 2_000,
+        "views": 100,
+    },
+}
+CATEGORIES = ("Food", "Travel", "Payroll", "Transfer", "Shops", "Utilities", "Rent", "Fees")
+COCKPIT_VIEWS = {
+    "cockpit.ignite_dashboard": "/admin/cockpit/ignite-dashboard",
+    "cockpit.borrower_card_grid": "/admin/cockpit/borrower-card-grid",
+    "cockpit.vault_metrics": "/admin/cockpit/card-vault/metrics",
+    "cockpit.system_health": "/admin/cockpit/system-health",
+}
+NOW = datetime.datetime(2025, 6, 30, 12, 0)
+SEED = 20250630
+CHUNK = 20_000
+
+
+# =============================================================================
+# Environment
+# =============================================================================
+def _redis_client():
+    try:
+        import fakeredis
+    except ImportError:
+        return None, "none"
+    return fakeredis.FakeRedis(decode_responses=True), "fakeredis"
+
+
+def build_app(database_uri: str | None = None):
+    """
+    Testing app with the webhook and cockpit blueprints mounted. SQLite is
+    in-memory unless ``database_uri`` is given (a file lets concurrent
+    clients use separate connections).
+    """
+    from app.cockpit.views import cockpit_bp
+    from app.config import TestingConfig
+    from app.webhooks.views import webhooks_bp
+
+    with mock.patch.object(
+        TestingConfig,
+        "SQLALCHEMY_DATABASE_URI",
+        database_uri or TestingConfig.SQLALCHEMY_DATABASE_URI,
+    ):
+        flask_app = create_app("testing")
+    flask_app.config.update(WTF_CSRF_ENABLED=False, SQLALCHEMY_RECORD_QUERIES=False)
+    for bp in (webhooks_bp, cockpit_bp):
+        if bp.name not in flask_app.blueprints:
+            flask_app.register_blueprint(bp)
+    flask_app.redis_client, redis_kind = _redis_client()
+    if flask_app.redis_client is not None:
+        # Boot-time pings against the configured Redis URL may have opened the breaker
+        reset_redis_client()
+    return flask_app, redis_kind
+
+
+class QueryCounter:
+    """Counts SQL statements issued on an engine between resets."""
+
+    def __init__(self, engine):
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args):
+        self.count += 1
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# =============================================================================
+# Deterministic dataset
+# =============================================================================
+def seed_user_id(i: int) -> str:
+    return f"00000000-0000-4000-8000-{i:012d}"
+
+
+def seed_dataset(sizes: dict) -> dict:
+    """(Re)create every table and load the dataset for one scale."""
+    rng = np.random.default_rng(SEED)
+    db.session.remove()
+    db.drop_all()
+    db.create_all()
+
+    users = sizes["users"]
+    db.session.execute(
+        insert(User.__table__),
+        [
+            {
+                "id": seed_user_id(i),
+                "username": f"user{i:05d}",
+                "email": f"user{i:05d}@example.com",
+                "password_hash": "x",
+                "role": "admin" if i == 0 else "borrower",
+                "is_admin": i == 0,
+            }
+            for i in range(users)
+        ],
+    )
+    scores = rng.integers(450, 850, users).tolist()
+    db.session.execute(
+        insert(BorrowerCard.__table__),
+        [
+            {
+                "id": i + 1,
+                "user_id": seed_user_id(i),
+                "card_number": f"4{i:015d}",
+                "expiration_date": "12/29",
+                "cvv": f"{i % 1000:03d}",
+                "score": score,
+                "color": "green" if score > 700 else "orange" if score > 600 else "red",
+                "issued_at": NOW - datetime.timedelta(days=i % 365),
+                "revoked": i % 17 == 0,
+            }
+            for i, score in enumerate(scores)
+        ],
+    )
+    db.session.execute(
+        insert(BankAccount.__table__),
+        [
+            {
+                "id": i + 1,
+                "user_id": seed_user_id(i),
+                "account_type": "vault",
+                "account_number": f"VAULT{i:08d}",
+                "balance": 0.0,
+            }
+            for i in range(users)
+        ],
+    )
+
+    total = sizes["transactions"]
+    for start in range(0, total, CHUNK):
+        n = min(CHUNK, total - start)
+        owners = rng.integers(0, users, n).tolist()
+        amounts = np.round(rng.normal(-40, 250, n), 2).tolist()
+        cats = rng.integers(0, len(CATEGORIES), n).tolist()
+        ages = rng.integers(0, 90 * 86400, n).tolist()
+        db.session.execute(
+            insert(Transaction.__table__),
+            [
+                {
+                    "id": f"txn-{start + i:08d}",
+                    "user_id": seed_user_id(owner),
+                    "amount": amount,
+                    "currency": "USD",
+                    "date": NOW - datetime.timedelta(seconds=age),
+                    "name": f"{CATEGORIES[cat]} {start + i}",
+                    "description": f"{CATEGORIES[cat]} payment {start + i}",
+                    "category": CATEGORIES[cat],
+                    "is_pending": False,
+                }
+                for i, (owner, amount, cat, age) in enumerate(zip(owners, amounts, cats, ages))
+            ],
+        )
+
+    vault = sizes["vault"]
+    owners = rng.integers(0, users, vault).tolist()
+    amounts = np.round(rng.uniform(10, 15_000, vault), 2).tolist()
+    db.session.execute(
+        insert(VaultTransaction.__table__),
+        [
+            {
+                "user_id": seed_user_id(owner),
+                "transaction_id": f"vault-{i:08d}",
+                "amount": amount,
+                "currency": "USD",
+                "status": "reconciled",
+                "created_at": NOW - datetime.timedelta(minutes=i),
+            }
+            for i, (owner, amount) in enumerate(zip(owners, amounts))
+        ],
+    )
+    db.session.commit()
+    return {"users": users, "transactions": total, "vault": vault}
+
+
+def _plaid_page(sizes: dict) -> list[dict]:
+    """One Plaid /transactions/get page: half updates of known rows, half new."""
+    rng = random.Random(SEED)
+    count = max(1, sizes["transactions"] // 10)
+    known = rng.sample(range(sizes["transactions"]), count // 2)
+    ids = [f"txn-{i:08d}" for i in known] + [f"plaid-{i:08d}" for i in range(count - len(known))]
+    return [
+        {
+            "transaction_id": txn_id,
+            "account_id": "acct-bench",
+            "amount": round(rng.uniform(-500, 500), 2),
+            "iso_currency_code": "USD",
+            "date": (NOW - datetime.timedelta(days=rng.randrange(30))).date().isoformat(),
+            "name": f"Merchant {txn_id}",
+            "merchant_name": f"Merchant {txn_id[-3:]}",
+            "category": [rng.choice(CATEGORIES)],
+            "pending": rng.random() < 0.1,
+            "payment_channel": "online",
+        }
+        for txn_id in ids
+    ]
+
+
+def _webhook_payloads(sizes: dict) -> list[dict]:
+    """Distinct valid events, with every tenth one replayed (idempotency path)."""
+    payloads = []
+    for i in range(sizes["webhooks"]):
+        owner = i % sizes["users"]
+        payloads.append(
+            {"borrower_id": seed_user_id(owner), "card_id": str(owner + 1), "amount": 10 + i / 100}
+        )
+    return payloads + payloads[::10]
+
+
+# =============================================================================
+# Cases: each returns (setup, run); run() returns (rows, extra)
+# =============================================================================
+def _case_plaid_sync(flask_app, sizes):
+    from app.services import plaid_api
+
+    # The Plaid HTTP fetch is outside the measured path (and importing the
+    # ingestion module needs the name to exist); every run gets a fixed page.
+    page = _plaid_page(sizes)
+    with mock.patch.object(plaid_api, "fetch_recent_transactions", create=True):
+        from app.services import transaction_ingestion
+
+    def setup():
+        db.session.execute(delete(Transaction).where(Transaction.id.like("plaid-%")))
+        db.session.commit()
+
+    def run():
+        # The Plaid HTTP call is outside the measured path; feed the page directly
+        with mock.patch.object(transaction_ingestion, "fetch_recent_transactions") as fetch:
+            fetch.return_value = page
+            inserted = transaction_ingestion.sync_user_transactions_from_plaid(
+                seed_user_id(1), "access-bench"
+            )
+        db.session.commit()
+        return len(page), {"inserted": inserted}
+
+    return setup, run
+
+
+def _case_category_summary(flask_app, sizes):
+    from app.dto.transaction_dto import TransactionDTO
+    from app.services.category_analytics import compute_category_summary
+
+    def run():
+        rows = Transaction.query.filter(Transaction.user_id == seed_user_id(1)).all()
+        summary = compute_category_summary([TransactionDTO.from_model(t) for t in rows])
+        db.session.expunge_all()
+        return len(rows), {"categories": len(summary.categories)}
+
+    return None, run
+
+
+def _case_fraud_batch(flask_app, sizes):
+    from app.services.fraud import analyze_transactions_batch
+
+    batch = [
+        {"id": f"txn-{i:08d}", "amount": round(25 + (i * 37) % 9_000, 2), "description": c}
+        for i, c in zip(range(sizes["transactions"] // 10), CATEGORIES * sizes["transactions"])
+    ]
+
+    def setup():
+        random.seed(SEED)
+
+    def run():
+        result = analyze_transactions_batch(batch)
+        return len(batch), {"flagged": result["stats"]["flagged"]}
+
+    return setup, run
+
+
+def _case_vault(flask_app, sizes):
+    from app.processors.vault_processor import process_reconciled_vaults
+
+    def setup():
+        db.session.execute(delete(BankTransaction))
+        db.session.execute(update(BankAccount).values(balance=0.0))
+        db.session.commit()
+
+    def run():
+        process_reconciled_vaults()
+        return sizes["vault"], {"deposits": db.session.query(BankTransaction).count()}
+
+    return setup, run
+
+
+def _case_webhook(provider):
+    def case(flask_app, sizes):
+        payloads = _webhook_payloads(sizes)
+        client = flask_app.test_client()
+
+        def setup():
+            if flask_app.redis_client is not None:
+                flask_app.redis_client.flushdb()
+
+        def run():
+            statuses: dict[str, int] = {}
+            for payload in payloads:
+                status = str(client.post(f"/webhooks/{provider}", json=payload).status_code)
+                statuses[status] = statuses.get(status, 0) + 1
+            db.session.remove()
+            return len(payloads), {"statuses": statuses}
+
+        return setup, run
+
+    return case
+
+
+def _case_cockpit(path):
+    def case(flask_app, sizes):
+        client = flask_app.test_client()
+        with client.session_transaction() as sess:
+            sess["_user_id"] = seed_user_id(0)
+            sess["_fresh"] = True
+
+        def run():
+            statuses: dict[str, int] = {}
+            for _ in range(sizes["views"]):
+                status = str(client.get(path).status_code)
+                statuses[status] = statuses.get(status, 0) + 1
+            db.session.remove()
+            return sizes["views"], {"statuses": statuses}
+
+        return None, run
+
+    return case
+
+
+CASES = {
+    "ingest.plaid_sync": _case_plaid_sync,
+    "analytics.category": _case_category_summary,
+    "fraud.batch": _case_fraud_batch,
+    "vault.process_reconciled": _case_vault,
+    "webhooks.ach": _case_webhook("ach"),
+    "webhooks.plaid": _case_webhook("plaid"),
+    **{name: _case_cockpit(path) for name, path in COCKPIT_VIEWS.items()},
+}
+
+
+# =============================================================================
+# Runner
+# =============================================================================
+def run_case(build, flask_app, sizes, repeat: int, counter: QueryCounter) -> dict:
+    """
+    One untimed warm-up run, then ``repeat`` timed runs; statements and
+    extras come from the last run.
+    """
+    try:
+        setup, run = build(flask_app, sizes)
+        samples = []
+        for i in range(repeat + 1):
+            if setup:
+                setup()
+            counter.count = 0
+            start = time.perf_counter()
+            rows, extra = run()
+            if i:
+                samples.append((time.perf_counter() - start) * 1000)
+    except Exception as e:
+        db.session.rollback()
+        return {"error": f"{type(e).__name__}: {e}"[:300]}
+
+    median = statistics.median(samples)
+    return {
+        "median_ms": round(median, 2),
+        "min_ms": round(min(samples), 2),
+        "max_ms": round(max(samples), 2),
+        "queries": counter.count,
+        "rows": rows,
+        "per_row_us": round(median * 1000 / rows, 1) if rows else None,
+        **extra,
+    }
+
+
+def main(argv=None) -> dict:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scales", default="small", help=f"Comma list of {', '.join(SCALES)}")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", default="", help="Comma list of case-name prefixes")
+    parser.add_argument("--out", default="", help="Also write the JSON results to this file")
+    parser.add_argument("--verbose", action="store_true", help="Keep application logging")
+    args = parser.parse_args(argv)
+
+    scales = [s.strip() for s in args.scales.split(",") if s.strip()]
+    unknown = [s for s in scales if s not in SCALES]
+    if unknown:
+        parser.error(f"unknown scales: {', '.join(unknown)}")
+    prefixes = tuple(p.strip() for p in args.only.split(",") if p.strip())
+    cases = {n: c for n, c in CASES.items() if not prefixes or n.startswith(prefixes)}
+
+    if not args.verbose:
+        logging.disable(logging.ERROR)
+    flask_app, redis_kind = build_app()
+    results: dict[str, dict] = {}
+    datasets: dict[str, dict] = {}
+    with flask_app.app_context():
+        counter = QueryCounter(db.engine)
+        for scale in scales:
+            sizes = SCALES[scale]
+            for name, build in cases.items():
+                # Every case starts from the same freshly seeded data
+                datasets[scale] = seed_dataset(sizes)
+                if flask_app.redis_client is not None:
+                    flask_app.redis_client.flushdb()
+                results[f"{name}@{scale}"] = run_case(build, flask_app, sizes, args.repeat, counter)
+        db.session.remove()
+    logging.disable(logging.NOTSET)
+
+    report = {
+        "benchmark": "suite",
+        "meta": {
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "database": "sqlite",
+            "redis": redis_kind,
+            "repeat": args.repeat,
+            "scales": {s: datasets.get(s, SCALES[s]) for s in scales},
+        },
+        "results": results,
+    }
+    print(json.dumps(report, indent=2))
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2, sort_keys=True)
+    return report
+
+
+if __name__ == "__main__":
+    main()
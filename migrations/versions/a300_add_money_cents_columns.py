@@ -0,0 +1,67 @@
+"""Add exact BIGINT cents columns alongside legacy Float money columns
+
+Online migration: the new columns are nullable, so they can be added without
+rewriting the table; the application dual-writes them (app.utils.money
+sync_exact) and existing rows are backfilled here in small batches keyed by
+primary key. The backfill runs in an autocommit block, outside the migration
+transaction, so each batch commits as it goes and no long-running transaction
+holds row locks.
+"""
+
+from decimal import ROUND_HALF_UP, Decimal
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "a300_add_money_cents_columns"
+down_revision = "71105643d932"
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+# (table, legacy Float column, new cents column)
+MONEY_COLUMNS = [
+    ("transactions", "amount", "amount_cents"),
+    ("bank_accounts", "balance", "balance_cents"),
+    ("bank_transactions", "amount", "amount_cents"),
+    ("vault_transactions", "amount", "amount_cents"),
+    ("ledger_entries", "amount", "amount_cents"),
+    ("credit_ledger", "credit_limit", "credit_limit_cents"),
+    ("credit_ledger", "balance_used", "balance_used_cents"),
+    ("payment_log", "amount", "amount_cents"),
+]
+
+
+def _to_cents(value):
+    # Same rounding as app.utils.money.to_cents (str() first, half-up)
+    return int(Decimal(str(value)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP) * 100)
+
+
+def _backfill(bind, table, legacy, cents):
+    select_batch = sa.text(
+        f"SELECT id, {legacy} FROM {table} "
+        f"WHERE {cents} IS NULL AND {legacy} IS NOT NULL ORDER BY id LIMIT :n"
+    )
+    update = sa.text(f"UPDATE {table} SET {cents} = :cents WHERE id = :id")
+    while True:
+        rows = bind.execute(select_batch, {"n": BATCH_SIZE}).fetchall()
+        if not rows:
+            return
+        bind.execute(update, [{"id": row[0], "cents": _to_cents(row[1])} for row in rows])
+
+
+def upgrade():
+    for table, _legacy, cents in MONEY_COLUMNS:
+        op.add_column(table, sa.Column(cents, sa.BigInteger(), nullable=True))
+
+    # Commits the column DDL first; every batch below then commits on its own
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        for table, legacy, cents in MONEY_COLUMNS:
+            _backfill(bind, table, legacy, cents)
+
+
+def downgrade():
+    for table, _legacy, cents in reversed(MONEY_COLUMNS):
+        op.drop_column(table, cents)
@@ -0,0 +1,48 @@
+"""Add composite indexes for hot cockpit / subscriber access paths
+
+Covers per-user date-ordered transaction history, timestamp-ordered
+schema_event / trace_events feeds, vault transaction lookups by user and
+status, audit log drilldowns and the bank transfer feed. Plans for these
+queries are checked by app/tests/test_query_plans.py.
+"""
+
+from alembic import op
+
+revision = "a301_add_hot_path_composite_indexes"
+down_revision = "a300_add_money_cents_columns"
+branch_labels = None
+depends_on = None
+
+# (index name, table, columns)
+INDEXES = [
+    ("ix_transactions_user_id_date", "transactions", ["user_id", "date"]),
+    ("ix_schema_event_event_type_timestamp", "schema_event", ["event_type", "timestamp"]),
+    ("ix_schema_event_user_id_timestamp", "schema_event", ["user_id", "timestamp"]),
+    ("ix_schema_event_timestamp", "schema_event", ["timestamp"]),
+    (
+        "ix_vault_transactions_user_id_created_at",
+        "vault_transactions",
+        ["user_id", "created_at"],
+    ),
+    (
+        "ix_vault_transactions_status_created_at",
+        "vault_transactions",
+        ["status", "created_at"],
+    ),
+    ("ix_audit_logs_user_id_created_at", "audit_logs", ["user_id", "created_at"]),
+    ("ix_audit_logs_event_type_created_at", "audit_logs", ["event_type", "created_at"]),
+    ("ix_trace_events_timestamp", "trace_events", ["timestamp"]),
+    ("ix_trace_events_event_type_timestamp", "trace_events", ["event_type", "timestamp"]),
+    ("ix_trace_events_user_id_timestamp", "trace_events", ["user_id", "timestamp"]),
+    ("ix_bank_transactions_timestamp", "bank_transactions", ["timestamp"]),
+]
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade():
+    for name, table, _columns in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
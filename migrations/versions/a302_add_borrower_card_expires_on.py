@@ -0,0 +1,80 @@
+"""Add indexed borrower_cards.expires_on normalized from the MM/YY string
+
+The column is nullable so it can be added online; the model keeps it in sync
+whenever expiration_date is written (app.models.borrower_card) and existing
+rows are backfilled here in primary-key batches, each committed on its own
+(autocommit block) so no long-running transaction holds row locks. The index
+is built after the backfill; on MySQL it is requested as ALGORITHM=INPLACE,
+LOCK=NONE so the server refuses rather than blocking writes. Vault metrics and
+the expiring-soon query read it with an index range scan instead of parsing
+the string in Python.
+"""
+
+import calendar
+import datetime
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "a302_add_borrower_card_expires_on"
+down_revision = "a301_add_hot_path_composite_indexes"
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+
+def _expires_on(value):
+    # Same rules as app.models.borrower_card.parse_card_expiry
+    try:
+        month, year = (int(part) for part in str(value).strip().split("/"))
+    except (AttributeError, TypeError, ValueError):
+        return None
+    if not 1 <= month <= 12:
+        return None
+    year += 2000 if year < 100 else 0
+    return datetime.date(year, month, calendar.monthrange(year, month)[1])
+
+
+def _backfill(bind):
+    select_batch = sa.text(
+        "SELECT id, expiration_date FROM borrower_cards "
+        "WHERE expires_on IS NULL AND id > :after ORDER BY id LIMIT :n"
+    )
+    update = sa.text("UPDATE borrower_cards SET expires_on = :expires_on WHERE id = :id")
+    after = 0
+    while True:
+        rows = bind.execute(select_batch, {"after": after, "n": BATCH_SIZE}).fetchall()
+        if not rows:
+            return
+        # Unparseable values stay NULL; `after` keeps them from being re-read
+        updates = [{"id": r[0], "expires_on": _expires_on(r[1])} for r in rows]
+        updates = [u for u in updates if u["expires_on"] is not None]
+        if updates:
+            bind.execute(update, updates)
+        after = rows[-1][0]
+
+
+def _create_index():
+    if op.get_bind().dialect.name == "mysql":
+        op.execute(
+            "ALTER TABLE borrower_cards ADD INDEX ix_borrower_cards_expires_on (expires_on), "
+            "ALGORITHM=INPLACE, LOCK=NONE"
+        )
+    else:
+        op.create_index("ix_borrower_cards_expires_on", "borrower_cards", ["expires_on"])
+
+
+def upgrade():
+    op.add_column("borrower_cards", sa.Column("expires_on", sa.Date(), nullable=True))
+
+    # Commits the column DDL first; every batch below then commits on its own
+    with op.get_context().autocommit_block():
+        _backfill(op.get_bind())
+
+    _create_index()
+
+
+def downgrade():
+    op.drop_index("ix_borrower_cards_expires_on", table_name="borrower_cards")
+    op.drop_column("borrower_cards", "expires_on")
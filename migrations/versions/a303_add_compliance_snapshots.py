@@ -0,0 +1,53 @@
+"""Add compliance_snapshots and the loan_agreement (lender_id, updated_at) index
+
+compliance_snapshots holds the latest batch evaluation per lender
+(app.compliance.refresh_compliance_snapshots). The composite index serves the
+per-lender COUNT / MAX(updated_at) change probe that decides which lenders
+need re-evaluating.
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "a303_add_compliance_snapshots"
+down_revision = "a302_add_borrower_card_expires_on"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "compliance_snapshots",
+        sa.Column(
+            "lender_id",
+            sa.String(36),
+            sa.ForeignKey("users.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("total_agreements", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("active_agreements", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("defaulted_agreements", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("ai_flagged_agreements", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("violating_agreements", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("violations_total", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("is_locked", sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column("status", sa.String(16), nullable=False),
+        sa.Column("source_updated_at", sa.DateTime(), nullable=True),
+        sa.Column("evaluated_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_compliance_snapshots_status", "compliance_snapshots", ["status"])
+    op.create_index(
+        "ix_compliance_snapshots_evaluated_at", "compliance_snapshots", ["evaluated_at"]
+    )
+    op.create_index(
+        "ix_loan_agreement_lender_id_updated_at",
+        "loan_agreement",
+        ["lender_id", "updated_at"],
+    )
+
+
+def downgrade():
+    op.drop_index("ix_loan_agreement_lender_id_updated_at", table_name="loan_agreement")
+    op.drop_index("ix_compliance_snapshots_evaluated_at", table_name="compliance_snapshots")
+    op.drop_index("ix_compliance_snapshots_status", table_name="compliance_snapshots")
+    op.drop_table("compliance_snapshots")
@@ -0,0 +1,41 @@
+"""Add the fraud trend rollup tables and the fraud_reports (created_at, id) index
+
+fraud_trend_buckets holds fraud report counts per (day, transaction category)
+and fraud_trend_watermark the last report folded into them
+(app.compliance_ai.refresh_fraud_trends). The composite index serves the
+"reports after the high-water mark" range scan that keeps reruns incremental.
+Buckets start empty; the first refresh after upgrading folds in every report.
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "a304_add_fraud_trend_rollup"
+down_revision = "a303_add_compliance_snapshots"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "fraud_trend_buckets",
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("category", sa.String(64), primary_key=True),
+        sa.Column("cases", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+    )
+    op.create_table(
+        "fraud_trend_watermark",
+        sa.Column("source", sa.String(32), primary_key=True),
+        sa.Column("last_created_at", sa.DateTime(), nullable=True),
+        sa.Column("last_report_id", sa.String(36), nullable=True),
+        sa.Column("reports_processed", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_fraud_reports_created_at_id", "fraud_reports", ["created_at", "id"])
+
+
+def downgrade():
+    op.drop_index("ix_fraud_reports_created_at_id", table_name="fraud_reports")
+    op.drop_table("fraud_trend_watermark")
+    op.drop_table("fraud_trend_buckets")
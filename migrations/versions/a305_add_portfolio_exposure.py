@@ -0,0 +1,87 @@
+"""Add portfolio_exposure running totals and backfill them
+
+One row per borrower with card or payment history: credit limit, balance
+used and repaid amounts as integer cents, plus the timestamps the read-time
+delinquency buckets are derived from. app.services.portfolio_exposure keeps
+the rows current on every CreditLedger / PaymentLog flush; the backfill here
+seeds them with the same grouped aggregates.
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "a305_add_portfolio_exposure"
+down_revision = "a304_add_fraud_trend_rollup"
+branch_labels = None
+depends_on = None
+
+
+def _backfill(bind):
+    # Same rollup as app.services.portfolio_exposure._recompute, set-based
+    bind.execute(
+        sa.text(
+            """
+            INSERT INTO portfolio_exposure (
+                user_id, cards, credit_limit_cents, balance_used_cents, first_credit_at,
+                payments, repaid_cents, last_paid_at, updated_at
+            )
+            SELECT u.user_id,
+                   COALESCE(l.cards, 0), COALESCE(l.limit_cents, 0), COALESCE(l.used_cents, 0),
+                   l.first_credit_at,
+                   COALESCE(p.payments, 0), COALESCE(p.repaid_cents, 0),
+                   CASE
+                       WHEN l.last_card_payment IS NULL THEN p.last_payment
+                       WHEN p.last_payment IS NULL OR l.last_card_payment > p.last_payment
+                           THEN l.last_card_payment
+                       ELSE p.last_payment
+                   END,
+                   CURRENT_TIMESTAMP
+            FROM (
+                SELECT user_id FROM credit_ledger
+                UNION
+                SELECT user_id FROM payment_log WHERE status <> 'failed'
+            ) u
+            LEFT JOIN (
+                SELECT user_id, COUNT(id) AS cards,
+                       SUM(COALESCE(credit_limit_cents, ROUND(credit_limit * 100))) AS limit_cents,
+                       SUM(COALESCE(balance_used_cents, ROUND(balance_used * 100))) AS used_cents,
+                       MIN(created_at) AS first_credit_at,
+                       MAX(last_payment_ts) AS last_card_payment
+                FROM credit_ledger GROUP BY user_id
+            ) l ON l.user_id = u.user_id
+            LEFT JOIN (
+                SELECT user_id, COUNT(id) AS payments,
+                       SUM(COALESCE(amount_cents, ROUND(amount * 100))) AS repaid_cents,
+                       MAX(created_at) AS last_payment
+                FROM payment_log WHERE status <> 'failed' GROUP BY user_id
+            ) p ON p.user_id = u.user_id
+            """
+        )
+    )
+
+
+def upgrade():
+    op.create_table(
+        "portfolio_exposure",
+        sa.Column(
+            "user_id",
+            sa.String(36),
+            sa.ForeignKey("users.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("cards", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("credit_limit_cents", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("balance_used_cents", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("first_credit_at", sa.DateTime(), nullable=True),
+        sa.Column("payments", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("repaid_cents", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("last_paid_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_portfolio_exposure_last_paid_at", "portfolio_exposure", ["last_paid_at"])
+    _backfill(op.get_bind())
+
+
+def downgrade():
+    op.drop_index("ix_portfolio_exposure_last_paid_at", table_name="portfolio_exposure")
+    op.drop_table("portfolio_exposure")
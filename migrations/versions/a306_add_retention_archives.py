@@ -0,0 +1,126 @@
+"""Add archive tables for audit/trace retention and the dispute_log time index
+
+audit_logs, trace_events, schema_event and dispute_log each get a
+<table>_archive twin (app.models.archive) that app.services.retention moves
+aged rows into. Archive tables carry no foreign keys and are keyed by
+(id, time column); on MySQL servers with partitioning they start out
+range-partitioned by that column with a single catch-all partition, and the
+retention job splits monthly partitions off it as rows arrive.
+ix_dispute_log_delivery_ts serves the "rows older than the cutoff" scan.
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "a306_add_retention_archives"
+down_revision = "a305_add_portfolio_exposure"
+branch_labels = None
+depends_on = None
+
+
+def _archive_columns(time_col):
+    return [
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=False),
+        sa.Column(time_col, sa.DateTime(), primary_key=True),
+    ]
+
+
+def _audit_logs():
+    return [
+        *_archive_columns("created_at"),
+        sa.Column("user_id", sa.String(36), nullable=False),
+        sa.Column("transaction_id", sa.String(36), nullable=True),
+        sa.Column("event_type", sa.String(64), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=False),
+    ]
+
+
+def _trace_events():
+    return [
+        *_archive_columns("timestamp"),
+        sa.Column("event_id", sa.String(128), nullable=False),
+        sa.Column("event_type", sa.String(64), nullable=False),
+        sa.Column("user_id", sa.String(36), nullable=True),
+        sa.Column("email", sa.String(120), nullable=True),
+        sa.Column("ip", sa.String(45), nullable=True),
+        sa.Column("meta", sa.Text(), nullable=True),
+        sa.Column("detail", sa.Text(), nullable=True),
+    ]
+
+
+def _schema_event():
+    return [
+        *_archive_columns("timestamp"),
+        sa.Column("user_id", sa.String(36), nullable=False),
+        sa.Column("event_type", sa.String(64), nullable=False),
+        sa.Column("detail", sa.Text(), nullable=True),
+        sa.Column("origin", sa.String(64), nullable=True),
+    ]
+
+
+def _dispute_log():
+    return [
+        *_archive_columns("delivery_ts"),
+        sa.Column("user_id", sa.String(36), nullable=False),
+        sa.Column("template_title", sa.String(128), nullable=False),
+        sa.Column("bureau", sa.String(64), nullable=False),
+        sa.Column("method", sa.String(16), nullable=False),
+        sa.Column("email_status", sa.String(16), nullable=True),
+        sa.Column("sendgrid_id", sa.String(128), nullable=True),
+        sa.Column("content_hash", sa.String(128), nullable=False),
+        sa.Column("acknowledged_ts", sa.DateTime(), nullable=True),
+        sa.Column("response_notes", sa.Text(), nullable=True),
+        sa.Column("status", sa.String(32), nullable=True),
+    ]
+
+
+# (hot table, time column, archive columns)
+ARCHIVES = [
+    ("audit_logs", "created_at", _audit_logs),
+    ("trace_events", "timestamp", _trace_events),
+    ("schema_event", "timestamp", _schema_event),
+    ("dispute_log", "delivery_ts", _dispute_log),
+]
+
+
+def _partitioning_available(bind):
+    if bind.dialect.name not in ("mysql", "mariadb"):
+        return False
+    if not getattr(bind.dialect, "is_mariadb", False) and (
+        bind.dialect.server_version_info or (0,)
+    ) >= (8,):
+        return True
+    status = bind.execute(
+        sa.text(
+            "SELECT PLUGIN_STATUS FROM information_schema.PLUGINS WHERE PLUGIN_NAME = 'partition'"
+        )
+    ).scalar()
+    return status == "ACTIVE"
+
+
+def upgrade():
+    op.create_index("ix_dispute_log_delivery_ts", "dispute_log", ["delivery_ts"])
+    partitioned = _partitioning_available(op.get_bind())
+    for table, time_col, columns in ARCHIVES:
+        name = f"{table}_archive"
+        op.create_table(
+            name,
+            *columns(),
+            sa.Column("archived_at", sa.DateTime(), nullable=False),
+        )
+        op.create_index(f"ix_{name}_{time_col}_id", name, [time_col, "id"])
+        op.create_index(f"ix_{name}_user_id_{time_col}_id", name, ["user_id", time_col, "id"])
+        if partitioned:
+            op.execute(
+                f"ALTER TABLE {name} PARTITION BY RANGE COLUMNS({time_col}) "
+                "(PARTITION pmax VALUES LESS THAN (MAXVALUE))"
+            )
+
+
+def downgrade():
+    for table, time_col, _columns in reversed(ARCHIVES):
+        name = f"{table}_archive"
+        op.drop_index(f"ix_{name}_user_id_{time_col}_id", table_name=name)
+        op.drop_index(f"ix_{name}_{time_col}_id", table_name=name)
+        op.drop_table(name)
+    op.drop_index("ix_dispute_log_delivery_ts", table_name="dispute_log")
@@ -0,0 +1,33 @@
+"""Add loan_agreement.violation_counted
+
+app.compliance.refresh_compliance_snapshots marks an agreement once its
+violation has added a strike to the lender, instead of diffing per-lender
+violating totals (which missed a new violation whenever another agreement
+stopped violating between runs). Agreements already violating for lenders
+that have a compliance snapshot were struck by earlier runs and start out
+marked.
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "a307_add_loan_agreement_violation_counted"
+down_revision = "a306_add_retention_archives"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "loan_agreement",
+        sa.Column("violation_counted", sa.Boolean(), nullable=False, server_default=sa.false()),
+    )
+    op.execute(
+        "UPDATE loan_agreement SET violation_counted = TRUE, updated_at = updated_at "
+        "WHERE COALESCE(violation_count, 0) > 0 "
+        "AND lender_id IN (SELECT lender_id FROM compliance_snapshots)"
+    )
+
+
+def downgrade():
+    op.drop_column("loan_agreement", "violation_counted")